@@ -4,4 +4,5 @@ from dext.common.utils.app_settings import app_settings
 
 
 achievements_settings = app_settings('ACHIEVEMENTS',
-                                     LAST_ACHIEVEMENTS_NUMBER=5)
+                                     LAST_ACHIEVEMENTS_NUMBER=5,
+                                     SPREAD_CHUNK_SIZE=1000)
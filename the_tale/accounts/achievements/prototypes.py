@@ -4,6 +4,7 @@ from django.db import models
 
 from dext.common.utils.urls import full_url
 
+from the_tale.common.utils import bulk
 from the_tale.common.utils.decorators import lazy_property
 from the_tale.common.utils.prototypes import BasePrototype
 
@@ -157,6 +158,32 @@ class AccountAchievementsPrototype(BasePrototype):
         MessagePrototype.create(get_system_user(), self.account, message)
 
 
+    @classmethod
+    def add_achievement_to_accounts(cls, achievement, accounts_ids):
+        # bulk version of add_achievement without notifications
+        from the_tale.collections.models import GiveItemTask
+
+        if not accounts_ids:
+            return
+
+        changed_models = []
+
+        for account_achievements in cls.from_query(cls._db_filter(account_id__in=accounts_ids)):
+            account_achievements.achievements.add_achievement(achievement)
+
+            if not account_achievements.achievements.updated:
+                continue
+
+            account_achievements.achievements.serialize()
+            account_achievements._model.points = account_achievements.achievements.get_points()
+            changed_models.append(account_achievements._model)
+
+        bulk.bulk_update(AccountAchievements, changed_models, fields=['achievements', 'points'])
+
+        GiveItemTask.objects.bulk_create([GiveItemTask(account_id=account_id, item_id=item.id)
+                                          for account_id in accounts_ids
+                                          for item in achievement.rewards])
+
     def remove_achievement(self, achievement):
         self.achievements.remove_achievement(achievement)
         self._model.points = self.achievements.get_points()
@@ -191,5 +218,20 @@ class GiveAchievementTaskPrototype(BasePrototype):
         return cls(model=cls._db_create(account_id=account_id,
                                         achievement_id=achievement_id))
 
+    @classmethod
+    def create_many(cls, tasks):
+        # tasks: [(account_id, achievement_id), ...], duplicates are skipped
+        tasks_models = []
+        created = set()
+
+        for account_id, achievement_id in tasks:
+            if (account_id, achievement_id) in created:
+                continue
+            created.add((account_id, achievement_id))
+            tasks_models.append(cls._model_class(account_id=account_id, achievement_id=achievement_id))
+
+        if tasks_models:
+            cls._model_class.objects.bulk_create(tasks_models)
+
     def remove(self):
         self._model.delete()
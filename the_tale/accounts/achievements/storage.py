@@ -1,19 +1,52 @@
 # coding: utf-8
+import bisect
 import contextlib
 import collections
 
 from the_tale.common.utils import storage
 
-from the_tale.accounts.achievements.prototypes import AchievementPrototype, AccountAchievementsPrototype
+from the_tale.accounts.achievements.prototypes import AchievementPrototype, AccountAchievementsPrototype, GiveAchievementTaskPrototype
 from the_tale.accounts.achievements.exceptions import AchievementsError
 from the_tale.accounts.achievements.relations import ACHIEVEMENT_GROUP
 
 
-class AchievementsStorage(storage.Storage):
+class AchievementsStorage(storage.CachedStorage):
     SETTINGS_KEY = 'achievements change time'
     EXCEPTION = AchievementsError
     PROTOTYPE = AchievementPrototype
 
+    def __init__(self):
+        super(AchievementsStorage, self).__init__()
+        self._barriers_index = None
+        self._batch = None
+
+    def _update_cached_data(self, item):
+        self._barriers_index = None
+
+    def _reset_cache(self):
+        self._barriers_index = None
+
+    def update_version(self):
+        # achievements can be changed in place (approved, barrier), so index must be rebuilt
+        super(AchievementsStorage, self).update_version()
+        self._barriers_index = None
+
+    def _build_barriers_index(self):
+        # {type: (sorted barriers, achievements in the same order)}, only for approved achievements
+        achievements_by_type = {}
+
+        for achievement in self.all():
+            if achievement.approved:
+                achievements_by_type.setdefault(achievement.type, []).append(achievement)
+
+        index = {}
+
+        for type, achievements in achievements_by_type.iteritems():
+            achievements.sort(key=lambda achievement: achievement.barrier)
+            index[type] = ([achievement.barrier for achievement in achievements], achievements)
+
+        return index
+
     def by_group(self, group, only_approved):
         by_group =  (achievement for achievement in self.all() if achievement.group == group)
 
@@ -31,14 +64,68 @@ class AchievementsStorage(storage.Storage):
         return by_type
 
 
+    def crossed_achievements(self, type, old_value, new_value):
+        # approved achievements, for which achievement.check(old_value, new_value) is True
+        self.sync()
+
+        if self._barriers_index is None:
+            self._barriers_index = self._build_barriers_index()
+
+        if type not in self._barriers_index:
+            return []
+
+        barriers, achievements = self._barriers_index[type]
+
+        if new_value < 0:
+            # old_value > barrier >= new_value
+            return achievements[bisect.bisect_left(barriers, new_value):bisect.bisect_left(barriers, old_value)]
+
+        # old_value < barrier <= new_value
+        return achievements[bisect.bisect_right(barriers, old_value):bisect.bisect_right(barriers, new_value)]
+
     def verify_achievements(self, account_id, type, old_value, new_value):
         if old_value == new_value:
             return
 
-        for achievement in self.by_type(type, only_approved=True):
-            if achievement.check(old_value, new_value):
+        for achievement in self.crossed_achievements(type, old_value, new_value):
+            if self._batch is not None:
+                self._batch.append((account_id, achievement.id))
+            else:
                 AccountAchievementsPrototype.give_achievement(account_id=account_id, achievement=achievement)
 
+    @contextlib.contextmanager
+    def batch(self):
+        # all achievements, given inside block, are saved as tasks with single query on exit
+        if self._batch is not None:
+            yield
+            return
+
+        self._batch = []
+
+        try:
+            yield
+        finally:
+            tasks, self._batch = self._batch, None
+            GiveAchievementTaskPrototype.create_many(tasks)
+
+    @contextlib.contextmanager
+    def collect(self):
+        # achievements, given inside block, are not saved but collected into list of (account_id, achievement_id)
+        # used by forked processes, which pass them to parent process (see add_collected)
+        batch, self._batch = self._batch, []
+
+        try:
+            yield self._batch
+        finally:
+            self._batch = batch
+
+    def add_collected(self, tasks):
+        if self._batch is not None:
+            self._batch.extend(tasks)
+            return
+
+        GiveAchievementTaskPrototype.create_many(tasks)
+
     @contextlib.contextmanager
     def verify(self, type, object):
         old_value = object.get_achievement_type_value(type)
@@ -90,6 +90,25 @@ class AchievementsManagerTests(testcase.TestCase):
 
         self.assertEqual(GiveAchievementTaskPrototype._db_count(), 0)
 
+    @mock.patch('the_tale.accounts.achievements.conf.achievements_settings.SPREAD_CHUNK_SIZE', 1)
+    @mock.patch('the_tale.accounts.achievements.storage.AchievementsStorage.verify_achievements', lambda *argv, **kwargs: None)
+    def test_add_achievements__all_accounts__chunks(self):
+        from the_tale.game.heroes.prototypes import HeroPrototype
+
+        GiveAchievementTaskPrototype.create(account_id=None, achievement_id=self.achievement_3.id)
+
+        for account in (self.account_1, self.account_2):
+            hero = HeroPrototype.get_by_account_id(account.id)
+            hero.statistics.change_pve_deaths(self.achievement_3.barrier)
+            hero.save()
+
+        with mock.patch('the_tale.accounts.achievements.prototypes.AccountAchievementsPrototype.add_achievement_to_accounts') as add_achievement_to_accounts:
+            self.worker.add_achievements()
+
+        self.assertEqual([call for call in add_achievement_to_accounts.call_args_list if call[0][1]],
+                         [mock.call(self.achievement_3, [self.account_1.id]),
+                          mock.call(self.achievement_3, [self.account_2.id])])
+
     @mock.patch('the_tale.accounts.achievements.storage.AchievementsStorage.verify_achievements', lambda *argv, **kwargs: None)
     def test_add_achievements__all_accounts__not_remove_already_received_achievements(self):
         self.account_achievements_1.achievements.add_achievement(self.achievement_3)
@@ -111,6 +111,30 @@ class AccountAchievementsPrototypeTests(testcase.TestCase):
             with self.check_not_changed(MessagePrototype._db_count):
                 self.account_achievements_1.add_achievement(self.achievement_1, notify=False)
 
+    def test_add_achievement_to_accounts(self):
+        result, account_id, bundle_id = register_user('test_user_2', 'test_user_2@test.com', '111111')
+
+        self.account_achievements_1.achievements.add_achievement(self.achievement_3)
+        self.account_achievements_1.save()
+
+        with self.check_delta(GiveItemTaskPrototype._db_count, 4):
+            with self.check_not_changed(MessagePrototype._db_count):
+                AccountAchievementsPrototype.add_achievement_to_accounts(self.achievement_1, [self.account_1.id, account_id])
+
+        self.account_achievements_1.reload()
+        account_achievements_2 = AccountAchievementsPrototype.get_by_account_id(account_id)
+
+        self.assertTrue(self.account_achievements_1.has_achievement(self.achievement_1))
+        self.assertTrue(self.account_achievements_1.has_achievement(self.achievement_3))
+        self.assertEqual(self.account_achievements_1.points, 20)
+
+        self.assertTrue(account_achievements_2.has_achievement(self.achievement_1))
+        self.assertEqual(account_achievements_2.points, 10)
+
+    def test_add_achievement_to_accounts__no_accounts(self):
+        with self.check_not_changed(GiveItemTaskPrototype._db_count):
+            AccountAchievementsPrototype.add_achievement_to_accounts(self.achievement_1, [])
+
     def test_check(self):
         self.achievement_1.barrier = 2
 
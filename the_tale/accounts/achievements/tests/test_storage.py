@@ -101,3 +101,77 @@ class StorageTests(testcase.TestCase):
                                                      type=ACHIEVEMENT_TYPE.MONEY,
                                                      old_value=0,
                                                      new_value=self.achievement_4.barrier)
+
+    def test_crossed_achievements(self):
+        self.assertEqual(achievements_storage.crossed_achievements(ACHIEVEMENT_TYPE.DEATHS, old_value=0, new_value=100), [])
+
+        self.assertEqual([a.id for a in achievements_storage.crossed_achievements(ACHIEVEMENT_TYPE.MONEY, old_value=-1, new_value=0)],
+                         [self.achievement_1.id])
+        self.assertEqual([a.id for a in achievements_storage.crossed_achievements(ACHIEVEMENT_TYPE.MONEY, old_value=0, new_value=3)],
+                         [self.achievement_3.id, self.achievement_4.id])
+        self.assertEqual([a.id for a in achievements_storage.crossed_achievements(ACHIEVEMENT_TYPE.MONEY, old_value=2, new_value=100)],
+                         [self.achievement_4.id, self.achievement_5.id])
+        self.assertEqual(achievements_storage.crossed_achievements(ACHIEVEMENT_TYPE.MONEY, old_value=4, new_value=0), [])
+
+    def test_crossed_achievements__equal_to_check(self):
+        achievement = AchievementPrototype.create(group=ACHIEVEMENT_GROUP.MONEY, type=ACHIEVEMENT_TYPE.MONEY, barrier=-2, points=10,
+                                                  caption=u'achievement_7', description=u'description_7', approved=True)
+
+        for old_value in xrange(-4, 6):
+            for new_value in xrange(-4, 6):
+                self.assertEqual(set(a.id for a in achievements_storage.crossed_achievements(ACHIEVEMENT_TYPE.MONEY, old_value, new_value)),
+                                 set(a.id for a in achievements_storage.by_type(ACHIEVEMENT_TYPE.MONEY, only_approved=True) if a.check(old_value, new_value)))
+
+        self.assertEqual([a.id for a in achievements_storage.crossed_achievements(ACHIEVEMENT_TYPE.MONEY, old_value=0, new_value=-3)],
+                         [achievement.id])
+
+    def test_crossed_achievements__index_updated(self):
+        self.assertEqual([a.id for a in achievements_storage.crossed_achievements(ACHIEVEMENT_TYPE.MONEY, old_value=0, new_value=1)], [])
+
+        self.achievement_2.approved = True
+        self.achievement_2.save()
+
+        self.assertEqual([a.id for a in achievements_storage.crossed_achievements(ACHIEVEMENT_TYPE.MONEY, old_value=0, new_value=1)],
+                         [self.achievement_2.id])
+
+    def test_batch(self):
+        with self.check_delta(GiveAchievementTaskPrototype._db_count, 3):
+            with achievements_storage.batch():
+                with self.check_not_changed(GiveAchievementTaskPrototype._db_count):
+                    achievements_storage.verify_achievements(self.account_1.id, type=ACHIEVEMENT_TYPE.MONEY, old_value=0, new_value=3)
+                    achievements_storage.verify_achievements(self.account_1.id, type=ACHIEVEMENT_TYPE.MONEY, old_value=0, new_value=3)
+                    achievements_storage.verify_achievements(self.account_1.id, type=ACHIEVEMENT_TYPE.TIME, old_value=0, new_value=3)
+
+        self.assertEqual(set(GiveAchievementTaskPrototype._db_all().values_list('achievement_id', flat=True)),
+                         set((self.achievement_3.id, self.achievement_4.id, self.achievement_6.id)))
+
+    def test_batch__nested(self):
+        with achievements_storage.batch():
+            with achievements_storage.batch():
+                achievements_storage.verify_achievements(self.account_1.id, type=ACHIEVEMENT_TYPE.MONEY, old_value=0, new_value=3)
+
+            self.assertEqual(GiveAchievementTaskPrototype._db_count(), 0)
+
+        self.assertEqual(GiveAchievementTaskPrototype._db_count(), 2)
+
+    def test_collect(self):
+        with achievements_storage.batch():
+            with achievements_storage.collect() as tasks:
+                achievements_storage.verify_achievements(self.account_1.id, type=ACHIEVEMENT_TYPE.MONEY, old_value=0, new_value=3)
+
+        self.assertEqual(GiveAchievementTaskPrototype._db_count(), 0)
+        self.assertEqual(set(tasks), set([(self.account_1.id, self.achievement_3.id), (self.account_1.id, self.achievement_4.id)]))
+
+    def test_add_collected(self):
+        with achievements_storage.collect() as tasks:
+            achievements_storage.verify_achievements(self.account_1.id, type=ACHIEVEMENT_TYPE.MONEY, old_value=0, new_value=3)
+
+        with achievements_storage.batch():
+            achievements_storage.add_collected(tasks)
+            self.assertEqual(GiveAchievementTaskPrototype._db_count(), 0)
+
+        self.assertEqual(GiveAchievementTaskPrototype._db_count(), 2)
+
+        achievements_storage.add_collected([(self.account_1.id, self.achievement_6.id)])
+
+        self.assertEqual(GiveAchievementTaskPrototype._db_count(), 3)
@@ -3,6 +3,7 @@ from the_tale.common.utils.workers import BaseWorker
 
 from the_tale.accounts.achievements.prototypes import GiveAchievementTaskPrototype, AccountAchievementsPrototype
 from the_tale.accounts.achievements.storage import achievements_storage
+from the_tale.accounts.achievements.conf import achievements_settings
 
 
 class Worker(BaseWorker):
@@ -43,15 +44,15 @@ class Worker(BaseWorker):
 
             task.remove()
 
-    def get_achievements_source_iterator(self, achievement):
+    def get_achievements_source_class(self, achievement):
         from the_tale.accounts.prototypes import AccountPrototype
         from the_tale.game.heroes.prototypes import HeroPrototype
 
         if achievement.type.source.is_ACCOUNT:
-            return (AccountPrototype(model=account_model) for account_model in AccountPrototype._db_all())
+            return AccountPrototype
 
         if achievement.type.source.is_GAME_OBJECT:
-            return (HeroPrototype(model=hero_model) for hero_model in HeroPrototype._db_all())
+            return HeroPrototype
 
     def spread_achievement(self, achievement):
         self.logger.info('spread achievement %d' % achievement.id)
@@ -59,10 +60,21 @@ class Worker(BaseWorker):
         if achievement.type.source.is_NONE:
             return
 
-        for source in self.get_achievements_source_iterator(achievement):
-            if not achievement.check(old_value=0, new_value=source.get_achievement_type_value(achievement.type)):
-                continue
-            self.add_achievement(achievement, source.account_id, notify=False)
+        source_class = self.get_achievements_source_class(achievement)
+
+        total = source_class._db_all().count()
+        processed = 0
+        received = 0
+
+        for values in source_class.get_achievement_type_values(achievement.type, chunk_size=achievements_settings.SPREAD_CHUNK_SIZE):
+            accounts_ids = [account_id for account_id, value in values if achievement.check(old_value=0, new_value=value)]
+
+            AccountAchievementsPrototype.add_achievement_to_accounts(achievement, accounts_ids)
+
+            processed += len(values)
+            received += len(accounts_ids)
+
+            self.logger.info('spread achievement %d: processed %d/%d, received %d' % (achievement.id, processed, total, received))
 
 
     def cmd_stop(self):
@@ -6,6 +6,7 @@ from dext.common.utils.urls import full_url
 
 from the_tale.common.utils.prototypes import BasePrototype
 from the_tale.common.utils import bbcode
+from the_tale.common.utils import html_cache
 from the_tale.common.utils.decorators import lazy_property
 
 from the_tale.accounts.personal_messages.prototypes import MessagePrototype
@@ -31,7 +32,7 @@ class ClanPrototype(BasePrototype): #pylint: disable=R0904
 
     @property
     def description_html(self):
-         return bbcode.render(self.description)
+         return html_cache.render(html_cache.BBCODE, self.description)
 
     @classmethod
     def get_forum_subcategory_caption(cls, clan_name):
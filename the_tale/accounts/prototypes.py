@@ -16,6 +16,7 @@ from dext.common.utils import s11n
 from the_tale.amqp_environment import environment
 
 from the_tale.common.utils import bbcode
+from the_tale.common.utils import bulk
 from the_tale.common.postponed_tasks import PostponedTaskPrototype
 from the_tale.common.utils.logic import verbose_timedelta
 
@@ -313,6 +314,34 @@ class AccountPrototype(BasePrototype): #pylint: disable=R0904
 
         raise exceptions.UnkwnownAchievementTypeError(achievement_type=achievement_type)
 
+    @classmethod
+    def get_achievement_type_values(cls, achievement_type, chunk_size):
+        # set-based version of get_achievement_type_value
+        # yields lists of (account_id, value) for all accounts
+        from the_tale.game.bills.prototypes import BillPrototype, VotePrototype
+
+        if achievement_type.is_POLITICS_ACCEPTED_BILLS:
+            get_counts = BillPrototype.accepted_bills_counts
+        elif achievement_type.is_POLITICS_VOTES_TOTAL:
+            get_counts = VotePrototype.votes_counts
+        elif achievement_type.is_POLITICS_VOTES_FOR:
+            get_counts = VotePrototype.votes_for_counts
+        elif achievement_type.is_POLITICS_VOTES_AGAINST:
+            get_counts = VotePrototype.votes_against_counts
+        elif achievement_type.is_KEEPER_MIGHT:
+            get_counts = None
+        else:
+            raise exceptions.UnkwnownAchievementTypeError(achievement_type=achievement_type)
+
+        for rows in bulk.values_chunks(cls._db_all(), ('might',), chunk_size=chunk_size):
+            if get_counts is None:
+                yield rows
+                continue
+
+            counts = get_counts([account_id for account_id, might in rows])
+
+            yield [(account_id, counts.get(account_id, 0)) for account_id, might in rows]
+
 
     @classmethod
     def create(cls, nick, email, is_fast, password=None, referer=None, referral_of=None, action_id=None, is_bot=False):
@@ -44,6 +44,16 @@ class AccountPrototypeTests(testcase.TestCase):
                 continue
             self.account.get_achievement_type_value(achievement_type)
 
+    def test_get_achievement_type_values(self):
+        for achievement_type in ACHIEVEMENT_TYPE.records:
+            if not achievement_type.source.is_ACCOUNT:
+                continue
+
+            chunks = list(AccountPrototype.get_achievement_type_values(achievement_type, chunk_size=1))
+
+            self.assertEqual(len(chunks), AccountPrototype._db_count())
+            self.assertEqual(dict(sum(chunks, []))[self.account.id], self.account.get_achievement_type_value(achievement_type))
+
 
     @mock.patch('the_tale.accounts.conf.accounts_settings.ACTIVE_STATE_REFRESH_PERIOD', 0)
     def test_update_active_state__expired(self):
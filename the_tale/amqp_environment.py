@@ -3,6 +3,7 @@
 from dext.common.amqp_queues.environment import BaseEnvironment
 
 from the_tale.game.conf import game_settings
+from the_tale.game.quests.conf import quests_settings
 
 
 class Environment(BaseEnvironment):
@@ -42,15 +43,27 @@ class Environment(BaseEnvironment):
         self.workers.market_manager = market_manager.Worker(name='market_manager', groups=['all', 'portal'])
 
         self.workers.supervisor = supervisor.Worker(name='game_supervisor', groups=['all', 'game'])
-        self.workers.logic_1 = logic.Worker(name='game_logic_1', groups=['all', 'game'])
-        self.workers.logic_2 = logic.Worker(name='game_logic_2', groups=['all', 'game'])
+
+        for logic_number in xrange(1, game_settings.LOGIC_WORKERS_NUMBER + 1):
+            setattr(self.workers, 'logic_%d' % logic_number, logic.Worker(name='game_logic_%d' % logic_number, groups=['all', 'game']))
+
         self.workers.highlevel = highlevel.Worker(name='game_highlevel', groups=['all', 'game']) if game_settings.ENABLE_WORKER_HIGHLEVEL else None
         self.workers.turns_loop = turns_loop.Worker(name='game_turns_loop', groups=['all', 'game']) if game_settings.ENABLE_WORKER_TURNS_LOOP else None
         self.workers.game_long_commands = game_long_commands.Worker(name='game_long_commands', groups=['all', 'game'])
         self.workers.pvp_balancer = balancer.Worker(name='game_pvp_balancer', groups=['all', 'game']) if game_settings.ENABLE_PVP else None
-        self.workers.quests_generator = quests_generator.Worker(name='game_quests_generator', groups=['all', 'game'])
+
+        for generator_number in xrange(1, quests_settings.GENERATORS_NUMBER + 1):
+            setattr(self.workers, 'quests_generator_%d' % generator_number, quests_generator.Worker(name='game_quests_generator_%d' % generator_number, groups=['all', 'game']))
 
         super(Environment, self).initialize()
 
+    @property
+    def logic_workers(self):
+        return [getattr(self.workers, 'logic_%d' % logic_number) for logic_number in xrange(1, game_settings.LOGIC_WORKERS_NUMBER + 1)]
+
+    @property
+    def quests_generators(self):
+        return [getattr(self.workers, 'quests_generator_%d' % generator_number) for generator_number in xrange(1, quests_settings.GENERATORS_NUMBER + 1)]
+
 
 environment = Environment()
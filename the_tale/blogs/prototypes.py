@@ -4,7 +4,7 @@ from django.core.urlresolvers import reverse
 from django.conf import settings as project_settings
 from django.db import transaction
 
-from the_tale.common.utils import bbcode
+from the_tale.common.utils import html_cache
 from the_tale.common.utils.decorators import lazy_property
 from the_tale.common.utils.prototypes import BasePrototype
 
@@ -32,7 +32,7 @@ class PostPrototype(BasePrototype):
     def forum_thread(self): return ForumThreadPrototype.get_by_id(self.forum_thread_id)
 
     @property
-    def text_html(self): return bbcode.render(self.text)
+    def text_html(self): return html_cache.render(html_cache.BBCODE, self.text)
 
     @lazy_property
     def author(self):
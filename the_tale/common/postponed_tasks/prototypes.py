@@ -5,11 +5,11 @@ import datetime
 
 from django.core.urlresolvers import reverse
 
-from dext.common.utils import s11n
 from dext.common.utils import discovering
 
 from the_tale.amqp_environment import environment
 
+from the_tale.common.utils import codec
 from the_tale.common.utils.prototypes import BasePrototype
 
 from the_tale.common.postponed_tasks.models import PostponedTask, POSTPONED_TASK_STATE, POSTPONED_TASK_LOGIC_RESULT
@@ -95,11 +95,11 @@ class PostponedTaskPrototype(BasePrototype):
     @property
     def internal_logic(self):
         if not hasattr(self, '_internal_logic'):
-            self._internal_logic = _INTERNAL_LOGICS[self.type].deserialize(s11n.from_json(self._model.internal_data))
+            self._internal_logic = _INTERNAL_LOGICS[self.type].deserialize(codec.from_json(self._model.internal_data))
         return self._internal_logic
 
     def save(self):
-        self._model.internal_data = s11n.to_json(self.internal_logic.serialize())
+        self._model.internal_data = codec.to_json(self.internal_logic.serialize())
         self._model.internal_state = self._model.internal_state if isinstance(self._model.internal_state, int) else self._model.internal_state.value
         self._model.save()
 
@@ -122,7 +122,7 @@ class PostponedTaskPrototype(BasePrototype):
     def create(cls, task_logic, live_time=None):
         model = PostponedTask.objects.create(internal_type=task_logic.TYPE,
                                              internal_state=task_logic.state if isinstance(task_logic.state, int) else task_logic.state.value,
-                                             internal_data=s11n.to_json(task_logic.serialize()),
+                                             internal_data=codec.to_json(task_logic.serialize()),
                                              live_time=live_time)
 
         return cls(model=model)
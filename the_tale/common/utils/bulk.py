@@ -0,0 +1,86 @@
+# coding: utf-8
+
+from django.db import connection, transaction, models
+
+
+BULK_UPDATE_CHUNK_SIZE = 500
+
+
+def is_bulk_update_supported():
+    return connection.vendor == 'postgresql'
+
+
+def _field_db_type(field):
+    if isinstance(field, models.AutoField):
+        return 'integer'
+    return field.db_type(connection)
+
+
+def _bulk_update_chunk(cursor, model_class, objects, fields):
+    quote = connection.ops.quote_name
+
+    pk_field = model_class._meta.pk
+    all_fields = [pk_field] + fields
+
+    row_template = '(%s)' % ', '.join('%%s::%s' % _field_db_type(field) for field in all_fields)
+
+    sql_request = 'UPDATE %(table)s SET %(assignments)s FROM (VALUES %(rows)s) AS bulk_values (%(columns)s) WHERE %(table)s.%(pk)s = bulk_values.%(pk)s'
+
+    sql_request = sql_request % {'table': quote(model_class._meta.db_table),
+                                 'assignments': ', '.join('%s = bulk_values.%s' % (quote(field.column), quote(field.column)) for field in fields),
+                                 'rows': ', '.join([row_template] * len(objects)),
+                                 'columns': ', '.join(quote(field.column) for field in all_fields),
+                                 'pk': quote(pk_field.column)}
+
+    arguments = []
+
+    for obj in objects:
+        arguments.append(pk_field.get_db_prep_save(obj.pk, connection=connection))
+        for field in fields:
+            arguments.append(field.get_db_prep_save(field.pre_save(obj, add=False), connection=connection))
+
+    cursor.execute(sql_request, arguments)
+
+
+# update rows of already saved objects with several multi-row UPDATE statements in one transaction
+# if database does not support UPDATE ... FROM (VALUES ...), objects saved one by one
+def bulk_update(model_class, objects, fields=None, chunk_size=BULK_UPDATE_CHUNK_SIZE):
+    if not objects or (fields is not None and not fields):
+        return
+
+    if fields is None:
+        fields = [field for field in model_class._meta.concrete_fields if not field.primary_key]
+    else:
+        fields = [model_class._meta.get_field(field_name) for field_name in fields]
+
+    if not is_bulk_update_supported():
+        for obj in objects:
+            obj.save(update_fields=[field.name for field in fields])
+        return
+
+    with transaction.atomic():
+        cursor = connection.cursor()
+
+        for i in xrange(0, len(objects), chunk_size):
+            _bulk_update_chunk(cursor, model_class, objects[i:i+chunk_size], fields)
+
+
+# iterate over values of query rows in chunks, ordered by primary key
+# each chunk is a list of tuples (pk, *fields); rows are read with separate queries, so iteration does not hold cursor open
+def values_chunks(query, fields, chunk_size=BULK_UPDATE_CHUNK_SIZE):
+    last_pk = None
+
+    while True:
+        chunk_query = query.order_by('pk')
+
+        if last_pk is not None:
+            chunk_query = chunk_query.filter(pk__gt=last_pk)
+
+        rows = list(chunk_query.values_list('pk', *fields)[:chunk_size])
+
+        if not rows:
+            return
+
+        last_pk = rows[-1][0]
+
+        yield rows
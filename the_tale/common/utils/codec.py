@@ -0,0 +1,92 @@
+# coding: utf-8
+import json
+import zlib
+import base64
+
+from dext.common.utils import s11n
+
+from the_tale.common.utils.conf import utils_settings
+
+try:
+    import ujson
+except ImportError: # pragma: no cover
+    ujson = None
+
+
+PACKED_PREFIX = 'z:'
+
+
+class S11nCodec(object):
+    # reference codec, plain dext serialization
+    name = 's11n'
+
+    def to_json(self, data):
+        return s11n.to_json(data)
+
+    def from_json(self, string):
+        return s11n.from_json(string)
+
+
+class JSONCodec(S11nCodec):
+    # C-accelerated stdlib json with compact separators
+    # values, which can not be serialized by stdlib encoder (dates, etc.), are passed to dext serializer
+    name = 'json'
+
+    def to_json(self, data):
+        try:
+            return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        except (TypeError, UnicodeDecodeError):
+            return s11n.to_json(data)
+
+    def from_json(self, string):
+        return json.loads(string)
+
+
+class UJSONCodec(JSONCodec):
+    # ujson is used only for decoding: its encoder rounds floats
+    name = 'ujson'
+
+    def from_json(self, string):
+        return ujson.loads(string, precise_float=True)
+
+
+CODECS = {codec.name: codec for codec in (S11nCodec, JSONCodec, UJSONCodec)
+          if codec is not UJSONCodec or ujson is not None}
+
+
+def get_codec(name):
+    if name not in CODECS:
+        return JSONCodec()
+    return CODECS[name]()
+
+
+_codec = get_codec(utils_settings.JSON_CODEC)
+
+
+def to_json(data):
+    return _codec.to_json(data)
+
+
+def from_json(string):
+    return _codec.from_json(string)
+
+
+# compact format for internal blobs, which are never read outside of the game (amqp messages, etc.)
+# unpack also accepts plain json, so producer and consumer can be updated separately
+
+def pack(data, codec=None):
+    string = (codec or _codec).to_json(data)
+
+    if isinstance(string, unicode):
+        string = string.encode('utf-8')
+
+    return PACKED_PREFIX + base64.b64encode(zlib.compress(string, utils_settings.PACKED_BLOBS_COMPRESSION_LEVEL))
+
+
+def unpack(string, codec=None):
+    codec = codec or _codec
+
+    if not string.startswith(PACKED_PREFIX):
+        return codec.from_json(string)
+
+    return codec.from_json(zlib.decompress(base64.b64decode(string[len(PACKED_PREFIX):])).decode('utf-8'))
@@ -5,5 +5,10 @@ from dext.common.utils.app_settings import app_settings
 
 utils_settings = app_settings('UTILS',
                               OPEN_EXCHANGE_RATES_API_ID='openexchangerates.org key',
-                              OPEN_EXCHANGE_RATES_API_LATEST_URL='http://openexchangerates.org/api/latest.json'
+                              OPEN_EXCHANGE_RATES_API_LATEST_URL='http://openexchangerates.org/api/latest.json',
+
+                              JSON_CODEC='json',
+                              PACKED_BLOBS_COMPRESSION_LEVEL=1,
+
+                              HTML_CACHE_TIMEOUT=7*24*60*60
                               )
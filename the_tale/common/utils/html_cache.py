@@ -0,0 +1,69 @@
+# coding: utf-8
+import hashlib
+
+import markdown
+
+from django.core.cache import cache
+
+from the_tale.common.utils import bbcode
+from the_tale.common.utils.conf import utils_settings
+
+
+# cache of html, rendered from user texts
+# html is addressed by content: (markup, renderers version, text hash), so changed texts never get stale html
+# and unused values are evicted by cache itself (by timeout or by memory pressure)
+
+# increase version after every change of markup renderers (new tags, new html of existed tags and so on)
+RENDERERS_VERSION = 1
+
+BBCODE = 'bbcode'
+BBCODE_SAFE = 'bbcode_safe'
+MARKDOWN = 'markdown'
+
+RENDERERS = {BBCODE: bbcode.render,
+             BBCODE_SAFE: bbcode.safe_render,
+             MARKDOWN: markdown.markdown}
+
+
+def get_key(markup, text):
+    if isinstance(text, unicode):
+        text = text.encode('utf-8')
+    return 'html-%s-%d-%s' % (markup, RENDERERS_VERSION, hashlib.sha1(text).hexdigest())
+
+
+def render_many(items):
+    # items: [(markup, text), ...]
+    # returns rendered html in the same order, all cached values are requested with single query
+    keys = [get_key(markup, text) if text else None for markup, text in items]
+
+    cached = cache.get_many(set(key for key in keys if key is not None))
+
+    rendered = {}
+    result = []
+
+    for key, (markup, text) in zip(keys, items):
+        if key is None:
+            result.append(RENDERERS[markup](text))
+            continue
+
+        if key not in cached and key not in rendered:
+            rendered[key] = RENDERERS[markup](text)
+
+        result.append(cached[key] if key in cached else rendered[key])
+
+    if rendered:
+        cache.set_many(rendered, utils_settings.HTML_CACHE_TIMEOUT)
+
+    return result
+
+
+def render(markup, text):
+    return render_many([(markup, text)])[0]
+
+
+def precache(markup, text):
+    # render text when it saved, so pages will not wait for renderer
+    if not text:
+        return
+
+    cache.set(get_key(markup, text), RENDERERS[markup](text), utils_settings.HTML_CACHE_TIMEOUT)
@@ -1,8 +1,7 @@
 # coding: utf-8
 import time
 
-from dext.common.utils import s11n
-
+from the_tale.common.utils import codec
 from the_tale.common.utils.decorators import lazy_property
 
 
@@ -22,7 +21,7 @@ def _serialization_proxy(Class, field_name, unload_after):
             self._accessed_at = 0
 
         def _load_object(self):
-            self._object = Class.deserialize(self._prototype, s11n.from_json(getattr(self._prototype._model, field_name)))
+            self._object = Class.deserialize(self._prototype, codec.from_json(getattr(self._prototype._model, field_name)))
 
         def _unload_object(self):
             self.serialize()
@@ -44,7 +43,7 @@ def _serialization_proxy(Class, field_name, unload_after):
             if self._object is None:
                 return
             self._object.updated = False
-            setattr(self._prototype._model, field_name, s11n.to_json(self._object.serialize(**kwargs)))
+            setattr(self._prototype._model, field_name, codec.to_json(self._object.serialize(**kwargs)))
 
         def __getattr__(self, name):
             if self._object is None:
@@ -162,16 +161,21 @@ class _PrototypeMetaclass(type):
 class BasePrototype(object):
 
     __metaclass__ = _PrototypeMetaclass
-    __slots__ = ('_model',)
+    __slots__ = ('_model', '_saved_fields')
 
     _model_class = None
     _readonly = ()
     _bidirectional = ()
     _get_by = ()
     _serialization_proxies = ()
+    _track_changed_fields = False
 
     def __init__(self, model):
         self._model = model
+        self._saved_fields = None
+
+        if self._track_changed_fields:
+            self.mark_fields_saved()
 
     def reload(self):
         self._model = self._model_class.objects.get(id=self._model.id)
@@ -179,6 +183,42 @@ class BasePrototype(object):
             getattr(self, field_name)._load_object()
         self.del_lazy_properties()
 
+        if self._track_changed_fields:
+            self.mark_fields_saved()
+
+    #############################
+    # changed fields tracking
+    #############################
+
+    # values of model fields are compared with values, remembered on last load or save,
+    # since prototypes change model attributes directly, not only through bidirectional properties
+    @classmethod
+    def _tracked_fields(cls):
+        if '_tracked_fields_cache' not in cls.__dict__:
+            cls._tracked_fields_cache = tuple(field.attname for field in cls._model_class._meta.concrete_fields if not field.primary_key)
+        return cls._tracked_fields_cache
+
+    def mark_fields_saved(self):
+        self._saved_fields = {field: getattr(self._model, field) for field in self._tracked_fields()}
+
+    def changed_fields(self):
+        saved_fields = getattr(self, '_saved_fields', None)
+
+        if saved_fields is None:
+            return list(self._tracked_fields())
+
+        return [field for field in self._tracked_fields() if getattr(self._model, field) != saved_fields[field]]
+
+    def save_changed_fields(self):
+        changed_fields = self.changed_fields()
+
+        if changed_fields:
+            self._model_class.objects.filter(pk=self._model.pk).update(**{field: getattr(self._model, field) for field in changed_fields})
+
+        self.mark_fields_saved()
+
+        return changed_fields
+
     def del_lazy_properties(self):
         for field_name in dir(self):
             if hasattr(self, '_%s__lazy' % field_name):
@@ -0,0 +1,44 @@
+# coding: utf-8
+from dext.common.utils import s11n
+
+from the_tale.common.utils import testcase
+from the_tale.common.utils import codec
+
+
+class CodecTests(testcase.TestCase):
+
+    def setUp(self):
+        super(CodecTests, self).setUp()
+        self.data = {'name': u'герой',
+                     'level': 10,
+                     'experience': 0.1 + 0.2,
+                     'flags': [True, False, None],
+                     'nested': {'list': [1, 2.5, u'строка', {}]}}
+
+    def test_codecs_compatibility(self):
+        for encoder in codec.CODECS.itervalues():
+            for decoder in codec.CODECS.itervalues():
+                self.assertEqual(decoder().from_json(encoder().to_json(self.data)), self.data)
+
+    def test_s11n_compatibility(self):
+        self.assertEqual(s11n.from_json(codec.to_json(self.data)), self.data)
+        self.assertEqual(codec.from_json(s11n.to_json(self.data)), self.data)
+
+    def test_floats_precision(self):
+        self.assertEqual(codec.from_json(codec.to_json(self.data))['experience'], 0.1 + 0.2)
+
+    def test_get_codec__unknown(self):
+        self.assertTrue(isinstance(codec.get_codec('unknown codec'), codec.JSONCodec))
+
+    def test_pack(self):
+        packed = codec.pack(self.data)
+
+        self.assertTrue(packed.startswith(codec.PACKED_PREFIX))
+        self.assertEqual(codec.unpack(packed), self.data)
+
+    def test_pack__smaller(self):
+        data = [self.data] * 100
+        self.assertTrue(len(codec.pack(data)) < len(codec.to_json(data)))
+
+    def test_unpack__plain_json(self):
+        self.assertEqual(codec.unpack(s11n.to_json(self.data)), self.data)
@@ -0,0 +1,65 @@
+# coding: utf-8
+import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+
+from the_tale.common.utils import testcase
+from the_tale.common.utils import bbcode
+from the_tale.common.utils import html_cache
+
+
+class HtmlCacheTests(testcase.TestCase):
+
+    def setUp(self):
+        super(HtmlCacheTests, self).setUp()
+        self.cache = LocMemCache('html-cache-tests', {})
+        self.cache.clear()
+
+        self.cache_patcher = mock.patch('the_tale.common.utils.html_cache.cache', self.cache)
+        self.cache_patcher.start()
+
+        self.text = u'[b]текст[/b] [spoiler]скрытый текст[/spoiler]'
+
+    def tearDown(self):
+        super(HtmlCacheTests, self).tearDown()
+        self.cache_patcher.stop()
+
+    def test_get_key(self):
+        self.assertEqual(html_cache.get_key(html_cache.BBCODE, self.text), html_cache.get_key(html_cache.BBCODE, self.text))
+        self.assertNotEqual(html_cache.get_key(html_cache.BBCODE, self.text), html_cache.get_key(html_cache.BBCODE_SAFE, self.text))
+        self.assertNotEqual(html_cache.get_key(html_cache.BBCODE, self.text), html_cache.get_key(html_cache.BBCODE, self.text + u'!'))
+
+    def test_get_key__version(self):
+        key = html_cache.get_key(html_cache.BBCODE, self.text)
+
+        with mock.patch('the_tale.common.utils.html_cache.RENDERERS_VERSION', html_cache.RENDERERS_VERSION + 1):
+            self.assertNotEqual(html_cache.get_key(html_cache.BBCODE, self.text), key)
+
+    def test_render(self):
+        self.assertEqual(html_cache.render(html_cache.BBCODE_SAFE, self.text), bbcode.safe_render(self.text))
+        self.assertEqual(self.cache.get(html_cache.get_key(html_cache.BBCODE_SAFE, self.text)), bbcode.safe_render(self.text))
+
+    def test_render__cached(self):
+        self.cache.set(html_cache.get_key(html_cache.BBCODE, self.text), u'cached html')
+
+        with mock.patch('the_tale.common.utils.bbcode.render') as render:
+            self.assertEqual(html_cache.render(html_cache.BBCODE, self.text), u'cached html')
+
+        self.assertEqual(render.call_count, 0)
+
+    def test_render__empty_text(self):
+        self.assertEqual(html_cache.render(html_cache.MARKDOWN, u''), u'')
+
+    def test_render_many(self):
+        self.cache.set(html_cache.get_key(html_cache.BBCODE, u'text 2'), u'cached html')
+
+        self.assertEqual(html_cache.render_many([(html_cache.MARKDOWN, u'text 1'),
+                                                 (html_cache.BBCODE, u'text 2'),
+                                                 (html_cache.MARKDOWN, u'text 1')]),
+                         [u'<p>text 1</p>', u'cached html', u'<p>text 1</p>'])
+
+        self.assertEqual(self.cache.get(html_cache.get_key(html_cache.MARKDOWN, u'text 1')), u'<p>text 1</p>')
+
+    def test_precache(self):
+        html_cache.precache(html_cache.BBCODE_SAFE, self.text)
+        self.assertEqual(self.cache.get(html_cache.get_key(html_cache.BBCODE_SAFE, self.text)), bbcode.safe_render(self.text))
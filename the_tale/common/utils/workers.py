@@ -1,7 +1,45 @@
 # coding: utf-8
+import contextlib
 
 from dext.common import amqp_queues
 
 
+# commands of all workers are collected here instead of sending, when not None (see defer_commands)
+_deferred_commands = None
+
+
 class BaseWorker(amqp_queues.BaseWorker):
     LOGGER_PREFIX = 'the-tale.workers'
+
+    # {worker name: worker}, used to send commands, collected in other process
+    _workers_by_name = {}
+
+    def __init__(self, *argv, **kwargs):
+        super(BaseWorker, self).__init__(*argv, **kwargs)
+        BaseWorker._workers_by_name[self.name] = self
+
+    def send_cmd(self, tp, data=None):
+        if _deferred_commands is not None:
+            _deferred_commands.append((self.name, tp, data))
+            return
+
+        return super(BaseWorker, self).send_cmd(tp, data)
+
+
+@contextlib.contextmanager
+def defer_commands():
+    # commands, sent inside block, are collected into list of (worker name, command type, data)
+    # used by forked processes, which must not use amqp connection of parent process
+    global _deferred_commands
+
+    commands, _deferred_commands = _deferred_commands, []
+
+    try:
+        yield _deferred_commands
+    finally:
+        _deferred_commands = commands
+
+
+def send_deferred_commands(commands):
+    for worker_name, tp, data in commands:
+        BaseWorker._workers_by_name[worker_name].send_cmd(tp, data)
@@ -1,8 +1,6 @@
 # coding: utf-8
 import datetime
 
-import markdown
-
 from django.core.urlresolvers import reverse
 from django.db import IntegrityError, transaction, models
 
@@ -11,7 +9,7 @@ from dext.common.utils.urls import UrlBuilder
 from the_tale.accounts.models import Account
 from the_tale.accounts.prototypes import AccountPrototype
 
-from the_tale.common.utils import bbcode
+from the_tale.common.utils import html_cache
 from the_tale.common.utils.pagination import Paginator
 from the_tale.common.utils.prototypes import BasePrototype
 from the_tale.common.utils.decorators import lazy_property
@@ -188,6 +186,8 @@ class ThreadPrototype(BasePrototype):
                             created_at_turn=TimePrototype.get_current_turn_number(),
                             state=POST_STATE.DEFAULT)
 
+        PostPrototype.precache_html(text, markup_method)
+
         prototype = cls(model=thread_model)
 
         subcategory.update()
@@ -270,19 +270,37 @@ class PostPrototype(BasePrototype):
     def is_updated(self):
         return self.updated_at is not None and self.updated_at > self.created_at + datetime.timedelta(seconds=1)
 
-    @property
-    def html(self):
-        if self.markup_method.is_POSTMARKUP:
-            return bbcode.render(self.text)
-        elif self.markup_method.is_MARKDOWN:
-            return markdown.markdown(self.text)
+    @classmethod
+    def get_html_markup(cls, markup_method):
+        if markup_method.is_POSTMARKUP:
+            return html_cache.BBCODE
+        elif markup_method.is_MARKDOWN:
+            return html_cache.MARKDOWN
+
+    @classmethod
+    def get_safe_html_markup(cls, markup_method):
+        if markup_method.is_POSTMARKUP:
+            return html_cache.BBCODE_SAFE
+        elif markup_method.is_MARKDOWN:
+            return html_cache.MARKDOWN
+
+    @classmethod
+    def precache_html(cls, text, markup_method):
+        html_cache.precache(cls.get_html_markup(markup_method), text)
+
+    @classmethod
+    def prerender(cls, posts):
+        # render html of page posts with single request to cache
+        htmls = html_cache.render_many([(cls.get_html_markup(post.markup_method), post.text) for post in posts])
+
+        for post, html in zip(posts, htmls):
+            setattr(post, '_html__lazy', html)
+
+    @lazy_property
+    def html(self): return html_cache.render(self.get_html_markup(self.markup_method), self.text)
 
     @property
-    def safe_html(self):
-        if self.markup_method.is_POSTMARKUP:
-            return bbcode.safe_render(self.text)
-        elif self.markup_method.is_MARKDOWN:
-            return markdown.markdown(self.text)
+    def safe_html(self): return html_cache.render(self.get_safe_html_markup(self.markup_method), self.text)
 
     @property
     def is_removed(self): return self.state.is_REMOVED
@@ -334,6 +352,8 @@ class PostPrototype(BasePrototype):
 
         thread.subcategory.update()
 
+        cls.precache_html(text, MARKUP_METHOD.POSTMARKUP)
+
         prototype = cls(post)
 
         MessagePrototype.create(ForumPostHandler(post_id=prototype.id))
@@ -364,6 +384,9 @@ class PostPrototype(BasePrototype):
         self._model.updated_at_turn = TimePrototype.get_current_turn_number()
         self.save()
 
+        del self.html
+        self.precache_html(self.text, self.markup_method)
+
     def save(self):
         self._model.save()
 
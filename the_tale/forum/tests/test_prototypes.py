@@ -4,6 +4,8 @@ import mock
 import datetime
 
 from the_tale.common.utils import testcase
+from the_tale.common.utils import bbcode
+from the_tale.common.utils import html_cache
 
 from the_tale.accounts.prototypes import AccountPrototype
 from the_tale.accounts.logic import register_user
@@ -388,6 +390,35 @@ class PostPrototypeTests(testcase.TestCase):
 
         self.assertEqual(thread_update.call_count, 1)
 
+    def test_precache_html_on_create(self):
+        with mock.patch('the_tale.common.utils.html_cache.precache') as precache:
+            PostPrototype.create(thread=self.thread, author=self.checked_account, text='[b]post-1-text[/b]')
+
+        self.assertEqual(precache.call_args_list, [mock.call(html_cache.BBCODE, '[b]post-1-text[/b]')])
+
+    def test_update__html(self):
+        post = PostPrototype.create(thread=self.thread, author=self.checked_account, text='[b]post-1-text[/b]')
+        self.assertEqual(post.html, bbcode.render('[b]post-1-text[/b]'))
+
+        with mock.patch('the_tale.common.utils.html_cache.precache') as precache:
+            post.update('[i]post-1-new-text[/i]')
+
+        self.assertEqual(precache.call_args_list, [mock.call(html_cache.BBCODE, '[i]post-1-new-text[/i]')])
+        self.assertEqual(post.html, bbcode.render('[i]post-1-new-text[/i]'))
+
+    def test_prerender(self):
+        PostPrototype.create(thread=self.thread, author=self.checked_account, text='[b]post-1-text[/b]')
+
+        posts = [PostPrototype(model=model) for model in PostPrototype._db_all().order_by('created_at')]
+
+        with mock.patch('the_tale.common.utils.html_cache.render_many', mock.Mock(return_value=['html 1', 'html 2'])) as render_many:
+            PostPrototype.prerender(posts)
+
+        self.assertEqual(render_many.call_args_list, [mock.call([(html_cache.BBCODE, 'thread-text'),
+                                                                 (html_cache.BBCODE, '[b]post-1-text[/b]')])])
+
+        self.assertEqual([post.html for post in posts], ['html 1', 'html 2'])
+
 
 class ThreadReadInfoPrototypeTests(testcase.TestCase):
 
@@ -354,6 +354,8 @@ class ThreadPageData(object):
 
         self.posts = [PostPrototype(post_model) for post_model in Post.objects.filter(thread=self.thread._model).order_by('created_at')[post_from:post_to]]
 
+        PostPrototype.prerender(self.posts)
+
         self.authors = {author.id:author for author in  AccountPrototype.get_list_by_id([post.author_id for post in self.posts])}
 
         self.game_objects = {game_object.account_id:game_object
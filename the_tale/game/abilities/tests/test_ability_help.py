@@ -40,6 +40,7 @@ from the_tale.game.postponed_tasks import ComplexChangeTask
 from the_tale.game.abilities.tests.helpers import UseAbilityTaskMixin
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class HelpAbilityTest(UseAbilityTaskMixin, testcase.TestCase):
     ABILITY = Help
 
@@ -0,0 +1,194 @@
+# coding: utf-8
+import itertools
+import multiprocessing
+
+from the_tale.game.balance import formulas as f
+from the_tale.game.balance.power import Power, Damage, PowerDistribution
+
+from the_tale.game.heroes.relations import MODIFIERS as HERO_MODIFIERS
+from the_tale.game.heroes.habilities import AbilitiesPrototype, ABILITIES
+
+from the_tale.game.mobs.prototypes import MobPrototype
+from the_tale.game.mobs.storage import mobs_storage
+
+from the_tale.game.actions import battle, contexts
+
+
+# battles, which take more turns, are counted as draws (for example, when both fighters heal themselves endlessly)
+MAX_BATTLE_TURNS = 10000
+
+POWER_DISTRIBUTION = PowerDistribution(0.5, 0.5)
+
+
+class NullMessanger(object):
+
+    def add_message(self, *argv, **kwargs):
+        pass
+
+
+MESSANGER = NullMessanger()
+
+
+class Fighter(object):
+    # hero for battles simulation: has only level, power and abilities
+    # does not require account, equipment, habits, companion or database at all
+
+    __slots__ = ('level', 'abilities', 'power', 'initiative', 'max_health', 'health', '_damage')
+
+    additional_abilities = []
+
+    mob_type = None
+    companion = None
+
+    def __init__(self, level, abilities, power):
+        self.level = level
+        self.abilities = abilities
+        self.power = power
+
+        self.initiative = abilities.modify_attribute(HERO_MODIFIERS.INITIATIVE, HERO_MODIFIERS.INITIATIVE.default())
+        self.max_health = int(f.hp_on_lvl(level) * abilities.modify_attribute(HERO_MODIFIERS.HEALTH, HERO_MODIFIERS.HEALTH.default()))
+        self.health = self.max_health
+
+        damage = power.damage() * abilities.modify_attribute(HERO_MODIFIERS.DAMAGE, HERO_MODIFIERS.DAMAGE.default())
+        damage.multiply(abilities.modify_attribute(HERO_MODIFIERS.PHYSIC_DAMAGE, HERO_MODIFIERS.PHYSIC_DAMAGE.default()),
+                        abilities.modify_attribute(HERO_MODIFIERS.MAGIC_DAMAGE, HERO_MODIFIERS.MAGIC_DAMAGE.default()))
+
+        self._damage = (damage.physic, damage.magic)
+
+    @classmethod
+    def create(cls, level, abilities_levels, power_distribution=POWER_DISTRIBUTION):
+        abilities = AbilitiesPrototype()
+
+        for ability_id, ability_level in abilities_levels:
+            abilities.add(ability_id, min(ability_level, ABILITIES[ability_id].MAX_LEVEL))
+
+        return cls(level=level, abilities=abilities, power=Power.power_to_level(power_distribution, level))
+
+    @property
+    def name(self): return u'fighter'
+
+    @property
+    def basic_damage(self):
+        # abilities modify damage in place, so always return new object
+        return Damage(physic=self._damage[0], magic=self._damage[1])
+
+    def linguistics_restrictions(self): return ()
+
+    def update_context(self, actor, enemy):
+        self.abilities.update_context(actor, enemy)
+
+    def restore(self):
+        self.health = self.max_health
+
+
+def process_battle(fighter_1, fighter_2, messanger=MESSANGER):
+    # returns 1 if first fighter wins, 2 if second one wins and 0 for draw
+
+    # mobs have no restore method, so restore health directly
+    fighter_1.health = fighter_1.max_health
+    fighter_2.health = fighter_2.max_health
+
+    actor_1 = battle.Actor(fighter_1, contexts.BattleContext())
+    actor_2 = battle.Actor(fighter_2, contexts.BattleContext())
+
+    for i in xrange(MAX_BATTLE_TURNS): # pylint: disable=W0612
+        battle.make_turn(actor_1, actor_2, messanger)
+
+        if fighter_1.health <= 0:
+            return 2
+
+        if fighter_2.health <= 0:
+            return 1
+
+    return 0
+
+
+def process_battles(fighter_1, fighter_2, battles_number):
+    # returns (fighter_1_wins, fighter_2_wins, draws)
+    results = [0, 0, 0]
+
+    for i in xrange(battles_number): # pylint: disable=W0612
+        results[process_battle(fighter_1, fighter_2)] += 1
+
+    return results[1], results[2], results[0]
+
+
+def _compare_abilities_task(arguments):
+    ability_1_id, ability_2_id, hero_level, ability_level, battles_number = arguments
+
+    fighter_1 = Fighter.create(hero_level, [('hit', ability_level), (ability_1_id, ability_level)])
+    fighter_2 = Fighter.create(hero_level, [('hit', ability_level), (ability_2_id, ability_level)])
+
+    return process_battles(fighter_1, fighter_2, battles_number)
+
+
+def compare_abilities(abilities_ids, hero_levels, ability_level, battles_number, processes=1):
+    # win rates of every pair of abilities on every hero level
+    # result: {hero_level: matrix}, where matrix[i][j] - win rate of abilities_ids[i] against abilities_ids[j]
+
+    tasks = [(ability_1_id, ability_2_id, hero_level, ability_level, battles_number)
+             for hero_level in hero_levels
+             for ability_1_id, ability_2_id in itertools.combinations(abilities_ids, 2)]
+
+    if processes > 1:
+        pool = multiprocessing.Pool(processes)
+        try:
+            results = pool.map(_compare_abilities_task, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = map(_compare_abilities_task, tasks)
+
+    index = {ability_id: i for i, ability_id in enumerate(abilities_ids)}
+
+    matrices = {hero_level: [[0.5] * len(abilities_ids) for i in xrange(len(abilities_ids))] for hero_level in hero_levels}
+
+    for (ability_1_id, ability_2_id, hero_level, ability_level, battles_number), (wins_1, wins_2, draws) in zip(tasks, results):
+        matrix = matrices[hero_level]
+        matrix[index[ability_1_id]][index[ability_2_id]] = (wins_1 + 0.5 * draws) / battles_number
+        matrix[index[ability_2_id]][index[ability_1_id]] = (wins_2 + 0.5 * draws) / battles_number
+
+    return matrices
+
+
+def process_pve_battles(fighter, mob_record_id, mob_level, battles_number):
+    # returns (fighter_wins, mob_wins, draws)
+    # mob abilities are randomized on creation, so every battle is fought with new mob
+    results = [0, 0, 0]
+
+    for i in xrange(battles_number): # pylint: disable=W0612
+        mob = MobPrototype(record_id=mob_record_id, level=mob_level)
+        results[process_battle(fighter, mob)] += 1
+
+    return results[1], results[2], results[0]
+
+
+def compare_with_mobs(abilities_ids, hero_levels, ability_level, battles_number, mobs_records=None):
+    # win rates of every ability against mobs of hero level
+    # result: {hero_level: rates}, where rates[i] - win rate of abilities_ids[i], averaged over mobs available on that level
+    #
+    # runs in current process only: mobs are taken from mobs_storage, which synchronizes with database
+    # and can not be safely shared with forked workers
+
+    rates = {}
+
+    for hero_level in hero_levels:
+        records = mobs_storage.get_available_mobs_list(level=hero_level) if mobs_records is None else mobs_records
+
+        level_rates = []
+
+        for ability_id in abilities_ids:
+            fighter = Fighter.create(hero_level, [('hit', ability_level), (ability_id, ability_level)])
+
+            wins = 0.0
+
+            for record in records:
+                fighter_wins, mob_wins, draws = process_pve_battles(fighter, record.id, hero_level, battles_number) # pylint: disable=W0612
+                wins += fighter_wins + 0.5 * draws
+
+            level_rates.append(wins / (battles_number * len(records)) if records else 0.0)
+
+        rates[hero_level] = level_rates
+
+    return rates
@@ -34,6 +34,7 @@ from the_tale.game.abilities.relations import HELP_CHOICES
 
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class BattlePvE1x1ActionTest(testcase.TestCase):
 
     def setUp(self):
@@ -377,6 +377,7 @@ class InPlaceActionTest(testcase.TestCase, ActionEventsTestsMixin):
         self.storage._test_save()
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class InPlaceActionSpendMoneyTest(testcase.TestCase):
 
     def setUp(self):
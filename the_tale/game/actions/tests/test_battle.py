@@ -51,6 +51,7 @@ class TestsBase(testcase.TestCase):
         self.hero.set_companion(companion)
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class BattleTests(TestsBase):
 
     @mock.patch('the_tale.game.heroes.prototypes.HeroPrototype.additional_abilities', [VAMPIRE_STRIKE(level=1)])
@@ -450,6 +451,7 @@ class TryCompanionBlockTests(TestsBase):
         self.assertTrue(self.hero.messages.messages[-1].key.is_COMPANIONS_BROKE_TO_SPARE_PARTS)
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class TryCompanionStrikeTests(TestsBase):
 
     def setUp(self):
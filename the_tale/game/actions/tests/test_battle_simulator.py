@@ -0,0 +1,127 @@
+# coding: utf-8
+
+import mock
+
+from the_tale.common.utils import testcase
+
+from the_tale.game.logic import create_test_map
+
+from the_tale.game.balance import formulas as f
+from the_tale.game.balance.power import Power
+
+from the_tale.game.heroes.habilities import battle as battle_abilities
+
+from the_tale.game.mobs.storage import mobs_storage
+
+from the_tale.game.actions import battle_simulator
+
+
+class FighterTests(testcase.TestCase):
+
+    def test_create(self):
+        fighter = battle_simulator.Fighter.create(10, [('hit', 1), (battle_abilities.BERSERK.get_id(), 3)])
+
+        self.assertEqual(fighter.level, 10)
+        self.assertEqual(fighter.power, Power.power_to_level(battle_simulator.POWER_DISTRIBUTION, 10))
+        self.assertEqual(fighter.health, fighter.max_health)
+        self.assertEqual(fighter.abilities.get(battle_abilities.BERSERK.get_id()).level, 3)
+        self.assertEqual(fighter.companion, None)
+        self.assertEqual(fighter.mob_type, None)
+
+    def test_create__ability_max_level(self):
+        fighter = battle_simulator.Fighter.create(10, [('hit', 5)])
+        self.assertEqual(fighter.abilities.get('hit').level, battle_abilities.HIT.MAX_LEVEL)
+        self.assertEqual(fighter.max_health, f.hp_on_lvl(10))
+
+    def test_basic_damage__new_object(self):
+        fighter = battle_simulator.Fighter.create(10, [('hit', 1)])
+
+        damage = fighter.basic_damage
+        damage.multiply(2, 2)
+
+        self.assertEqual(fighter.basic_damage.physic * 2, damage.physic)
+        self.assertEqual(fighter.basic_damage.magic * 2, damage.magic)
+
+    def test_restore(self):
+        fighter = battle_simulator.Fighter.create(10, [('hit', 1)])
+        fighter.health = 1
+        fighter.restore()
+        self.assertEqual(fighter.health, fighter.max_health)
+
+
+class BattlesTests(testcase.TestCase):
+
+    def setUp(self):
+        super(BattlesTests, self).setUp()
+        self.fighter_1 = battle_simulator.Fighter.create(10, [('hit', 1)])
+        self.fighter_2 = battle_simulator.Fighter.create(10, [('hit', 1)])
+
+    def test_process_battle(self):
+        result = battle_simulator.process_battle(self.fighter_1, self.fighter_2)
+
+        self.assertTrue(result in (1, 2))
+
+        if result == 1:
+            self.assertTrue(self.fighter_2.health <= 0 < self.fighter_1.health)
+        else:
+            self.assertTrue(self.fighter_1.health <= 0 < self.fighter_2.health)
+
+    @mock.patch('the_tale.game.actions.battle_simulator.MAX_BATTLE_TURNS', 1)
+    def test_process_battle__draw(self):
+        self.assertEqual(battle_simulator.process_battle(self.fighter_1, self.fighter_2), 0)
+
+    def test_process_battles(self):
+        self.assertEqual(sum(battle_simulator.process_battles(self.fighter_1, self.fighter_2, 20)), 20)
+
+    def test_compare_abilities(self):
+        abilities_ids = [battle_abilities.STRONG_HIT.get_id(),
+                         battle_abilities.REGENERATION.get_id(),
+                         battle_abilities.FIREBALL.get_id()]
+
+        matrices = battle_simulator.compare_abilities(abilities_ids, hero_levels=[5, 25], ability_level=2, battles_number=10)
+
+        self.assertEqual(set(matrices.keys()), set([5, 25]))
+
+        for matrix in matrices.itervalues():
+            self.assertEqual(len(matrix), 3)
+
+            for i in xrange(3):
+                self.assertEqual(matrix[i][i], 0.5)
+
+                for j in xrange(3):
+                    self.assertAlmostEqual(matrix[i][j] + matrix[j][i], 1.0)
+
+
+class PvEBattlesTests(testcase.TestCase):
+
+    def setUp(self):
+        super(PvEBattlesTests, self).setUp()
+        create_test_map()
+
+        self.fighter = battle_simulator.Fighter.create(10, [('hit', 1)])
+        self.mob_record = mobs_storage.get_available_mobs_list(level=10)[0]
+
+    def test_process_battle__mob(self):
+        result = battle_simulator.process_battle(self.fighter, battle_simulator.MobPrototype(record_id=self.mob_record.id, level=10))
+        self.assertTrue(result in (0, 1, 2))
+
+    def test_process_pve_battles(self):
+        self.assertEqual(sum(battle_simulator.process_pve_battles(self.fighter, self.mob_record.id, 10, 20)), 20)
+
+    def test_compare_with_mobs(self):
+        abilities_ids = [battle_abilities.STRONG_HIT.get_id(),
+                         battle_abilities.REGENERATION.get_id()]
+
+        rates = battle_simulator.compare_with_mobs(abilities_ids, hero_levels=[5, 25], ability_level=2, battles_number=5)
+
+        self.assertEqual(set(rates.keys()), set([5, 25]))
+
+        for level_rates in rates.itervalues():
+            self.assertEqual(len(level_rates), 2)
+
+            for rate in level_rates:
+                self.assertTrue(0.0 <= rate <= 1.0)
+
+    def test_compare_with_mobs__no_mobs(self):
+        rates = battle_simulator.compare_with_mobs(['hit'], hero_levels=[5], ability_level=1, battles_number=5, mobs_records=[])
+        self.assertEqual(rates, {5: [0.0]})
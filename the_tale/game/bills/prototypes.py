@@ -5,6 +5,7 @@ import datetime
 from django.core.urlresolvers import reverse
 from django.conf import settings as project_settings
 from django.db import transaction
+from django.db.models import Count
 
 from dext.common.utils import s11n
 
@@ -33,6 +34,11 @@ from the_tale.game.bills import signals
 from the_tale.game.bills import logic
 
 
+def _counts_by_owner(query):
+    # {owner_id: rows number}, owners without rows are not included
+    return dict(query.order_by().values('owner_id').annotate(count=Count('id')).values_list('owner_id', 'count'))
+
+
 class BillPrototype(BasePrototype):
     _model_class = Bill
     _readonly = ('id', 'type', 'created_at', 'updated_at', 'caption', 'rationale', 'votes_for',
@@ -46,6 +52,10 @@ class BillPrototype(BasePrototype):
     def accepted_bills_count(cls, account_id):
         return cls._model_class.objects.filter(owner_id=account_id, state=BILL_STATE.ACCEPTED).count()
 
+    @classmethod
+    def accepted_bills_counts(cls, accounts_ids):
+        return _counts_by_owner(cls._model_class.objects.filter(owner_id__in=accounts_ids, state=BILL_STATE.ACCEPTED))
+
     @lazy_property
     def declined_by(self): return BillPrototype.get_by_id(self._model.declined_by_id)
 
@@ -419,6 +429,15 @@ class VotePrototype(BasePrototype):
     @classmethod
     def votes_against_count(cls, account_id): return cls._model_class.objects.filter(owner_id=account_id, type=VOTE_TYPE.AGAINST).count()
 
+    @classmethod
+    def votes_counts(cls, accounts_ids): return _counts_by_owner(cls._model_class.objects.filter(owner_id__in=accounts_ids))
+
+    @classmethod
+    def votes_for_counts(cls, accounts_ids): return _counts_by_owner(cls._model_class.objects.filter(owner_id__in=accounts_ids, type=VOTE_TYPE.FOR))
+
+    @classmethod
+    def votes_against_counts(cls, accounts_ids): return _counts_by_owner(cls._model_class.objects.filter(owner_id__in=accounts_ids, type=VOTE_TYPE.AGAINST))
+
     @classmethod
     def get_for(cls, owner, bill):
         try:
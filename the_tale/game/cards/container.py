@@ -13,10 +13,11 @@ from the_tale.game.cards import effects
 
 class CardsContainer(object):
 
-    __slots__ = ('updated', '_cards', '_hero', '_help_count', '_premium_help_count', '_next_uid')
+    __slots__ = ('updated', '_cards', '_hero', '_help_count', '_premium_help_count', '_next_uid', 'ui_info_version')
 
     def __init__(self, hero=None):
         self.updated = False
+        self.ui_info_version = 0
         self._cards = {}
         self._hero = hero
         self._help_count = 0
@@ -64,6 +65,7 @@ class CardsContainer(object):
 
     def add_card(self, card):
         self.updated = True
+        self.ui_info_version += 1
         card.uid = self._get_next_uid()
         self._cards[card.uid] = card
         goods_types.cards_hero_good.sync_added_item(self._hero.account_id, card)
@@ -71,6 +73,7 @@ class CardsContainer(object):
 
     def remove_card(self, card_uid):
         self.updated = True
+        self.ui_info_version += 1
 
         if card_uid not in self._cards:
             raise exceptions.RemoveUnexistedCardError(card_uid=card_uid)
@@ -95,6 +98,7 @@ class CardsContainer(object):
             raise exceptions.HelpCountBelowZero(current_value=self._help_count, delta=delta)
 
         self.updated = True
+        self.ui_info_version += 1
 
         self._help_count += delta
 
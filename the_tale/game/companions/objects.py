@@ -164,7 +164,7 @@ class Companion(object):
             self.experience -= self.experience_to_next_level
             self.coherence += 1
 
-            self._hero.reset_accessors_cache()
+            self._hero.reset_accessors_cache(source='companion')
 
     @property
     def actual_coherence(self):
@@ -76,6 +76,7 @@ class CommonTests(BaseEffectsTests):
         self.assertEqual(effects.aprox(1, 2, 5), 2)
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class CoherenceSpeedTests(BaseEffectsTests):
 
     def test_effect(self):
@@ -110,6 +111,7 @@ class CoherenceSpeedTests(BaseEffectsTests):
         self.assertEqual(int(round(old_delta * ability.effect.multiplier_left)), new_delta)
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class ChangeHabitsTests(BaseEffectsTests):
 
     def test_effect(self):
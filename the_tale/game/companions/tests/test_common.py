@@ -20,6 +20,7 @@ from the_tale.game.companions.abilities import effects
 from the_tale.game.companions.tests import helpers
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class CommonTests(testcase.TestCase):
 
     def setUp(self):
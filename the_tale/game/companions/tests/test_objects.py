@@ -25,6 +25,7 @@ from the_tale.game.companions.abilities import container as abilities_container
 from the_tale.game.companions.abilities import effects as companions_effects
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class CompanionTests(testcase.TestCase):
 
     def setUp(self):
@@ -1,6 +1,8 @@
 # coding: utf-8
 import os
 
+from django.conf import settings as project_settings
+
 from dext.common.utils.app_settings import app_settings
 
 from the_tale.game.balance import constants as c
@@ -26,6 +28,24 @@ game_settings = app_settings('GAME',
                              STOP_WAIT_TIMEOUT = 20 * 60,
 
                              SAVED_UNCACHED_HEROES_FRACTION=0.00025,
+                             BULK_SAVE_MIN_HEROES=2, # save heroes one by one, if there are less heroes to save
+
+                             LOGIC_WORKERS_NUMBER=2,
+                             LOGIC_REBALANCE_PERIOD=60, # in turns
+                             LOGIC_REBALANCE_THRESHOLD=0.1, # fraction of average worker processing time
+                             LOGIC_REBALANCE_MAX_MIGRATIONS=50, # bundles per rebalancing
+
+                             LOGIC_TURN_PROCESSES=1, # if greater than 1, bundles without meta actions are processed in forked processes
+                                                     # (processes are forked every turn, see forked.* sections of turn statistics)
+                             LOGIC_TURN_PROCESSES_MIN_BUNDLES=100, # fork processes only if there are enough bundles to process
+
+                             LOGIC_REGISTER_BATCH_SIZE=1000, # accounts per registration command, sent on supervisor initialization
+
+                             ENABLE_LOGIC_SNAPSHOT=not project_settings.TESTS_RUNNING,
+                             LOGIC_SNAPSHOT_FILE=os.path.join(project_settings.DEXT_PID_DIRECTORY, 'snapshots', 'logic_%(worker_id)s.snapshot'),
+
+                             TURN_PROFILER_HISTORY_LENGTH=360, # in turns
+                             TURN_PROFILE_FILE=os.path.join(project_settings.DEXT_PID_DIRECTORY, 'profiles', 'turns_%(worker_id)s_%(turn_number)d.profile'),
 
                              JS_CONSTNATS_FILE_LOCATION='./the_tale/static/game/data/constants.js',
 
@@ -11,13 +11,14 @@ class EquipmentException(Exception): pass
 
 class Bag(object):
 
-    __slots__ = ('next_uuid', 'updated', 'bag', '_ui_info')
+    __slots__ = ('next_uuid', 'updated', 'bag', '_ui_info', 'ui_info_version')
 
     def __init__(self):
         self.next_uuid = 0
         self.updated = True
         self.bag = {}
         self._ui_info = None
+        self.ui_info_version = 0
 
     @classmethod
     def deserialize(cls, hero, data):
@@ -34,6 +35,7 @@ class Bag(object):
     def mark_updated(self):
         self.updated = True
         self._ui_info = None
+        self.ui_info_version += 1
 
     def serialize(self):
         return { 'next_uuid': self.next_uuid,
@@ -114,19 +116,21 @@ class Bag(object):
 
 class Equipment(object):
 
-    __slots__ = ('equipment', 'updated', '_ui_info', 'hero')
+    __slots__ = ('equipment', 'updated', '_ui_info', 'hero', 'ui_info_version')
 
     def __init__(self, hero=None):
         self.equipment = {}
         self.updated = True
         self._ui_info = None
         self.hero = hero
+        self.ui_info_version = 0
 
     # must be called on every attribute access, not only on updating of equipment
     # since artifacts can be changed from outsice this container
     def mark_updated(self):
         self.updated = True
         self._ui_info = None
+        self.ui_info_version += 1
         self.hero.quests.mark_updated()
 
     def get_power(self):
@@ -21,6 +21,8 @@ heroes_settings = app_settings('HEROES',
 
                                DUMP_CACHED_HEROES=False, # should we dump cached heroes to database
 
+                               MODIFIERS_CACHE_ENABLED=True, # turn off only in tests, which change modifiers sources without resetting cache
+
                                START_ENERGY_BONUS=10,
                                MAX_HELPS_IN_TURN=10,
 
@@ -258,12 +258,12 @@ class EquipmentMethodsMixin(object):
             self.bag.pop_artifact(equipped)
             self.equipment.equip(slot, equipped)
 
-        self.reset_accessors_cache()
+        self.reset_accessors_cache(source='equipment')
 
 
     def increment_equipment_rarity(self, artifact):
         artifact.rarity = artifacts_relations.RARITY(artifact.rarity.value+1)
-        self.reset_accessors_cache()
+        self.reset_accessors_cache(source='equipment')
 
 
     def randomize_equip(self):
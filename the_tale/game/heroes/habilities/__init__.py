@@ -71,7 +71,7 @@ class AbilitiesPrototype(object):
         self.updated = True
 
         if self.hero:
-            self.hero.reset_accessors_cache()
+            self.hero.reset_accessors_cache(source='abilities')
 
     def is_initial_state(self):
         return self.current_ability_points_number == 2
@@ -112,7 +112,7 @@ class AbilitiesPrototype(object):
         self.destiny_points_spend += 1
 
         if self.hero:
-            self.hero.reset_accessors_cache()
+            self.hero.reset_accessors_cache(source='abilities')
 
     def increment_level(self, ability_id):
         self.updated = True
@@ -120,7 +120,7 @@ class AbilitiesPrototype(object):
         self.destiny_points_spend += 1
 
         if self.hero:
-            self.hero.reset_accessors_cache()
+            self.hero.reset_accessors_cache(source='abilities')
 
     def _get_candidates(self):
 
@@ -200,7 +200,7 @@ class AbilitiesPrototype(object):
             self.updated = True
 
         if self.hero:
-            self.hero.reset_accessors_cache()
+            self.hero.reset_accessors_cache(source='abilities')
 
         return 0
 
@@ -251,7 +251,7 @@ class AbilitiesPrototype(object):
         self.updated = True
 
         if self.hero:
-            self.hero.reset_accessors_cache()
+            self.hero.reset_accessors_cache(source='abilities')
 
         return True
 
@@ -12,6 +12,7 @@ from the_tale.game.balance import constants as c
 from the_tale.game.actions.relations import ACTION_EVENT
 
 from the_tale.game.habits import HabitBase
+from the_tale.game.heroes.relations import MODIFIERS
 from the_tale.game.relations import HABIT_TYPE
 
 from the_tale.accounts.achievements.storage import achievements_storage
@@ -20,6 +21,10 @@ from the_tale.accounts.achievements.relations import ACHIEVEMENT_TYPE
 
 class Habit(HabitBase):
 
+    # all modifiers, which habit can change in any interval
+    # modifiers cache invalidates them on habit change instead of probing every modifier
+    AFFECTED_MODIFIERS = frozenset()
+
     @property
     def _real_interval(self):
         if self.owner.clouded_mind:
@@ -35,7 +40,7 @@ class Habit(HabitBase):
         return self.interval.neuter_text
 
     def reset_accessors_cache(self):
-        self.owner.reset_accessors_cache()
+        self.owner.reset_accessors_cache(source=self.field_name)
 
     @property
     def increase_modifier(self):
@@ -50,6 +55,12 @@ class Honor(Habit):
 
     TYPE = HABIT_TYPE.HONOR
 
+    AFFECTED_MODIFIERS = frozenset((MODIFIERS.POWER_TO_ENEMY,
+                                    MODIFIERS.POWER_TO_FRIEND,
+                                    MODIFIERS.QUEST_MARKERS,
+                                    MODIFIERS.QUEST_MARKERS_REWARD_BONUS,
+                                    MODIFIERS.HONOR_EVENTS))
+
     def change(self, delta):
         with achievements_storage.verify(type=ACHIEVEMENT_TYPE.HABITS_HONOR, object=self.owner):
             super(Honor, self).change(delta)
@@ -109,6 +120,13 @@ class Peacefulness(Habit):
 
     TYPE = HABIT_TYPE.PEACEFULNESS
 
+    AFFECTED_MODIFIERS = frozenset((MODIFIERS.FRIEND_QUEST_PRIORITY,
+                                    MODIFIERS.ENEMY_QUEST_PRIORITY,
+                                    MODIFIERS.LOOT_PROBABILITY,
+                                    MODIFIERS.QUEST_MARKERS,
+                                    MODIFIERS.QUEST_MARKERS_REWARD_BONUS,
+                                    MODIFIERS.HONOR_EVENTS))
+
     def change(self, delta):
         with achievements_storage.verify(type=ACHIEVEMENT_TYPE.HABITS_PEACEFULNESS, object=self.owner):
             super(Peacefulness, self).change(delta)
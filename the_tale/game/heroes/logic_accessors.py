@@ -3,21 +3,39 @@
 import math
 import random
 
-from django.conf import settings as project_settings
-
 from the_tale.game.balance import constants as c, formulas as f
 
 from the_tale.game.heroes import relations
 from the_tale.game.heroes import conf
+from the_tale.game.heroes import modifiers_cache
 
 
 class LogicAccessorsMixin(object):
 
-    def reset_accessors_cache(self):
-        if not hasattr(self, '_cached_modifiers'):
-            self._cached_modifiers = {}
+    def get_modifiers_cache(self):
+        if not hasattr(self, '_modifiers_cache'):
+            self._modifiers_cache = modifiers_cache.ModifiersCache(modifiers=frozenset(relations.MODIFIERS.records),
+                                                                   compute=self._compute_attribute_modifier,
+                                                                   get_source=self._get_modifiers_source)
+        return self._modifiers_cache
+
+    @property
+    def _cached_modifiers(self):
+        return self.get_modifiers_cache().values
+
+    def _compute_attribute_modifier(self, modifier):
+        return self.modify_attribute(modifier, modifier.default())
+
+    def _get_modifiers_source(self, source):
+        # source is name of hero's attribute: abilities, habit_honor, habit_peacefulness, equipment or companion
+        return getattr(self, source)
+
+    def reset_accessors_cache(self, source=None):
+        # if source is specified, only modifiers, which depend from it, are reset
+        if source is None:
+            self.get_modifiers_cache().clear()
         else:
-            self._cached_modifiers.clear()
+            self.get_modifiers_cache().invalidate(source)
 
         # sync some parameters
         self.health = min(self.health, self.max_health)
@@ -27,18 +45,7 @@ class LogicAccessorsMixin(object):
 
 
     def attribute_modifier(self, modifier):
-
-        if not hasattr(self, '_cached_modifiers'):
-            self._cached_modifiers = {}
-
-        if not project_settings.TESTS_RUNNING and modifier in self._cached_modifiers:
-            return self._cached_modifiers[modifier]
-
-        result = self.modify_attribute(modifier, modifier.default())
-
-        self._cached_modifiers[modifier] = result
-
-        return result
+        return self.get_modifiers_cache().get(modifier, use_cache=conf.heroes_settings.MODIFIERS_CACHE_ENABLED)
 
     def modify_attribute(self, modifier, value):
         value = self.abilities.modify_attribute(modifier, value)
@@ -0,0 +1,59 @@
+# coding: utf-8
+import time
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from the_tale.common.utils import codec
+
+from the_tale.game.heroes.models import Hero
+
+
+FIELDS = ('data', 'messages', 'actions', 'preferences', 'actual_bills')
+
+
+def measure(blobs, encode, decode):
+    values = [codec.JSONCodec().from_json(blob) for blob in blobs]
+
+    started_at = time.time()
+    encoded = [encode(value) for value in values]
+    encode_time = time.time() - started_at
+
+    started_at = time.time()
+    for string in encoded:
+        decode(string)
+    decode_time = time.time() - started_at
+
+    return sum(len(string) for string in encoded), encode_time, decode_time
+
+
+class Command(BaseCommand):
+
+    help = 'compare size and encode/decode time of heroes blobs for available codecs'
+
+    option_list = BaseCommand.option_list + ( make_option('-n', '--number',
+                                                          action='store',
+                                                          type=int,
+                                                          dest='number',
+                                                          default=1000,
+                                                          help='number of heroes to process'), )
+
+    def handle(self, *args, **options):
+
+        number = options['number']
+
+        for field in FIELDS:
+            blobs = list(Hero.objects.all().order_by('-id').values_list(field, flat=True)[:number])
+
+            print '%s: %d blobs' % (field, len(blobs))
+
+            for name, codec_class in sorted(codec.CODECS.iteritems()):
+                current_codec = codec_class()
+
+                size, encode_time, decode_time = measure(blobs, current_codec.to_json, current_codec.from_json)
+                print '\t%-10s size: %10d\tencode: %.3fs\tdecode: %.3fs' % (name, size, encode_time, decode_time)
+
+                size, encode_time, decode_time = measure(blobs,
+                                                         lambda value: codec.pack(value, codec=current_codec), # pylint: disable=W0640
+                                                         lambda string: codec.unpack(string, codec=current_codec)) # pylint: disable=W0640
+                print '\t%-10s size: %10d\tencode: %.3fs\tdecode: %.3fs' % (name + '+pack', size, encode_time, decode_time)
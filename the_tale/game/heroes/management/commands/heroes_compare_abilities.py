@@ -1,115 +1,20 @@
 # coding: utf-8
-import mock
+import time
+from optparse import make_option
+
 import numpy as np
 import matplotlib.pyplot as plt
 
 from django.core.management.base import BaseCommand
 
-from the_tale.accounts.prototypes import AccountPrototype
-from the_tale.accounts.logic import register_user, remove_account
-
-from the_tale.game.logic_storage import LogicStorage
-
-from the_tale.game.actions import battle, contexts
-
-from the_tale.game.balance.power import Power, PowerDistribution
+from the_tale.game.actions import battle_simulator
 
 from the_tale.game.heroes.habilities import ABILITIES, ABILITY_AVAILABILITY, ABILITY_TYPE
 
 
-class Messanger(object):
-
-    def add_message(self, *argv, **kwargs):
-        pass
-
-
-MESSANGER = Messanger()
-
-TEST_BATTLES_NUMBER = 40
+TEST_BATTLES_NUMBER = 200
 LEVEL = 5
 HERO_LEVELS = [5, 15, 25, 35, 45]
-POWER_DISTRIBUTION = PowerDistribution(0.5, 0.5)
-
-
-def process_battle(hero_1, hero_2):
-
-    hero_1_context = contexts.BattleContext()
-    hero_2_context = contexts.BattleContext()
-
-    while hero_1.health > 0 and hero_2.health > 0:
-        battle.make_turn(battle.Actor(hero_1, hero_1_context),
-                         battle.Actor(hero_2, hero_2_context ),
-                         MESSANGER)
-
-    return hero_1.health > 0
-
-def get_battles_statistics(hero_1, hero_2):
-
-    hero_1_wins = 0
-    hero_2_wins = 0
-
-    for hero_level in HERO_LEVELS:
-
-        with mock.patch('the_tale.game.heroes.prototypes.HeroPrototype.power', Power.power_to_level(POWER_DISTRIBUTION, hero_level)):
-            hero_1._model.level = hero_level
-            hero_2._model.level = hero_level
-
-            for i in xrange(TEST_BATTLES_NUMBER): # pylint: disable=W0612
-                hero_1.health = hero_1.max_health
-                hero_2.health = hero_2.max_health
-
-                if process_battle(hero_1, hero_2):
-                    hero_1_wins += 1
-                else:
-                    hero_2_wins += 1
-
-    return hero_1_wins, hero_2_wins
-
-
-def set_heroes_companion(hero_1, hero_2):
-    from the_tale.game.companions import storage
-    from the_tale.game.companions import models
-    from the_tale.game.companions import logic
-
-    COMPANION_NAME = u'test_hero_battle_companion'
-
-    for companion in storage.companions.all():
-        if companion.name.startswith(COMPANION_NAME):
-            models.CompanionRecord.objects.filter(id=companion.id).delete()
-            storage.companions.refresh()
-            break
-
-    companion_record = logic.create_random_companion_record(COMPANION_NAME)
-
-    hero_1.set_companion(logic.create_companion(companion_record))
-    hero_2.set_companion(logic.create_companion(companion_record))
-
-
-def compare_abilities(hero_1, hero_2, abilities, level):
-
-    hero_1.companion.health = hero_1.companion.max_health
-    hero_2.companion.health = hero_2.companion.max_health
-
-    ability_matches = {}
-
-    for i, ability_1 in enumerate(abilities[:-1]):
-        for ability_2 in abilities[i+1:]:
-
-            hero_1.abilities.reset() #abilities = {}
-            hero_1.abilities.add('hit', min(level, ABILITIES['hit'].MAX_LEVEL))
-            hero_1.abilities.add(ability_1.get_id(), level)
-
-            hero_2.abilities.reset() #abilities = {}
-            hero_2.abilities.add('hit', min(level, ABILITIES['hit'].MAX_LEVEL))
-            hero_2.abilities.add(ability_2.get_id(), level)
-
-            hero_1_wins, hero_2_wins = get_battles_statistics(hero_1, hero_2)
-
-            ability_matches[(ability_1.get_id(), ability_2.get_id())] = (hero_1_wins, hero_2_wins)
-
-            print 'compared "%s" with "%s": %d/%d' % (ability_1.get_id(), ability_2.get_id(), hero_1_wins, hero_2_wins)
-
-    return ability_matches
 
 
 def save_ability_power_statistics(statistics):
@@ -176,7 +81,7 @@ def save_ability_mathces_statistics(statistics, matches): # pylint: disable=R091
     plt.savefig('/tmp/matches.png')
 
 
-def save_ability_wins_distribution(statistics, ability_wins):
+def save_ability_wins_distribution(statistics, ability_wins, max_wins):
 
     fig = plt.figure()
     ax = fig.add_subplot(111)
@@ -187,7 +92,7 @@ def save_ability_wins_distribution(statistics, ability_wins):
     ax.boxplot(data)#, positions=[i for i in xrange(len(keys))])
 
     ax.set_xlim(0.5, len(statistics)+0.5)
-    ax.set_ylim(0, TEST_BATTLES_NUMBER*len(HERO_LEVELS))
+    ax.set_ylim(0, max_wins)
 
     locator = plt.IndexLocator(1, 0.5)
     formatter = plt.FixedFormatter([s[0] for s in statistics])
@@ -208,62 +113,114 @@ class Command(BaseCommand):
 
     help = 'compare power of different abilities'
 
+    option_list = BaseCommand.option_list + ( make_option('-b', '--battles',
+                                                          action='store',
+                                                          type=int,
+                                                          dest='battles',
+                                                          default=TEST_BATTLES_NUMBER,
+                                                          help='battles number for every pair of abilities on every level'),
+                                              make_option('-l', '--levels',
+                                                          action='store',
+                                                          type=str,
+                                                          dest='levels',
+                                                          default=','.join(str(level) for level in HERO_LEVELS),
+                                                          help='comma separated hero levels'),
+                                              make_option('-a', '--ability-level',
+                                                          action='store',
+                                                          type=int,
+                                                          dest='ability-level',
+                                                          default=LEVEL,
+                                                          help='level of compared abilities'),
+                                              make_option('-p', '--processes',
+                                                          action='store',
+                                                          type=int,
+                                                          dest='processes',
+                                                          default=1,
+                                                          help='number of processes for battles simulation'),
+                                              make_option('--pve',
+                                                          action='store_true',
+                                                          dest='pve',
+                                                          default=False,
+                                                          help='compare abilities in battles with mobs instead of battles between heroes'), )
+
     def handle(self, *args, **options): # pylint: disable=R0914
 
-        # account = AccountPrototype.get_by_nick('compare_abilities_user')
-        # if account:
-        #     account.remove()
+        battles_number = options['battles']
+        hero_levels = [int(level) for level in options['levels'].split(',')]
+
+        abilities = [ability_class
+                     for ability_class in ABILITIES.values()
+                     if (ability_class.AVAILABILITY.value & ABILITY_AVAILABILITY.FOR_PLAYERS.value and
+                         ability_class.get_id() != 'hit' and
+                         ability_class.TYPE == ABILITY_TYPE.BATTLE) ]
+
+        abilities_ids = [ability.get_id() for ability in abilities]
+
+        if options['pve']:
+            self.handle_pve(abilities_ids, hero_levels, options['ability-level'], battles_number)
+            return
+
+        started_at = time.time()
+
+        matrices = battle_simulator.compare_abilities(abilities_ids,
+                                                      hero_levels=hero_levels,
+                                                      ability_level=options['ability-level'],
+                                                      battles_number=battles_number,
+                                                      processes=options['processes'])
+
+        print 'simulated %d battles in %.2f seconds' % (battles_number * len(hero_levels) * len(abilities_ids) * (len(abilities_ids) - 1) / 2,
+                                                        time.time() - started_at)
 
-        # account = AccountPrototype.get_by_nick('compare_abilities_user_2')
-        # if account:
-        #     account.remove()
+        for hero_level in hero_levels:
+            print
+            print 'win rates on level %d' % hero_level
+            print '\t'.join([' ' * 8] + [ability_id[:8] for ability_id in abilities_ids])
+            for ability_id, row in zip(abilities_ids, matrices[hero_level]):
+                print '\t'.join(['%-8s' % ability_id[:8]] + ['%.2f' % rate for rate in row])
 
-        result, account_1_id, bundle_id = register_user('compare_abilities_user') # pylint: disable=W0612
-        result, account_2_id, bundle_id = register_user('compare_abilities_user_2') # pylint: disable=W0612
+        ability_matches = {}
 
-        account_1 = AccountPrototype.get_by_id(account_1_id)
-        account_2 = AccountPrototype.get_by_id(account_2_id)
+        for i, ability_1_id in enumerate(abilities_ids[:-1]):
+            for j, ability_2_id in enumerate(abilities_ids[i+1:], start=i+1):
+                ability_matches[(ability_1_id, ability_2_id)] = (int(round(sum(matrices[level][i][j] for level in hero_levels) * battles_number)),
+                                                                 int(round(sum(matrices[level][j][i] for level in hero_levels) * battles_number)))
 
-        storage = LogicStorage()
-        storage.load_account_data(account_1)
-        storage.load_account_data(account_2)
+        ability_statistics = dict( (ability_id, 0) for ability_id in abilities_ids)
+        ability_wins = dict( (ability_id, []) for ability_id in abilities_ids)
 
-        hero_1 = storage.accounts_to_heroes[account_1_id]
-        hero_2 = storage.accounts_to_heroes[account_2_id]
+        for (ability_1_id, ability_2_id), (ability_1_wins, ability_2_wins) in ability_matches.items():
+            ability_statistics[ability_1_id] += ability_1_wins
+            ability_statistics[ability_2_id] += ability_2_wins
 
-        set_heroes_companion(hero_1, hero_2)
+            ability_wins[ability_1_id].append(ability_1_wins)
+            ability_wins[ability_2_id].append(ability_2_wins)
 
-        try:
+        statistics = sorted(ability_statistics.items(), key=lambda stat: -stat[1])
 
-            abilities = [ability_class
-                         for ability_class in ABILITIES.values()
-                         if (ability_class.AVAILABILITY.value & ABILITY_AVAILABILITY.FOR_PLAYERS.value and
-                             ability_class.get_id() != 'hit' and
-                             ability_class.TYPE == ABILITY_TYPE.BATTLE) ]
+        battles_per_ability = battles_number * (len(abilities_ids)-1)
 
-            ability_matches = compare_abilities(hero_1, hero_2, abilities, level=LEVEL)
+        print
 
-            ability_statistics = dict( (ability.get_id(), 0) for ability in abilities)
-            ability_wins = dict( (ability.get_id(), []) for ability in abilities)
+        for ability_id, wins in statistics:
+            print '%d\t%.0f%%\t%s' % (wins, 100*float(wins)/(battles_per_ability*len(hero_levels)), ability_id)
 
-            for (ability_1_id, ability_2_id), (ability_1_wins, ability_2_wins) in ability_matches.items():
-                ability_statistics[ability_1_id] = ability_statistics.get(ability_1_id, 0) + ability_1_wins
-                ability_statistics[ability_2_id] = ability_statistics.get(ability_2_id, 0) + ability_2_wins
+        save_ability_power_statistics(statistics)
+        save_ability_mathces_statistics(statistics, ability_matches)
+        save_ability_wins_distribution(statistics, ability_wins, max_wins=battles_number*len(hero_levels))
 
-                ability_wins[ability_1_id].append(ability_1_wins)
-                ability_wins[ability_2_id].append(ability_2_wins)
+    def handle_pve(self, abilities_ids, hero_levels, ability_level, battles_number):
 
-            statistics = sorted(ability_statistics.items(), key=lambda stat: -stat[1])
+        started_at = time.time()
 
-            battles_per_ability = TEST_BATTLES_NUMBER * (len(abilities)-1)
+        rates = battle_simulator.compare_with_mobs(abilities_ids,
+                                                   hero_levels=hero_levels,
+                                                   ability_level=ability_level,
+                                                   battles_number=battles_number)
 
-            for ability_id, wins in statistics:
-                print '%d\t%.0f%%\t%s' % (wins, 100*float(wins)/(battles_per_ability*len(HERO_LEVELS)), ability_id)
+        print 'simulated battles with mobs in %.2f seconds' % (time.time() - started_at)
 
-            save_ability_power_statistics(statistics)
-            save_ability_mathces_statistics(statistics, ability_matches)
-            save_ability_wins_distribution(statistics, ability_wins)
+        print
+        print '\t'.join([' ' * 8] + ['%8d' % hero_level for hero_level in hero_levels])
 
-        finally:
-            remove_account(account_1)
-            remove_account(account_2)
+        for i, ability_id in enumerate(abilities_ids):
+            print '\t'.join(['%-8s' % ability_id[:8]] + ['%8.2f' % rates[hero_level][i] for hero_level in hero_levels])
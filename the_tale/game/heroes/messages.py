@@ -1,7 +1,11 @@
 # coding: utf-8
+import re
 import time
+import itertools
 import collections
 
+from the_tale.common.utils import codec
+
 from the_tale.game.balance import constants as c
 
 from the_tale.game.prototypes import TimePrototype, GameTime
@@ -48,7 +52,10 @@ class MessageSurrogate(object):
                    position=position)
 
     def serialize(self):
-        return (self.turn_number, self.timestamp, self.message, self.position)
+        # compact row: position is stored only if it is not empty
+        if self.position:
+            return (self.turn_number, self.timestamp, self.message, self.position)
+        return (self.turn_number, self.timestamp, self.message)
 
     @classmethod
     def deserialize(cls, data):
@@ -57,7 +64,7 @@ class MessageSurrogate(object):
                    message=data[2],
                    key=None,
                    externals=None,
-                   position=data[3])
+                   position=data[3] if len(data) > 3 else u'')
 
     @property
     def message(self):
@@ -75,16 +82,7 @@ class MessageSurrogate(object):
         if self._ui_info is not None:
             return self._ui_info
 
-        game_time = GameTime.create_from_turn(self.turn_number)
-
-        if with_info:
-            self._ui_info = (self.timestamp,
-                             game_time.verbose_time,
-                             self.message,
-                             game_time.verbose_date,
-                             self.position)
-        else:
-            self._ui_info = (self.timestamp, game_time.verbose_time, self.message)
+        self._ui_info = _ui_info(self.turn_number, self.timestamp, self.message, self.position, with_info)
 
         return self._ui_info
 
@@ -97,62 +95,245 @@ class MessageSurrogate(object):
                               position=self.position)
 
 
-def _message_key(m): return (m.turn_number, m.timestamp)
+def _ui_info(turn_number, timestamp, message, position, with_info):
+    game_time = GameTime.create_from_turn(turn_number)
+
+    if with_info:
+        return (timestamp, game_time.verbose_time, message, game_time.verbose_date, position)
+
+    return (timestamp, game_time.verbose_time, message)
+
+
+# container stores loaded messages as serialized rows and new messages as MessageSurrogate objects
+# rows are never converted to objects: they already contain everything needed for ui and serialization
+#
+# container, loaded from json, is not decoded until its messages are read:
+# new messages are kept aside and written back as encoded rows, appended to serialized text
+
+def _turn_number(item): return item.turn_number if isinstance(item, MessageSurrogate) else item[0]
+def _timestamp(item): return item.timestamp if isinstance(item, MessageSurrogate) else item[1]
+def _text(item): return item.message if isinstance(item, MessageSurrogate) else item[2]
+
+def _message_key(item): return (_turn_number(item), _timestamp(item))
+
+def _item_ui_info(item, with_info):
+    if isinstance(item, MessageSurrogate):
+        return item.ui_info(with_info=with_info)
+    return _ui_info(item[0], item[1], item[2], item[3] if len(item) > 3 else u'', with_info)
+
+def _serialize_item(item):
+    return item.serialize() if isinstance(item, MessageSurrogate) else item
+
+
+def _split_rows(raw):
+    # serialized container is {"messages": [row, ...]}
+    # returns text before closing bracket of rows list and flag, is list empty, or None for unknown format
+    text = raw.rstrip()
+
+    if not text.endswith('}'):
+        return None
+
+    text = text[:-1].rstrip()
+
+    if not text.endswith(']'):
+        return None
+
+    text = text[:-1].rstrip()
+
+    return text, text.endswith('[')
+
+
+_ROWS_SEPARATOR = re.compile(r'\]\s*,\s*\[')
+
+def _estimate_rows_number(raw):
+    # rows are never counted less than they are: separator can be found in message text, but not missed
+    split = _split_rows(raw)
+
+    if split is None or split[1]:
+        return 0
+
+    return len(_ROWS_SEPARATOR.findall(raw)) + 1
+
+
+def _append_rows(raw, rows):
+    split = _split_rows(raw)
+
+    if split is None:
+        return None
+
+    text, is_empty = split
+
+    return u'%s%s%s]}' % (text, u'' if is_empty else u',', u','.join(rows))
 
 
 class MessagesContainer(object):
 
-    __slots__ = ('messages', 'updated')
+    __slots__ = ('_messages', '_raw', '_raw_rows', '_new_messages', 'updated', 'ui_info_version')
 
     MESSAGES_LOG_LENGTH = None
 
     def __init__(self):
-        self.messages = collections.deque()
+        self._messages = collections.deque()
+
+        self._raw = None # serialized container, which is not decoded yet
+        self._raw_rows = None # estimated number of rows in serialized container
+        self._new_messages = [] # messages, pushed to not decoded container
+
         self.updated = False
+        self.ui_info_version = 0
+
+    @property
+    def messages(self):
+        if self._raw is not None:
+            self._decode()
+        return self._messages
+
+    def _decode(self):
+        rows = codec.from_json(self._raw)['messages']
+
+        if any(_message_key(a) > _message_key(b) for a, b in zip(rows, rows[1:])):
+            rows.sort(key=_message_key)
+
+        self._messages = collections.deque(rows)
+
+        self._raw = None
+        self._raw_rows = None
+
+        new_messages, self._new_messages = self._new_messages, []
+
+        for msg in new_messages:
+            self._push_message(msg)
+
+        self._trim()
+
+    def _trim(self):
+        while len(self._messages) > self.MESSAGES_LOG_LENGTH:
+            self._messages.popleft()
+
+    def _push_message(self, msg):
+        if self._messages and (msg.turn_number < _turn_number(self._messages[-1]) or msg.timestamp < _timestamp(self._messages[-1])):
+            self._messages.append(msg)
+            self._messages = collections.deque(sorted(self._messages, key=_message_key))
+        else:
+            self._messages.append(msg)
+
+        self._trim()
 
     def push_message(self, msg):
         self.updated = True
+        self.ui_info_version += 1
 
-        self.messages.append(msg)
+        if self._raw is None:
+            self._push_message(msg)
+            return
 
-        if len(self.messages) > 1 and (self.messages[-1].turn_number < self.messages[-2].turn_number or self.messages[-1].timestamp < self.messages[-2].timestamp):
-            messages = sorted(self.messages, key=_message_key)
-            self.messages = collections.deque(messages)
+        self._new_messages.append(msg)
 
-        if len(self.messages) > self.MESSAGES_LOG_LENGTH:
-            self.messages.popleft()
+        if self._raw_rows is None:
+            self._raw_rows = _estimate_rows_number(self._raw)
+
+        # do not let not decoded container grow without limit
+        if self._raw_rows + len(self._new_messages) > 2 * self.MESSAGES_LOG_LENGTH:
+            self._decode()
 
     def messages_number(self):
         return len(self.messages)
 
     def clear(self):
-        if self.messages:
-            self.messages.clear()
+        if self._raw is not None and not self._new_messages:
+            split = _split_rows(self._raw)
+            if split is not None and split[1]:
+                return
+
+        if self._raw is not None or self._messages:
+            self._messages.clear()
+            self._raw = None
+            self._raw_rows = None
+            self._new_messages = []
             self.updated = True
+            self.ui_info_version += 1
 
     def __len__(self): return len(self.messages)
 
+    def visible_messages_number(self):
+        # messages from future turns are not shown, so visible part of container can change without updates
+        current_turn = TimePrototype.get_current_turn_number()
+
+        messages = self.messages
+
+        number = len(messages)
+
+        for item in reversed(messages):
+            if _turn_number(item) <= current_turn:
+                break
+            number -= 1
+
+        return number
+
+
+    def render_messages(self):
+        # render texts of all not rendered messages at once, instead of rendering them one by one
+        from the_tale.linguistics.logic import render_texts
+
+        not_rendered_messages = [item
+                                 for item in itertools.chain(self._messages, self._new_messages)
+                                 if isinstance(item, MessageSurrogate) and item._message is None]
+
+        if not not_rendered_messages:
+            return
+
+        texts = render_texts([(message.key, message.externals, message.restrictions) for message in not_rendered_messages])
+
+        for message, text in zip(not_rendered_messages, texts):
+            message._message = text
 
     def ui_info(self, with_info=False):
+        self.render_messages()
+
         current_turn = TimePrototype.get_current_turn_number()
 
         messages = []
 
-        for message in self.messages:
-            if message.turn_number > current_turn:
+        for item in self.messages:
+            if _turn_number(item) > current_turn:
                 break
 
-            messages.append(message.ui_info(with_info=with_info))
+            messages.append(_item_ui_info(item, with_info))
 
         return messages
 
     def serialize(self):
-        return {'messages': [message.serialize() for message in self.messages]}
+        self.render_messages()
+        return {'messages': [_serialize_item(item) for item in self.messages]}
+
+    def serialize_to_json(self):
+        if self._raw is None:
+            return codec.to_json(self.serialize())
+
+        if self._new_messages:
+            self.render_messages()
+
+            raw = _append_rows(self._raw, [codec.to_json(_serialize_item(msg)) for msg in self._new_messages])
+
+            if raw is None:
+                return codec.to_json(self.serialize())
+
+            self._raw = raw
+            self._raw_rows += len(self._new_messages)
+            self._new_messages = []
+
+        return self._raw
 
     @classmethod
     def deserialize(cls, hero, data):
         obj = cls()
-        obj.messages = collections.deque(MessageSurrogate.deserialize(message_data) for message_data in data['messages'])
+        obj._messages = collections.deque(data['messages'])
+        return obj
+
+    @classmethod
+    def deserialize_from_json(cls, hero, raw):
+        obj = cls()
+        obj._raw = raw
         return obj
 
     def __eq__(self, other):
@@ -160,7 +341,9 @@ class MessagesContainer(object):
             return False
 
         for a, b in zip(self.messages, other.messages):
-            if a.turn_number != b.turn_number or a.message != b.message or abs(a.timestamp - b.timestamp) > 0.0001:
+            if (_turn_number(a) != _turn_number(b) or
+                _text(a) != _text(b) or
+                abs(_timestamp(a) - _timestamp(b)) > 0.0001):
                 return False
 
         return True
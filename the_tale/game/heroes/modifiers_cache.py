@@ -0,0 +1,146 @@
+# coding: utf-8
+import collections
+
+
+# process-wide counters, collected by turn profiler
+COUNTERS = collections.Counter()
+
+
+def pop_counters():
+    counters = dict(COUNTERS)
+    COUNTERS.clear()
+    return counters
+
+
+def _is_changed(source, modifier):
+    # check if source changes value of modifier
+    # numbers and flags are checked with two different values, since multiplier does not change default zero
+    default = modifier.default()
+
+    if isinstance(default, bool):
+        return any(source.modify_attribute(modifier, value) != value for value in (False, True))
+
+    if isinstance(default, (int, long, float)):
+        return any(source.modify_attribute(modifier, value) != value for value in (default, default + 1))
+
+    # default value can be mutable and modified in place, so compare with new one
+    return source.modify_attribute(modifier, modifier.default()) != modifier.default()
+
+
+class ModifiersCache(object):
+    # cache of attribute modifiers values, calculated from several sources (abilities, habits, equipment, etc.)
+    #
+    # - when source changed, only modifiers, which it changed before or changes now, are invalidated
+    #   (they are found by probing source.modify_attribute with test values)
+    # - sources, which declare AFFECTED_MODIFIERS (all modifiers they can ever change), are not probed:
+    #   probing costs about 2*len(modifiers) modify_attribute calls and such sources (habits) change often
+    # - modifiers, calculated with values of other modifiers, are invalidated with them
+    # - sources, probed with values of invalidated modifiers, are probed again
+
+    __slots__ = ('modifiers', 'values', 'hits', 'misses', '_compute', '_get_source', '_affected', '_dependents', '_probe_reads', '_stack')
+
+    def __init__(self, modifiers, compute, get_source):
+        self.modifiers = modifiers
+        self.values = {}
+
+        self.hits = 0
+        self.misses = 0
+
+        self._compute = compute
+        self._get_source = get_source
+
+        self._affected = {}
+        self._dependents = collections.defaultdict(set)
+        self._probe_reads = collections.defaultdict(set)
+        self._stack = []
+
+    def get(self, modifier, use_cache=True):
+        if self._stack:
+            is_probe, key = self._stack[-1]
+            if is_probe:
+                self._probe_reads[modifier].add(key)
+            else:
+                self._dependents[modifier].add(key)
+
+        if use_cache and modifier in self.values:
+            self.hits += 1
+            COUNTERS['modifiers_cache.hits'] += 1
+            return self.values[modifier]
+
+        self.misses += 1
+        COUNTERS['modifiers_cache.misses'] += 1
+
+        self._stack.append((False, modifier))
+
+        try:
+            value = self._compute(modifier)
+        finally:
+            self._stack.pop()
+
+        self.values[modifier] = value
+
+        return value
+
+    def clear(self):
+        COUNTERS['modifiers_cache.clears'] += 1
+
+        self.values.clear()
+        self._affected.clear()
+        self._dependents.clear()
+        self._probe_reads.clear()
+
+    def probe(self, source_key):
+        source = self._get_source(source_key)
+
+        if source is None:
+            return frozenset()
+
+        COUNTERS['modifiers_cache.probes'] += 1
+
+        self._stack.append((True, source_key))
+
+        try:
+            return frozenset(modifier for modifier in self.modifiers if _is_changed(source, modifier))
+        finally:
+            self._stack.pop()
+
+    def invalidate(self, source_key):
+        COUNTERS['modifiers_cache.invalidations'] += 1
+        self._invalidate_source(source_key, processed_sources=set())
+
+    def _invalidate_source(self, source_key, processed_sources):
+        if source_key in processed_sources:
+            return
+
+        processed_sources.add(source_key)
+
+        declared_modifiers = getattr(self._get_source(source_key), 'AFFECTED_MODIFIERS', None)
+
+        if declared_modifiers is not None:
+            self._invalidate_modifiers(declared_modifiers, processed_sources)
+            return
+
+        # if source was never probed, we do not know what it changed
+        old_affected = self._affected.get(source_key, self.modifiers)
+
+        self._invalidate_modifiers(old_affected, processed_sources)
+
+        new_affected = self.probe(source_key)
+
+        self._affected[source_key] = new_affected
+
+        self._invalidate_modifiers(new_affected.difference(old_affected), processed_sources)
+
+    def _invalidate_modifiers(self, modifiers, processed_sources):
+        queue = list(modifiers)
+
+        while queue:
+            modifier = queue.pop()
+
+            if self.values.pop(modifier, None) is not None:
+                COUNTERS['modifiers_cache.invalidated'] += 1
+
+            queue.extend(self._dependents.pop(modifier, ()))
+
+            for source_key in self._probe_reads.pop(modifier, ()):
+                self._invalidate_source(source_key, processed_sources)
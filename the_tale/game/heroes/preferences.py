@@ -279,3 +279,53 @@ class HeroPreferences(object):
 
         return ( (honor_positive, honor_negative),
                  (peacefulness_positive, peacefulness_negative) )
+
+    @classmethod
+    def count_places_statistics(cls, places):
+        # citizens number and habits values (in format of count_habit_values) for all places with single query
+        # place, which depends_from_all_heroes, counts all active heroes, other places count only premium heroes
+        # result: {place_id: (heroes_number, habits_values)}
+
+        current_time = datetime.datetime.now()
+
+        persons_places = {}
+
+        for place in places:
+            for person in place.persons:
+                persons_places[person.id] = place.id
+
+        depends_from_all = {place.id: place.depends_from_all_heroes for place in places}
+
+        heroes_numbers = {place.id: 0 for place in places}
+        habits = {place.id: [0, 0, 0, 0] for place in places}
+
+        query = cls._preferences_query(all=True).values_list('place_id', 'friend_id', 'enemy_id',
+                                                               'hero__premium_state_end_at',
+                                                               'hero__habit_honor', 'hero__habit_peacefulness')
+
+        for place_id, friend_id, enemy_id, premium_state_end_at, honor, peacefulness in query.iterator():
+            is_premium = premium_state_end_at >= current_time
+
+            if place_id in heroes_numbers and (is_premium or depends_from_all[place_id]):
+                heroes_numbers[place_id] += 1
+
+            heroes_places = set((place_id, persons_places.get(friend_id), persons_places.get(enemy_id)))
+
+            for hero_place_id in heroes_places:
+                if hero_place_id not in habits or not (is_premium or depends_from_all[hero_place_id]):
+                    continue
+
+                values = habits[hero_place_id]
+
+                if honor > 0:
+                    values[0] += honor
+                elif honor < 0:
+                    values[1] += honor
+
+                if peacefulness > 0:
+                    values[2] += peacefulness
+                elif peacefulness < 0:
+                    values[3] += peacefulness
+
+        return {place_id: (heroes_numbers[place_id], ((values[0], values[1]), (values[2], values[3])))
+                for place_id, values in habits.iteritems()}
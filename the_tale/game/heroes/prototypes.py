@@ -4,11 +4,13 @@ import datetime
 import time
 import random
 
-from dext.common.utils import s11n, database, cache
+from dext.common.utils import s11n, cache
 
 from the_tale.amqp_environment import environment
 
 from the_tale.common.utils.prototypes import BasePrototype
+from the_tale.common.utils import bulk
+from the_tale.common.utils import codec
 from the_tale.common.utils.logic import random_value_by_priority
 from the_tale.common.utils.decorators import lazy_property
 
@@ -76,6 +78,7 @@ class HeroPrototype(BasePrototype,
                       'settings_approved',
                       'next_spending')
     _get_by = ('id', 'account_id')
+    _track_changed_fields = True
     _serialization_proxies = (('quests', QuestsContainer, heroes_settings.UNLOAD_TIMEOUT),
                               ('places_history', places_help_statistics.PlacesHelpStatistics, heroes_settings.UNLOAD_TIMEOUT),
                               ('cards', CardsContainer, heroes_settings.UNLOAD_TIMEOUT),
@@ -92,6 +95,14 @@ class HeroPrototype(BasePrototype,
         self.last_help_on_turn = 0
         self.helps_in_turn = 0
 
+        self._saved_data = None
+
+        self._ui_info_sections = {}
+
+    def reload(self):
+        super(HeroPrototype, self).reload()
+        self._saved_data = None
+
     def can_be_helped(self):
         if (self.last_help_on_turn == TimePrototype.get_current_turn_number() and
             self.helps_in_turn >= heroes_settings.MAX_HELPS_IN_TURN):
@@ -140,7 +151,7 @@ class HeroPrototype(BasePrototype,
 
     @lazy_property
     def data(self):
-        return s11n.from_json(self._model.data)
+        return codec.from_json(self._model.data)
 
     ###########################################
     # Base attributes
@@ -370,7 +381,7 @@ class HeroPrototype(BasePrototype,
     def preferences(self):
         from the_tale.game.heroes.preferences import HeroPreferences
 
-        preferences = HeroPreferences.deserialize(hero=self, data=s11n.from_json(self._model.preferences))
+        preferences = HeroPreferences.deserialize(hero=self, data=codec.from_json(self._model.preferences))
 
         if preferences.energy_regeneration_type is None:
             preferences.set_energy_regeneration_type(self.race.energy_regeneration, change_time=datetime.datetime.fromtimestamp(0))
@@ -387,7 +398,7 @@ class HeroPrototype(BasePrototype,
 
     @lazy_property
     def actions(self):
-        actions_container = ActionsContainer.deserialize(self, s11n.from_json(self._model.actions))
+        actions_container = ActionsContainer.deserialize(self, codec.from_json(self._model.actions))
         actions_container.initialize(hero=self)
         return actions_container
 
@@ -414,12 +425,14 @@ class HeroPrototype(BasePrototype,
 
         del self.companion
 
+        self.reset_accessors_cache(source='companion')
+
         self.companion.on_settupped()
 
     def remove_companion(self):
         del self.companion
         self.data['companion'] = None
-        self.reset_accessors_cache()
+        self.reset_accessors_cache(source='companion')
 
         while self.next_spending.is_HEAL_COMPANION:
             self.switch_spending()
@@ -434,7 +447,7 @@ class HeroPrototype(BasePrototype,
 
 
     @lazy_property
-    def messages(self): return messages.JournalContainer.deserialize(self, s11n.from_json(self._model.messages))
+    def messages(self): return messages.JournalContainer.deserialize_from_json(self, self._model.messages)
 
     def push_message(self, message, diary=False, journal=True):
         if journal:
@@ -502,13 +515,16 @@ class HeroPrototype(BasePrototype,
     def remove(self):
         self._model.delete()
 
-    def save(self):
+    def prepare_to_save(self):
         self._model.saved_at_turn = TimePrototype.get_current_turn_number()
         self._model.saved_at = datetime.datetime.now()
 
         self.serialize_companion()
 
-        self._model.data = s11n.to_json(self.data)
+        # encode data only if it changed since last save
+        if self.data != self._saved_data:
+            self._model.data = codec.to_json(self.data)
+            self._saved_data = dict(self.data)
 
         if self.bag.updated:
             self.bag.serialize()
@@ -528,7 +544,7 @@ class HeroPrototype(BasePrototype,
             self.cards.serialize()
 
         if self.messages.updated:
-            self._model.messages = s11n.to_json(self.messages.serialize())
+            self._model.messages = self.messages.serialize_to_json()
             self.messages.updated = False
 
         if self.diary.updated:
@@ -536,7 +552,7 @@ class HeroPrototype(BasePrototype,
 
         if self.actions.updated:
             self.actions.on_save()
-            self._model.actions = s11n.to_json(self.actions.serialize())
+            self._model.actions = codec.to_json(self.actions.serialize())
             self.actions.updated = False
 
         if self.quests.updated:
@@ -547,12 +563,27 @@ class HeroPrototype(BasePrototype,
             self.pvp.serialize()
 
         if self.preferences.updated:
-            self._model.preferences = s11n.to_json(self.preferences.serialize())
+            self._model.preferences = codec.to_json(self.preferences.serialize())
             self.preferences.updated = False
 
         self._model.stat_politics_multiplier = self.politics_power_multiplier() if self.can_change_all_powers() else 0
 
-        database.raw_save(self._model)
+    def save(self):
+        self.prepare_to_save()
+        self.save_changed_fields()
+
+    @classmethod
+    def save_many(cls, heroes):
+        changed_fields = set()
+
+        for hero in heroes:
+            hero.prepare_to_save()
+            changed_fields.update(hero.changed_fields())
+
+        bulk.bulk_update(Hero, [hero._model for hero in heroes], fields=sorted(changed_fields))
+
+        for hero in heroes:
+            hero.mark_fields_saved()
 
     def reset_level(self):
         self._model.level = 1
@@ -596,6 +627,16 @@ class HeroPrototype(BasePrototype,
                 self.messages == other.messages and
                 self.diary == other.diary)
 
+    def ui_info_sections(self):
+        # sections of ui info, which are rebuilt only after change of their containers
+        # key of section changes with every update of container (or with replacement of container itself)
+        return (('messages', (id(self.messages), self.messages.ui_info_version, self.messages.visible_messages_number()), lambda: self.messages.ui_info()),
+                ('diary', (id(self.diary), self.diary.ui_info_version, self.diary.visible_messages_number()), lambda: self.diary.ui_info(with_info=True)),
+                ('bag', (id(self.bag), self.bag.ui_info_version), lambda: self.bag.ui_info(self)),
+                ('equipment', (id(self.equipment), self.equipment.ui_info_version), lambda: self.equipment.ui_info(self)),
+                ('cards', (id(self.cards), self.cards.ui_info_version), lambda: self.cards.ui_info()),
+                ('quests', (id(self.quests), self.quests.ui_info_version), lambda: self.quests.ui_info(self)))
+
     def ui_info(self, actual_guaranteed, old_info=None):
         from the_tale.game.map.generator.drawer import get_hero_sprite
 
@@ -603,12 +644,7 @@ class HeroPrototype(BasePrototype,
                     'patch_turn': None if old_info is None else old_info['actual_on_turn'],
                 'actual_on_turn': TimePrototype.get_current_turn_number() if actual_guaranteed else self.saved_at_turn,
                 'ui_caching_started_at': time.mktime(self.ui_caching_started_at.timetuple()),
-                'messages': self.messages.ui_info(),
-                'diary': self.diary.ui_info(with_info=True),
                 'position': self.position.ui_info(),
-                'bag': self.bag.ui_info(self),
-                'equipment': self.equipment.ui_info(self),
-                'cards': self.cards.ui_info(),
                 'might': { 'value': self.might,
                            'crit_chance': self.might_crit_chance,
                            'pvp_effectiveness_bonus': self.might_pvp_effectiveness_bonus,
@@ -644,19 +680,37 @@ class HeroPrototype(BasePrototype,
                                                                             'raw': self.habit_honor.raw_value},
                             game_relations.HABIT_TYPE.PEACEFULNESS.verbose_value: {'verbose': self.habit_peacefulness.verbose_value,
                                                                                    'raw': self.habit_peacefulness.raw_value}},
-                'quests': self.quests.ui_info(self),
                 'sprite': get_hero_sprite(self).value,
                 }
 
+        unchanged_sections = set()
+        sections = {}
+
+        for section, key, get_section_info in self.ui_info_sections():
+            last_key, last_info = self._ui_info_sections.get(section, (None, None))
+
+            # section is unchanged only if old info contains exactly the object, built for the same key
+            if old_info is not None and last_key == key and old_info.get(section) is last_info:
+                unchanged_sections.add(section)
+            else:
+                last_info = get_section_info()
+
+            new_info[section] = last_info
+            sections[section] = (key, last_info)
+
         changed_fields = ['changed_fields', 'actual_on_turn', 'patch_turn']
 
         if old_info:
             for key, value in new_info.iteritems():
+                if key in unchanged_sections:
+                    continue
                 if old_info[key] != value:
                     changed_fields.append(key)
 
         new_info['changed_fields'] = changed_fields
 
+        self._ui_info_sections = sections
+
         return new_info
 
     @classmethod
@@ -757,7 +811,7 @@ class HeroPrototype(BasePrototype,
 
     @lazy_property
     def actual_bills(self):
-        return s11n.from_json(self._model.actual_bills)
+        return codec.from_json(self._model.actual_bills)
 
     @property
     def actual_bills_number(self):
@@ -775,7 +829,7 @@ class HeroPrototype(BasePrototype,
         self.premium_state_end_at = premium_end_at
         self.ban_state_end_at = ban_end_at
         self.might = might
-        self._model.actual_bills = s11n.to_json(actual_bills)
+        self._model.actual_bills = codec.to_json(actual_bills)
 
 
     ###########################################
@@ -794,38 +848,62 @@ class HeroPrototype(BasePrototype,
     def get_achievement_account_id(self):
         return self.account_id
 
-    def get_achievement_type_value(self, achievement_type):
+    @classmethod
+    def _achievement_type_value_calculator(cls, achievement_type):
+        # returns model columns, required for achievement value, and function, which calculates value from them
 
         if achievement_type.is_TIME:
-            return f.turns_to_game_time(self.last_rare_operation_at_turn - self.created_at_turn)[0]
+            return (('last_rare_operation_at_turn', 'created_at_turn'),
+                    lambda last_rare_operation_at_turn, created_at_turn: f.turns_to_game_time(last_rare_operation_at_turn - created_at_turn)[0])
         elif achievement_type.is_MONEY:
-            return self.statistics.money_earned
-        elif achievement_type.is_MOBS:
-            return self.statistics.pve_kills
+            return (('stat_money_earned_from_loot',
+                     'stat_money_earned_from_artifacts',
+                     'stat_money_earned_from_quests',
+                     'stat_money_earned_from_help',
+                     'stat_money_earned_from_habits',
+                     'stat_money_earned_from_companions'),
+                    lambda *values: sum(values))
+        elif achievement_type.is_PVP_VICTORIES_1X1:
+            return (('stat_pvp_battles_1x1_number', 'stat_pvp_battles_1x1_victories'),
+                    lambda number, victories: int(float(victories) / number * 100) if number >= heroes_settings.MIN_PVP_BATTLES else 0)
+
+        if achievement_type.is_MOBS:
+            column = 'stat_pve_kills'
         elif achievement_type.is_ARTIFACTS:
-            return self.statistics.artifacts_had
+            column = 'stat_artifacts_had'
         elif achievement_type.is_QUESTS:
-            return self.statistics.quests_done
+            column = 'stat_quests_done'
         elif achievement_type.is_DEATHS:
-            return self.statistics.pve_deaths
+            column = 'stat_pve_deaths'
         elif achievement_type.is_PVP_BATTLES_1X1:
-            return self.statistics.pvp_battles_1x1_number
-        elif achievement_type.is_PVP_VICTORIES_1X1:
-            if self.statistics.pvp_battles_1x1_number >= heroes_settings.MIN_PVP_BATTLES:
-                return int(float(self.statistics.pvp_battles_1x1_victories) / self.statistics.pvp_battles_1x1_number * 100)
-            return 0
+            column = 'stat_pvp_battles_1x1_number'
         elif achievement_type.is_KEEPER_HELP_COUNT:
-            return self.statistics.help_count
+            column = 'stat_help_count'
         elif achievement_type.is_HABITS_HONOR:
-            return self.habit_honor.raw_value
+            column = 'habit_honor'
         elif achievement_type.is_HABITS_PEACEFULNESS:
-            return self.habit_peacefulness.raw_value
+            column = 'habit_peacefulness'
         elif achievement_type.is_KEEPER_CARDS_USED:
-            return self.statistics.cards_used
+            column = 'stat_cards_used'
         elif achievement_type.is_KEEPER_CARDS_COMBINED:
-            return self.statistics.cards_combined
+            column = 'stat_cards_combined'
+        else:
+            raise exceptions.UnkwnownAchievementTypeError(achievement_type=achievement_type)
 
-        raise exceptions.UnkwnownAchievementTypeError(achievement_type=achievement_type)
+        return ((column,), lambda value: value)
+
+    def get_achievement_type_value(self, achievement_type):
+        columns, calculator = self._achievement_type_value_calculator(achievement_type)
+        return calculator(*[getattr(self._model, column) for column in columns])
+
+    @classmethod
+    def get_achievement_type_values(cls, achievement_type, chunk_size):
+        # set-based version of get_achievement_type_value, reads only required columns
+        # yields lists of (account_id, value) for all heroes
+        columns, calculator = cls._achievement_type_value_calculator(achievement_type)
+
+        for rows in bulk.values_chunks(cls._db_all(), ('account_id',) + columns, chunk_size=chunk_size):
+            yield [(row[1], calculator(*row[2:])) for row in rows]
 
     def process_rare_operations(self):
         from the_tale.accounts.achievements.storage import achievements_storage
@@ -996,16 +1074,7 @@ class HeroPositionPrototype(object):
             return map_info_storage.item.get_dominant_place(*self.cell_coordinates)
 
     def get_nearest_place(self):
-        x, y = self.cell_coordinates
-        best_distance = 999999999999999
-        best_place = None
-        for place in places_storage.all():
-            distance = math.hypot(place.x-x, place.y-y)
-            if distance < best_distance:
-                best_distance = distance
-                best_place = place
-
-        return best_place
+        return places_storage.get_nearest_place(*self.cell_coordinates)
 
     def get_nearest_dominant_place(self):
         place = self.get_dominant_place()
@@ -1042,13 +1111,13 @@ class HeroPositionPrototype(object):
         from the_tale.game.map.roads.storage import waymarks_storage
 
         if self.place:
-            return waymarks_storage.look_for_road(self.place, destination).length
+            return waymarks_storage.get_distance(self.place, destination)
 
         if self.is_walking:
             x = self.coordinates_from[0] + (self.coordinates_to[0] - self.coordinates_from[0]) * self.percents
             y = self.coordinates_from[1] + (self.coordinates_to[1] - self.coordinates_from[1]) * self.percents
             nearest_place = self.get_nearest_place()
-            return math.hypot(x-nearest_place.x, y-nearest_place.y) + waymarks_storage.look_for_road(nearest_place, destination).length
+            return math.hypot(x-nearest_place.x, y-nearest_place.y) + waymarks_storage.get_distance(nearest_place, destination)
 
         # if on road
         place_from = self.road.point_1
@@ -1060,8 +1129,8 @@ class HeroPositionPrototype(object):
         delta_from = self.road.length * self.percents
         delta_to = self.road.length * (1-self.percents)
 
-        return min(waymarks_storage.look_for_road(place_from, destination).length + delta_from,
-                   waymarks_storage.look_for_road(place_to, destination).length + delta_to)
+        return min(waymarks_storage.get_distance(place_from, destination) + delta_from,
+                   waymarks_storage.get_distance(place_to, destination) + delta_to)
 
 
 
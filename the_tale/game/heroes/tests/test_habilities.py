@@ -323,6 +323,7 @@ class HabilitiesTest(TestCase):
 
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class ChooseAbilityTaskTest(TestCase):
 
     def setUp(self):
@@ -24,6 +24,7 @@ from the_tale.game.logic_storage import LogicStorage
 
 from the_tale.game.heroes.relations import MODIFIERS
 from the_tale.game.heroes import habits
+from the_tale.game.heroes import modifiers_cache
 
 
 class BaseHabitTest(testcase.TestCase):
@@ -108,6 +109,7 @@ class BaseHabitTest(testcase.TestCase):
 
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class HabitTest(BaseHabitTest):
 
     def test_raw_value(self):
@@ -262,6 +264,7 @@ class UpdateHabitsTest(BaseHabitTest):
 @mock.patch('the_tale.game.mobs.storage.mobs_storage.mob_type_fraction', lambda mob_type: {MOB_TYPE.PLANT: 0.1,
                                                                                            MOB_TYPE.CIVILIZED: 0.4,
                                                                                            MOB_TYPE.MONSTER: 0.5}.get(mob_type, 0))
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class HonorHabitModifiersTest(BaseHabitTest):
 
     def setUp(self):
@@ -396,6 +399,7 @@ class HonorHabitModifiersTest(BaseHabitTest):
         self.assertEqual(self.hero.modify_attribute(MODIFIERS.HONOR_EVENTS, set()), set([ACTION_EVENT.NOBLE]))
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 @mock.patch('the_tale.game.balance.constants.EXP_FOR_KILL_PROBABILITY', 1.01)
 @mock.patch('the_tale.game.balance.constants.PEACEFULL_BATTLE_PROBABILITY', 1.01)
 class PeacefulnessHabitModifiersTest(BaseHabitTest):
@@ -535,3 +539,32 @@ class PeacefulnessHabitModifiersTest(BaseHabitTest):
         self.check_quest_markers_reward_bonus([QUEST_OPTION_MARKERS.UNAGGRESSIVE], habit_class=habits.Peacefulness)
 
         self.assertEqual(self.hero.modify_attribute(MODIFIERS.HONOR_EVENTS, set()), set([ACTION_EVENT.PEACEABLE]))
+
+
+class AffectedModifiersTest(BaseHabitTest):
+
+    def check_affected_modifiers(self, habit):
+        for right_border in c.HABITS_RIGHT_BORDERS:
+            habit.set_habit(right_border - 1)
+            del habit.interval
+
+            for modifier in MODIFIERS.records:
+                if modifier not in habit.AFFECTED_MODIFIERS:
+                    self.assertFalse(modifiers_cache._is_changed(habit, modifier))
+
+    def test_honor(self):
+        self.check_affected_modifiers(self.hero.habit_honor)
+
+    def test_peacefulness(self):
+        self.check_affected_modifiers(self.hero.habit_peacefulness)
+
+    def test_change__without_probing(self):
+        self.hero.attribute_modifier(MODIFIERS.POWER_TO_FRIEND)
+
+        modifiers_cache.pop_counters()
+
+        self.hero.habit_honor.change(c.HABITS_BORDER)
+        self.hero.habit_peacefulness.change(c.HABITS_BORDER)
+
+        self.assertFalse('modifiers_cache.probes' in modifiers_cache.pop_counters())
+        self.assertFalse(MODIFIERS.POWER_TO_FRIEND in self.hero.get_modifiers_cache().values)
@@ -39,6 +39,7 @@ class _HeroEquipmentTestsBase(TestCase):
         self.hero.save()
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class HeroEquipmentTests(_HeroEquipmentTestsBase):
 
     def test_put_loot(self):
@@ -620,6 +621,7 @@ class ReceiveArtifactsChoicesTests(_HeroEquipmentTestsBase):
 
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class ReceiveArtifactsTests(_HeroEquipmentTestsBase):
 
     def setUp(self):
@@ -193,6 +193,7 @@ class HeroLogicAccessorsTest(HeroLogicAccessorsTestBase):
             self.assertEqual(self.hero.companion_damage_probability, 2)
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class PoliticalPowerTests(HeroLogicAccessorsTestBase):
 
     def test_power_modifier__risk_level(self):
@@ -303,3 +304,67 @@ class PoliticalPowerTests(HeroLogicAccessorsTestBase):
 
         with self.check_increased(self.hero.politics_power_multiplier):
             self.hero.abilities.add(nonbattle_abilities.DIPLOMATIC.get_id(), level=len(nonbattle_abilities.DIPLOMATIC.POWER_MULTIPLIER))
+
+
+class ModifiersCacheTests(HeroLogicAccessorsTestBase):
+
+    def setUp(self):
+        super(ModifiersCacheTests, self).setUp()
+
+        # make sources probed, so only really affected modifiers are invalidated
+        for source in ('abilities', 'habit_honor', 'habit_peacefulness', 'equipment', 'companion'):
+            self.hero.reset_accessors_cache(source=source)
+
+    def check_refreshed(self, modifier, change):
+        old_value = self.hero.attribute_modifier(modifier)
+
+        with self.check_delta(lambda: self.hero.get_modifiers_cache().hits, 1):
+            self.assertEqual(self.hero.attribute_modifier(modifier), old_value)
+
+        change()
+
+        new_value = self.hero.attribute_modifier(modifier)
+
+        self.assertNotEqual(old_value, new_value)
+        self.assertEqual(new_value, self.hero.modify_attribute(modifier, modifier.default()))
+
+    def test_cache_enabled(self):
+        self.assertTrue(heroes_settings.MODIFIERS_CACHE_ENABLED)
+
+    @mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
+    def test_cache_disabled(self):
+        self.hero.attribute_modifier(relations.MODIFIERS.POWER)
+
+        with self.check_delta(lambda: self.hero.get_modifiers_cache().misses, 1):
+            with self.check_not_changed(lambda: self.hero.get_modifiers_cache().hits):
+                self.hero.attribute_modifier(relations.MODIFIERS.POWER)
+
+    def test_equipment(self):
+        artifact = artifacts_storage.generate_artifact_from_list(artifacts_storage.artifacts, self.hero.level, rarity=artifacts_relations.RARITY.NORMAL)
+
+        def change():
+            artifact.record.special_effect = artifacts_relations.ARTIFACT_EFFECT.GREAT_POWER
+            self.hero.bag.put_artifact(artifact)
+            slot = artifact.type.equipment_slot
+            self.hero.change_equipment(slot, self.hero.equipment.get(slot), artifact)
+
+        self.check_refreshed(relations.MODIFIERS.POWER, change)
+
+    def test_habit_honor(self):
+        self.check_refreshed(relations.MODIFIERS.POWER_TO_FRIEND, lambda: self.hero.habit_honor.change(c.HABITS_BORDER))
+
+    def test_habit_peacefulness(self):
+        self.check_refreshed(relations.MODIFIERS.LOOT_PROBABILITY, lambda: self.hero.habit_peacefulness.change(c.HABITS_BORDER))
+
+    def test_abilities(self):
+        self.check_refreshed(relations.MODIFIERS.POWER,
+                             lambda: self.hero.abilities.add(nonbattle_abilities.DIPLOMATIC.get_id(), level=len(nonbattle_abilities.DIPLOMATIC.POWER_MULTIPLIER)))
+
+    def test_companion(self):
+        companion_record = companions_logic.create_random_companion_record(name='test-companion',
+                                                                           state=companions_relations.STATE.ENABLED,
+                                                                           abilities=companions_abilities_container.Container(start=(companions_effects.ABILITIES.KNOWN,)))
+
+        self.check_refreshed(relations.MODIFIERS.POWER, lambda: self.hero.set_companion(companions_logic.create_companion(companion_record)))
+
+        self.check_refreshed(relations.MODIFIERS.POWER, self.hero.remove_companion)
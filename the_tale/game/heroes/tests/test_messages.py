@@ -2,7 +2,10 @@
 import time
 import collections
 
+import mock
+
 from the_tale.common.utils import testcase
+from the_tale.common.utils import codec
 
 from the_tale.game.prototypes import TimePrototype
 
@@ -85,3 +88,118 @@ class MessagesContainerTest(testcase.TestCase):
         self.messages.push_message(self.create_message(u'1'))
         self.messages.push_message(self.create_message(u'2', time_delta=-10))
         self.assertEqual([msg.message for msg in self.messages.messages], ['2', '1'])
+
+    def test_serialize__compact_rows(self):
+        self.messages.push_message(self.create_message('1', position=u''))
+        self.messages.push_message(self.create_message('2'))
+
+        rows = self.messages.serialize()['messages']
+
+        self.assertEqual(len(rows[0]), 3)
+        self.assertEqual(len(rows[1]), 4)
+
+    def test_deserialize__rows_not_decoded(self):
+        self.messages.push_message(self.create_message('1'))
+
+        with mock.patch('the_tale.game.heroes.messages.MessageSurrogate.deserialize') as deserialize:
+            container = messages.JournalContainer.deserialize(None, self.messages.serialize())
+            container.push_message(self.create_message('2', position=u''))
+            data = container.serialize()
+            ui_info = container.ui_info()
+
+        self.assertEqual(deserialize.call_count, 0)
+
+        self.assertEqual([row[2] for row in data['messages']], ['1', '2'])
+        self.assertEqual([msg[2] for msg in ui_info], ['1', '2'])
+
+    def test_deserialize__old_format(self):
+        message = self.create_message('1', position=u'')
+        container = messages.JournalContainer.deserialize(None, {'messages': [[message.turn_number, message.timestamp, u'1', u'']]})
+
+        self.assertEqual(container.ui_info(with_info=True), [message.ui_info(with_info=True)])
+
+    def test_push_message__sort_with_rows(self):
+        self.messages.push_message(self.create_message(u'1'))
+
+        container = messages.JournalContainer.deserialize(None, self.messages.serialize())
+        container.push_message(self.create_message(u'2', time_delta=-10))
+
+        self.assertEqual([msg[2] for msg in container.ui_info()], ['2', '1'])
+
+    def test_push_message__log_length(self):
+        for i in xrange(messages.JournalContainer.MESSAGES_LOG_LENGTH):
+            self.messages.push_message(self.create_message(unicode(i)))
+
+        container = messages.JournalContainer.deserialize(None, self.messages.serialize())
+        container.push_message(self.create_message(u'last'))
+
+        self.assertEqual(len(container), messages.JournalContainer.MESSAGES_LOG_LENGTH)
+        self.assertEqual(container.ui_info()[0][2], u'1')
+        self.assertEqual(container.ui_info()[-1][2], u'last')
+
+    def test_deserialize_from_json__not_decoded(self):
+        self.messages.push_message(self.create_message(u'1'))
+
+        raw = self.messages.serialize_to_json()
+
+        with mock.patch('the_tale.common.utils.codec.from_json') as from_json:
+            container = messages.JournalContainer.deserialize_from_json(None, raw)
+            container.push_message(self.create_message(u'2', position=u''))
+            new_raw = container.serialize_to_json()
+
+        self.assertEqual(from_json.call_count, 0)
+
+        self.assertTrue(container.updated)
+        self.assertEqual([row[2] for row in codec.from_json(new_raw)['messages']], [u'1', u'2'])
+        self.assertEqual([msg[2] for msg in container.ui_info()], [u'1', u'2'])
+
+    def test_deserialize_from_json__empty(self):
+        container = messages.JournalContainer.deserialize_from_json(None, self.messages.serialize_to_json())
+        container.push_message(self.create_message(u'1'))
+
+        self.assertEqual([row[2] for row in codec.from_json(container.serialize_to_json())['messages']], [u'1'])
+
+    def test_deserialize_from_json__decoded_on_read(self):
+        self.messages.push_message(self.create_message(u'1'))
+        self.messages.push_message(self.create_message(u'2', turn_delta=2))
+
+        container = messages.JournalContainer.deserialize_from_json(None, self.messages.serialize_to_json())
+        container.push_message(self.create_message(u'3'))
+
+        self.assertEqual([messages._text(msg) for msg in container.messages], [u'1', u'3', u'2'])
+        self.assertEqual(container, messages.JournalContainer.deserialize(None, codec.from_json(container.serialize_to_json())))
+
+    def test_deserialize_from_json__unknown_format(self):
+        self.messages.push_message(self.create_message(u'1'))
+
+        container = messages.JournalContainer.deserialize_from_json(None, codec.to_json({'messages': self.messages.serialize()['messages'], 'x': 1}))
+        container.push_message(self.create_message(u'2'))
+
+        self.assertEqual([row[2] for row in codec.from_json(container.serialize_to_json())['messages']], [u'1', u'2'])
+
+    def test_deserialize_from_json__log_length(self):
+        for i in xrange(messages.JournalContainer.MESSAGES_LOG_LENGTH):
+            self.messages.push_message(self.create_message(unicode(i)))
+
+        container = messages.JournalContainer.deserialize_from_json(None, self.messages.serialize_to_json())
+
+        for i in xrange(messages.JournalContainer.MESSAGES_LOG_LENGTH * 3):
+            container.push_message(self.create_message(u'new_%d' % i))
+            container = messages.JournalContainer.deserialize_from_json(None, container.serialize_to_json())
+
+            self.assertTrue(len(codec.from_json(container._raw)['messages']) <= messages.JournalContainer.MESSAGES_LOG_LENGTH * 2)
+
+        self.assertEqual(len(container), messages.JournalContainer.MESSAGES_LOG_LENGTH)
+        self.assertEqual(container.ui_info()[-1][2], u'new_%d' % (messages.JournalContainer.MESSAGES_LOG_LENGTH * 3 - 1))
+
+    def test_clear__not_decoded(self):
+        container = messages.JournalContainer.deserialize_from_json(None, self.messages.serialize_to_json())
+        container.clear()
+        self.assertFalse(container.updated)
+
+        self.messages.push_message(self.create_message(u'1'))
+
+        container = messages.JournalContainer.deserialize_from_json(None, self.messages.serialize_to_json())
+        container.clear()
+        self.assertTrue(container.updated)
+        self.assertEqual(len(container), 0)
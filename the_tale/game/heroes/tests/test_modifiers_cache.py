@@ -0,0 +1,225 @@
+# coding: utf-8
+
+from rels import Column
+from rels.django import DjangoEnum
+
+from the_tale.common.utils import testcase
+
+from the_tale.game.heroes import modifiers_cache
+
+
+class FAKE_MODIFIERS(DjangoEnum):
+    default = Column(unique=False, single_type=False)
+
+    records = ( ('SPEED', 0, u'скорость', lambda: 1.0),
+                ('POWER', 1, u'влияние', lambda: 0.0),
+                ('FLAG', 2, u'флаг', lambda: False),
+                ('MARKERS', 3, u'маркеры', lambda: set()),
+                ('DEPENDENT', 4, u'зависимый', lambda: 1.0) )
+
+
+class FakeSource(object):
+
+    def __init__(self, owner=None, **modifiers):
+        self.owner = owner
+        self.modifiers = modifiers
+
+    def modify_attribute(self, modifier, value):
+        if modifier.is_DEPENDENT and 'dependent' in self.modifiers:
+            # value depends from other modifier
+            return value * self.owner.get(FAKE_MODIFIERS.SPEED)
+
+        if modifier.is_SPEED and 'speed' in self.modifiers:
+            return value * self.modifiers['speed']
+
+        if modifier.is_POWER and 'power' in self.modifiers:
+            return value * self.modifiers['power']
+
+        if modifier.is_FLAG and 'flag' in self.modifiers:
+            return self.modifiers['flag']
+
+        if modifier.is_MARKERS and 'markers' in self.modifiers:
+            value.update(self.modifiers['markers'])
+
+        return value
+
+
+class FakeDeclaredSource(FakeSource):
+    AFFECTED_MODIFIERS = frozenset((FAKE_MODIFIERS.POWER,))
+
+
+class ModifiersCacheTests(testcase.TestCase):
+
+    def setUp(self):
+        super(ModifiersCacheTests, self).setUp()
+
+        self.sources = {'source_1': FakeSource(speed=2.0),
+                        'source_2': FakeSource(markers=set([1]))}
+
+        self.cache = modifiers_cache.ModifiersCache(modifiers=frozenset(FAKE_MODIFIERS.records),
+                                                    compute=self.compute,
+                                                    get_source=self.sources.get)
+
+        self.compute_calls = []
+
+    def compute(self, modifier):
+        self.compute_calls.append(modifier)
+
+        value = modifier.default()
+
+        for source_key in sorted(self.sources):
+            source = self.sources[source_key]
+            if source is not None:
+                value = source.modify_attribute(modifier, value)
+
+        return value
+
+    def fill_cache(self):
+        for modifier in FAKE_MODIFIERS.records:
+            self.cache.get(modifier)
+
+        self.cache.invalidate('source_1')
+        self.cache.invalidate('source_2')
+
+        for modifier in FAKE_MODIFIERS.records:
+            self.cache.get(modifier)
+
+        self.compute_calls = []
+
+    def test_get(self):
+        self.assertEqual(self.cache.get(FAKE_MODIFIERS.SPEED), 2.0)
+        self.assertEqual(self.cache.get(FAKE_MODIFIERS.SPEED), 2.0)
+
+        self.assertEqual(self.compute_calls, [FAKE_MODIFIERS.SPEED])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_get__without_cache(self):
+        self.cache.get(FAKE_MODIFIERS.SPEED)
+        self.cache.get(FAKE_MODIFIERS.SPEED, use_cache=False)
+
+        self.assertEqual(self.compute_calls, [FAKE_MODIFIERS.SPEED, FAKE_MODIFIERS.SPEED])
+
+    def test_counters(self):
+        modifiers_cache.pop_counters()
+
+        self.cache.get(FAKE_MODIFIERS.SPEED)
+        self.cache.get(FAKE_MODIFIERS.SPEED)
+
+        self.assertEqual(modifiers_cache.pop_counters(), {'modifiers_cache.hits': 1, 'modifiers_cache.misses': 1})
+        self.assertEqual(modifiers_cache.pop_counters(), {})
+
+    def test_clear(self):
+        self.cache.get(FAKE_MODIFIERS.SPEED)
+        self.cache.clear()
+        self.assertEqual(self.cache.values, {})
+
+    def test_probe(self):
+        self.assertEqual(self.cache.probe('source_1'), frozenset([FAKE_MODIFIERS.SPEED]))
+        self.assertEqual(self.cache.probe('source_2'), frozenset([FAKE_MODIFIERS.MARKERS]))
+        self.assertEqual(self.cache.probe('unknown_source'), frozenset())
+
+    def test_probe__multiplier_of_zero_default(self):
+        self.sources['source_1'] = FakeSource(power=3.0)
+        self.assertEqual(self.cache.probe('source_1'), frozenset([FAKE_MODIFIERS.POWER]))
+
+    def test_probe__flag(self):
+        self.sources['source_1'] = FakeSource(flag=True)
+        self.assertEqual(self.cache.probe('source_1'), frozenset([FAKE_MODIFIERS.FLAG]))
+
+    def test_invalidate__not_probed_source(self):
+        self.cache.get(FAKE_MODIFIERS.SPEED)
+        self.cache.get(FAKE_MODIFIERS.MARKERS)
+
+        self.cache.invalidate('source_2')
+
+        self.assertEqual(self.cache.values, {})
+
+    def test_invalidate__only_affected_modifiers(self):
+        self.fill_cache()
+
+        self.sources['source_2'].modifiers['markers'] = set([2])
+
+        self.cache.invalidate('source_2')
+
+        self.assertEqual(set(self.cache.values.keys()), set(FAKE_MODIFIERS.records) - set([FAKE_MODIFIERS.MARKERS]))
+        self.assertEqual(self.cache.get(FAKE_MODIFIERS.MARKERS), set([2]))
+
+    def test_invalidate__new_modifier(self):
+        self.fill_cache()
+
+        self.sources['source_2'].modifiers['flag'] = True
+
+        self.cache.invalidate('source_2')
+
+        self.assertEqual(set(self.cache.values.keys()), set(FAKE_MODIFIERS.records) - set([FAKE_MODIFIERS.FLAG, FAKE_MODIFIERS.MARKERS]))
+
+        self.assertEqual(self.cache.get(FAKE_MODIFIERS.FLAG), True)
+        self.assertEqual(self.cache.get(FAKE_MODIFIERS.SPEED), 2.0)
+        self.assertEqual(self.compute_calls, [FAKE_MODIFIERS.FLAG])
+
+    def test_invalidate__removed_modifier(self):
+        self.fill_cache()
+
+        del self.sources['source_1'].modifiers['speed']
+
+        self.cache.invalidate('source_1')
+
+        self.assertEqual(self.cache.get(FAKE_MODIFIERS.SPEED), 1.0)
+
+    def test_invalidate__removed_source(self):
+        self.fill_cache()
+
+        self.sources['source_1'] = None
+
+        self.cache.invalidate('source_1')
+
+        self.assertEqual(self.cache.get(FAKE_MODIFIERS.SPEED), 1.0)
+        self.assertEqual(self.cache.probe('source_1'), frozenset())
+
+    def test_invalidate__dependent_modifiers(self):
+        self.sources['source_3'] = FakeSource(owner=self.cache, dependent=True)
+
+        self.fill_cache()
+        self.cache.invalidate('source_3')
+
+        self.assertEqual(self.cache.get(FAKE_MODIFIERS.DEPENDENT), 2.0)
+
+        self.sources['source_1'].modifiers['speed'] = 3.0
+
+        self.cache.invalidate('source_1')
+
+        self.assertEqual(self.cache.get(FAKE_MODIFIERS.DEPENDENT), 3.0)
+
+    def test_equal_to_not_cached_values(self):
+        self.sources['source_3'] = FakeSource(owner=self.cache, dependent=True)
+
+        self.fill_cache()
+
+        changes = [('source_1', 'speed', 5.0),
+                   ('source_2', 'flag', True),
+                   ('source_3', 'power', 2.0),
+                   ('source_1', 'power', 0.5),
+                   ('source_2', 'markers', set([3, 4])),
+                   ('source_1', 'speed', 1.0)]
+
+        for source_key, modifier_name, value in changes:
+            self.sources[source_key].modifiers[modifier_name] = value
+            self.cache.invalidate(source_key)
+
+            for modifier in FAKE_MODIFIERS.records:
+                self.assertEqual(self.cache.get(modifier), self.compute(modifier))
+
+    def test_invalidate__declared_modifiers(self):
+        self.sources['source_3'] = FakeDeclaredSource(power=2.0)
+
+        self.fill_cache()
+
+        modifiers_cache.pop_counters()
+
+        self.sources['source_3'].modifiers['power'] = 3.0
+
+        self.cache.invalidate('source_3')
+
+        self.assertFalse('modifiers_cache.probes' in modifiers_cache.pop_counters())
+        self.assertEqual(set(self.cache.values.keys()), set(FAKE_MODIFIERS.records) - set([FAKE_MODIFIERS.POWER]))
+        self.assertEqual(self.cache.get(FAKE_MODIFIERS.POWER), self.compute(FAKE_MODIFIERS.POWER))
@@ -502,6 +502,47 @@ class HeroPreferencesPlaceTest(PreferencesTestMixin, TestCase):
         self.assertEqual(HeroPreferences.count_habit_values(self.place, all=True), ((10, -1), (1, -10)))
         self.assertEqual(HeroPreferences.count_habit_values(self.place_2, all=True), ((0, -4), (4, 0)))
 
+    def test_count_places_statistics(self):
+        hero_1 = self.hero
+        hero_1.preferences.set_place(self.place)
+        hero_1.premium_state_end_at = datetime.datetime.now() + datetime.timedelta(seconds=60)
+        hero_1.habit_honor.change(-1)
+        hero_1.habit_peacefulness.change(1)
+        hero_1.save()
+
+        result, account_id, bundle_id = register_user('test_user_2', 'test_user_2@test.com', '111111')
+        hero_2 = HeroPrototype.get_by_account_id(account_id)
+        hero_2.preferences.set_place(self.place)
+        hero_2.habit_honor.change(2)
+        hero_2.habit_peacefulness.change(-2)
+        hero_2.save()
+
+        result, account_id, bundle_id = register_user('test_user_3', 'test_user_3@test.com', '111111')
+        hero_3 = HeroPrototype.get_by_account_id(account_id)
+        hero_3.preferences.set_place(self.place_2)
+        hero_3.preferences.set_friend(self.place.persons[0])
+        hero_3.premium_state_end_at = datetime.datetime.now() + datetime.timedelta(seconds=30)
+        hero_3.habit_honor.change(-4)
+        hero_3.habit_peacefulness.change(4)
+        hero_3.save()
+
+        result, account_id, bundle_id = register_user('test_user_4', 'test_user_4@test.com', '111111')
+        hero_4 = HeroPrototype.get_by_account_id(account_id)
+        hero_4.preferences.set_place(self.place_2)
+        hero_4.habit_honor.change(8)
+        hero_4.habit_peacefulness.change(-8)
+        hero_4.save()
+
+        places = [self.place, self.place_2, self.place_3]
+
+        for depends_from_all_heroes in (True, False):
+            with mock.patch('the_tale.game.map.places.prototypes.PlacePrototype.depends_from_all_heroes', depends_from_all_heroes):
+                statistics = HeroPreferences.count_places_statistics(places)
+
+                for place in places:
+                    self.assertEqual(statistics[place.id], (HeroPreferences.count_citizens_of(place, all=depends_from_all_heroes),
+                                                            HeroPreferences.count_habit_values(place, all=depends_from_all_heroes)))
+
 
 
 class HeroPreferencesFriendTest(PreferencesTestMixin, TestCase):
@@ -1099,6 +1140,7 @@ class HeroPreferencesEquipmentSlotTest(PreferencesTestMixin, TestCase):
         self.check_change_equipment_slot(None, self.slot_1, CHOOSE_PREFERENCES_TASK_STATE.COOLDOWN)
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class HeroPreferencesFavoriteItemTest(PreferencesTestMixin, TestCase):
     PREFERENCE_TYPE = relations.PREFERENCE_TYPE.FAVORITE_ITEM
 
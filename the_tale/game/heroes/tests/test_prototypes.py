@@ -79,6 +79,55 @@ class HeroTest(testcase.TestCase):
         self.assertEqual(HeroPreferencesPrototype.get_by_hero_id(self.hero.id).energy_regeneration_type, self.hero.preferences.energy_regeneration_type)
         self.assertEqual(HeroPreferencesPrototype.get_by_hero_id(self.hero.id).risk_level, self.hero.preferences.risk_level)
 
+    def test_changed_fields(self):
+        self.hero.save()
+
+        self.assertEqual(self.hero.changed_fields(), [])
+
+        self.hero.health = 1
+        self.hero._model.level += 1
+
+        self.assertEqual(set(self.hero.changed_fields()), set(['health', 'level']))
+
+    def test_save__only_changed_fields(self):
+        self.hero.save()
+
+        self.hero.health = 1
+
+        with mock.patch('django.db.models.query.QuerySet.update') as update:
+            self.hero.save()
+
+        updated_fields = set(update.call_args[1].keys())
+
+        self.assertIn('health', updated_fields)
+        self.assertIn('saved_at', updated_fields)
+        self.assertNotIn('data', updated_fields)
+        self.assertNotIn('messages', updated_fields)
+        self.assertNotIn('actions', updated_fields)
+
+        self.assertEqual(self.hero.changed_fields(), [])
+
+    def test_save__changed_fields_saved(self):
+        self.hero.save()
+
+        self.hero.health = 1
+        self.hero._model.experience = 13
+
+        self.hero.save()
+
+        hero = HeroPrototype.get_by_id(self.hero.id)
+
+        self.assertEqual(hero.health, 1)
+        self.assertEqual(hero.experience, 13)
+
+    def test_save__data_not_encoded_if_not_changed(self):
+        self.hero.save()
+
+        with mock.patch('dext.common.utils.s11n.to_json') as to_json:
+            self.hero.save()
+
+        self.assertEqual(to_json.call_count, 0)
+
     def test_helps_number_restriction(self):
         self.assertEqual(self.hero.last_help_on_turn, 0)
         self.assertEqual(self.hero.helps_in_turn, 0)
@@ -510,6 +559,20 @@ class HeroTest(testcase.TestCase):
                 continue
             self.hero.get_achievement_type_value(achievement_type)
 
+    def test_get_achievement_type_values(self):
+        self.hero.statistics.change_pve_kills(7)
+        self.hero._model.stat_pvp_battles_1x1_number = heroes_settings.MIN_PVP_BATTLES + 1
+        self.hero._model.stat_pvp_battles_1x1_victories = 1
+        self.hero.save()
+
+        for achievement_type in ACHIEVEMENT_TYPE.records:
+            if not achievement_type.source.is_GAME_OBJECT:
+                continue
+
+            chunks = list(HeroPrototype.get_achievement_type_values(achievement_type, chunk_size=100))
+
+            self.assertEqual(dict(chunks[0])[self.hero.account_id], self.hero.get_achievement_type_value(achievement_type))
+
     def test_update_habits__premium(self):
         self.assertEqual(self.hero.habit_honor.raw_value, 0)
         self.assertFalse(self.hero.is_premium)
@@ -935,6 +998,7 @@ class HeroLevelUpTests(testcase.TestCase):
             self.assertEqual(len(abilities), c.ABILITIES_OLD_ABILITIES_FOR_CHOOSE_MAXIMUM)
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class HeroQuestsTest(testcase.TestCase):
 
     def setUp(self):
@@ -1297,6 +1361,50 @@ class HeroUiInfoTest(testcase.TestCase):
 
         self.assertEqual(set(new_info['changed_fields']), set(('changed_fields', 'actual_on_turn', 'patch_turn')))
 
+    def test_ui_info__sections_reused(self):
+        old_info = self.hero.ui_info(actual_guaranteed=True, old_info=None)
+
+        with mock.patch('the_tale.game.heroes.bag.Bag.ui_info') as bag_ui_info:
+            with mock.patch('the_tale.game.quests.container.QuestsContainer.ui_info') as quests_ui_info:
+                new_info = self.hero.ui_info(actual_guaranteed=True, old_info=old_info)
+
+        self.assertEqual(bag_ui_info.call_count, 0)
+        self.assertEqual(quests_ui_info.call_count, 0)
+
+        self.assertTrue(new_info['bag'] is old_info['bag'])
+        self.assertTrue(new_info['quests'] is old_info['quests'])
+
+    def test_ui_info__section_rebuilt_after_update(self):
+        old_info = self.hero.ui_info(actual_guaranteed=True, old_info=None)
+
+        self.hero.messages.push_message(messages.MessageSurrogate(turn_number=TimePrototype.get_current_turn_number(),
+                                                                  timestamp=time.time(),
+                                                                  key=None,
+                                                                  externals=None,
+                                                                  message=u'message'))
+
+        new_info = self.hero.ui_info(actual_guaranteed=True, old_info=old_info)
+
+        self.assertNotEqual(new_info['messages'], old_info['messages'])
+        self.assertIn('messages', new_info['changed_fields'])
+        self.assertNotIn('bag', new_info['changed_fields'])
+
+    def test_ui_info__future_messages(self):
+        self.hero.messages.push_message(messages.MessageSurrogate(turn_number=TimePrototype.get_current_turn_number()+1,
+                                                                  timestamp=time.time(),
+                                                                  key=None,
+                                                                  externals=None,
+                                                                  message=u'message'))
+
+        old_info = self.hero.ui_info(actual_guaranteed=True, old_info=None)
+
+        TimePrototype.get_current_time().increment_turn()
+
+        new_info = self.hero.ui_info(actual_guaranteed=True, old_info=old_info)
+
+        self.assertEqual(len(new_info['messages']), len(old_info['messages']) + 1)
+        self.assertIn('messages', new_info['changed_fields'])
+
     def test_ui_info__actual_guaranteed(self):
         self.assertEqual(self.hero.saved_at_turn, 0)
 
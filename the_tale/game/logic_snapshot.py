@@ -0,0 +1,146 @@
+# coding: utf-8
+import os
+import stat
+import datetime
+import tempfile
+
+from django.db import DEFAULT_DB_ALIAS
+
+from the_tale.common.utils import codec
+
+from the_tale.game.heroes.models import Hero
+
+
+FORMAT_VERSION = 2
+
+
+def model_to_dict(model):
+    # {field attname: database value}, dates are stored as iso strings
+    data = {}
+
+    for field in model._meta.concrete_fields:
+        value = field.get_prep_value(field.value_from_object(model))
+
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            value = value.isoformat()
+
+        data[field.attname] = value
+
+    return data
+
+
+def model_from_dict(model_class, data):
+    # returns None, if data does not contain all fields of model
+    fields = model_class._meta.concrete_fields
+
+    if any(field.attname not in data for field in fields):
+        return None
+
+    return model_class.from_db(DEFAULT_DB_ALIAS,
+                               [field.attname for field in fields],
+                               [field.to_python(data[field.attname]) for field in fields])
+
+
+def is_trusted_file(filename):
+    # snapshot must be regular file of current user, which can not be changed by other users
+    file_stat = os.lstat(filename)
+
+    return (stat.S_ISREG(file_stat.st_mode) and
+            file_stat.st_uid == os.getuid() and
+            not file_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH))
+
+
+class LogicSnapshot(object):
+    # snapshot of heroes models of logic worker, written on worker stop
+    # on next start heroes, which were not changed after snapshot had been written, are loaded from it instead of database
+
+    __slots__ = ('worker_id', 'turn_number', 'heroes_models')
+
+    def __init__(self, worker_id, turn_number, heroes_models):
+        self.worker_id = worker_id
+        self.turn_number = turn_number
+        self.heroes_models = heroes_models # {account_id: hero model}
+
+    @classmethod
+    def create(cls, worker_id, turn_number, heroes):
+        # heroes must be saved before snapshot creation
+        return cls(worker_id=worker_id,
+                   turn_number=turn_number,
+                   heroes_models={hero.account_id: hero._model for hero in heroes})
+
+    def save(self, filename):
+        data = {'format_version': FORMAT_VERSION,
+                'worker_id': self.worker_id,
+                'turn_number': self.turn_number,
+                'heroes': [model_to_dict(model) for model in self.heroes_models.itervalues()]}
+
+        dirname = os.path.dirname(filename)
+
+        if not os.path.exists(dirname):
+            os.makedirs(dirname, 0700)
+
+        # temporary file is created with unique name and 0600 permissions in the same directory, so rename is atomic
+        descriptor, tmp_filename = tempfile.mkstemp(dir=dirname, prefix='%s.' % os.path.basename(filename), suffix='.tmp')
+
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                f.write(codec.pack(data))
+            os.rename(tmp_filename, filename)
+        except:
+            os.remove(tmp_filename)
+            raise
+
+    @classmethod
+    def load(cls, filename, worker_id, turn_number):
+        # returns None if there is no suitable snapshot
+        # snapshot is removed after loading, since it must be used only once
+        # snapshot is plain data (packed json), so loading of broken or foreign file can not execute code
+
+        if not os.path.lexists(filename):
+            return None
+
+        if not is_trusted_file(filename):
+            return None
+
+        try:
+            with open(filename, 'rb') as f:
+                data = codec.unpack(f.read())
+        except Exception: # pylint: disable=W0703
+            data = None
+
+        os.remove(filename)
+
+        if (not isinstance(data, dict) or
+            data.get('format_version') != FORMAT_VERSION or
+            data['worker_id'] != worker_id or
+            data['turn_number'] != turn_number):
+            return None
+
+        heroes_models = {}
+
+        for hero_data in data['heroes']:
+            model = model_from_dict(Hero, hero_data)
+
+            if model is None:
+                return None
+
+            heroes_models[model.account_id] = model
+
+        return cls(worker_id=worker_id,
+                   turn_number=turn_number,
+                   heroes_models=heroes_models)
+
+    def pop_actual_heroes_models(self, accounts_ids):
+        # returns {account_id: hero model} for heroes, which have not been saved to database after snapshot creation
+        candidates = {account_id: self.heroes_models.pop(account_id)
+                      for account_id in accounts_ids
+                      if account_id in self.heroes_models}
+
+        if not candidates:
+            return {}
+
+        saved_at = dict(Hero.objects.filter(account_id__in=candidates.keys()).values_list('account_id', 'saved_at'))
+
+        return {account_id: model
+                for account_id, model in candidates.iteritems()
+                if saved_at.get(account_id) == model.saved_at}
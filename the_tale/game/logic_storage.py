@@ -3,17 +3,52 @@ import sys
 import time
 import datetime
 import contextlib
+import multiprocessing
 
 from dext.common.utils import cache
 
+from the_tale.common.utils import bulk
+from the_tale.common.utils import workers
+
+from the_tale.accounts.achievements.storage import achievements_storage
+
+from the_tale.game.heroes.models import Hero
 from the_tale.game.heroes.prototypes import HeroPrototype
 from the_tale.game.heroes.conf import heroes_settings
+from the_tale.game.heroes import modifiers_cache
 
 from the_tale.game import exceptions
 from the_tale.game import conf
+from the_tale.game import profiling
+from the_tale.game import logic_snapshot
 from the_tale.game.prototypes import TimePrototype
 
 
+# (storage, bundles, process_turn__bundle arguments) of current turn, inherited by forked processes
+_FORKED_TURN = None
+
+# connections of parent process, which must not be closed in forked process
+_DETACHED_CONNECTIONS = []
+
+
+def _initialize_forked_process():
+    # closing of inherited connection terminates it on server side for parent process too,
+    # so connections are only forgotten (and kept from garbage collection) and new ones are opened on demand
+    from django.db import connections
+
+    for connection in connections.all():
+        _DETACHED_CONNECTIONS.append(connection.connection)
+        connection.connection = None
+
+    # counters of parent process
+    modifiers_cache.pop_counters()
+
+
+def _process_forked_bundles(bundles_ids):
+    storage, bundles, arguments = _FORKED_TURN
+    return storage._process_isolated_bundles(bundles={bundle_id: bundles[bundle_id] for bundle_id in bundles_ids}, **arguments)
+
+
 class LogicStorage(object):
 
     def __init__(self=None):
@@ -25,21 +60,69 @@ class LogicStorage(object):
         self.bundles_to_accounts = {}
         self.ignored_bundles = set()
 
+        self.bundles_processing_time = {}
+
+        self.profiler = profiling.TurnProfiler(history_length=conf.game_settings.TURN_PROFILER_HISTORY_LENGTH)
+
         self.previous_cache = {}
         self.current_cache = {}
         self.cache_queue = set()
 
+        self.snapshot = None
+
     def load_account_data(self, account):
-        hero = HeroPrototype.get_by_account_id(account.id)
-        hero.update_with_account_data(is_fast=account.is_fast,
-                                      premium_end_at=account.premium_end_at,
-                                      active_end_at=account.active_end_at,
-                                      ban_end_at=account.ban_game_end_at,
-                                      might=account.might,
-                                      actual_bills=account.actual_bills)
-        self._add_hero(hero)
+        return self.load_accounts_data([account])[0]
+
+    def _load_heroes(self, accounts_ids):
+        heroes = {}
 
-        return hero
+        if self.snapshot is not None:
+            heroes.update((account_id, HeroPrototype(model=model))
+                          for account_id, model in self.snapshot.pop_actual_heroes_models(accounts_ids).iteritems())
+
+        not_loaded_accounts_ids = [account_id for account_id in accounts_ids if account_id not in heroes]
+
+        # heroes of all accounts are loaded with single query
+        if not_loaded_accounts_ids:
+            heroes.update((hero.account_id, hero) for hero in HeroPrototype.get_list_by_account_id(not_loaded_accounts_ids))
+
+        return heroes
+
+    def _load_meta_actions(self, heroes):
+        from the_tale.game.actions.models import MetaAction
+        from the_tale.game.actions.meta_actions import get_meta_action_by_model
+
+        meta_actions_ids = set(action.meta_action_id
+                               for hero in heroes
+                               for action in hero.actions.actions_list
+                               if action.meta_action_id is not None and action.meta_action_id not in self.meta_actions)
+
+        if not meta_actions_ids:
+            return
+
+        for meta_action_model in MetaAction.objects.filter(id__in=meta_actions_ids):
+            self.add_meta_action(get_meta_action_by_model(meta_action_model))
+
+    def load_accounts_data(self, accounts):
+        heroes = self._load_heroes([account.id for account in accounts])
+
+        self._load_meta_actions(heroes.itervalues())
+
+        loaded_heroes = []
+
+        for account in accounts:
+            hero = heroes[account.id]
+            hero.update_with_account_data(is_fast=account.is_fast,
+                                          premium_end_at=account.premium_end_at,
+                                          active_end_at=account.active_end_at,
+                                          ban_end_at=account.ban_game_end_at,
+                                          might=account.might,
+                                          actual_bills=account.actual_bills)
+            self._add_hero(hero)
+
+            loaded_heroes.append(hero)
+
+        return loaded_heroes
 
     def release_account_data(self, account_id, save_required=True):
         hero = self.accounts_to_heroes[account_id]
@@ -76,6 +159,17 @@ class LogicStorage(object):
     def _save_hero_data(self, hero_id):
         self.heroes[hero_id].save()
 
+    def _save_heroes_data(self, heroes_ids):
+        # sorted order of rows prevents deadlocks between concurrent updates
+        heroes_ids = sorted(heroes_ids)
+
+        if len(heroes_ids) < conf.game_settings.BULK_SAVE_MIN_HEROES or not bulk.is_bulk_update_supported():
+            for hero_id in heroes_ids:
+                self._save_hero_data(hero_id)
+            return
+
+        HeroPrototype.save_many([self.heroes[hero_id] for hero_id in heroes_ids])
+
     def _add_hero(self, hero):
 
         if hero.id in self.heroes:
@@ -194,7 +288,8 @@ class LogicStorage(object):
                                     excluded_bundle_id=bundle_id):
 
             while True:
-                leader_action.process_turn()
+                with self.profiler.measure('action.%s' % leader_action.__class__.__name__):
+                    leader_action.process_turn()
 
                 # process new actions if it has been created or remove already processed actions
                 if (continue_steps_if_needed and
@@ -208,7 +303,8 @@ class LogicStorage(object):
                 break
 
 
-            hero.process_rare_operations()
+            with self.profiler.measure('process_rare_operations'):
+                hero.process_rare_operations()
 
         if leader_action.removed and leader_action.bundle_id != hero.actions.current_action.bundle_id:
             self.unmerge_bundles(account_id=hero.account_id,
@@ -217,17 +313,13 @@ class LogicStorage(object):
             self.skipped_heroes.add(hero.id)
 
 
-    def process_turn(self, logger=None, continue_steps_if_needed=True):
-        self.switch_caches()
-
-        timestamp = time.time()
-
-        turn_number = TimePrototype.get_current_turn_number()
-
-        processed_heroes = 0
+    def _get_bundles_to_process(self, turn_number):
+        bundles = {}
 
         for hero in self.heroes.values():
-            if hero.actions.current_action.bundle_id in self.ignored_bundles:
+            bundle_id = hero.actions.current_action.bundle_id
+
+            if bundle_id in self.ignored_bundles:
                 continue
 
             if hero.id in self.skipped_heroes:
@@ -236,6 +328,24 @@ class LogicStorage(object):
             if not hero.can_process_turn(turn_number):
                 continue
 
+            if bundle_id not in bundles:
+                bundles[bundle_id] = []
+
+            bundles[bundle_id].append(hero)
+
+        return bundles
+
+    # bundle is the unit of isolation: heroes of different bundles never interact during turn,
+    # so bundles can be processed in any order and exception in one of them does not affect others
+    def process_turn__bundle(self, bundle_id, heroes, logger, continue_steps_if_needed, timestamp):
+        started_at = time.time()
+
+        processed_heroes = 0
+
+        for hero in heroes:
+            if bundle_id in self.ignored_bundles:
+                break
+
             self.process_turn__single_hero(hero=hero, logger=logger, continue_steps_if_needed=continue_steps_if_needed)
 
             processed_heroes += 1
@@ -243,11 +353,193 @@ class LogicStorage(object):
             if conf.game_settings.UNLOAD_OBJECTS:
                 hero.unload_serializable_items(timestamp)
 
+        self.bundles_processing_time[bundle_id] = self.bundles_processing_time.get(bundle_id, 0) + time.time() - started_at
+
+        return processed_heroes
+
+    def _is_isolated_bundle(self, heroes):
+        # meta actions are shared between bundles and storage, so bundles with them are processed only in current process
+        return all(action.meta_action_id is None for hero in heroes for action in hero.actions.actions_list)
+
+    def _process_isolated_bundles(self, bundles, logger, continue_steps_if_needed, timestamp):
+        # runs in forked process: bundles are processed in separate storage, so any changes of heroes
+        # (including saving on exception) are limited by them, commands and achievements are collected
+        # result is passed to parent process (see _merge_isolated_bundles)
+        storage = LogicStorage()
+
+        for heroes in bundles.itervalues():
+            for hero in heroes:
+                storage._add_hero(hero)
+
+        storage.profiler.start_turn()
+
+        processed_heroes = 0
+
+        with workers.defer_commands() as commands:
+            with achievements_storage.collect() as achievements:
+                for bundle_id, heroes in bundles.iteritems():
+                    processed_heroes += storage.process_turn__bundle(bundle_id=bundle_id,
+                                                                     heroes=heroes,
+                                                                     logger=logger,
+                                                                     continue_steps_if_needed=continue_steps_if_needed,
+                                                                     timestamp=timestamp)
+
+        heroes_data = []
+
+        for bundle_id, heroes in bundles.iteritems():
+            if bundle_id in storage.ignored_bundles:
+                continue
+
+            for hero in heroes:
+                # heroes are not saved here, so save time must not change
+                saved_at, saved_at_turn = hero._model.saved_at, hero._model.saved_at_turn
+                hero.prepare_to_save()
+                hero._model.saved_at, hero._model.saved_at_turn = saved_at, saved_at_turn
+
+                heroes_data.append({'bundle_id': bundle_id,
+                                    'model': logic_snapshot.model_to_dict(hero._model),
+                                    'force_save_required': hero.force_save_required,
+                                    'last_help_on_turn': hero.last_help_on_turn,
+                                    'helps_in_turn': hero.helps_in_turn})
+
+        return {'heroes': heroes_data,
+                'processed_heroes': processed_heroes,
+                'ignored_bundles': storage.ignored_bundles,
+                'skipped_heroes': storage.skipped_heroes,
+                'bundles_processing_time': storage.bundles_processing_time,
+                'commands': commands,
+                'achievements': achievements,
+                'modifiers_counters': modifiers_cache.pop_counters(),
+                'profiler_histograms': storage.profiler.serialize_current()}
+
+    def _replace_hero(self, bundle_id, data):
+        old_hero = self.heroes[data['model']['id']]
+
+        del self.heroes[old_hero.id]
+        del self.accounts_to_heroes[old_hero.account_id]
+
+        self.bundles_to_accounts[bundle_id].remove(old_hero.account_id)
+        if not self.bundles_to_accounts[bundle_id]:
+            del self.bundles_to_accounts[bundle_id]
+
+        hero = HeroPrototype(model=logic_snapshot.model_from_dict(Hero, data['model']))
+
+        # changes, made in forked process, are not saved yet
+        hero._saved_fields = old_hero._saved_fields
+
+        hero.force_save_required = data['force_save_required']
+        hero.last_help_on_turn = data['last_help_on_turn']
+        hero.helps_in_turn = data['helps_in_turn']
+
+        self._add_hero(hero)
+
+    def _merge_isolated_bundles(self, result):
+        for hero_data in result['heroes']:
+            self._replace_hero(hero_data['bundle_id'], hero_data)
+
+        self.skipped_heroes |= result['skipped_heroes']
+
+        for bundle_id, processing_time in result['bundles_processing_time'].iteritems():
+            self.bundles_processing_time[bundle_id] = self.bundles_processing_time.get(bundle_id, 0) + processing_time
+
+        workers.send_deferred_commands(result['commands'])
+
+        achievements_storage.add_collected(result['achievements'])
+
+        modifiers_cache.COUNTERS.update(result['modifiers_counters'])
+
+        self.profiler.merge_current(result['profiler_histograms'])
+
+        self.ignored_bundles |= result['ignored_bundles']
+
+        return result['processed_heroes']
+
+    def _run_forked(self, bundles_ids_chunks):
+        # processes are forked every turn: long-lived processes would require to pass all heroes to them every turn
+        # and to restore heroes from models there, which is much slower than copy-on-write fork of worker
+        # fork and exit of processes are part of turn latency and measured as forked.start and forked.stop sections
+        with self.profiler.measure('forked.start'):
+            pool = multiprocessing.Pool(len(bundles_ids_chunks), initializer=_initialize_forked_process, maxtasksperchild=1)
+
+        try:
+            with self.profiler.measure('forked.processing'):
+                return pool.map(_process_forked_bundles, bundles_ids_chunks, chunksize=1)
+        finally:
+            with self.profiler.measure('forked.stop'):
+                pool.close()
+                pool.join()
+
+    def process_turn__forked(self, bundles, logger, continue_steps_if_needed, timestamp):
+        # processes isolated bundles in forked processes and removes them from bundles
+        # heroes are sent back to current process as serialized models and replace old ones
+        global _FORKED_TURN
+
+        isolated_bundles_ids = sorted(bundle_id for bundle_id, heroes in bundles.iteritems() if self._is_isolated_bundle(heroes))
+
+        if len(isolated_bundles_ids) < conf.game_settings.LOGIC_TURN_PROCESSES_MIN_BUNDLES:
+            return 0
+
+        processes = min(conf.game_settings.LOGIC_TURN_PROCESSES, len(isolated_bundles_ids))
+
+        _FORKED_TURN = (self,
+                        {bundle_id: bundles.pop(bundle_id) for bundle_id in isolated_bundles_ids},
+                        {'logger': logger, 'continue_steps_if_needed': continue_steps_if_needed, 'timestamp': timestamp})
+
+        try:
+            results = self._run_forked([isolated_bundles_ids[i::processes] for i in xrange(processes)])
+        finally:
+            _FORKED_TURN = None
+
+        with self.profiler.measure('forked.merge'):
+            processed_heroes = sum(self._merge_isolated_bundles(result) for result in results)
+
+        # forked processes saved only heroes of their bundles
+        if any(result['ignored_bundles'] for result in results):
+            self._save_on_exception()
+
+        return processed_heroes
+
+    def process_turn(self, logger=None, continue_steps_if_needed=True):
+        # snapshot is used only for heroes loading on worker start
+        self.snapshot = None
+
+        self.switch_caches()
+
+        timestamp = time.time()
+
+        turn_number = TimePrototype.get_current_turn_number()
+
+        processed_heroes = 0
+
+        bundles = self._get_bundles_to_process(turn_number)
+
+        if conf.game_settings.LOGIC_TURN_PROCESSES > 1:
+            processed_heroes += self.process_turn__forked(bundles=bundles,
+                                                          logger=logger,
+                                                          continue_steps_if_needed=continue_steps_if_needed,
+                                                          timestamp=timestamp)
+
+        for bundle_id, heroes in bundles.iteritems():
+            processed_heroes += self.process_turn__bundle(bundle_id=bundle_id,
+                                                          heroes=heroes,
+                                                          logger=logger,
+                                                          continue_steps_if_needed=continue_steps_if_needed,
+                                                          timestamp=timestamp)
+
         if logger:
             logger.info('[next_turn] processed heroes: %d / %d' % (processed_heroes, len(self.heroes)))
             if self.ignored_bundles:
                 logger.info('[next_turn] ignore bundles: %r' % list(self.ignored_bundles))
 
+    def pop_bundles_processing_time(self):
+        bundles_info = [(bundle_id, sorted(self.bundles_to_accounts[bundle_id]), processing_time)
+                        for bundle_id, processing_time in self.bundles_processing_time.iteritems()
+                        if bundle_id in self.bundles_to_accounts and bundle_id not in self.ignored_bundles]
+
+        self.bundles_processing_time = {}
+
+        return bundles_info
+
     def _save_on_exception(self):
         for hero_id, hero in self.heroes.iteritems():
             if hero.actions.current_action.bundle_id in self.ignored_bundles:
@@ -259,17 +551,28 @@ class LogicStorage(object):
                 self._save_hero_data(hero_id)
 
     def save_all(self, logger=None):
-        heroes = self.heroes.items()
-        heroes.sort(key=lambda x: x[0])
+        heroes_ids = [hero_id
+                      for hero_id, hero in self.heroes.iteritems()
+                      if hero.actions.current_action.bundle_id not in self.ignored_bundles]
 
-        for hero_id, hero in heroes:
+        if logger:
+            logger.info('save heroes: %d' % len(heroes_ids))
 
-            if hero.actions.current_action.bundle_id in self.ignored_bundles:
-                continue
+        self._save_heroes_data(heroes_ids)
 
-            if logger:
-                logger.info('save hero %d' % hero_id)
-            self._save_hero_data(hero_id)
+    def save_snapshot(self, filename, worker_id, turn_number):
+        # only saved heroes can be stored in snapshot (see save_all)
+        heroes = [hero
+                  for hero in self.heroes.itervalues()
+                  if hero.actions.current_action.bundle_id not in self.ignored_bundles]
+
+        logic_snapshot.LogicSnapshot.create(worker_id=worker_id, turn_number=turn_number, heroes=heroes).save(filename)
+
+        return len(heroes)
+
+    def load_snapshot(self, filename, worker_id, turn_number):
+        self.snapshot = logic_snapshot.LogicSnapshot.load(filename, worker_id=worker_id, turn_number=turn_number)
+        return self.snapshot is not None
 
     def _get_bundles_to_save(self):
         bundles = set()
@@ -296,12 +599,18 @@ class LogicStorage(object):
                    if hero.is_ui_caching_required)
 
     def save_changed_data(self, logger=None):
+        with self.profiler.measure('save_changed_data'):
+            self._save_changed_data(logger=logger)
+
+    def _save_changed_data(self, logger=None):
         saved_bundles = self._get_bundles_to_save()
         cached_bundles = self._get_bundles_to_cache()
 
         if logger:
             logger.info('[save_changed_data] saved bundles number: %d' % len(saved_bundles))
 
+        heroes_to_save = []
+
         for hero_id, hero in self.heroes.iteritems():
 
             bundle_id = hero.actions.current_action.bundle_id
@@ -313,9 +622,12 @@ class LogicStorage(object):
                 self.cache_queue.add(hero_id)
 
             if bundle_id in saved_bundles:
-                self._save_hero_data(hero_id)
+                heroes_to_save.append(hero_id)
+
+        self._save_heroes_data(heroes_to_save)
 
-        cached_heroes_number = self.process_cache_queue(update_cache=True)
+        with self.profiler.measure('process_cache_queue'):
+            cached_heroes_number = self.process_cache_queue(update_cache=True)
 
         if logger:
             logger.info('[save_changed_data] cached heroes: %d' % cached_heroes_number)
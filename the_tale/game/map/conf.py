@@ -22,5 +22,11 @@ map_settings = app_settings('MAP',
                             GEN_MAP_DIR=GEN_MAP_DIR,
                             GEN_WORLD_PROGRESSION=os.path.join(GEN_MAP_DIR, './progression'),
                             GEN_REGION_OUTPUT=os.path.join(GEN_MAP_DIR, './region-%s.js'),
+                            GEN_WRITE_FULL_REGION=False, # full region file is required only by old clients, map client loads chunks
+
+                            GEN_CHUNK_SIZE=16,
+                            GEN_CHUNKS_INDEX_OUTPUT=os.path.join(GEN_MAP_DIR, './chunks-index-%s.js'),
+                            GEN_CHUNKS_INDEXES_KEPT=24, # last map versions, which chunks are kept for already opened pages
+                            GEN_CHUNK_OUTPUT=os.path.join(GEN_MAP_DIR, './chunks', './chunk-%s.js'),
                             TERRAIN_PRIORITIES_FIXTURE=os.path.join(os.path.dirname(__file__), 'fixtures', 'bioms.xls')
     )
@@ -0,0 +1,137 @@
+# coding: utf-8
+import os
+import hashlib
+
+from dext.common.utils import s11n
+
+
+def chunk_key(x, y):
+    return '%d_%d' % (x, y)
+
+
+def split_to_chunks(rows, chunk_size):
+    # split map rows to square chunks
+    # returns {(chunk_x, chunk_y): chunk rows}, border chunks can be smaller than chunk_size
+    chunks = {}
+
+    for chunk_y, y in enumerate(xrange(0, len(rows), chunk_size)):
+        chunk_rows = rows[y:y+chunk_size]
+
+        for chunk_x, x in enumerate(xrange(0, len(chunk_rows[0]), chunk_size)):
+            chunks[(chunk_x, chunk_y)] = [row[x:x+chunk_size] for row in chunk_rows]
+
+    return chunks
+
+
+def serialize_chunk(chunk):
+    return s11n.to_json(chunk).encode('utf-8')
+
+
+def chunk_hash(content):
+    return hashlib.md5(content).hexdigest()
+
+
+def write_file(filename, content):
+    # write to temporary file first, so clients never get partially written file
+    output_dir_name = os.path.dirname(filename)
+    if not os.path.exists(output_dir_name):
+        os.makedirs(output_dir_name, 0755)
+
+    tmp_filename = '%s.tmp' % filename
+
+    with open(tmp_filename, 'w') as f:
+        f.write(content)
+
+    os.rename(tmp_filename, filename)
+
+
+def write_chunks(chunks, output_template):
+    # chunks files are named by content hash, so chunks, which did not changed since previous map version, are not rewritten
+    # returns ({chunk_key: hash}, number of written chunks)
+    index = {}
+    written = 0
+
+    for (x, y), chunk in chunks.iteritems():
+        content = serialize_chunk(chunk)
+        content_hash = chunk_hash(content)
+
+        index[chunk_key(x, y)] = content_hash
+
+        filename = output_template % content_hash
+
+        if os.path.exists(filename):
+            continue
+
+        write_file(filename, content)
+        written += 1
+
+    return index, written
+
+
+def _list_files(template):
+    # names of files in template directory, which match template with single %s
+    output_dir_name, template = os.path.split(template)
+    prefix, suffix = template.split('%s')
+
+    if not os.path.exists(output_dir_name):
+        return []
+
+    return [filename
+            for filename in os.listdir(output_dir_name)
+            if filename.startswith(prefix) and filename.endswith(suffix)]
+
+
+def load_index(filename):
+    with open(filename) as f:
+        return s11n.from_json(f.read())
+
+
+def remove_old_indexes(index_template, current_version, keep_versions):
+    # clients load map version, which was actual on page rendering, so several last indexes are kept with their chunks
+    # current index and keep_versions-1 newest (by modification time) other indexes are kept
+    # returns names of kept indexes files
+    output_dir_name = os.path.dirname(index_template)
+    current_filename = os.path.basename(index_template % current_version)
+
+    filenames = sorted((filename for filename in _list_files(index_template) if filename != current_filename),
+                       key=lambda filename: os.path.getmtime(os.path.join(output_dir_name, filename)),
+                       reverse=True)
+
+    for filename in filenames[max(keep_versions-1, 0):]:
+        os.remove(os.path.join(output_dir_name, filename))
+
+    return [os.path.join(output_dir_name, filename) for filename in [current_filename] + filenames[:max(keep_versions-1, 0)]]
+
+
+def remove_unused_chunks(indexes, output_template):
+    # remove chunks files, which are not referenced by any of indexes ({chunk_key: hash} dicts)
+    # returns number of removed files
+    output_dir_name, template = os.path.split(output_template)
+
+    used_files = set(template % content_hash for index in indexes for content_hash in index.itervalues())
+
+    removed = 0
+
+    for filename in _list_files(output_template):
+        if filename in used_files:
+            continue
+
+        os.remove(os.path.join(output_dir_name, filename))
+        removed += 1
+
+    return removed
+
+
+def load_draw_info(index, output_template):
+    # restore full map rows from chunks index and chunks files
+    loaded_chunks = {}
+
+    for content_hash in set(index['chunks'].itervalues()):
+        with open(output_template % content_hash) as f:
+            loaded_chunks[content_hash] = s11n.from_json(f.read())
+
+    chunk_size = index['chunk_size']
+
+    return [[loaded_chunks[index['chunks'][chunk_key(x // chunk_size, y // chunk_size)]][y % chunk_size][x % chunk_size]
+             for x in xrange(index['width'])]
+            for y in xrange(index['height'])]
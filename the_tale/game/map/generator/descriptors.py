@@ -1,6 +1,8 @@
 # coding: utf-8
 
 import math
+import array
+import base64
 
 import rels
 
@@ -210,11 +212,12 @@ class UICell(object):
     @classmethod
     def transport(self, x, y):
         from the_tale.game.map.storage import map_info_storage
+        from the_tale.game.map.generator import drawer
         from the_tale.game.heroes.prototypes import HeroPositionPrototype
 
         dominant_place = map_info_storage.item.get_dominant_place(x, y)
 
-        has_road = map_info_storage.item.roads_map[y][x].get('road')
+        has_road = map_info_storage.item.roads_map.get(x, y) & drawer.ROAD
 
         if dominant_place:
             transport = dominant_place.transport
@@ -229,39 +232,36 @@ class UICell(object):
 
 
 class UICells(object):
+    # cells descriptions, packed to array of relations values (CELL_SIZE values per cell)
+
+    CELL_SIZE = 4
 
     def __init__(self, generator=None): # pylint: disable=W0613
-        self.cells = ()
+        self.width = 0
+        self.height = 0
+        self.values = array.array('B')
 
     def get_cell(self, x, y):
-        return self.cells[y][x]
+        index = (y * self.width + x) * self.CELL_SIZE
+        return UICell.deserialize(self.values[index:index+self.CELL_SIZE])
 
     def serialize(self):
-        data = []
-
-        for row in self.cells:
-            serialized_row = [cell.serialize() for cell in row]
-            data.append(serialized_row)
-
-        return data
+        return {'width': self.width,
+                'height': self.height,
+                'values': base64.b64encode(self.values.tostring())}
 
     @classmethod
     def create(cls, generator):
         obj = cls()
 
-        cells = []
+        obj.width = generator.w
+        obj.height = generator.h
 
         for y in xrange(0, generator.h):
-            row = []
-
             for x in xrange(0, generator.w):
                 cell = generator.cell_info(x, y)
                 randomized_cell = cell.randomize(seed=(x+y)*TimePrototype.get_current_time().game_time.day, fraction=map_settings.CELL_RANDOMIZE_FRACTION)
-                row.append(UICell(randomized_cell))
-
-            cells.append(tuple(row))
-
-        obj.cells = tuple(cells)
+                obj.values.extend(UICell(randomized_cell).serialize())
 
         return obj
 
@@ -270,12 +270,14 @@ class UICells(object):
     def deserialize(cls, data):
         obj = cls()
 
-        cells = []
-
-        for row in data:
-            cells_row = [UICell.deserialize(cell_data) for cell_data in row ]
-            cells.append(tuple(cells_row))
+        if isinstance(data, list): # old format: nested lists of serialized cells
+            obj.width = len(data[0]) if data else 0
+            obj.height = len(data)
+            obj.values = array.array('B', [value for row in data for cell_data in row for value in cell_data])
+            return obj
 
-        obj.cells = tuple(cells)
+        obj.width = data['width']
+        obj.height = data['height']
+        obj.values.fromstring(base64.b64decode(data['values']))
 
         return obj
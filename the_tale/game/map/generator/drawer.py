@@ -1,5 +1,6 @@
 # coding: utf-8
 
+from the_tale.game.map import grids
 from the_tale.game.map.relations import SPRITES
 from the_tale.game.map.storage import map_info_storage
 
@@ -33,14 +34,22 @@ class CellDrawer(object):
         return sprites
 
 
-def get_roads_map(w, h, roads):
+# roads map cell flags
+ROAD_LEFT = 1
+ROAD_RIGHT = 2
+ROAD_UP = 4
+ROAD_DOWN = 8
+ROAD = 16
+
+_ROAD_DIRECTIONS = {'l': ROAD_LEFT,
+                    'r': ROAD_RIGHT,
+                    'u': ROAD_UP,
+                    'd': ROAD_DOWN}
 
-    m = []
 
-    for i in xrange(h):
-        m.append([])
-        for j in xrange(w):
-            m[-1].append({})
+def get_roads_map(w, h, roads):
+
+    m = grids.Grid(width=w, height=h)
 
     for road in roads:
         if not road.exists: continue
@@ -50,15 +59,14 @@ def get_roads_map(w, h, roads):
         y = point_1.y
 
         for path in road.path:
-            m[y][x][path] = True
-            m[y][x]['road'] = True
+            m.set(x, y, m.get(x, y) | _ROAD_DIRECTIONS[path] | ROAD)
 
             if path == 'l': x -= 1
             elif path == 'r': x += 1
             elif path == 'u': y -= 1
             elif path == 'd': y += 1
 
-            m[y][x]['road'] = True
+            m.set(x, y, m.get(x, y) | ROAD)
 
     return m
 
@@ -68,17 +76,17 @@ def get_road_sprite_info(m, x, y):
     u = 0
     d = 0
 
-    cell = m[y][x]
+    cell = m.get(x, y)
 
-    l_cell = m[y][x-1] if x > 0 else {}
-    r_cell = m[y][x+1] if x < len(m[y])-1 else {}
-    u_cell = m[y-1][x] if y > 0 else {}
-    d_cell = m[y+1][x] if y < len(m)-1 else {}
+    l_cell = m.get(x-1, y) if x > 0 else 0
+    r_cell = m.get(x+1, y) if x < m.width-1 else 0
+    u_cell = m.get(x, y-1) if y > 0 else 0
+    d_cell = m.get(x, y+1) if y < m.height-1 else 0
 
-    if cell.get('l') or l_cell.get('r'): l = 1
-    if cell.get('r') or r_cell.get('l'): r = 1
-    if cell.get('u') or u_cell.get('d'): u = 1
-    if cell.get('d') or d_cell.get('u'): d = 1
+    if cell & ROAD_LEFT or l_cell & ROAD_RIGHT: l = 1
+    if cell & ROAD_RIGHT or r_cell & ROAD_LEFT: r = 1
+    if cell & ROAD_UP or u_cell & ROAD_DOWN: u = 1
+    if cell & ROAD_DOWN or d_cell & ROAD_UP: d = 1
 
     sum = l + r + u + d
 
@@ -131,7 +139,7 @@ def get_draw_info(biomes_map):
 
             cell_drawer.terrain = SPRITES.index_name[biom.id.name]
 
-            if roads_map[y][x]:
+            if roads_map.get(x, y):
                 road_sprite = get_road_sprite_info(roads_map, x, y)
 
                 cell_drawer.road = SPRITES.index_name[road_sprite['name']]
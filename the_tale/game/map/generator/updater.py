@@ -1,5 +1,4 @@
 # coding: utf-8
-import os
 
 import deworld
 
@@ -15,6 +14,7 @@ from the_tale.game.map.prototypes import MapInfoPrototype, WorldInfoPrototype
 from the_tale.game.map.generator.biomes import Biom
 from the_tale.game.map.generator.power_points import get_power_points
 from the_tale.game.map.generator.drawer import get_draw_info
+from the_tale.game.map.generator import chunks
 from the_tale.game.map.places.storage import places_storage, buildings_storage
 from the_tale.game.map.roads.storage import roads_storage
 from the_tale.game.map.relations import TERRAIN
@@ -68,23 +68,43 @@ def update_map(index):
         for cell in row:
             raw_draw_info[-1].append(cell.get_sprites())
 
-    data = {'width': generator.w,
-            'height': generator.h,
-            'map_version': map_info_storage.version,
-            'format_version': '0.1',
-            'draw_info': raw_draw_info,
-            'places': dict( (place.id, place.map_info() ) for place in places_storage.all() ),
-            # 'buildings': dict( (building.id, building.map_info() ) for building in buildings_storage.all() ),
-            'roads': dict( (road.id, road.map_info() ) for road in roads_storage.all()) }
+    places = dict( (place.id, place.map_info() ) for place in places_storage.all() )
+    # buildings = dict( (building.id, building.map_info() ) for building in buildings_storage.all() )
+    roads = dict( (road.id, road.map_info() ) for road in roads_storage.all())
 
-    region_js_file = map_settings.GEN_REGION_OUTPUT % map_info_storage.version
+    chunks_index, written_chunks = chunks.write_chunks(chunks.split_to_chunks(raw_draw_info, map_settings.GEN_CHUNK_SIZE),
+                                                       output_template=map_settings.GEN_CHUNK_OUTPUT)
 
-    output_dir_name = os.path.dirname(region_js_file)
-    if not os.path.exists(output_dir_name):
-        os.makedirs(output_dir_name, 0755)
+    index_data = {'width': generator.w,
+                  'height': generator.h,
+                  'map_version': map_info_storage.version,
+                  'format_version': '0.2',
+                  'chunk_size': map_settings.GEN_CHUNK_SIZE,
+                  'chunks': chunks_index,
+                  'places': places,
+                  'roads': roads }
 
-    with open(region_js_file, 'w') as region_json_file:
-        region_json_file.write(s11n.to_json(data).encode('utf-8'))
+    chunks.write_file(map_settings.GEN_CHUNKS_INDEX_OUTPUT % map_info_storage.version, s11n.to_json(index_data).encode('utf-8'))
+
+    kept_indexes = chunks.remove_old_indexes(map_settings.GEN_CHUNKS_INDEX_OUTPUT,
+                                             current_version=map_info_storage.version,
+                                             keep_versions=map_settings.GEN_CHUNKS_INDEXES_KEPT)
+
+    chunks.remove_unused_chunks([chunks.load_index(filename)['chunks'] for filename in kept_indexes],
+                                output_template=map_settings.GEN_CHUNK_OUTPUT)
+
+    if map_settings.GEN_WRITE_FULL_REGION:
+        data = {'width': generator.w,
+                'height': generator.h,
+                'map_version': map_info_storage.version,
+                'format_version': '0.1',
+                'draw_info': raw_draw_info,
+                'places': places,
+                'roads': roads }
+
+        chunks.write_file(map_settings.GEN_REGION_OUTPUT % map_info_storage.version, s11n.to_json(data).encode('utf-8'))
 
     if project_settings.DEBUG:
         deworld.draw_world(index, generator, catalog=map_settings.GEN_WORLD_PROGRESSION)
+
+    return written_chunks
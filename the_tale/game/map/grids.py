@@ -0,0 +1,107 @@
+# coding: utf-8
+import array
+import base64
+
+
+class _GridRow(object):
+    __slots__ = ('grid', 'offset')
+
+    def __init__(self, grid, offset):
+        self.grid = grid
+        self.offset = offset
+
+    def _index(self, x):
+        if x < 0:
+            x += self.grid.width
+        if not 0 <= x < self.grid.width:
+            raise IndexError('grid row index out of range')
+        return self.offset + x
+
+    def __getitem__(self, x):
+        return self.grid._decode(self.grid.values[self._index(x)])
+
+    def __setitem__(self, x, value):
+        self.grid.values[self._index(x)] = self.grid._encode(value)
+
+    def __len__(self):
+        return self.grid.width
+
+    def __iter__(self):
+        for x in xrange(self.grid.width):
+            yield self.grid._decode(self.grid.values[self.offset + x])
+
+
+class Grid(object):
+    # map-sized grid of small non negative integers, packed to single array
+    # supports grid[y][x] access, as nested lists did
+
+    __slots__ = ('width', 'height', 'values')
+
+    TYPECODE = 'B'
+
+    def __init__(self, width, height, values=None):
+        self.width = width
+        self.height = height
+
+        if values is None:
+            values = array.array(self.TYPECODE, [0]) * (width * height)
+
+        self.values = values
+
+    def _decode(self, value): return value
+    def _encode(self, value): return value
+
+    def get(self, x, y):
+        return self._decode(self.values[y * self.width + x])
+
+    def set(self, x, y, value):
+        self.values[y * self.width + x] = self._encode(value)
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError('grid index out of range')
+        return _GridRow(self, y * self.width)
+
+    def __len__(self):
+        return self.height
+
+    def __iter__(self):
+        for y in xrange(self.height):
+            yield _GridRow(self, y * self.width)
+
+    def rows(self):
+        return [list(row) for row in self]
+
+    @classmethod
+    def from_rows(cls, rows, **kwargs):
+        grid = cls(width=len(rows[0]) if rows else 0, height=len(rows), **kwargs)
+
+        grid.values = array.array(cls.TYPECODE, [grid._encode(value) for row in rows for value in row])
+
+        return grid
+
+    def serialize(self):
+        return {'width': self.width,
+                'height': self.height,
+                'values': base64.b64encode(self.values.tostring())}
+
+    @classmethod
+    def deserialize(cls, data, **kwargs):
+        values = array.array(cls.TYPECODE)
+        values.fromstring(base64.b64decode(data['values']))
+        return cls(width=data['width'], height=data['height'], values=values, **kwargs)
+
+
+class RelationGrid(Grid):
+    # grid of relation records, stores only their values
+
+    __slots__ = ('relation',)
+
+    def __init__(self, width, height, values=None, relation=None):
+        super(RelationGrid, self).__init__(width=width, height=height, values=values)
+        self.relation = relation
+
+    def _decode(self, value): return self.relation.index_value[value]
+    def _encode(self, value): return value.value
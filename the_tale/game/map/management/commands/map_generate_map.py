@@ -29,7 +29,8 @@ class Command(BaseCommand):
         try:
             for i in xrange(options['repeate_number']): # pylint: disable=W0612
                 # print i
-                update_map(index=map_info_storage.item.id+1)
+                written_chunks = update_map(index=map_info_storage.item.id+1)
+                logger.info('map generated, %d changed chunks written' % written_chunks)
         except Exception: # pylint: disable=W0703
             traceback.print_exc()
             logger.error('Map generation exception',
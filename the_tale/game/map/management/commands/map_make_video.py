@@ -18,14 +18,14 @@ TEXTURE_PATH = '/home/tie/repos/mine/the-tale/the_tale/static/game/images/map.pn
 
 class Command(BaseCommand):
 
-    help = 'make map changing video from region datas'
+    help = 'make map changing video from region files and chunks indexes'
 
     option_list = BaseCommand.option_list + ( make_option('-r', '--regions',
                                                           action='store',
                                                           type=str,
                                                           dest='regions',
                                                           default=map_settings.GEN_MAP_DIR,
-                                                          help='region file name'),
+                                                          help='directory with region files and chunks indexes'),
                                               make_option('-o', '--output',
                                                           action='store',
                                                           type=str,
@@ -42,9 +42,12 @@ class Command(BaseCommand):
 
         print 'REGIONS DIR: %s' % regions_dir
 
+        # region files are not written since map is stored in chunks, so frames of new map versions are taken from chunks indexes
+        # only last map_settings.GEN_CHUNKS_INDEXES_KEPT chunks indexes are kept
         regions = sorted([os.path.join(regions_dir, filename)
                           for filename in os.listdir(regions_dir)
-                          if os.path.isfile(os.path.join(regions_dir, filename)) and filename.startswith('region-')])
+                          if os.path.isfile(os.path.join(regions_dir, filename)) and filename.startswith(('region-', 'chunks-index-'))],
+                         key=os.path.getmtime)
 
         temp_dir = tempfile.mkdtemp(prefix='the-tale-map-viz')
 
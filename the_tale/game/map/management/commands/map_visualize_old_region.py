@@ -8,12 +8,13 @@ from optparse import make_option
 
 from django.core.management.base import BaseCommand
 
+from dext.common.utils.logic import run_django_command
+
 from the_tale.game.relations import RACE
 
 from the_tale.game.map.places.relations import BUILDING_TYPE
 
 from the_tale.game.map.relations import TERRAIN, SPRITES
-from the_tale.game.map.storage import map_info_storage
 from the_tale.game.map.conf import map_settings
 
 
@@ -139,13 +140,16 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
 
         region = options['region']
-        if not region:
-            region = map_settings.GEN_REGION_OUTPUT % map_info_storage.version
 
         output = options['output']
         if not output:
             output = '/tmp/the-tale-map.png'
 
+        if not region:
+            # current map has no region file in old format, it is stored in chunks
+            run_django_command(['map_visualize_region', '-o', output])
+            return
+
         with open(region) as region_file:
             data = json.loads(region_file.read())
 
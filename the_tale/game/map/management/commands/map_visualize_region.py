@@ -13,6 +13,7 @@ from dext.common.utils.logic import run_django_command
 from the_tale.game.map.relations import SPRITES
 from the_tale.game.map.storage import map_info_storage
 from the_tale.game.map.conf import map_settings
+from the_tale.game.map.generator import chunks
 
 
 OUTPUT_RECTANGLE = (8*map_settings.CELL_SIZE, 1*map_settings.CELL_SIZE, 50*map_settings.CELL_SIZE, 36*map_settings.CELL_SIZE)
@@ -45,7 +46,7 @@ class Command(BaseCommand):
                                                           action='store',
                                                           type=str,
                                                           dest='region',
-                                                          help='region file name'),
+                                                          help='region or chunks index file name'),
                                               make_option('-o', '--output',
                                                           action='store',
                                                           type=str,
@@ -57,7 +58,7 @@ class Command(BaseCommand):
 
         region = options['region']
         if not region:
-            region = map_settings.GEN_REGION_OUTPUT % map_info_storage.version
+            region = map_settings.GEN_CHUNKS_INDEX_OUTPUT % map_info_storage.version
 
         output = options['output']
         if not output:
@@ -72,7 +73,10 @@ class Command(BaseCommand):
             run_django_command(['map_visualize_old_region', '-r', region, '-o', output])
             return
 
-        draw_info = data['draw_info']
+        if 'chunks' in data:
+            draw_info = chunks.load_draw_info(data, map_settings.GEN_CHUNK_OUTPUT)
+        else:
+            draw_info = data['draw_info']
 
         width = data['width']
         height = data['height']
@@ -0,0 +1,109 @@
+# coding: utf-8
+import math
+import array
+
+
+NO_PLACE = -1
+
+
+class CellsIndex(object):
+    # cell -> place lookups for map of width x height cells
+    # dominant[y*width+x] - id of place, which owns cell (in which nearest_cells it is)
+    # nearest[y*width+x] - id of place, nearest to cell
+    # cells outside of map are not indexed and looked up with linear search
+
+    __slots__ = ('width', 'height', 'places', 'places_by_id', 'dominant', 'nearest', 'coordinates')
+
+    def __init__(self, width, height, places):
+        self.width = width
+        self.height = height
+        self.places = list(places)
+        self.places_by_id = {place.id: place for place in self.places}
+
+        self.dominant = array.array('l', [NO_PLACE]) * (width * height)
+        self.nearest = array.array('l', [NO_PLACE]) * (width * height)
+
+        self.coordinates = None
+
+    @classmethod
+    def get_coordinates(cls, places):
+        return tuple((place.id, place.x, place.y) for place in places)
+
+    @classmethod
+    def build(cls, width, height, places):
+        index = cls(width, height, places)
+
+        index.build_dominant(places)
+        index.build_nearest(places)
+
+        return index
+
+    def copy_for(self, places):
+        # new index with same nearest places (places coordinates not changed) and new dominant places
+        index = self.__class__(self.width, self.height, places)
+
+        index.nearest = self.nearest
+        index.coordinates = self.coordinates
+
+        index.build_dominant(places)
+
+        return index
+
+    def is_inside(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def build_dominant(self, places):
+        # if cell is in nearest_cells of several places, it is owned by the first one, as in linear search
+        dominant = self.dominant
+
+        for place in places:
+            for x, y in place.nearest_cells:
+                if self.is_inside(x, y) and dominant[y*self.width+x] == NO_PLACE:
+                    dominant[y*self.width+x] = place.id
+
+    def build_nearest(self, places):
+        # places are checked in the same order, as in linear search, so ties are resolved in the same way
+        nearest = self.nearest
+
+        for y in xrange(self.height):
+            for x in xrange(self.width):
+                best_distance = None
+                best_place_id = NO_PLACE
+
+                for place in places:
+                    distance = math.hypot(place.x-x, place.y-y)
+                    if best_distance is None or distance < best_distance:
+                        best_distance = distance
+                        best_place_id = place.id
+
+                nearest[y*self.width+x] = best_place_id
+
+        self.coordinates = self.get_coordinates(places)
+
+    def _get_place(self, place_id):
+        return self.places_by_id[place_id] if place_id != NO_PLACE else None
+
+    def get_dominant_place(self, x, y):
+        if self.is_inside(x, y):
+            return self._get_place(self.dominant[y*self.width+x])
+
+        for place in self.places:
+            if (x, y) in place.nearest_cells:
+                return place
+
+        return None
+
+    def get_nearest_place(self, x, y):
+        if self.is_inside(x, y):
+            return self._get_place(self.nearest[y*self.width+x])
+
+        best_distance = None
+        best_place = None
+
+        for place in self.places:
+            distance = math.hypot(place.x-x, place.y-y)
+            if best_distance is None or distance < best_distance:
+                best_distance = distance
+                best_place = place
+
+        return best_place
@@ -94,6 +94,16 @@ def update_nearest_cells():
     storage.places_storage.save_all()
 
 
+def update_heroes_statistics(places):
+    # heroes number & habits for all places, calculated with one query instead of several queries per place
+    statistics = HeroPreferences.count_places_statistics(places)
+
+    for place in places:
+        heroes_number, habits_values = statistics[place.id]
+        place.set_heroes_number(heroes_number)
+        place.set_heroes_habits(habits_values)
+
+
 def api_list_url():
     arguments = {'api_version': conf.places_settings.API_LIST_VERSION,
                  'api_client': project_settings.API_CLIENT}
@@ -3,6 +3,7 @@
 from django.core.management.base import BaseCommand
 
 from the_tale.game.map.places.storage import places_storage
+from the_tale.game.map.places.logic import update_heroes_statistics
 
 class Command(BaseCommand):
 
@@ -16,7 +17,7 @@ class Command(BaseCommand):
 
             place.sync_parameters() # must be last operation to display and use real data
 
-            place.update_heroes_number()
-            place.update_heroes_habits()
+        update_heroes_statistics(places_storage.all())
 
+        for place in places_storage.all():
             place.save()
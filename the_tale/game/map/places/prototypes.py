@@ -7,7 +7,7 @@ from dext.common.utils import s11n
 
 from the_tale.amqp_environment import environment
 
-from the_tale.common.utils import bbcode
+from the_tale.common.utils import html_cache
 from the_tale.common.utils.prototypes import BasePrototype
 from the_tale.common.utils.decorators import lazy_property
 
@@ -84,7 +84,7 @@ class PlacePrototype(BasePrototype, names.ManageNameMixin):
             signals.place_modifier_reseted.send(self.__class__, place=self, old_modifier=old_modifier)
 
     @property
-    def description_html(self): return bbcode.render(self._model.description)
+    def description_html(self): return html_cache.render(html_cache.BBCODE, self._model.description)
 
     def linguistics_restrictions(self):
         from the_tale.linguistics.relations import TEMPLATE_RESTRICTION_GROUP
@@ -125,13 +125,16 @@ class PlacePrototype(BasePrototype, names.ManageNameMixin):
 
     def update_heroes_number(self):
         from the_tale.game.heroes.preferences import HeroPreferences
-        self._model.heroes_number = HeroPreferences.count_citizens_of(self, all=self.depends_from_all_heroes)
+        self.set_heroes_number(HeroPreferences.count_citizens_of(self, all=self.depends_from_all_heroes))
+
+    def set_heroes_number(self, heroes_number):
+        self._model.heroes_number = heroes_number
 
     def update_heroes_habits(self):
         from the_tale.game.heroes.preferences import HeroPreferences
+        self.set_heroes_habits(HeroPreferences.count_habit_values(self, all=self.depends_from_all_heroes))
 
-        habits_values = HeroPreferences.count_habit_values(self, all=self.depends_from_all_heroes)
-
+    def set_heroes_habits(self, habits_values):
         self._model.habit_honor_positive = habits_values[0][0]
         self._model.habit_honor_negative = habits_values[0][1]
         self._model.habit_peacefulness_positive = habits_values[1][0]
@@ -3,8 +3,11 @@ import random
 
 from the_tale.common.utils import storage
 
+from the_tale.game.map import conf as map_conf
+
 from the_tale.game.map.places.prototypes import PlacePrototype, BuildingPrototype, ResourceExchangePrototype
 from the_tale.game.map.places import exceptions
+from the_tale.game.map.places import cells
 from the_tale.game.map.places.relations import BUILDING_STATE
 
 
@@ -13,6 +16,9 @@ class PlacesStorage(storage.Storage):
     EXCEPTION = exceptions.PlacesStorageError
     PROTOTYPE = PlacePrototype
 
+    _cells_index = None
+    _cells_index_version = None
+
     def random_place(self):
         self.sync()
         return random.choice(self._data.values())
@@ -34,6 +40,34 @@ class PlacesStorage(storage.Storage):
             place.shift(dx, dy)
         self.save_all()
 
+    def get_cells_index(self):
+        # index is rebuilt after every change of places (nearest_cells can be changed)
+        # nearest places are recalculated only if places coordinates changed
+        self.sync()
+
+        if self._cells_index is not None and self._cells_index_version == self._version:
+            return self._cells_index
+
+        places = self.all()
+
+        if (self._cells_index is not None and
+            self._cells_index.width == map_conf.map_settings.WIDTH and
+            self._cells_index.height == map_conf.map_settings.HEIGHT and
+            self._cells_index.coordinates == cells.CellsIndex.get_coordinates(places)):
+            self._cells_index = self._cells_index.copy_for(places)
+        else:
+            self._cells_index = cells.CellsIndex.build(map_conf.map_settings.WIDTH, map_conf.map_settings.HEIGHT, places)
+
+        self._cells_index_version = self._version
+
+        return self._cells_index
+
+    def get_dominant_place(self, x, y):
+        return self.get_cells_index().get_dominant_place(x, y)
+
+    def get_nearest_place(self, x, y):
+        return self.get_cells_index().get_nearest_place(x, y)
+
 
 places_storage = PlacesStorage()
 
@@ -0,0 +1,91 @@
+# coding: utf-8
+import math
+import random
+import collections
+
+from the_tale.common.utils import testcase
+
+from the_tale.game.map.places import cells
+
+
+FakePlace = collections.namedtuple('FakePlace', ('id', 'x', 'y', 'nearest_cells'))
+
+
+class CellsIndexTests(testcase.TestCase):
+
+    def setUp(self):
+        super(CellsIndexTests, self).setUp()
+
+        self.places = [FakePlace(id=1, x=0, y=0, nearest_cells=[(0, 0), (1, 0), (0, 1)]),
+                       FakePlace(id=2, x=4, y=4, nearest_cells=[(4, 4), (3, 4), (1, 0)]),
+                       FakePlace(id=3, x=4, y=0, nearest_cells=[(4, 0), (7, 7)])]
+
+        self.index = cells.CellsIndex.build(5, 5, self.places)
+
+    def linear_dominant_place(self, x, y):
+        for place in self.places:
+            if (x, y) in place.nearest_cells:
+                return place
+        return None
+
+    def linear_nearest_place(self, x, y):
+        best_distance = None
+        best_place = None
+        for place in self.places:
+            distance = math.hypot(place.x-x, place.y-y)
+            if best_distance is None or distance < best_distance:
+                best_distance = distance
+                best_place = place
+        return best_place
+
+    def test_get_dominant_place(self):
+        self.assertEqual(self.index.get_dominant_place(0, 1).id, 1)
+        self.assertEqual(self.index.get_dominant_place(3, 4).id, 2)
+        self.assertEqual(self.index.get_dominant_place(2, 2), None)
+
+    def test_get_dominant_place__first_place_wins(self):
+        self.assertEqual(self.index.get_dominant_place(1, 0).id, 1)
+
+    def test_get_dominant_place__outside_of_map(self):
+        self.assertEqual(self.index.get_dominant_place(7, 7).id, 3)
+        self.assertEqual(self.index.get_dominant_place(-1, 0), None)
+
+    def test_get_nearest_place(self):
+        self.assertEqual(self.index.get_nearest_place(1, 1).id, 1)
+        self.assertEqual(self.index.get_nearest_place(4, 3).id, 2)
+        self.assertEqual(self.index.get_nearest_place(4, 1).id, 3)
+
+    def test_get_nearest_place__outside_of_map(self):
+        self.assertEqual(self.index.get_nearest_place(10, 10).id, 2)
+
+    def test_get_nearest_place__no_places(self):
+        index = cells.CellsIndex.build(5, 5, [])
+        self.assertEqual(index.get_nearest_place(1, 1), None)
+        self.assertEqual(index.get_dominant_place(1, 1), None)
+
+    def test_equal_to_linear_search(self):
+        random.seed(1)
+
+        self.places = [FakePlace(id=i, x=random.randint(0, 19), y=random.randint(0, 19), nearest_cells=[]) for i in xrange(10)]
+
+        for x in xrange(20):
+            for y in xrange(20):
+                random.choice(self.places).nearest_cells.append((x, y))
+
+        index = cells.CellsIndex.build(20, 20, self.places)
+
+        for x in xrange(-2, 22):
+            for y in xrange(-2, 22):
+                self.assertEqual(index.get_dominant_place(x, y), self.linear_dominant_place(x, y))
+                self.assertEqual(index.get_nearest_place(x, y), self.linear_nearest_place(x, y))
+
+    def test_copy_for(self):
+        places = [FakePlace(id=place.id, x=place.x, y=place.y, nearest_cells=[]) for place in self.places]
+        places[0].nearest_cells.append((2, 2))
+
+        index = self.index.copy_for(places)
+
+        self.assertEqual(index.nearest, self.index.nearest)
+        self.assertEqual(index.coordinates, self.index.coordinates)
+        self.assertEqual(index.get_dominant_place(2, 2).id, 1)
+        self.assertEqual(index.get_dominant_place(0, 0), None)
@@ -89,6 +89,37 @@ class PlacesStorageTest(testcase.TestCase):
         self.assertTrue(self.p1.id in self.storage)
         self.assertFalse(666 in self.storage)
 
+    def test_get_cells_index__cached(self):
+        index = self.storage.get_cells_index()
+        self.assertEqual(self.storage.get_cells_index(), index)
+
+    def test_get_cells_index__places_changed(self):
+        index = self.storage.get_cells_index()
+
+        self.storage.update_version()
+
+        new_index = self.storage.get_cells_index()
+
+        self.assertNotEqual(new_index, index)
+        self.assertEqual(new_index.nearest, index.nearest)
+
+    def test_get_cells_index__coordinates_changed(self):
+        index = self.storage.get_cells_index()
+
+        self.storage[self.p1.id].shift(1, 0)
+        self.storage.update_version()
+
+        self.assertNotEqual(self.storage.get_cells_index().coordinates, index.coordinates)
+
+    def test_get_dominant_place(self):
+        for place in self.storage.all():
+            for x, y in place.nearest_cells:
+                self.assertEqual(self.storage.get_dominant_place(x, y).id, place.id)
+
+    def test_get_nearest_place(self):
+        for place in self.storage.all():
+            self.assertEqual(self.storage.get_nearest_place(place.x, place.y).id, place.id)
+
 
 
 class ResourceExchangeStorageTests(testcase.TestCase):
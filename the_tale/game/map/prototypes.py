@@ -27,6 +27,7 @@ from the_tale.game.map.utils import get_person_race_percents, get_race_percents
 from the_tale.game.map.relations import MAP_STATISTICS, TERRAIN
 
 from the_tale.game.map import conf
+from the_tale.game.map import grids
 
 
 
@@ -36,13 +37,12 @@ class MapInfoPrototype(BasePrototype):
 
     @lazy_property
     def terrain(self):
-        data =  s11n.from_json(self._model.terrain)
-        terrain = []
-        for row in data:
-            terrain.append([])
-            for cell in row:
-                terrain[-1].append(TERRAIN(cell))
-        return terrain
+        data = s11n.from_json(self._model.terrain)
+
+        if isinstance(data, list): # old format: nested lists of terrain values
+            return grids.RelationGrid.from_rows([[TERRAIN(cell) for cell in row] for row in data], relation=TERRAIN)
+
+        return grids.RelationGrid.deserialize(data, relation=TERRAIN)
 
     @lazy_property
     def statistics(self):
@@ -77,10 +77,7 @@ class MapInfoPrototype(BasePrototype):
     def race_cities(self): return self.statistics['race_cities']
 
     def get_dominant_place(self, x, y):
-        for place in places_storage.all():
-            if (x, y) in place.nearest_cells:
-                return place
-        return None
+        return places_storage.get_dominant_place(x, y)
 
     ######################
     # object operations
@@ -139,7 +136,7 @@ class MapInfoPrototype(BasePrototype):
         model = MapInfo.objects.create(turn_number=turn_number,
                                        width=width,
                                        height=height,
-                                       terrain=s11n.to_json([ [cell.value for cell in row] for row in terrain]),
+                                       terrain=s11n.to_json(grids.RelationGrid.from_rows(terrain, relation=TERRAIN).serialize()),
                                        cells=s11n.to_json(UICells.create(world.generator).serialize()),
                                        world=world._model,
                                        statistics=s11n.to_json(statistics))
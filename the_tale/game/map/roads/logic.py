@@ -1,73 +1,87 @@
 # coding: utf-8
 
+from the_tale.common.utils import bulk
+
 from the_tale.game.map.places.storage import places_storage
 from the_tale.game.map.roads.storage import roads_storage, waymarks_storage
 from the_tale.game.map.roads.prototypes import WaymarkPrototype
+from the_tale.game.map.roads.models import Waymark
+from the_tale.game.map.roads import paths
+
+
+UNREACHABLE_LENGTH = paths.UNREACHABLE_LENGTH
+
+
+def get_roads():
+    return [paths.Road.from_prototype(road) for road in roads_storage.all_exists_roads()]
+
 
+def get_removed_roads():
+    return [paths.Road.from_prototype(road) for road in roads_storage.all() if not road.exists]
 
-class Path(object):
 
-    def __init__(self):
-        self.road_id = -1
-        self.length = 9999999999999999999999999999
+def get_waymarks_matrix(places_ids):
+    # returns matrix of stored waymarks and list of places pairs without waymarks
+    matrix = paths.PathsMatrix(places_ids)
+    missed_pairs = []
+
+    for place_from_id in places_ids:
+        for place_to_id in places_ids:
+            waymark = waymarks_storage.look_for_road(point_from=place_from_id, point_to=place_to_id)
+
+            if waymark is None:
+                missed_pairs.append((place_from_id, place_to_id))
+                continue
+
+            matrix.set_path(place_from_id, place_to_id, paths.waymark_length(waymark.length), waymark.road_id)
+
+    return matrix, missed_pairs
 
-    def update_path(self, new_length, new_road_id):
-        if self.length > new_length:
-            self.road_id = new_road_id
-            self.length = new_length
 
 @waymarks_storage.postpone_version_update
-def update_waymarks(): # pylint: disable=R0912
+def update_waymarks():
+
+    places_ids = [place.id for place in places_storage.all()]
+
+    roads = get_roads()
 
-    places = places_storage.all()
+    old_matrix, missed_pairs = get_waymarks_matrix(places_ids)
 
-    roads = roads_storage.all_exists_roads()
+    if missed_pairs:
+        new_matrix = paths.PathsMatrix.build(places_ids, roads)
+    else:
+        new_matrix = old_matrix.copy()
+        new_matrix.update(roads, removed_roads=get_removed_roads())
 
-    places_len = len(places)
+    changed_pairs = set(new_matrix.changed_pairs(old_matrix))
+    changed_pairs.update(missed_pairs)
 
-    paths = [ [ Path() for place in xrange(places_len) ] for i in xrange(places_len)] # pylint: disable=W0612
+    changed_models = []
 
-    p2i = dict( (place.id, i) for i, place in enumerate(places))
+    for place_from_id, place_to_id in sorted(changed_pairs):
+        length = new_matrix.get_length(place_from_id, place_to_id)
 
-    for i in xrange(len(places)):
-        paths[i][i].update_path(0, None)
+        if length == paths.INFINITE_LENGTH:
+            length = UNREACHABLE_LENGTH
 
-    for road in roads:
-        i = p2i[road.point_1_id]
-        j = p2i[road.point_2_id]
-        paths[i][j].update_path(road.length, road.id)
-        paths[j][i].update_path(road.length, road.id)
+        road_id = new_matrix.get_road_id(place_from_id, place_to_id)
 
-    for k in xrange(places_len):
-        for i in xrange(places_len):
-            for j in xrange(places_len):
-                new_len = min(paths[i][j].length,
-                              paths[i][k].length + paths[k][j].length)
-                paths[i][j].update_path(new_len, paths[i][k].road_id)
+        waymark = waymarks_storage.look_for_road(point_from=place_from_id, point_to=place_to_id)
 
-    for row in paths:
-        res = []
-        for el in row:
-            res.append(el.road_id)
+        if waymark is None:
+            WaymarkPrototype.create(point_from=places_storage[place_from_id],
+                                    point_to=places_storage[place_to_id],
+                                    road=roads_storage[road_id] if road_id is not None else None,
+                                    length=length)
+            continue
 
+        waymark._model.road_id = road_id
+        waymark.length = length
 
-    for i in xrange(places_len):
-        for j in xrange(places_len):
-            if paths[i][j].road_id is not None:
-                road = roads_storage[paths[i][j].road_id]
-            else:
-                road = None
+        changed_models.append(waymark._model)
 
-            waymark = waymarks_storage.look_for_road(point_from=places[i].id, point_to=places[j].id)
+    bulk.bulk_update(Waymark, changed_models, fields=['road', 'length'])
 
-            if waymark:
-                waymark.road = road
-                waymark.length = paths[i][j].length
-                waymark.save()
-            else:
-                waymark = WaymarkPrototype.create(point_from=places[i],
-                                                  point_to=places[j],
-                                                  road=road,
-                                                  length=paths[i][j].length)
+    waymarks_storage.reset_paths_matrix()
 
     waymarks_storage.update_version()
@@ -0,0 +1,86 @@
+# coding: utf-8
+import time
+import random
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from the_tale.game.map.roads import paths
+
+
+def generate_map(places_number, extra_roads_number):
+    # random connected map: spanning tree plus some additional roads
+    roads = []
+
+    for i in xrange(1, places_number):
+        roads.append(paths.Road(id=len(roads)+1, point_1_id=i, point_2_id=random.randrange(i), length=float(random.randint(1, 20))))
+
+    for i in xrange(extra_roads_number):
+        point_1_id, point_2_id = random.sample(xrange(places_number), 2)
+        roads.append(paths.Road(id=len(roads)+1, point_1_id=point_1_id, point_2_id=point_2_id, length=float(random.randint(1, 20))))
+
+    return range(places_number), roads
+
+
+def measure(callback):
+    started_at = time.time()
+    callback()
+    return time.time() - started_at
+
+
+class Command(BaseCommand):
+
+    help = 'compare waymarks calculation algorithms on synthetic maps'
+
+    option_list = BaseCommand.option_list + ( make_option('-p', '--places',
+                                                          action='store',
+                                                          type=str,
+                                                          dest='places',
+                                                          default='50,100,200,500',
+                                                          help='comma separated numbers of places'),
+                                              make_option('-s', '--seed',
+                                                          action='store',
+                                                          type=int,
+                                                          dest='seed',
+                                                          default=0,
+                                                          help='random seed'),
+                                              make_option('--skip-floyd-warshall',
+                                                          action='store_true',
+                                                          dest='skip-floyd-warshall',
+                                                          help='do not run O(n^3) algorithm'), )
+
+    def handle(self, *args, **options):
+
+        random.seed(options['seed'])
+
+        print '%8s %14s %14s %14s %14s %14s' % ('places', 'floyd-warshall', 'dijkstra', 'add road', 'remove road', 'change road')
+
+        for places_number in [int(number) for number in options['places'].split(',')]:
+            places_ids, roads = generate_map(places_number, extra_roads_number=places_number)
+
+            if options.get('skip-floyd-warshall'):
+                floyd_warshall_time = None
+            else:
+                floyd_warshall_time = measure(lambda: paths.PathsMatrix.build_floyd_warshall(places_ids, roads))
+
+            matrix = paths.PathsMatrix.build(places_ids, roads)
+            dijkstra_time = measure(lambda: paths.PathsMatrix.build(places_ids, roads))
+
+            point_1_id, point_2_id = random.sample(places_ids, 2)
+            new_road = paths.Road(id=len(roads)+1, point_1_id=point_1_id, point_2_id=point_2_id, length=1.0)
+            add_time = measure(lambda: matrix.copy().update(roads + [new_road]))
+
+            removed_road = random.choice(roads[places_number-1:])
+            remove_time = measure(lambda: matrix.copy().update([road for road in roads if road.id != removed_road.id], removed_roads=[removed_road]))
+
+            changed_road = random.choice(roads)
+            changed_roads = [road if road.id != changed_road.id else paths.Road(id=road.id, point_1_id=road.point_1_id, point_2_id=road.point_2_id, length=road.length+5)
+                             for road in roads]
+            change_time = measure(lambda: matrix.copy().update(changed_roads))
+
+            print '%8d %14s %14.4f %14.4f %14.4f %14.4f' % (places_number,
+                                                           '%.4f' % floyd_warshall_time if floyd_warshall_time is not None else '-',
+                                                           dijkstra_time,
+                                                           add_time,
+                                                           remove_time,
+                                                           change_time)
@@ -0,0 +1,309 @@
+# coding: utf-8
+import heapq
+import array
+
+
+NO_ROAD = -1
+
+INFINITE_LENGTH = float('inf')
+
+# length of waymark between places, which are not connected by roads
+# stored in float database field, so it must be float too: after database round trip long value is read back rounded
+UNREACHABLE_LENGTH = float(9999999999999999999999999999)
+
+# relative tolerance for comparison of lengths sums
+LENGTH_EPSILON = 1e-9
+
+
+class Road(object):
+    __slots__ = ('id', 'point_1_id', 'point_2_id', 'length')
+
+    def __init__(self, id, point_1_id, point_2_id, length):
+        self.id = id
+        self.point_1_id = point_1_id
+        self.point_2_id = point_2_id
+        self.length = length
+
+    @classmethod
+    def from_prototype(cls, road):
+        return cls(id=road.id, point_1_id=road.point_1_id, point_2_id=road.point_2_id, length=road.length)
+
+
+def waymark_length(length):
+    # length of stored waymark as length of path in matrix
+    if length >= UNREACHABLE_LENGTH:
+        return INFINITE_LENGTH
+    return length
+
+
+def _is_equal(a, b):
+    if a == INFINITE_LENGTH or b == INFINITE_LENGTH:
+        return a == b
+    return abs(a - b) <= LENGTH_EPSILON * max(1.0, abs(a), abs(b))
+
+
+def _is_less(a, b):
+    return a < b and not _is_equal(a, b)
+
+
+class PathsMatrix(object):
+    # all pairs shortest paths between places
+    # lengths[i*n+j] - length of shortest path from place i to place j
+    # roads[i*n+j] - id of first road on that path (NO_ROAD if there is no road)
+    # places are referenced by index, place_index contains place_id -> index mapping
+
+    __slots__ = ('places_ids', 'places_number', 'place_index', 'lengths', 'roads')
+
+    def __init__(self, places_ids):
+        self.places_ids = list(places_ids)
+        self.places_number = len(self.places_ids)
+        self.place_index = {place_id: i for i, place_id in enumerate(self.places_ids)}
+
+        n = self.places_number
+
+        self.lengths = array.array('d', [INFINITE_LENGTH]) * (n * n)
+        self.roads = array.array('l', [NO_ROAD]) * (n * n)
+
+        for i in xrange(n):
+            self.lengths[i*n+i] = 0.0
+
+    def copy(self):
+        matrix = PathsMatrix(self.places_ids)
+        matrix.lengths = array.array('d', self.lengths)
+        matrix.roads = array.array('l', self.roads)
+        return matrix
+
+    def get_length(self, place_from_id, place_to_id):
+        return self.lengths[self.place_index[place_from_id] * self.places_number + self.place_index[place_to_id]]
+
+    def get_road_id(self, place_from_id, place_to_id):
+        road_id = self.roads[self.place_index[place_from_id] * self.places_number + self.place_index[place_to_id]]
+        return road_id if road_id != NO_ROAD else None
+
+    def get_row(self, place_from_id):
+        # lengths of paths from place to all places in order of places_ids
+        offset = self.place_index[place_from_id] * self.places_number
+        return self.lengths[offset:offset+self.places_number]
+
+    def get_places_within(self, place_from_id, max_distance):
+        # sorted list of (length, place_id) for places not farther than max_distance
+        return sorted((length, place_id)
+                      for place_id, length in zip(self.places_ids, self.get_row(place_from_id))
+                      if length <= max_distance)
+
+    def set_path(self, place_from_id, place_to_id, length, road_id):
+        index = self.place_index[place_from_id] * self.places_number + self.place_index[place_to_id]
+        self.lengths[index] = length
+        self.roads[index] = road_id if road_id is not None else NO_ROAD
+
+    def changed_pairs(self, other):
+        n = self.places_number
+        return [(self.places_ids[k // n], self.places_ids[k % n])
+                for k in xrange(n * n)
+                if self.roads[k] != other.roads[k] or not _is_equal(self.lengths[k], other.lengths[k])]
+
+    def _adjacency(self, roads):
+        adjacency = [[] for i in xrange(self.places_number)]
+
+        for road in roads:
+            i = self.place_index[road.point_1_id]
+            j = self.place_index[road.point_2_id]
+            adjacency[i].append((j, road.length, road.id))
+            adjacency[j].append((i, road.length, road.id))
+
+        return adjacency
+
+    def _process_source(self, source, adjacency):
+        n = self.places_number
+
+        lengths = [INFINITE_LENGTH] * n
+        first_roads = [NO_ROAD] * n
+
+        lengths[source] = 0.0
+
+        queue = [(0.0, source)]
+
+        while queue:
+            length, i = heapq.heappop(queue)
+
+            if length > lengths[i]:
+                continue
+
+            for j, road_length, road_id in adjacency[i]:
+                new_length = length + road_length
+
+                if new_length < lengths[j]:
+                    lengths[j] = new_length
+                    first_roads[j] = road_id if i == source else first_roads[i]
+                    heapq.heappush(queue, (new_length, j))
+
+        offset = source * n
+
+        self.lengths[offset:offset+n] = array.array('d', lengths)
+        self.roads[offset:offset+n] = array.array('l', first_roads)
+
+    @classmethod
+    def build(cls, places_ids, roads):
+        matrix = cls(places_ids)
+
+        adjacency = matrix._adjacency(roads)
+
+        for source in xrange(matrix.places_number):
+            matrix._process_source(source, adjacency)
+
+        return matrix
+
+    def _add_road(self, road):
+        # O(n^2) update of all pairs after road was added or became shorter
+        n = self.places_number
+        lengths = self.lengths
+        roads = self.roads
+
+        u = self.place_index[road.point_1_id]
+        v = self.place_index[road.point_2_id]
+
+        for a, b in ((u, v), (v, u)):
+            row_b = lengths[b*n:b*n+n]
+
+            for i in xrange(n):
+                length_to_a = lengths[i*n+a]
+
+                if length_to_a == INFINITE_LENGTH:
+                    continue
+
+                base = length_to_a + road.length
+                first_road = road.id if i == a else roads[i*n+a]
+
+                offset = i * n
+
+                for j in xrange(n):
+                    new_length = base + row_b[j]
+
+                    if _is_less(new_length, lengths[offset+j]):
+                        lengths[offset+j] = new_length
+                        roads[offset+j] = first_road
+
+    def _affected_sources(self, u, v, old_length, road_id):
+        # sources, whose shortest paths can go through the road between places with indexes u and v
+        n = self.places_number
+        lengths = self.lengths
+        roads = self.roads
+
+        affected = set()
+
+        for i in xrange(n):
+            offset = i * n
+
+            length_to_u = lengths[offset+u]
+            length_to_v = lengths[offset+v]
+
+            for j in xrange(n):
+                if roads[offset+j] == road_id:
+                    affected.add(i)
+                    break
+
+                length = lengths[offset+j]
+
+                if length == INFINITE_LENGTH:
+                    continue
+
+                if (_is_equal(length_to_u + old_length + lengths[v*n+j], length) or
+                    _is_equal(length_to_v + old_length + lengths[u*n+j], length)):
+                    affected.add(i)
+                    break
+
+        return affected
+
+    def _used_roads(self):
+        return set(road_id for road_id in self.roads if road_id != NO_ROAD)
+
+    def update(self, roads, removed_roads=()):
+        # incremental update of matrix, which was built for some previous roads set
+        #   - sources, which shortest paths used removed or lengthened roads, are recalculated with Dijkstra algorithm
+        #   - new and shortened roads are inserted one by one with O(n^2) update of all pairs
+        # returns number of recalculated sources
+        n = self.places_number
+
+        roads = [road for road in roads if road.point_1_id in self.place_index and road.point_2_id in self.place_index]
+        current_roads = {road.id: road for road in roads}
+
+        known_roads = {road.id: road for road in removed_roads}
+        known_roads.update(current_roads)
+
+        improving_roads = [road for road in roads
+                           if _is_less(road.length, self.lengths[self.place_index[road.point_1_id]*n+self.place_index[road.point_2_id]])]
+        improving_ids = set(road.id for road in improving_roads)
+
+        affected_sources = set()
+
+        for road_id in self._used_roads():
+            if road_id not in known_roads or known_roads[road_id].point_1_id not in self.place_index or known_roads[road_id].point_2_id not in self.place_index:
+                # nothing known about road, so recalculate everything
+                affected_sources = set(xrange(n))
+                break
+
+            road = known_roads[road_id]
+
+            u = self.place_index[road.point_1_id]
+            v = self.place_index[road.point_2_id]
+
+            # road, used by shortest paths, always has length equal to distance between its places
+            old_length = self.lengths[u*n+v]
+
+            if road.id in current_roads and (road.id in improving_ids or _is_equal(road.length, old_length)):
+                continue
+
+            # road removed or become longer
+            affected_sources |= self._affected_sources(u, v, old_length, road_id)
+
+        if affected_sources:
+            # graph, for which not affected sources have actual shortest paths:
+            # new and shortened roads are taken with the old distance between their places
+            intermediate_roads = []
+
+            for road in roads:
+                if road.id not in improving_ids:
+                    intermediate_roads.append(road)
+                    continue
+
+                old_length = self.lengths[self.place_index[road.point_1_id]*n+self.place_index[road.point_2_id]]
+
+                if old_length != INFINITE_LENGTH:
+                    intermediate_roads.append(Road(id=road.id, point_1_id=road.point_1_id, point_2_id=road.point_2_id, length=old_length))
+
+            adjacency = self._adjacency(intermediate_roads)
+
+            for source in affected_sources:
+                self._process_source(source, adjacency)
+
+        for road in improving_roads:
+            self._add_road(road)
+
+        return len(affected_sources)
+
+    @classmethod
+    def build_floyd_warshall(cls, places_ids, roads):
+        # reference implementation, O(n^3)
+        matrix = cls(places_ids)
+
+        n = matrix.places_number
+        lengths = matrix.lengths
+        roads_ids = matrix.roads
+
+        for road in roads:
+            u = matrix.place_index[road.point_1_id]
+            v = matrix.place_index[road.point_2_id]
+            if road.length < lengths[u*n+v]:
+                lengths[u*n+v] = lengths[v*n+u] = road.length
+                roads_ids[u*n+v] = roads_ids[v*n+u] = road.id
+
+        for k in xrange(n):
+            for i in xrange(n):
+                length_to_k = lengths[i*n+k]
+                for j in xrange(n):
+                    new_length = length_to_k + lengths[k*n+j]
+                    if new_length < lengths[i*n+j]:
+                        lengths[i*n+j] = new_length
+                        roads_ids[i*n+j] = roads_ids[i*n+k]
+
+        return matrix
@@ -1,9 +1,11 @@
 # coding: utf-8
+import numbers
 
 from the_tale.common.utils import storage
 
 from the_tale.game.map.roads.prototypes import RoadPrototype, WaymarkPrototype
 from the_tale.game.map.roads import exceptions
+from the_tale.game.map.roads import paths
 
 
 class RoadsStorage(storage.Storage):
@@ -34,19 +36,56 @@ class WaymarksStorage(storage.CachedStorage):
 
     def _update_cached_data(self, item):
         self._waymarks_map[(item.point_from_id, item.point_to_id)] = item
+        self._paths_matrix = None
 
     def _reset_cache(self):
         self._waymarks_map = {}
+        self._paths_matrix = None
+
+    def reset_paths_matrix(self):
+        self._paths_matrix = None
+
+    def _build_paths_matrix(self):
+        places_ids = sorted(set(point_from_id for point_from_id, point_to_id in self._waymarks_map))
+
+        matrix = paths.PathsMatrix(places_ids)
+
+        for waymark in self._waymarks_map.itervalues():
+            matrix.set_path(waymark.point_from_id, waymark.point_to_id, paths.waymark_length(waymark.length), waymark.road_id)
+
+        return matrix
+
+    def get_paths_matrix(self):
+        self.sync()
+
+        if self._paths_matrix is None:
+            self._paths_matrix = self._build_paths_matrix()
+
+        return self._paths_matrix
 
     def look_for_road(self, point_from, point_to):
         self.sync()
 
-        if not isinstance(point_from, int):
+        if not isinstance(point_from, numbers.Integral):
             point_from = point_from.id
-        if not isinstance(point_to, int):
+        if not isinstance(point_to, numbers.Integral):
             point_to = point_to.id
 
         return  self._waymarks_map.get((point_from, point_to))
 
+    def get_distance(self, point_from, point_to):
+        if not isinstance(point_from, numbers.Integral):
+            point_from = point_from.id
+        if not isinstance(point_to, numbers.Integral):
+            point_to = point_to.id
+
+        return self.get_paths_matrix().get_length(point_from, point_to)
+
+    def get_places_within(self, point_from, max_distance):
+        if not isinstance(point_from, numbers.Integral):
+            point_from = point_from.id
+
+        return self.get_paths_matrix().get_places_within(point_from, max_distance)
+
 
 waymarks_storage = WaymarksStorage()
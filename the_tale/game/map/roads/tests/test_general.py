@@ -1,4 +1,6 @@
 # coding: utf-8
+import mock
+
 from the_tale.common.utils import testcase
 
 from the_tale.game.logic import create_test_map
@@ -6,7 +8,8 @@ from the_tale.game.logic import create_test_map
 from the_tale.game.map.roads.models import Road, Waymark
 from the_tale.game.map.roads.prototypes import RoadPrototype
 from the_tale.game.map.roads.storage import roads_storage, waymarks_storage
-from the_tale.game.map.roads.logic import update_waymarks
+from the_tale.game.map.roads.logic import update_waymarks, get_waymarks_matrix, UNREACHABLE_LENGTH
+from the_tale.game.map.roads import paths
 
 
 class GeneralTest(testcase.TestCase):
@@ -42,6 +45,55 @@ class GeneralTest(testcase.TestCase):
 
         self.assertNotEqual(r3.id, self.r1.id)
 
+    def test_update_waymarks__unreachable_place(self):
+        self.r2.exists = False
+        self.r2.save()
+
+        update_waymarks()
+
+        self.assertEqual(Waymark.objects.all().count(), 9)
+
+        waymark = waymarks_storage.look_for_road(point_from=self.p1.id, point_to=self.p3.id)
+        self.assertEqual(waymark.road, None)
+        self.assertEqual(waymark.length, UNREACHABLE_LENGTH)
+
+        self.r2.exists = True
+        self.r2.save()
+
+        update_waymarks()
+
+        waymark = waymarks_storage.look_for_road(point_from=self.p1.id, point_to=self.p3.id)
+        self.assertEqual(waymark.road.id, self.r1.id)
+        self.assertEqual(waymark.length, self.r1.length + self.r2.length)
+
+    def test_update_waymarks__unreachable_place__reloaded_from_database(self):
+        self.r2.exists = False
+        self.r2.save()
+
+        update_waymarks()
+
+        waymarks_storage.refresh()
+
+        waymark = waymarks_storage.look_for_road(point_from=self.p1.id, point_to=self.p3.id)
+        self.assertEqual(waymark.length, UNREACHABLE_LENGTH)
+
+        matrix, missed_pairs = get_waymarks_matrix([self.p1.id, self.p2.id, self.p3.id])
+
+        self.assertEqual(missed_pairs, [])
+        self.assertEqual(matrix.get_length(self.p1.id, self.p3.id), paths.INFINITE_LENGTH)
+        self.assertEqual(waymarks_storage.get_distance(self.p1.id, self.p3.id), paths.INFINITE_LENGTH)
+
+        with mock.patch('the_tale.common.utils.bulk.bulk_update') as bulk_update:
+            update_waymarks()
+
+        self.assertEqual(bulk_update.call_args_list, [mock.call(Waymark, [], fields=['road', 'length'])])
+
+    def test_update_waymarks__save_only_changed(self):
+        with mock.patch('the_tale.common.utils.bulk.bulk_update') as bulk_update:
+            update_waymarks()
+
+        self.assertEqual(bulk_update.call_args_list, [mock.call(Waymark, [], fields=['road', 'length'])])
+
     def test_roll_road(self):
         self.assertEqual(RoadPrototype._roll(5, 4, 13, 8), 'rdrrdrrdrrdr')
         self.assertEqual(RoadPrototype._roll(13, 8, 5, 4), 'llullullullu')
@@ -0,0 +1,118 @@
+# coding: utf-8
+import random
+
+from the_tale.common.utils import testcase
+
+from the_tale.game.map.roads import paths
+
+
+class PathsMatrixTests(testcase.TestCase):
+
+    def setUp(self):
+        super(PathsMatrixTests, self).setUp()
+
+        self.places_ids = [10, 20, 30, 40]
+
+        self.roads = [paths.Road(id=1, point_1_id=10, point_2_id=20, length=1.0),
+                      paths.Road(id=2, point_1_id=20, point_2_id=30, length=2.0),
+                      paths.Road(id=3, point_1_id=30, point_2_id=40, length=3.0)]
+
+    def random_map(self, places_number, next_road_id):
+        roads = []
+
+        for i in xrange(1, places_number):
+            roads.append(paths.Road(id=next_road_id+len(roads), point_1_id=i, point_2_id=random.randrange(i), length=float(random.randint(1, 10))))
+
+        for i in xrange(places_number):
+            point_1_id, point_2_id = random.sample(xrange(places_number), 2)
+            roads.append(paths.Road(id=next_road_id+len(roads), point_1_id=point_1_id, point_2_id=point_2_id, length=float(random.randint(1, 10))))
+
+        return roads
+
+    def check_matrices_equal(self, matrix_1, matrix_2):
+        self.assertEqual(list(matrix_1.lengths), list(matrix_2.lengths))
+
+    def test_build(self):
+        matrix = paths.PathsMatrix.build(self.places_ids, self.roads)
+
+        self.assertEqual(matrix.get_length(10, 40), 6.0)
+        self.assertEqual(matrix.get_road_id(10, 40), 1)
+        self.assertEqual(matrix.get_road_id(40, 10), 3)
+        self.assertEqual(matrix.get_length(30, 30), 0.0)
+        self.assertEqual(matrix.get_road_id(30, 30), None)
+
+    def test_build__unreachable(self):
+        matrix = paths.PathsMatrix.build(self.places_ids + [50], self.roads)
+
+        self.assertEqual(matrix.get_length(10, 50), paths.INFINITE_LENGTH)
+        self.assertEqual(matrix.get_road_id(10, 50), None)
+
+    def test_build__equal_to_floyd_warshall(self):
+        random.seed(1)
+
+        for i in xrange(10):
+            places_ids = range(20)
+            roads = self.random_map(len(places_ids), next_road_id=1)
+            self.check_matrices_equal(paths.PathsMatrix.build(places_ids, roads),
+                                      paths.PathsMatrix.build_floyd_warshall(places_ids, roads))
+
+    def test_changed_pairs(self):
+        matrix = paths.PathsMatrix.build(self.places_ids, self.roads)
+        new_matrix = matrix.copy()
+
+        self.assertEqual(new_matrix.update(self.roads + [paths.Road(id=4, point_1_id=10, point_2_id=40, length=1.0)]), 0)
+
+        self.assertEqual(set(new_matrix.changed_pairs(matrix)), set([(10, 40), (40, 10), (20, 40), (40, 20)]))
+
+    def test_update__add_road(self):
+        matrix = paths.PathsMatrix.build(self.places_ids, self.roads)
+
+        road = paths.Road(id=4, point_1_id=10, point_2_id=40, length=1.0)
+
+        self.assertEqual(matrix.update(self.roads + [road]), 0)
+
+        self.assertEqual(matrix.get_length(10, 40), 1.0)
+        self.assertEqual(matrix.get_road_id(10, 40), 4)
+        self.assertEqual(matrix.get_length(20, 40), 2.0)
+        self.assertEqual(matrix.get_road_id(20, 40), 1)
+
+    def test_update__remove_road(self):
+        matrix = paths.PathsMatrix.build(self.places_ids, self.roads)
+
+        self.assertEqual(matrix.update(self.roads[:2], removed_roads=self.roads[2:]), 4)
+
+        self.assertEqual(matrix.get_length(10, 40), paths.INFINITE_LENGTH)
+        self.assertEqual(matrix.get_road_id(10, 40), None)
+        self.assertEqual(matrix.get_length(10, 30), 3.0)
+
+    def test_update__unknown_road(self):
+        matrix = paths.PathsMatrix.build(self.places_ids, self.roads)
+
+        self.assertEqual(matrix.update(self.roads[:2]), 4)
+
+        self.assertEqual(matrix.get_length(10, 40), paths.INFINITE_LENGTH)
+
+    def test_update__equal_to_rebuild(self):
+        random.seed(2)
+
+        for i in xrange(20):
+            places_ids = range(15)
+            roads = self.random_map(len(places_ids), next_road_id=1)
+            next_road_id = len(roads) + 1
+
+            matrix = paths.PathsMatrix.build(places_ids, roads)
+
+            for j in xrange(5):
+                removed_roads = [roads.pop(random.randrange(len(roads)))]
+
+                index = random.randrange(len(roads))
+                road = roads[index]
+                roads[index] = paths.Road(id=road.id, point_1_id=road.point_1_id, point_2_id=road.point_2_id, length=float(random.randint(1, 10)))
+
+                point_1_id, point_2_id = random.sample(places_ids, 2)
+                roads.append(paths.Road(id=next_road_id, point_1_id=point_1_id, point_2_id=point_2_id, length=float(random.randint(1, 10))))
+                next_road_id += 1
+
+                matrix.update(roads, removed_roads=removed_roads)
+
+                self.check_matrices_equal(matrix, paths.PathsMatrix.build(places_ids, roads))
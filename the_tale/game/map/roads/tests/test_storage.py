@@ -8,7 +8,7 @@ from dext.settings import settings
 from the_tale.game.logic import create_test_map
 
 from the_tale.game.map.roads.models import Road
-from the_tale.game.map.roads.storage import RoadsStorage
+from the_tale.game.map.roads.storage import RoadsStorage, WaymarksStorage
 from the_tale.game.map.roads import exceptions
 
 class RoadsStorageTest(testcase.TestCase):
@@ -71,3 +71,51 @@ class RoadsStorageTest(testcase.TestCase):
         road = Road.objects.order_by('?')[0]
         self.assertTrue(road.id in self.storage)
         self.assertFalse(666 in self.storage)
+
+
+class WaymarksStorageTest(testcase.TestCase):
+
+    def setUp(self):
+        super(WaymarksStorageTest, self).setUp()
+        self.p1, self.p2, self.p3 = create_test_map()
+        self.storage = WaymarksStorage()
+        self.storage.sync()
+
+    def test_get_paths_matrix(self):
+        matrix = self.storage.get_paths_matrix()
+
+        self.assertEqual(set(matrix.places_ids), set([self.p1.id, self.p2.id, self.p3.id]))
+
+        for place_from in (self.p1, self.p2, self.p3):
+            for place_to in (self.p1, self.p2, self.p3):
+                waymark = self.storage.look_for_road(place_from, place_to)
+                self.assertEqual(matrix.get_length(place_from.id, place_to.id), waymark.length)
+                self.assertEqual(matrix.get_road_id(place_from.id, place_to.id), waymark.road_id)
+
+    def test_get_paths_matrix__cached(self):
+        self.assertTrue(self.storage.get_paths_matrix() is self.storage.get_paths_matrix())
+
+    def test_get_paths_matrix__reset_on_update(self):
+        matrix = self.storage.get_paths_matrix()
+
+        self.storage._update_cached_data(self.storage.look_for_road(self.p1, self.p2))
+
+        self.assertFalse(matrix is self.storage.get_paths_matrix())
+
+    def test_get_distance(self):
+        self.assertEqual(self.storage.get_distance(self.p1, self.p3), self.storage.look_for_road(self.p1, self.p3).length)
+        self.assertEqual(self.storage.get_distance(self.p1.id, self.p3.id), self.storage.look_for_road(self.p1, self.p3).length)
+
+    def test_long_ids(self):
+        self.assertEqual(self.storage.look_for_road(long(self.p1.id), long(self.p3.id)), self.storage.look_for_road(self.p1, self.p3))
+        self.assertEqual(self.storage.get_distance(long(self.p1.id), long(self.p3.id)), self.storage.look_for_road(self.p1, self.p3).length)
+        self.assertEqual(self.storage.get_places_within(long(self.p1.id), 0), [(0.0, self.p1.id)])
+
+    def test_get_places_within(self):
+        length_1_2 = self.storage.look_for_road(self.p1, self.p2).length
+        length_1_3 = self.storage.look_for_road(self.p1, self.p3).length
+
+        self.assertEqual(self.storage.get_places_within(self.p1, length_1_2),
+                         [(0.0, self.p1.id), (length_1_2, self.p2.id)])
+        self.assertEqual(self.storage.get_places_within(self.p1.id, length_1_3),
+                         [(0.0, self.p1.id), (length_1_2, self.p2.id), (length_1_3, self.p3.id)])
@@ -0,0 +1,158 @@
+# coding: utf-8
+import os
+import shutil
+import tempfile
+
+from dext.common.utils import s11n
+
+from the_tale.common.utils import testcase
+
+from the_tale.game.map.generator import chunks
+
+
+class ChunksTests(testcase.TestCase):
+
+    def setUp(self):
+        super(ChunksTests, self).setUp()
+
+        self.rows = [[(x, y) for x in xrange(5)] for y in xrange(3)]
+
+        self.output_dir = tempfile.mkdtemp()
+        self.output_template = os.path.join(self.output_dir, 'chunks', 'chunk-%s.js')
+        self.index_template = os.path.join(self.output_dir, 'index-%s.js')
+
+        # files, which do not match templates, must never be removed
+        chunks.write_file(os.path.join(self.output_dir, 'other.js'), 'content')
+
+    def tearDown(self):
+        super(ChunksTests, self).tearDown()
+        shutil.rmtree(self.output_dir)
+
+    def test_split_to_chunks(self):
+        result = chunks.split_to_chunks(self.rows, 2)
+
+        self.assertEqual(set(result.keys()), set([(0, 0), (1, 0), (2, 0), (0, 1), (1, 1), (2, 1)]))
+
+        self.assertEqual(result[(0, 0)], [[(0, 0), (1, 0)], [(0, 1), (1, 1)]])
+        self.assertEqual(result[(2, 0)], [[(4, 0)], [(4, 1)]])
+        self.assertEqual(result[(1, 1)], [[(2, 2), (3, 2)]])
+        self.assertEqual(result[(2, 1)], [[(4, 2)]])
+
+    def test_split_to_chunks__restore(self):
+        result = chunks.split_to_chunks(self.rows, 2)
+
+        for (chunk_x, chunk_y), chunk in result.iteritems():
+            for y, row in enumerate(chunk):
+                for x, cell in enumerate(row):
+                    self.assertEqual(cell, self.rows[chunk_y*2+y][chunk_x*2+x])
+
+    def test_write_chunks(self):
+        index, written = chunks.write_chunks(chunks.split_to_chunks(self.rows, 2), self.output_template)
+
+        self.assertEqual(written, 6)
+        self.assertEqual(len(index), 6)
+
+        with open(self.output_template % index[chunks.chunk_key(1, 1)]) as f:
+            self.assertEqual(s11n.from_json(f.read()), [[[2, 2], [3, 2]]])
+
+    def test_write_chunks__only_changed(self):
+        old_index, written = chunks.write_chunks(chunks.split_to_chunks(self.rows, 2), self.output_template)
+
+        self.rows[2][4] = (0, 0)
+
+        new_index, written = chunks.write_chunks(chunks.split_to_chunks(self.rows, 2), self.output_template)
+
+        self.assertEqual(written, 1)
+
+        self.assertEqual(set(key for key in new_index if new_index[key] != old_index[key]), set([chunks.chunk_key(2, 1)]))
+
+        self.assertEqual(len(os.listdir(os.path.dirname(self.output_template))), 7)
+
+    def test_write_chunks__same_chunks(self):
+        rows = [[1] * 4 for y in xrange(4)]
+
+        index, written = chunks.write_chunks(chunks.split_to_chunks(rows, 2), self.output_template)
+
+        self.assertEqual(written, 1)
+        self.assertEqual(len(set(index.values())), 1)
+
+    def test_remove_unused_chunks(self):
+        old_index, written = chunks.write_chunks(chunks.split_to_chunks(self.rows, 2), self.output_template)
+
+        self.rows[2][4] = (0, 0)
+
+        new_index, written = chunks.write_chunks(chunks.split_to_chunks(self.rows, 2), self.output_template)
+
+        other_file = os.path.join(os.path.dirname(self.output_template), 'other.js')
+        chunks.write_file(other_file, 'content')
+
+        self.assertEqual(chunks.remove_unused_chunks([new_index], self.output_template), 1)
+
+        self.assertFalse(os.path.exists(self.output_template % old_index[chunks.chunk_key(2, 1)]))
+        self.assertTrue(os.path.exists(other_file))
+
+        for content_hash in new_index.itervalues():
+            self.assertTrue(os.path.exists(self.output_template % content_hash))
+
+    def test_remove_unused_chunks__nothing_to_remove(self):
+        index, written = chunks.write_chunks(chunks.split_to_chunks(self.rows, 2), self.output_template)
+        self.assertEqual(chunks.remove_unused_chunks([index], self.output_template), 0)
+
+    def test_remove_unused_chunks__referenced_by_old_index(self):
+        old_index, written = chunks.write_chunks(chunks.split_to_chunks(self.rows, 2), self.output_template)
+
+        self.rows[2][4] = (0, 0)
+
+        new_index, written = chunks.write_chunks(chunks.split_to_chunks(self.rows, 2), self.output_template)
+
+        self.assertEqual(chunks.remove_unused_chunks([new_index, old_index], self.output_template), 0)
+
+        for content_hash in old_index.itervalues():
+            self.assertTrue(os.path.exists(self.output_template % content_hash))
+
+    def test_remove_unused_chunks__no_directory(self):
+        self.assertEqual(chunks.remove_unused_chunks([], self.output_template), 0)
+
+    def write_indexes(self, versions):
+        for i, version in enumerate(versions):
+            filename = self.index_template % version
+            chunks.write_file(filename, s11n.to_json({'chunks': {}}))
+            os.utime(filename, (1000 + i, 1000 + i))
+
+    def test_remove_old_indexes(self):
+        self.write_indexes(['v1', 'v2', 'v3', 'v4'])
+
+        kept = chunks.remove_old_indexes(self.index_template, current_version='v4', keep_versions=2)
+
+        self.assertEqual(kept, [self.index_template % 'v4', self.index_template % 'v3'])
+        self.assertEqual(sorted(os.listdir(self.output_dir)), ['index-v3.js', 'index-v4.js', 'other.js'])
+
+    def test_remove_old_indexes__current_is_kept(self):
+        # current index can have older modification time (for example, if map version was rolled back)
+        self.write_indexes(['v1', 'v2', 'v3'])
+
+        kept = chunks.remove_old_indexes(self.index_template, current_version='v1', keep_versions=1)
+
+        self.assertEqual(kept, [self.index_template % 'v1'])
+        self.assertEqual(sorted(os.listdir(self.output_dir)), ['index-v1.js', 'other.js'])
+
+    def test_load_index(self):
+        self.write_indexes(['v1'])
+        self.assertEqual(chunks.load_index(self.index_template % 'v1'), {'chunks': {}})
+
+    def test_load_draw_info(self):
+        index, written = chunks.write_chunks(chunks.split_to_chunks(self.rows, 2), self.output_template)
+
+        draw_info = chunks.load_draw_info({'width': 5, 'height': 3, 'chunk_size': 2, 'chunks': index}, self.output_template)
+
+        self.assertEqual(draw_info, [[[x, y] for x in xrange(5)] for y in xrange(3)])
+
+    def test_write_file(self):
+        filename = os.path.join(self.output_dir, 'subdir', 'file.js')
+
+        chunks.write_file(filename, 'content')
+
+        with open(filename) as f:
+            self.assertEqual(f.read(), 'content')
+
+        self.assertEqual(os.listdir(os.path.dirname(filename)), ['file.js'])
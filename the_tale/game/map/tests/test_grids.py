@@ -0,0 +1,64 @@
+# coding: utf-8
+
+from the_tale.common.utils import testcase
+
+from the_tale.game.map import grids
+from the_tale.game.map.relations import TERRAIN
+
+
+class GridTests(testcase.TestCase):
+
+    def setUp(self):
+        super(GridTests, self).setUp()
+        self.rows = [[0, 1, 2],
+                     [3, 4, 5]]
+        self.grid = grids.Grid.from_rows(self.rows)
+
+    def test_create(self):
+        grid = grids.Grid(width=3, height=2)
+        self.assertEqual(grid.rows(), [[0, 0, 0], [0, 0, 0]])
+
+    def test_from_rows(self):
+        self.assertEqual((self.grid.width, self.grid.height), (3, 2))
+        self.assertEqual(self.grid.rows(), self.rows)
+
+    def test_access(self):
+        self.assertEqual(self.grid[1][0], 3)
+        self.assertEqual(self.grid.get(0, 1), 3)
+        self.assertEqual(self.grid[-1][-1], 5)
+        self.assertEqual(len(self.grid), 2)
+        self.assertEqual(len(self.grid[0]), 3)
+
+    def test_access__out_of_range(self):
+        self.assertRaises(IndexError, lambda: self.grid[2])
+        self.assertRaises(IndexError, lambda: self.grid[0][3])
+
+    def test_set(self):
+        self.grid[1][2] = 7
+        self.grid.set(0, 0, 8)
+        self.assertEqual(self.grid.rows(), [[8, 1, 2], [3, 4, 7]])
+
+    def test_serialization(self):
+        self.assertEqual(grids.Grid.deserialize(self.grid.serialize()).rows(), self.rows)
+
+
+class RelationGridTests(testcase.TestCase):
+
+    def setUp(self):
+        super(RelationGridTests, self).setUp()
+        self.rows = [[TERRAIN.WATER_DEEP, TERRAIN.HILLS_SAND],
+                     [TERRAIN.PLANE_MUD, TERRAIN.WATER_DEEP]]
+        self.grid = grids.RelationGrid.from_rows(self.rows, relation=TERRAIN)
+
+    def test_access(self):
+        self.assertEqual(self.grid[0][1], TERRAIN.HILLS_SAND)
+        self.assertEqual(self.grid.get(0, 1), TERRAIN.PLANE_MUD)
+
+    def test_set(self):
+        self.grid[0][1] = TERRAIN.PLANE_GRASS
+        self.assertEqual(self.grid.values[1], TERRAIN.PLANE_GRASS.value)
+        self.assertEqual(self.grid[0][1], TERRAIN.PLANE_GRASS)
+
+    def test_serialization(self):
+        grid = grids.RelationGrid.deserialize(self.grid.serialize(), relation=TERRAIN)
+        self.assertEqual(grid.rows(), self.rows)
@@ -1,11 +1,17 @@
 # coding: utf-8
 
+from dext.common.utils import s11n
+
 from the_tale.common.utils.testcase import TestCase
 
 from the_tale.game.logic import create_test_map
 
 from the_tale.game.map.conf import map_settings
 from the_tale.game.map.storage import map_info_storage
+from the_tale.game.map.models import MapInfo
+from the_tale.game.map.prototypes import MapInfoPrototype
+from the_tale.game.map.relations import TERRAIN
+from the_tale.game.map.generator import drawer
 
 
 class PrototypeTests(TestCase):
@@ -29,3 +35,29 @@ class PrototypeTests(TestCase):
                     self.assertEqual(map_info.get_dominant_place(x, y), None)
                 else:
                     self.assertEqual(place_id, map_info.get_dominant_place(x, y).id)
+
+    def test_terrain(self):
+        terrain = map_info_storage.item.terrain
+
+        self.assertEqual(len(terrain), map_settings.HEIGHT)
+        self.assertEqual(len(terrain[0]), map_settings.WIDTH)
+        self.assertTrue(all(cell.is_PLANE_GREENWOOD for row in terrain for cell in row))
+
+    def test_terrain__old_format(self):
+        map_info = MapInfoPrototype(MapInfo.objects.get(id=map_info_storage.item.id))
+
+        map_info._model.terrain = s11n.to_json([[TERRAIN.WATER_DEEP.value, TERRAIN.HILLS_SAND.value],
+                                                [TERRAIN.PLANE_MUD.value, TERRAIN.WATER_DEEP.value]])
+
+        self.assertEqual(map_info.terrain.rows(), [[TERRAIN.WATER_DEEP, TERRAIN.HILLS_SAND],
+                                                   [TERRAIN.PLANE_MUD, TERRAIN.WATER_DEEP]])
+
+    def test_terrain__serialization(self):
+        map_info = MapInfoPrototype(MapInfo.objects.get(id=map_info_storage.item.id))
+        self.assertEqual(map_info.terrain.rows(), map_info_storage.item.terrain.rows())
+
+    def test_roads_map(self):
+        roads_map = map_info_storage.item.roads_map
+
+        self.assertEqual((roads_map.width, roads_map.height), (map_settings.WIDTH, map_settings.HEIGHT))
+        self.assertTrue(roads_map.get(self.place_1.x, self.place_1.y) & drawer.ROAD)
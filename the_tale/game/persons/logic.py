@@ -66,10 +66,13 @@ def get_next_connection_minimum_distance(person):
 
     minimum_distance = conf.settings.SOCIAL_CONNECTIONS_MINIMUM * c.QUEST_AREA_RADIUS * conf.settings.SOCIAL_CONNECTIONS_AVERAGE_PATH_FRACTION
 
+    paths_matrix = waymarks_storage.get_paths_matrix()
+
+    distances = paths_matrix.get_row(person.place_id)
+
     for connected_person_id in storage.social_connections.get_connected_persons_ids(person):
         connected_person = storage.persons_storage[connected_person_id]
-        path_length = waymarks_storage.look_for_road(person.place, connected_person.place).length
-        minimum_distance -= path_length
+        minimum_distance -= distances[paths_matrix.place_index[connected_person.place_id]]
 
     return minimum_distance
 
@@ -84,6 +87,10 @@ def search_available_connections(person, minimum_distance=None):
     if minimum_distance is None:
         minimum_distance = get_next_connection_minimum_distance(person)
 
+    paths_matrix = waymarks_storage.get_paths_matrix()
+
+    distances = paths_matrix.get_row(person.place_id)
+
     for candidate in persons:
         if candidate.id in excluded_persons_ids:
             continue
@@ -91,7 +98,7 @@ def search_available_connections(person, minimum_distance=None):
         if person.place_id == candidate.place_id:
             continue
 
-        path_length = waymarks_storage.look_for_road(person.place, candidate.place).length
+        path_length = distances[paths_matrix.place_index[candidate.place_id]]
 
         if path_length > c.QUEST_AREA_RADIUS:
             continue
@@ -0,0 +1,200 @@
+# coding: utf-8
+import os
+import time
+import bisect
+import marshal
+import tempfile
+import pstats
+import cProfile
+import contextlib
+import collections
+
+
+# histogram buckets borders in seconds (upper bound of every bucket, last bucket is unbounded)
+HISTOGRAM_BORDERS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+class Histogram(object):
+    __slots__ = ('counts', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(HISTOGRAM_BORDERS) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(HISTOGRAM_BORDERS, value)] += 1
+        self.total += value
+        if self.max < value:
+            self.max = value
+
+    def merge(self, other):
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.total += other.total
+        if self.max < other.max:
+            self.max = other.max
+
+    def serialize(self):
+        return {'counts': list(self.counts),
+                'total': self.total,
+                'max': self.max}
+
+    @classmethod
+    def deserialize(cls, data):
+        histogram = cls()
+        histogram.counts = list(data['counts'])
+        histogram.total = data['total']
+        histogram.max = data['max']
+        return histogram
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def percentile(self, fraction):
+        border = fraction * self.count
+
+        accumulated = 0
+
+        for i, count in enumerate(self.counts):
+            accumulated += count
+            if accumulated >= border and accumulated > 0:
+                return HISTOGRAM_BORDERS[i] if i < len(HISTOGRAM_BORDERS) else self.max
+
+        return 0.0
+
+    def ui_info(self):
+        count = self.count
+        return {'count': count,
+                'total': self.total,
+                'average': self.total / count if count else 0.0,
+                'max': self.max,
+                'p50': self.percentile(0.5),
+                'p95': self.percentile(0.95),
+                'p99': self.percentile(0.99),
+                'buckets': list(self.counts)}
+
+
+class TurnProfiler(object):
+
+    def __init__(self, history_length):
+        self.history = collections.deque(maxlen=history_length)
+        self.current = None
+        self.turn_started_at = None
+
+        self.counters_history = collections.deque(maxlen=history_length)
+        self.current_counters = None
+
+        self.profile = None
+        self.profile_turns = 0
+        self.profile_file = None
+
+    def start_turn(self):
+        self.current = collections.defaultdict(Histogram)
+        self.current_counters = collections.Counter()
+        self.turn_started_at = time.time()
+
+        if self.profile is not None:
+            self.profile.enable()
+
+    def finish_turn(self):
+        if self.current is None:
+            return
+
+        self.add('turn', time.time() - self.turn_started_at)
+
+        self.history.append(self.current)
+        self.current = None
+
+        self.counters_history.append(self.current_counters)
+        self.current_counters = None
+
+        if self.profile is not None:
+            self.profile.disable()
+            self.profile_turns -= 1
+
+            if self.profile_turns <= 0:
+                self.dump_profile()
+
+    def add(self, section, value):
+        if self.current is None:
+            return
+        self.current[section].add(value)
+
+    def add_counters(self, counters):
+        # counters of events (cache hits, etc.), happened during turn
+        if self.current_counters is None:
+            return
+        self.current_counters.update(counters)
+
+    def serialize_current(self):
+        # histograms of current turn, used to pass measurements from forked processes (see merge_current)
+        if self.current is None:
+            return {}
+        return {section: histogram.serialize() for section, histogram in self.current.iteritems()}
+
+    def merge_current(self, histograms):
+        if self.current is None:
+            return
+        for section, data in histograms.iteritems():
+            self.current[section].merge(Histogram.deserialize(data))
+
+    @contextlib.contextmanager
+    def measure(self, section):
+        started_at = time.time()
+        try:
+            yield
+        finally:
+            self.add(section, time.time() - started_at)
+
+    def histograms(self):
+        histograms = collections.defaultdict(Histogram)
+
+        for turn_histograms in self.history:
+            for section, histogram in turn_histograms.iteritems():
+                histograms[section].merge(histogram)
+
+        return histograms
+
+    def counters(self):
+        counters = collections.Counter()
+
+        for turn_counters in self.counters_history:
+            counters.update(turn_counters)
+
+        return dict(counters)
+
+    def statistics(self):
+        return {'turns': len(self.history),
+                'sections': {section: histogram.ui_info() for section, histogram in self.histograms().iteritems()},
+                'counters': self.counters()}
+
+    def start_profile(self, turns, profile_file):
+        self.profile = cProfile.Profile()
+        self.profile_turns = turns
+        self.profile_file = profile_file
+
+    def dump_profile(self):
+        profile = self.profile
+        self.profile = None
+
+        dirname = os.path.dirname(self.profile_file)
+
+        if not os.path.exists(dirname):
+            os.makedirs(dirname, 0700)
+
+        # same as profile.dump_stats, but file is not opened by predictable name, which can be replaced with symlink:
+        # temporary file is created with unique name and 0600 permissions in the same directory, so rename is atomic
+        descriptor, tmp_filename = tempfile.mkstemp(dir=dirname, prefix='%s.' % os.path.basename(self.profile_file), suffix='.tmp')
+
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                profile.create_stats()
+                marshal.dump(profile.stats, f)
+            os.rename(tmp_filename, self.profile_file)
+        except:
+            os.remove(tmp_filename)
+            raise
+
+        return pstats.Stats(self.profile_file)
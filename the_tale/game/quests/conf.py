@@ -9,4 +9,5 @@ APP_DIR = os.path.abspath(os.path.dirname(__file__))
 quests_settings = app_settings('QUESTS',
                                WRITERS_DIRECTORY=os.path.join(APP_DIR, 'fixtures', 'writers'),
                                MAX_QUEST_GENERATION_RETRIES=100,
+                               GENERATORS_NUMBER=2,
                                INTERFERED_PERSONS_LIVE_TIME=24*60*60)
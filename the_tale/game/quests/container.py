@@ -8,19 +8,21 @@ from the_tale.game.quests.conf import quests_settings
 
 class QuestsContainer(object):
 
-    __slots__ = ('updated', 'quests_list', 'history', 'interfered_persons', 'hero', '_ui_info')
+    __slots__ = ('updated', 'quests_list', 'history', 'interfered_persons', 'hero', '_ui_info', 'ui_info_version')
 
     def __init__(self):
         self.quests_list = []
         self.history = {}
         self.interfered_persons = {}
         self.hero = None
+        self.ui_info_version = 0
 
         self.mark_updated()
 
     def mark_updated(self):
         self.updated = True
         self._ui_info = None
+        self.ui_info_version += 1
 
     def serialize(self):
         return {'quests': [quest.serialize() for quest in self.quests_list],
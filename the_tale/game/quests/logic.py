@@ -19,6 +19,7 @@ from questgen.relations import PLACE_TYPE as QUEST_PLACE_TYPE
 
 from the_tale import amqp_environment
 
+from the_tale.common.utils import codec
 from the_tale.common.utils.logic import shuffle_values_by_priority
 
 from the_tale.game.balance import constants as c
@@ -172,56 +173,99 @@ def fact_social_connection(connection_type, person_uid, connected_person_uid):
 def fact_located_in(person):
     return facts.LocatedIn(object=uids.person(person.id), place=uids.place(person.place.id))
 
-def fill_places_for_first_quest(kb, hero_info):
-    best_distance = c.QUEST_AREA_MAXIMUM_RADIUS
-    best_destination = None
 
-    for place in places_storage.all():
-        if place.id == hero_info.position_place_id:
-            continue
-        path_length = waymarks_storage.look_for_road(places_storage[hero_info.position_place_id], place).length
-        if path_length < best_distance:
-            best_distance = path_length
-            best_destination = place
+class WorldFacts(object):
+    # facts, which are equal for all heroes
+    # rebuilt only after change of places, persons, social connections or map
 
-    kb += fact_place(best_destination)
-    kb += fact_place(places_storage[hero_info.position_place_id])
+    def __init__(self):
+        self.version = None
+        self.places = {}
+        self.persons = {}
+        self.places_persons = {}
+        self.social_connections = {}
 
+    def get_version(self):
+        from the_tale.game.map.storage import map_info_storage
+
+        storages = (places_storage,
+                    persons_storage.persons_storage,
+                    persons_storage.social_connections,
+                    map_info_storage)
+
+        for storage in storages:
+            storage.sync()
+
+        return tuple(storage._version for storage in storages)
+
+    def sync(self):
+        version = self.get_version()
+
+        if version == self.version:
+            return
+
+        self.refresh()
+
+        self.version = version
+
+    def refresh(self):
+        self.places = {place.id: fact_place(place) for place in places_storage.all()}
+
+        self.persons = {}
+        self.places_persons = {place_id: [] for place_id in self.places}
+        self.social_connections = {}
+
+        for person in persons_storage.persons_storage.filter(state=PERSON_STATE.IN_GAME):
+            f_person = fact_person(person)
+            self.persons[person.id] = f_person
+            self.places_persons[person.place_id].append((f_person, facts.LocatedIn(object=f_person.uid, place=uids.place(person.place_id))))
+            self.social_connections[person.id] = persons_storage.social_connections.get_person_connections(person)
 
-def fill_places(kb, hero_info, max_distance):
-    places = []
 
-    for place in places_storage.all():
-        path_length = waymarks_storage.look_for_road(places_storage[hero_info.position_place_id], place).length
+WORLD_FACTS = WorldFacts()
 
-        if path_length > max_distance:
+
+def get_world_facts():
+    WORLD_FACTS.sync()
+    return WORLD_FACTS
+
+
+def fill_places_for_first_quest(kb, hero_info):
+    best_destination = None
+
+    for path_length, place_id in waymarks_storage.get_places_within(hero_info.position_place_id, c.QUEST_AREA_MAXIMUM_RADIUS):
+        if place_id == hero_info.position_place_id:
             continue
+        if path_length < c.QUEST_AREA_MAXIMUM_RADIUS:
+            best_destination = place_id
+        break
 
-        places.append((path_length, place))
+    world_facts = get_world_facts()
 
-    places.sort()
+    kb += world_facts.places[best_destination]
+    kb += world_facts.places[hero_info.position_place_id]
 
 
-    chosen_places = []
+def fill_places(kb, hero_info, max_distance):
+    paths_matrix = waymarks_storage.get_paths_matrix()
 
-    for base_distance, place in places:
-        for chosen_place in chosen_places:
-            path_length = waymarks_storage.look_for_road(chosen_place, place).length
+    chosen_places_ids = []
 
-            if path_length > max_distance:
-                break
+    for base_distance, place_id in paths_matrix.get_places_within(hero_info.position_place_id, max_distance):
+        distances = paths_matrix.get_row(place_id)
 
-        else:
-            chosen_places.append(place)
+        if all(distances[paths_matrix.place_index[chosen_place_id]] <= max_distance for chosen_place_id in chosen_places_ids):
+            chosen_places_ids.append(place_id)
 
+    world_facts = get_world_facts()
 
-    for place in chosen_places:
-        uid = uids.place(place.id)
+    for place_id in chosen_places_ids:
+        uid = uids.place(place_id)
 
         if uid in kb:
             continue
 
-        kb += fact_place(place)
+        kb += world_facts.places[place_id]
 
 
 def setup_places(kb, hero_info):
@@ -234,7 +278,7 @@ def setup_places(kb, hero_info):
 
     hero_position_uid = uids.place(hero_info.position_place_id)
     if hero_position_uid not in kb:
-        kb += fact_place(places_storage[hero_info.position_place_id])
+        kb += get_world_facts().places[hero_info.position_place_id]
 
     kb += facts.LocatedIn(object=uids.hero(hero_info.id), place=hero_position_uid)
 
@@ -243,24 +287,21 @@ def setup_places(kb, hero_info):
 
 
 def setup_persons(kb, hero_info):
-    for person in persons_storage.persons_storage.filter(state=PERSON_STATE.IN_GAME):
-        place_uid = uids.place(person.place.id)
+    world_facts = get_world_facts()
 
-        if place_uid not in kb:
-            continue
-
-        f_person = fact_person(person)
-        kb += f_person
-        kb += facts.LocatedIn(object=f_person.uid, place=place_uid)
+    for f_place in list(kb.filter(facts.Place)):
+        for f_person, f_located_in in world_facts.places_persons.get(f_place.externals['id'], ()):
+            kb += f_person
+            kb += f_located_in
 
 
 def setup_social_connections(kb):
+    world_facts = get_world_facts()
+
     persons_in_kb = {f_person.externals['id']: f_person.uid for f_person in kb.filter(facts.Person)}
 
     for person_id, person_uid in persons_in_kb.iteritems():
-        person = persons_storage.persons_storage[person_id]
-
-        for connection_type, connected_person_id in persons_storage.social_connections.get_person_connections(person):
+        for connection_type, connected_person_id in world_facts.social_connections.get(person_id, ()):
             if connected_person_id not in persons_in_kb:
                 continue
             kb += fact_social_connection(connection_type, person_uid, persons_in_kb[connected_person_id])
@@ -331,9 +372,9 @@ def get_knowledge_base(hero_info, without_restrictions=False): # pylint: disable
 
     if not without_restrictions:
 
-        for person in persons_storage.persons_storage.filter(state=PERSON_STATE.IN_GAME):
-            if person.place.id == hero_info.position_place_id and person.id in hero_info.interfered_persons:
-                kb += facts.NotFirstInitiator(person=uids.person(person.id))
+        for f_person, f_located_in in get_world_facts().places_persons.get(hero_info.position_place_id, ()):
+            if f_person.externals['id'] in hero_info.interfered_persons:
+                kb += facts.NotFirstInitiator(person=f_person.uid)
 
     kb.validate_consistency(WORLD_RESTRICTIONS)
 
@@ -436,7 +477,9 @@ def create_hero_info(hero):
 
 def request_quest_for_hero(hero):
     hero_info = create_hero_info(hero)
-    amqp_environment.environment.workers.quests_generator.cmd_request_quest(hero.account_id, hero_info.serialize())
+    # requests of one hero always go to the same generator, so repeated requests replace each other in its queue
+    quests_generators = amqp_environment.environment.quests_generators
+    quests_generators[hero.account_id % len(quests_generators)].cmd_request_quest(hero.account_id, hero_info.serialize())
 
 
 def setup_quest_for_hero(hero, knowledge_base_data):
@@ -445,6 +488,9 @@ def setup_quest_for_hero(hero, knowledge_base_data):
     if not hero.actions.current_action.searching_quest:
         return
 
+    if isinstance(knowledge_base_data, basestring):
+        knowledge_base_data = codec.unpack(knowledge_base_data)
+
     knowledge_base = KnowledgeBase.deserialize(knowledge_base_data, fact_classes=facts.FACTS)
 
     states_to_percents = analysers.percents_collector(knowledge_base)
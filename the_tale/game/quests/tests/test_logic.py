@@ -377,3 +377,46 @@ class SetupPersonsTest(LogicTestsBase):
                          persons=[logic.fact_person(person) for person in persons_storage.persons_storage.all() if person.place_id != self.place_3.id],
                          locations=[logic.fact_located_in(person) for person in persons_storage.persons_storage.all() if person.place_id != self.place_3.id],
                          social_connections=expected_connections)
+
+
+class WorldFactsTest(LogicTestsBase):
+
+    def test_refresh(self):
+        world_facts = logic.WorldFacts()
+        world_facts.sync()
+
+        self.assertEqual(set(world_facts.places.keys()), set([self.place_1.id, self.place_2.id, self.place_3.id]))
+        self.assertEqual(world_facts.places[self.place_1.id].uid, logic.fact_place(self.place_1).uid)
+
+        for person in persons_storage.persons_storage.all():
+            self.assertEqual(world_facts.persons[person.id].uid, logic.fact_person(person).uid)
+            self.assertIn(logic.fact_located_in(person).uid, [f_located_in.uid for f_person, f_located_in in world_facts.places_persons[person.place_id]])
+
+    def test_sync__cached(self):
+        world_facts = logic.WorldFacts()
+        world_facts.sync()
+
+        with mock.patch('the_tale.game.quests.logic.WorldFacts.refresh') as refresh:
+            world_facts.sync()
+
+        self.assertEqual(refresh.call_count, 0)
+
+    def test_sync__storage_changed(self):
+        world_facts = logic.WorldFacts()
+        world_facts.sync()
+
+        persons_storage.persons_storage.update_version()
+
+        with mock.patch('the_tale.game.quests.logic.WorldFacts.refresh') as refresh:
+            world_facts.sync()
+
+        self.assertEqual(refresh.call_count, 1)
+
+
+class RequestQuestTest(LogicTestsBase):
+
+    def test_request_quest_for_hero(self):
+        with mock.patch('the_tale.game.quests.workers.quests_generator.Worker.cmd_request_quest') as cmd_request_quest:
+            logic.request_quest_for_hero(self.hero)
+
+        self.assertEqual(cmd_request_quest.call_args_list, [mock.call(self.hero.account_id, self.get_hero_info().serialize())])
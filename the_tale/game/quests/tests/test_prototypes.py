@@ -77,6 +77,7 @@ class PrototypeTestsBase(testcase.TestCase):
         self.quest = self.hero.quests.current_quest
 
 
+@mock.patch('the_tale.game.heroes.conf.heroes_settings.MODIFIERS_CACHE_ENABLED', False)
 class PrototypeTests(PrototypeTestsBase):
 
     def setUp(self):
@@ -9,6 +9,7 @@ from questgen import knowledge_base as questgen_knowlege_base
 
 from the_tale import amqp_environment
 
+from the_tale.common.utils import codec
 from the_tale.common.utils import testcase
 
 from the_tale.game.logic_storage import LogicStorage
@@ -46,7 +47,7 @@ class QuestsGeneratorWorkerTests(testcase.TestCase):
         self.assertEqual(cmd_setup_quest.call_count, 1)
 
         self.assertEqual(cmd_setup_quest.call_args_list[0][0][0], self.hero_1.account_id)
-        self.assertTrue(questgen_knowlege_base.KnowledgeBase.deserialize(cmd_setup_quest.call_args_list[0][0][1], fact_classes=questgen_facts.FACTS))
+        self.assertTrue(questgen_knowlege_base.KnowledgeBase.deserialize(codec.unpack(cmd_setup_quest.call_args_list[0][0][1]), fact_classes=questgen_facts.FACTS))
 
 
     def test_generate_quest__empty_queue(self):
@@ -4,6 +4,7 @@ import collections
 
 from the_tale import amqp_environment
 
+from the_tale.common.utils import codec
 from the_tale.common.utils.workers import BaseWorker
 
 from the_tale.game.quests import logic
@@ -65,4 +66,4 @@ class Worker(BaseWorker):
             self.logger.error('continue processing')
             return
 
-        amqp_environment.environment.workers.supervisor.cmd_setup_quest(account_id, knowledge_base.serialize())
+        amqp_environment.environment.workers.supervisor.cmd_setup_quest(account_id, codec.pack(knowledge_base.serialize()))
@@ -156,7 +156,8 @@ class HighlevelTest(testcase.TestCase):
         sync_habits = mock.Mock()
         sync_modifier = mock.Mock()
         sync_parameters = mock.Mock()
-        update_heroes_number = mock.Mock()
+        set_heroes_number = mock.Mock()
+        set_heroes_habits = mock.Mock()
         mark_as_updated = mock.Mock()
 
         with contextlib.nested(mock.patch('the_tale.game.map.places.prototypes.PlacePrototype.set_expected_size', set_expected_size),
@@ -166,7 +167,8 @@ class HighlevelTest(testcase.TestCase):
                                mock.patch('the_tale.game.map.places.prototypes.PlacePrototype.sync_habits', sync_habits),
                                mock.patch('the_tale.game.map.places.prototypes.PlacePrototype.sync_modifier', sync_modifier),
                                mock.patch('the_tale.game.map.places.prototypes.PlacePrototype.sync_parameters', sync_parameters),
-                               mock.patch('the_tale.game.map.places.prototypes.PlacePrototype.update_heroes_number', update_heroes_number),
+                               mock.patch('the_tale.game.map.places.prototypes.PlacePrototype.set_heroes_number', set_heroes_number),
+                               mock.patch('the_tale.game.map.places.prototypes.PlacePrototype.set_heroes_habits', set_heroes_habits),
                                mock.patch('the_tale.game.map.places.prototypes.PlacePrototype.mark_as_updated', mark_as_updated)):
             self.worker.sync_data()
 
@@ -179,7 +181,8 @@ class HighlevelTest(testcase.TestCase):
         self.assertEqual(sync_habits.call_count, places_number)
         self.assertEqual(sync_modifier.call_count, places_number)
         self.assertEqual(sync_parameters.call_count, places_number)
-        self.assertEqual(update_heroes_number.call_count, places_number)
+        self.assertEqual(set_heroes_number.call_count, places_number)
+        self.assertEqual(set_heroes_habits.call_count, places_number)
         self.assertEqual(mark_as_updated.call_count, places_number)
 
 
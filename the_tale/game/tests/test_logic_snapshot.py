@@ -0,0 +1,196 @@
+# coding: utf-8
+import os
+import shutil
+import tempfile
+import cPickle as pickle
+
+import mock
+
+from the_tale.common.utils import testcase
+from the_tale.common.utils import codec
+
+from the_tale.accounts.prototypes import AccountPrototype
+
+from the_tale.game.heroes.prototypes import HeroPrototype
+from the_tale.game.heroes.models import Hero
+
+from the_tale.game.logic import create_test_map
+from the_tale.game.logic_storage import LogicStorage
+from the_tale.game import logic_snapshot
+from the_tale.game.logic_snapshot import LogicSnapshot
+
+
+class LogicSnapshotTests(testcase.TestCase):
+
+    def setUp(self):
+        super(LogicSnapshotTests, self).setUp()
+
+        create_test_map()
+
+        self.account_1 = self.accounts_factory.create_account()
+        self.account_2 = self.accounts_factory.create_account()
+
+        self.storage = LogicStorage()
+        self.storage.load_accounts_data([self.account_1, self.account_2])
+        self.storage.save_all()
+
+        self.hero_1 = self.storage.accounts_to_heroes[self.account_1.id]
+        self.hero_2 = self.storage.accounts_to_heroes[self.account_2.id]
+
+        self.snapshot_dir = tempfile.mkdtemp()
+        self.snapshot_file = os.path.join(self.snapshot_dir, 'logic.snapshot')
+
+    def tearDown(self):
+        super(LogicSnapshotTests, self).tearDown()
+        shutil.rmtree(self.snapshot_dir)
+
+    def test_save_and_load(self):
+        self.assertEqual(self.storage.save_snapshot(self.snapshot_file, worker_id='logic_1', turn_number=7), 2)
+
+        snapshot = LogicSnapshot.load(self.snapshot_file, worker_id='logic_1', turn_number=7)
+
+        self.assertFalse(os.path.exists(self.snapshot_file))
+
+        self.assertEqual(set(snapshot.heroes_models.keys()), set([self.account_1.id, self.account_2.id]))
+        self.assertEqual(snapshot.heroes_models[self.account_1.id].actions, self.hero_1._model.actions)
+
+    def test_save__file_permissions(self):
+        self.storage.save_snapshot(self.snapshot_file, worker_id='logic_1', turn_number=7)
+
+        self.assertEqual(os.stat(self.snapshot_file).st_mode & 0777, 0600)
+        self.assertEqual(os.listdir(self.snapshot_dir), ['logic.snapshot'])
+
+    def test_save__create_directory(self):
+        snapshot_file = os.path.join(self.snapshot_dir, 'snapshots', 'logic.snapshot')
+
+        self.storage.save_snapshot(snapshot_file, worker_id='logic_1', turn_number=7)
+
+        self.assertEqual(os.stat(os.path.dirname(snapshot_file)).st_mode & 0777, 0700)
+        self.assertNotEqual(LogicSnapshot.load(snapshot_file, worker_id='logic_1', turn_number=7), None)
+
+    def test_save__no_code_in_format(self):
+        self.storage.save_snapshot(self.snapshot_file, worker_id='logic_1', turn_number=7)
+
+        with open(self.snapshot_file) as f:
+            data = codec.unpack(f.read())
+
+        self.assertEqual(data['turn_number'], 7)
+        self.assertEqual(set(hero['account_id'] for hero in data['heroes']), set([self.account_1.id, self.account_2.id]))
+
+    def test_load__pickle(self):
+        with open(self.snapshot_file, 'wb') as f:
+            pickle.dump({'format_version': logic_snapshot.FORMAT_VERSION, 'worker_id': 'logic_1', 'turn_number': 7, 'heroes': []}, f)
+
+        self.assertEqual(LogicSnapshot.load(self.snapshot_file, worker_id='logic_1', turn_number=7), None)
+
+    def test_load__writable_by_others(self):
+        self.storage.save_snapshot(self.snapshot_file, worker_id='logic_1', turn_number=7)
+        os.chmod(self.snapshot_file, 0666)
+
+        self.assertEqual(LogicSnapshot.load(self.snapshot_file, worker_id='logic_1', turn_number=7), None)
+
+    def test_load__symlink(self):
+        target_file = os.path.join(self.snapshot_dir, 'target.snapshot')
+        self.storage.save_snapshot(target_file, worker_id='logic_1', turn_number=7)
+        os.symlink(target_file, self.snapshot_file)
+
+        self.assertEqual(LogicSnapshot.load(self.snapshot_file, worker_id='logic_1', turn_number=7), None)
+        self.assertTrue(os.path.exists(target_file))
+
+    def test_load__other_owner(self):
+        self.storage.save_snapshot(self.snapshot_file, worker_id='logic_1', turn_number=7)
+
+        with mock.patch('os.getuid', lambda: os.stat(self.snapshot_file).st_uid + 1):
+            self.assertEqual(LogicSnapshot.load(self.snapshot_file, worker_id='logic_1', turn_number=7), None)
+
+    def test_load__models_equal_to_database(self):
+        self.storage.save_snapshot(self.snapshot_file, worker_id='logic_1', turn_number=7)
+
+        snapshot = LogicSnapshot.load(self.snapshot_file, worker_id='logic_1', turn_number=7)
+
+        model = snapshot.heroes_models[self.account_1.id]
+        database_model = Hero.objects.get(account_id=self.account_1.id)
+
+        self.assertFalse(model._state.adding)
+
+        for field in Hero._meta.concrete_fields:
+            self.assertEqual(getattr(model, field.attname), getattr(database_model, field.attname))
+
+    def test_save__ignored_bundles(self):
+        self.storage.ignored_bundles.add(self.hero_1.actions.current_action.bundle_id)
+
+        self.assertEqual(self.storage.save_snapshot(self.snapshot_file, worker_id='logic_1', turn_number=7), 1)
+
+        snapshot = LogicSnapshot.load(self.snapshot_file, worker_id='logic_1', turn_number=7)
+
+        self.assertEqual(snapshot.heroes_models.keys(), [self.account_2.id])
+
+    def test_load__no_file(self):
+        self.assertEqual(LogicSnapshot.load(self.snapshot_file, worker_id='logic_1', turn_number=7), None)
+
+    def test_load__wrong_worker(self):
+        self.storage.save_snapshot(self.snapshot_file, worker_id='logic_1', turn_number=7)
+        self.assertEqual(LogicSnapshot.load(self.snapshot_file, worker_id='logic_2', turn_number=7), None)
+        self.assertFalse(os.path.exists(self.snapshot_file))
+
+    def test_load__wrong_turn(self):
+        self.storage.save_snapshot(self.snapshot_file, worker_id='logic_1', turn_number=7)
+        self.assertEqual(LogicSnapshot.load(self.snapshot_file, worker_id='logic_1', turn_number=8), None)
+
+    def test_load__broken_file(self):
+        with open(self.snapshot_file, 'w') as f:
+            f.write('broken snapshot')
+
+        self.assertEqual(LogicSnapshot.load(self.snapshot_file, worker_id='logic_1', turn_number=7), None)
+        self.assertFalse(os.path.exists(self.snapshot_file))
+
+    def test_pop_actual_heroes_models(self):
+        self.storage.save_snapshot(self.snapshot_file, worker_id='logic_1', turn_number=7)
+
+        # hero changed after snapshot creation
+        self.hero_2.save()
+
+        snapshot = LogicSnapshot.load(self.snapshot_file, worker_id='logic_1', turn_number=7)
+
+        self.assertEqual(snapshot.pop_actual_heroes_models([self.account_1.id, self.account_2.id, 666]).keys(), [self.account_1.id])
+        self.assertEqual(snapshot.heroes_models, {})
+
+    def test_load_accounts_data(self):
+        self.storage.save_snapshot(self.snapshot_file, worker_id='logic_1', turn_number=7)
+
+        self.hero_2.save()
+
+        storage = LogicStorage()
+        self.assertTrue(storage.load_snapshot(self.snapshot_file, worker_id='logic_1', turn_number=7))
+
+        get_list_by_account_id = mock.Mock(side_effect=HeroPrototype.get_list_by_account_id)
+
+        with mock.patch('the_tale.game.heroes.prototypes.HeroPrototype.get_list_by_account_id', get_list_by_account_id):
+            storage.load_accounts_data([AccountPrototype.get_by_id(self.account_1.id),
+                                        AccountPrototype.get_by_id(self.account_2.id)])
+
+        self.assertEqual(get_list_by_account_id.call_args_list, [mock.call([self.account_2.id])])
+        self.assertEqual(set(storage.accounts_to_heroes.keys()), set([self.account_1.id, self.account_2.id]))
+
+    def test_load_accounts_data__equal_to_database(self):
+        self.storage.save_snapshot(self.snapshot_file, worker_id='logic_1', turn_number=7)
+
+        storage = LogicStorage()
+        storage.load_snapshot(self.snapshot_file, worker_id='logic_1', turn_number=7)
+        storage.load_accounts_data([AccountPrototype.get_by_id(self.account_1.id)])
+
+        hero = storage.accounts_to_heroes[self.account_1.id]
+
+        self.assertEqual(hero.id, self.hero_1.id)
+        self.assertEqual(hero.level, self.hero_1.level)
+        self.assertEqual(hero._model.data, self.hero_1._model.data)
+        self.assertEqual(hero.actions.current_action.bundle_id, self.hero_1.actions.current_action.bundle_id)
+
+    def test_process_turn__drop_snapshot(self):
+        self.storage.save_snapshot(self.snapshot_file, worker_id='logic_1', turn_number=7)
+
+        storage = LogicStorage()
+        storage.load_snapshot(self.snapshot_file, worker_id='logic_1', turn_number=7)
+        storage.process_turn()
+
+        self.assertEqual(storage.snapshot, None)
@@ -8,12 +8,14 @@ from the_tale.accounts.prototypes import AccountPrototype
 from the_tale.accounts.logic import register_user
 
 from the_tale.game.heroes.prototypes import HeroPrototype
+from the_tale.game.heroes.relations import MONEY_SOURCE
 
 from the_tale.game.actions import prototypes as actions_prototypes
 from the_tale.game.actions.meta_actions import MetaActionArenaPvP1x1Prototype
 
 from the_tale.game.logic import create_test_map
 from the_tale.game.logic_storage import LogicStorage
+from the_tale.game import logic_storage
 from the_tale.game import exceptions
 from the_tale.game.prototypes import TimePrototype
 from the_tale.game import conf
@@ -87,6 +89,25 @@ class LogicStorageTests(testcase.TestCase):
                                                        self.hero_2.actions.current_action.bundle_id: set([self.account_2.id])})
 
 
+    def test_load_accounts_data(self):
+        storage = LogicStorage()
+
+        with self.check_delta(lambda: len(storage.heroes), 2):
+            heroes = storage.load_accounts_data([AccountPrototype.get_by_id(self.account_2.id),
+                                                 AccountPrototype.get_by_id(self.account_1.id)])
+
+        self.assertEqual([hero.id for hero in heroes], [self.hero_2.id, self.hero_1.id])
+        self.assertEqual(set(storage.accounts_to_heroes.keys()), set([self.account_1.id, self.account_2.id]))
+
+    def test_load_accounts_data__single_query(self):
+        storage = LogicStorage()
+
+        with mock.patch('the_tale.game.heroes.prototypes.HeroPrototype.get_by_account_id') as get_by_account_id:
+            storage.load_accounts_data([AccountPrototype.get_by_id(self.account_1.id),
+                                        AccountPrototype.get_by_id(self.account_2.id)])
+
+        self.assertEqual(get_by_account_id.call_count, 0)
+
     def test_load_account_data_with_meta_action(self):
         bundle_id = 666
 
@@ -160,6 +181,34 @@ class LogicStorageTests(testcase.TestCase):
 
         self.assertFalse(self.hero_1.actions.updated)
 
+    def test_save_heroes_data__bulk(self):
+        with mock.patch('the_tale.common.utils.bulk.is_bulk_update_supported', lambda: True):
+            with mock.patch('the_tale.game.heroes.prototypes.HeroPrototype.save_many') as save_many:
+                with mock.patch('the_tale.game.logic_storage.LogicStorage._save_hero_data') as save_hero_data:
+                    self.storage._save_heroes_data([self.hero_2.id, self.hero_1.id])
+
+        self.assertEqual(save_hero_data.call_count, 0)
+        self.assertEqual(save_many.call_args_list, [mock.call([self.hero_1, self.hero_2])])
+
+    @mock.patch('the_tale.game.conf.game_settings.BULK_SAVE_MIN_HEROES', 3)
+    def test_save_heroes_data__not_enough_heroes_for_bulk(self):
+        with mock.patch('the_tale.common.utils.bulk.is_bulk_update_supported', lambda: True):
+            with mock.patch('the_tale.game.heroes.prototypes.HeroPrototype.save_many') as save_many:
+                with mock.patch('the_tale.game.logic_storage.LogicStorage._save_hero_data') as save_hero_data:
+                    self.storage._save_heroes_data([self.hero_2.id, self.hero_1.id])
+
+        self.assertEqual(save_many.call_count, 0)
+        self.assertEqual(save_hero_data.call_args_list, [mock.call(self.hero_1.id), mock.call(self.hero_2.id)])
+
+    def test_save_many(self):
+        self.hero_1.health = 1
+        self.hero_2.health = 2
+
+        HeroPrototype.save_many([self.hero_1, self.hero_2])
+
+        self.assertEqual(HeroPrototype.get_by_id(self.hero_1.id).health, 1)
+        self.assertEqual(HeroPrototype.get_by_id(self.hero_2.id).health, 2)
+
     def test_save_hero_data_with_meta_action(self):
         bundle_id = 666
 
@@ -411,6 +460,40 @@ class LogicStorageTests(testcase.TestCase):
         self.assertEqual(_save_on_exception.call_count, 1)
         self.assertEqual(_save_on_exception.call_args, mock.call())
 
+    def test_process_turn___exception_raises__skip_bundle_members(self):
+        result, account_3_id, bundle_3_id = register_user('test_user_3', 'test_user_3@test.com', '111111')
+        self.storage.load_account_data(AccountPrototype.get_by_id(account_3_id))
+        hero_3 = self.storage.accounts_to_heroes[account_3_id]
+
+        self.storage.merge_bundles([hero_3.actions.current_action.bundle_id], self.hero_2.actions.current_action.bundle_id)
+        hero_3.actions.current_action.bundle_id = self.hero_2.actions.current_action.bundle_id
+
+        processed_heroes = []
+
+        def process_turn_raise_exception(action):
+            processed_heroes.append(action.hero.id)
+            if action.hero.id in (self.hero_2.id, hero_3.id):
+                raise Exception('error')
+
+        with mock.patch('the_tale.game.actions.prototypes.ActionBase.process_turn', process_turn_raise_exception):
+            with mock.patch('the_tale.game.logic_storage.LogicStorage._save_on_exception') as _save_on_exception:
+                self.storage.process_turn(continue_steps_if_needed=False)
+
+        self.assertEqual(self.storage.ignored_bundles, set([self.hero_2.actions.current_action.bundle_id]))
+        self.assertEqual(_save_on_exception.call_count, 1)
+        self.assertEqual(len(processed_heroes), 2)
+        self.assertIn(self.hero_1.id, processed_heroes)
+
+    def test_get_bundles_to_process(self):
+        self.storage.skipped_heroes.add(self.hero_1.id)
+
+        self.assertEqual(self.storage._get_bundles_to_process(TimePrototype.get_current_turn_number()),
+                         {self.hero_2.actions.current_action.bundle_id: [self.hero_2]})
+
+        self.storage.ignored_bundles.add(self.hero_2.actions.current_action.bundle_id)
+
+        self.assertEqual(self.storage._get_bundles_to_process(TimePrototype.get_current_turn_number()), {})
+
     @mock.patch('the_tale.game.conf.game_settings.SAVE_ON_EXCEPTION_TIMEOUT', 0)
     def test_save_on_exception(self):
         # hero 1 not saved due to one bundle with hero 3
@@ -846,3 +929,231 @@ class LogicStorageTests(testcase.TestCase):
         self.assertEqual(process_cache_queue.call_count, 1)
 
         self.assertEqual(set(call[0][0] for call in _save_hero_data.call_args_list), set([3, 7, 9]))
+
+
+def run_forked_in_current_process(storage, bundles_ids_chunks):
+    return [logic_storage._process_forked_bundles(bundles_ids) for bundles_ids in bundles_ids_chunks]
+
+
+class LogicStorageForkedTestsBase(testcase.TestCase):
+
+    def setUp(self):
+        super(LogicStorageForkedTestsBase, self).setUp()
+
+        self.p1, self.p2, self.p3 = create_test_map()
+
+        self.storage = LogicStorage()
+
+        self.account_1 = self.accounts_factory.create_account()
+        self.account_2 = self.accounts_factory.create_account()
+
+        self.storage.load_account_data(self.account_1)
+        self.storage.load_account_data(self.account_2)
+
+        self.hero_1 = self.storage.accounts_to_heroes[self.account_1.id]
+        self.hero_2 = self.storage.accounts_to_heroes[self.account_2.id]
+
+        self.bundles_to_accounts = {bundle_id: set(accounts_ids) for bundle_id, accounts_ids in self.storage.bundles_to_accounts.iteritems()}
+
+
+@mock.patch('the_tale.game.conf.game_settings.LOGIC_TURN_PROCESSES', 2)
+@mock.patch('the_tale.game.conf.game_settings.LOGIC_TURN_PROCESSES_MIN_BUNDLES', 1)
+@mock.patch('the_tale.game.logic_storage.LogicStorage._run_forked', run_forked_in_current_process)
+class LogicStorageForkedTests(LogicStorageForkedTestsBase):
+
+    def earn_money(self, action):
+        action.hero.change_money(MONEY_SOURCE.EARNED_FROM_LOOT, 10)
+
+    def test_process_turn(self):
+        money_1, money_2 = self.hero_1.money, self.hero_2.money
+
+        with mock.patch('the_tale.game.actions.prototypes.ActionBase.process_turn', self.earn_money):
+            self.storage.process_turn(continue_steps_if_needed=False)
+
+        hero_1 = self.storage.accounts_to_heroes[self.account_1.id]
+        hero_2 = self.storage.accounts_to_heroes[self.account_2.id]
+
+        # heroes are restored from data of forked processes
+        self.assertIsNot(hero_1, self.hero_1)
+        self.assertIsNot(hero_2, self.hero_2)
+
+        self.assertEqual(self.storage.heroes, {hero_1.id: hero_1, hero_2.id: hero_2})
+        self.assertEqual(self.storage.bundles_to_accounts, self.bundles_to_accounts)
+        self.assertEqual(set(self.storage.bundles_processing_time.keys()), set(self.bundles_to_accounts.keys()))
+
+        self.assertEqual(hero_1.money, money_1 + 10)
+        self.assertEqual(hero_2.money, money_2 + 10)
+
+        self.assertEqual(hero_1.actions.current_action.storage, self.storage)
+
+        # changes are not saved yet
+        self.assertIn('money', hero_1.changed_fields())
+        self.assertNotIn('saved_at', hero_1.changed_fields())
+
+        self.storage._save_hero_data(hero_1.id)
+
+        self.assertEqual(HeroPrototype.get_by_id(hero_1.id).money, money_1 + 10)
+
+    def test_process_turn__processes_number(self):
+        with mock.patch('the_tale.game.logic_storage.LogicStorage._run_forked', autospec=True, side_effect=run_forked_in_current_process) as run_forked:
+            self.storage.process_turn(continue_steps_if_needed=False)
+
+        self.assertEqual(run_forked.call_count, 1)
+        self.assertEqual(sorted(run_forked.call_args[0][1]), [[bundle_id] for bundle_id in sorted(self.bundles_to_accounts)])
+
+    @mock.patch('the_tale.game.conf.game_settings.LOGIC_TURN_PROCESSES_MIN_BUNDLES', 3)
+    def test_process_turn__not_enough_bundles(self):
+        with mock.patch('the_tale.game.logic_storage.LogicStorage._run_forked') as run_forked:
+            with mock.patch('the_tale.game.actions.prototypes.ActionBase.process_turn') as action_process_turn:
+                self.storage.process_turn(continue_steps_if_needed=False)
+
+        self.assertEqual(run_forked.call_count, 0)
+        self.assertEqual(action_process_turn.call_count, 2)
+        self.assertIs(self.storage.accounts_to_heroes[self.account_1.id], self.hero_1)
+
+    def test_process_turn__meta_action_bundles_in_current_process(self):
+        account_3 = self.accounts_factory.create_account()
+        hero_3 = self.storage.load_account_data(account_3)
+
+        bundle_id = 666
+
+        meta_action_battle = MetaActionArenaPvP1x1Prototype.create(self.storage, self.hero_1, self.hero_2, bundle_id=bundle_id)
+
+        actions_prototypes.ActionMetaProxyPrototype.create(hero=self.hero_1, _bundle_id=bundle_id, meta_action=meta_action_battle)
+        actions_prototypes.ActionMetaProxyPrototype.create(hero=self.hero_2, _bundle_id=bundle_id, meta_action=meta_action_battle)
+
+        self.storage.merge_bundles([self.hero_1.actions.actions_list[0].bundle_id, self.hero_2.actions.actions_list[0].bundle_id], bundle_id)
+
+        with mock.patch('the_tale.game.logic_storage.LogicStorage._run_forked', autospec=True, side_effect=run_forked_in_current_process) as run_forked:
+            with mock.patch('the_tale.game.actions.prototypes.ActionBase.process_turn'):
+                self.storage.process_turn(continue_steps_if_needed=False)
+
+        self.assertEqual(run_forked.call_args[0][1], [[hero_3.actions.current_action.bundle_id]])
+
+        self.assertIs(self.storage.accounts_to_heroes[self.account_1.id], self.hero_1)
+        self.assertIs(self.storage.accounts_to_heroes[self.account_2.id], self.hero_2)
+        self.assertIsNot(self.storage.accounts_to_heroes[account_3.id], hero_3)
+
+        self.assertEqual(set(self.storage.bundles_processing_time.keys()), set([bundle_id, hero_3.actions.current_action.bundle_id]))
+
+    def test_process_turn__exception(self):
+        def process_turn_raise_exception(action):
+            if action.hero.id == self.hero_2.id:
+                raise Exception('error')
+
+        with mock.patch('the_tale.game.actions.prototypes.ActionBase.process_turn', process_turn_raise_exception):
+            with mock.patch('the_tale.game.logic_storage.LogicStorage._save_on_exception') as _save_on_exception:
+                self.storage.process_turn(continue_steps_if_needed=False)
+
+        bundle_2_id = self.hero_2.actions.current_action.bundle_id
+
+        self.assertEqual(self.storage.ignored_bundles, set([bundle_2_id]))
+
+        # in forked process and in current one
+        self.assertEqual(_save_on_exception.call_count, 2)
+
+        # heroes of ignored bundles are not returned from forked process
+        self.assertIs(self.storage.accounts_to_heroes[self.account_2.id], self.hero_2)
+        self.assertIsNot(self.storage.accounts_to_heroes[self.account_1.id], self.hero_1)
+
+        self.assertEqual(self.storage.bundles_to_accounts, self.bundles_to_accounts)
+
+    def test_process_turn__deferred_commands(self):
+        from the_tale.amqp_environment import environment
+
+        def process_turn(action):
+            environment.workers.supervisor.cmd_start_hero_caching(action.hero.account_id)
+
+        with mock.patch('the_tale.game.actions.prototypes.ActionBase.process_turn', process_turn):
+            with mock.patch('the_tale.common.utils.workers.send_deferred_commands') as send_deferred_commands:
+                self.storage.process_turn(continue_steps_if_needed=False)
+
+        commands = sorted(command for call in send_deferred_commands.call_args_list for command in call[0][0])
+
+        self.assertEqual(commands, sorted((environment.workers.supervisor.name, 'start_hero_caching', {'account_id': account_id})
+                                          for account_id in (self.account_1.id, self.account_2.id)))
+
+    def test_process_turn__collected_achievements(self):
+        from the_tale.accounts.achievements.storage import achievements_storage
+
+        def process_turn(action):
+            achievements_storage._batch.append((action.hero.account_id, 666))
+
+        with mock.patch('the_tale.game.actions.prototypes.ActionBase.process_turn', process_turn):
+            with mock.patch('the_tale.accounts.achievements.prototypes.GiveAchievementTaskPrototype.create_many') as create_many:
+                self.storage.process_turn(continue_steps_if_needed=False)
+
+        tasks = sorted(task for call in create_many.call_args_list for task in call[0][0])
+
+        self.assertEqual(tasks, sorted([(self.account_1.id, 666), (self.account_2.id, 666)]))
+
+    def test_process_turn__profiler_measurements(self):
+        self.storage.profiler.start_turn()
+
+        with mock.patch('the_tale.game.actions.prototypes.ActionBase.process_turn'):
+            self.storage.process_turn(continue_steps_if_needed=False)
+
+        self.assertEqual(self.storage.profiler.current['process_rare_operations'].count, 2)
+        self.assertEqual(self.storage.profiler.current['action.%s' % self.hero_1.actions.current_action.__class__.__name__].count, 2)
+
+    def test_process_isolated_bundles__result_serializable(self):
+        import pickle
+
+        bundles = self.storage._get_bundles_to_process(TimePrototype.get_current_turn_number())
+
+        result = self.storage._process_isolated_bundles(bundles=bundles, logger=None, continue_steps_if_needed=True, timestamp=0)
+
+        self.assertEqual(pickle.loads(pickle.dumps(result)), result)
+        self.assertEqual(result['processed_heroes'], 2)
+        self.assertEqual(len(result['heroes']), 2)
+
+
+@mock.patch('the_tale.game.conf.game_settings.LOGIC_TURN_PROCESSES', 2)
+@mock.patch('the_tale.game.conf.game_settings.LOGIC_TURN_PROCESSES_MIN_BUNDLES', 1)
+class LogicStorageForkedProcessesTests(LogicStorageForkedTestsBase):
+
+    # bundles are processed in really forked processes, which have no access to data of test transaction,
+    # so heroes are processed without database queries
+
+    def test_process_turn(self):
+        from the_tale.amqp_environment import environment
+        from the_tale.accounts.achievements.storage import achievements_storage
+
+        def process_turn(action):
+            action.hero.change_money(MONEY_SOURCE.EARNED_FROM_LOOT, 10)
+            environment.workers.supervisor.cmd_start_hero_caching(action.hero.account_id)
+            achievements_storage._batch.append((action.hero.account_id, 666))
+
+        money_1, money_2 = self.hero_1.money, self.hero_2.money
+
+        self.storage.profiler.start_turn()
+
+        with mock.patch('the_tale.game.actions.prototypes.ActionBase.process_turn', process_turn):
+            with mock.patch('the_tale.game.heroes.prototypes.HeroPrototype.process_rare_operations'):
+                with mock.patch('the_tale.common.utils.workers.send_deferred_commands') as send_deferred_commands:
+                    with mock.patch('the_tale.accounts.achievements.prototypes.GiveAchievementTaskPrototype.create_many') as create_many:
+                        self.storage.process_turn(continue_steps_if_needed=False)
+
+        hero_1 = self.storage.accounts_to_heroes[self.account_1.id]
+        hero_2 = self.storage.accounts_to_heroes[self.account_2.id]
+
+        # heroes were changed only in forked processes
+        self.assertEqual((self.hero_1.money, self.hero_2.money), (money_1, money_2))
+        self.assertEqual((hero_1.money, hero_2.money), (money_1 + 10, money_2 + 10))
+
+        self.assertEqual(self.storage.bundles_to_accounts, self.bundles_to_accounts)
+        self.assertEqual(self.storage.ignored_bundles, set())
+
+        commands = sorted(command for call in send_deferred_commands.call_args_list for command in call[0][0])
+        self.assertEqual(commands, sorted((environment.workers.supervisor.name, 'start_hero_caching', {'account_id': account_id})
+                                          for account_id in (self.account_1.id, self.account_2.id)))
+
+        tasks = sorted(task for call in create_many.call_args_list for task in call[0][0])
+        self.assertEqual(tasks, sorted([(self.account_1.id, 666), (self.account_2.id, 666)]))
+
+        self.assertEqual(self.storage.profiler.current['process_rare_operations'].count, 2)
+        self.assertEqual(self.storage.profiler.current['forked.start'].count, 1)
+
+        # database connection of current process is not closed by forked processes
+        self.storage._save_hero_data(hero_1.id)
+        self.assertEqual(HeroPrototype.get_by_id(hero_1.id).money, money_1 + 10)
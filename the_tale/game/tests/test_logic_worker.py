@@ -87,6 +87,27 @@ class LogicWorkerTests(testcase.TestCase):
         self.assertEqual(save_counter.call_count, 1)
         self.assertEqual(release_required_counter.call_count, 1)
 
+    def test_process_next_turn__send_bundles_processing_time(self):
+
+        current_time = TimePrototype.get_current_time()
+        current_time.increment_turn()
+        current_time.save()
+
+        self.worker.process_register_account(self.account.id)
+
+        with mock.patch('the_tale.game.conf.game_settings.LOGIC_REBALANCE_PERIOD', 1):
+            with mock.patch('the_tale.game.workers.supervisor.Worker.cmd_logic_bundles_processing_time') as cmd_logic_bundles_processing_time:
+                self.worker.process_next_turn(current_time.turn_number)
+
+        self.assertEqual(cmd_logic_bundles_processing_time.call_count, 1)
+
+        bundles_info = cmd_logic_bundles_processing_time.call_args[1]['bundles_info']
+
+        self.assertEqual(cmd_logic_bundles_processing_time.call_args[1]['worker_id'], 'logic')
+        self.assertEqual([(bundle_id, accounts_ids) for bundle_id, accounts_ids, processing_time in bundles_info],
+                         [(self.hero.actions.current_action.bundle_id, [self.account.id])])
+        self.assertEqual(self.worker.storage.bundles_processing_time, {})
+
     def test_process_update_hero_with_account_data(self):
         self.worker.process_register_account(self.account.id)
 
@@ -130,6 +151,42 @@ class LogicWorkerTests(testcase.TestCase):
 
         self.assertEqual(release_account_data.call_count, 0)
 
+    def test_process_register_accounts(self):
+        account_2 = self.accounts_factory.create_account()
+
+        with mock.patch('the_tale.game.heroes.prototypes.HeroPrototype.get_by_account_id') as get_by_account_id:
+            self.worker.process_register_accounts([account_2.id, self.account.id])
+
+        self.assertEqual(get_by_account_id.call_count, 0)
+        self.assertEqual(set(self.worker.storage.accounts_to_heroes.keys()), set([self.account.id, account_2.id]))
+
+    def test_process_register_accounts__wrong_account(self):
+        from the_tale.game.workers.logic import LogicException
+        self.assertRaises(LogicException, self.worker.process_register_accounts, [self.account.id, 666])
+        self.assertEqual(self.worker.storage.heroes, {})
+
+    def test_release_accounts(self):
+        account_2 = self.accounts_factory.create_account()
+
+        self.worker.process_register_accounts([self.account.id, account_2.id])
+
+        with mock.patch('the_tale.game.workers.supervisor.Worker.cmd_accounts_released') as cmd_accounts_released:
+            self.worker.release_accounts([self.account.id, account_2.id, 666])
+
+        self.assertEqual(cmd_accounts_released.call_args_list, [mock.call([self.account.id, account_2.id, 666])])
+        self.assertEqual(self.worker.storage.heroes, {})
+
+    def test_release_accounts__ignored_bundle(self):
+        self.worker.process_register_account(self.account.id)
+
+        self.worker.storage.ignored_bundles.add(self.hero.actions.current_action.bundle_id)
+
+        with mock.patch('the_tale.game.workers.supervisor.Worker.cmd_accounts_released') as cmd_accounts_released:
+            self.worker.release_accounts([self.account.id])
+
+        self.assertEqual(cmd_accounts_released.call_count, 0)
+        self.assertEqual(self.worker.storage.heroes.keys(), [self.hero.id])
+
     def test_force_save(self):
         self.worker.process_register_account(self.account.id)
 
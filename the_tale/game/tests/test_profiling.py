@@ -0,0 +1,178 @@
+# coding: utf-8
+import os
+import shutil
+import tempfile
+
+from the_tale.common.utils import testcase
+
+from the_tale.game import profiling
+
+
+class HistogramTests(testcase.TestCase):
+
+    def setUp(self):
+        super(HistogramTests, self).setUp()
+        self.histogram = profiling.Histogram()
+
+    def test_initialize(self):
+        self.assertEqual(self.histogram.count, 0)
+        self.assertEqual(self.histogram.total, 0)
+        self.assertEqual(self.histogram.max, 0)
+        self.assertEqual(self.histogram.percentile(0.5), 0)
+
+    def test_add(self):
+        self.histogram.add(0.00005)
+        self.histogram.add(0.003)
+        self.histogram.add(0.004)
+        self.histogram.add(20)
+
+        self.assertEqual(self.histogram.count, 4)
+        self.assertEqual(self.histogram.max, 20)
+        self.assertEqual(self.histogram.counts[0], 1)
+        self.assertEqual(self.histogram.counts[3], 2)
+        self.assertEqual(self.histogram.counts[-1], 1)
+
+        self.assertEqual(self.histogram.percentile(0.5), 0.005)
+        self.assertEqual(self.histogram.percentile(1.0), 20)
+
+    def test_merge(self):
+        other = profiling.Histogram()
+
+        self.histogram.add(0.003)
+        other.add(0.004)
+        other.add(0.5)
+
+        self.histogram.merge(other)
+
+        self.assertEqual(self.histogram.count, 3)
+        self.assertEqual(self.histogram.max, 0.5)
+        self.assertAlmostEqual(self.histogram.total, 0.507)
+
+    def test_serialization(self):
+        self.histogram.add(0.003)
+        self.histogram.add(0.5)
+
+        histogram = profiling.Histogram.deserialize(self.histogram.serialize())
+
+        self.assertEqual(histogram.counts, self.histogram.counts)
+        self.assertEqual(histogram.total, self.histogram.total)
+        self.assertEqual(histogram.max, self.histogram.max)
+
+
+class TurnProfilerTests(testcase.TestCase):
+
+    def setUp(self):
+        super(TurnProfilerTests, self).setUp()
+        self.profiler = profiling.TurnProfiler(history_length=2)
+
+    def test_add__outside_turn(self):
+        self.profiler.add('section', 1.0)
+        self.profiler.add_counters({'counter': 1})
+        self.assertEqual(self.profiler.statistics(), {'turns': 0, 'sections': {}, 'counters': {}})
+
+    def test_merge_current(self):
+        other = profiling.TurnProfiler(history_length=2)
+        other.start_turn()
+        other.add('section', 0.5)
+        other.add('other_section', 0.1)
+
+        self.profiler.start_turn()
+        self.profiler.add('section', 1.0)
+        self.profiler.merge_current(other.serialize_current())
+
+        self.assertEqual(self.profiler.current['section'].count, 2)
+        self.assertEqual(self.profiler.current['section'].total, 1.5)
+        self.assertEqual(self.profiler.current['other_section'].count, 1)
+
+    def test_merge_current__outside_turn(self):
+        self.assertEqual(self.profiler.serialize_current(), {})
+        self.profiler.merge_current({'section': profiling.Histogram().serialize()})
+        self.assertEqual(self.profiler.current, None)
+
+    def test_rolling_history(self):
+        for i in xrange(3):
+            self.profiler.start_turn()
+            self.profiler.add('section', i)
+            self.profiler.finish_turn()
+
+        statistics = self.profiler.statistics()
+
+        self.assertEqual(statistics['turns'], 2)
+        self.assertEqual(set(statistics['sections'].keys()), set(['section', 'turn']))
+        self.assertEqual(statistics['sections']['section']['count'], 2)
+        self.assertEqual(statistics['sections']['section']['total'], 3)
+
+    def test_counters(self):
+        for i in xrange(3):
+            self.profiler.start_turn()
+            self.profiler.add_counters({'counter_1': i, 'counter_2': 1})
+            self.profiler.add_counters({'counter_1': 1})
+            self.profiler.finish_turn()
+
+        self.assertEqual(self.profiler.statistics()['counters'], {'counter_1': 5, 'counter_2': 2})
+
+    def test_measure(self):
+        self.profiler.start_turn()
+
+        with self.profiler.measure('section'):
+            pass
+
+        self.profiler.finish_turn()
+
+        self.assertEqual(self.profiler.histograms()['section'].count, 1)
+
+    def test_profile(self):
+        profile_file = tempfile.mktemp()
+
+        self.profiler.start_profile(turns=2, profile_file=profile_file)
+
+        self.profiler.start_turn()
+        self.profiler.finish_turn()
+
+        self.assertNotEqual(self.profiler.profile, None)
+        self.assertFalse(os.path.exists(profile_file))
+
+        self.profiler.start_turn()
+        self.profiler.finish_turn()
+
+        self.assertEqual(self.profiler.profile, None)
+        self.assertTrue(os.path.exists(profile_file))
+
+        os.remove(profile_file)
+
+    def test_profile__private_file(self):
+        output_dir = tempfile.mkdtemp()
+        profile_file = os.path.join(output_dir, 'profiles', 'turns.profile')
+
+        self.profiler.start_profile(turns=1, profile_file=profile_file)
+
+        self.profiler.start_turn()
+        self.profiler.finish_turn()
+
+        self.assertEqual(os.stat(os.path.dirname(profile_file)).st_mode & 0777, 0700)
+        self.assertEqual(os.stat(profile_file).st_mode & 0777, 0600)
+        self.assertEqual(os.listdir(os.path.dirname(profile_file)), ['turns.profile'])
+
+        shutil.rmtree(output_dir)
+
+    def test_profile__symlink_is_not_followed(self):
+        output_dir = tempfile.mkdtemp()
+        profile_file = os.path.join(output_dir, 'turns.profile')
+        target_file = os.path.join(output_dir, 'target')
+
+        with open(target_file, 'w') as f:
+            f.write('content')
+
+        os.symlink(target_file, profile_file)
+
+        self.profiler.start_profile(turns=1, profile_file=profile_file)
+
+        self.profiler.start_turn()
+        self.profiler.finish_turn()
+
+        self.assertFalse(os.path.islink(profile_file))
+
+        with open(target_file) as f:
+            self.assertEqual(f.read(), 'content')
+
+        shutil.rmtree(output_dir)
@@ -80,7 +80,7 @@ class SupervisorWorkerTests(testcase.TestCase):
         self.assertEqual(len(self.worker.tasks), 0)
         self.assertEqual(len(self.worker.accounts_for_tasks), 0)
 
-        with mock.patch('the_tale.game.workers.logic.Worker.cmd_release_account') as release_accounts_counter:
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_release_accounts') as release_accounts_counter:
             self.worker.register_task(task, release_accounts=True)
 
         self.assertEqual(len(self.worker.tasks), 1)
@@ -112,10 +112,10 @@ class SupervisorWorkerTests(testcase.TestCase):
 
         task = SupervisorTaskPrototype.create_arena_pvp_1x1(self.account_1, self.account_2)
 
-        with mock.patch('the_tale.game.workers.logic.Worker.cmd_release_account') as release_accounts_counter:
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_release_accounts') as release_accounts_counter:
             self.worker.register_task(task)
 
-        self.assertEqual(release_accounts_counter.call_count, 2)
+        self.assertEqual(release_accounts_counter.call_args_list, [mock.call([self.account_1.id]), mock.call([self.account_2.id])])
 
 
     def test_register_task_second_time(self):
@@ -150,7 +150,7 @@ class SupervisorWorkerTests(testcase.TestCase):
                                                    ('logic_task', {'account_id': self.account_1.id, 'task_id': 2}),
                                                    ('logic_task', {'account_id': self.account_1.id, 'task_id': 4}) ]
 
-        with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_account') as register_account_counter:
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_accounts') as register_account_counter:
             with mock.patch('the_tale.game.workers.logic.Worker.cmd_logic_task') as cmd_logic_task:
                 self.worker.register_account(account_id)
 
@@ -166,7 +166,7 @@ class SupervisorWorkerTests(testcase.TestCase):
         task = SupervisorTaskPrototype.create_arena_pvp_1x1(self.account_1, self.account_2)
         self.worker.register_task(task)
 
-        with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_account') as register_account_counter:
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_accounts') as register_account_counter:
             self.worker.register_account(self.account_1.id)
 
         self.assertEqual(register_account_counter.call_count, 0)
@@ -184,11 +184,11 @@ class SupervisorWorkerTests(testcase.TestCase):
 
         self.worker.register_task(task)
 
-        with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_account') as register_account_counter:
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_accounts') as register_account_counter:
             self.worker.register_account(self.account_1.id)
             self.worker.register_account(self.account_2.id)
 
-        self.assertEqual(register_account_counter.call_count, 2)
+        self.assertEqual(register_account_counter.call_args_list, [mock.call([self.account_1.id, self.account_2.id])])
         self.assertEqual(set(self.worker.accounts_for_tasks.keys()), set())
         self.assertEqual(self.worker.tasks.values(), [])
         self.assertEqual(SupervisorTask.objects.all().count(), 0)
@@ -202,7 +202,7 @@ class SupervisorWorkerTests(testcase.TestCase):
         account_4 = self.accounts_factory.create_account()
         account_5 = self.accounts_factory.create_account()
 
-        with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_account') as register_account_counter:
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_accounts') as register_account_counter:
             self.worker.register_account(account_3.id)
             self.worker.register_account(account_4.id)
             self.worker.register_account(account_5.id)
@@ -263,6 +263,50 @@ class SupervisorWorkerTests(testcase.TestCase):
                                                        account_6.id: 'game_logic_2'})
         self.assertEqual(self.worker.logic_accounts_number, {'game_logic_1': 2, 'game_logic_2': 4})
 
+    @mock.patch('the_tale.game.conf.game_settings.LOGIC_REGISTER_BATCH_SIZE', 2)
+    def test_register_accounts_on_initialization__batches(self):
+        account_3 = self.accounts_factory.create_account()
+        account_4 = self.accounts_factory.create_account()
+        account_5 = self.accounts_factory.create_account()
+
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_accounts') as cmd_register_accounts:
+            self.worker.process_initialize()
+
+        self.assertEqual(cmd_register_accounts.call_args_list, [mock.call([self.account_1.id]),
+                                                                mock.call([self.account_2.id]),
+                                                                mock.call([account_3.id]),
+                                                                mock.call([account_4.id]),
+                                                                mock.call([account_5.id])])
+
+    def test_register_accounts__single_command_per_worker(self):
+        self.worker.process_initialize()
+
+        account_3 = self.accounts_factory.create_account()
+        account_4 = self.accounts_factory.create_account()
+        account_5 = self.accounts_factory.create_account()
+
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_accounts') as cmd_register_accounts:
+            with mock.patch('the_tale.game.heroes.prototypes.HeroPrototype.get_by_account_id') as get_by_account_id:
+                self.worker.register_accounts([account_3.id, account_4.id, account_5.id])
+
+        self.assertEqual(get_by_account_id.call_count, 0)
+
+        self.assertEqual(cmd_register_accounts.call_args_list, [mock.call([account_3.id, account_5.id]),
+                                                                mock.call([account_4.id])])
+
+        self.assertEqual(self.worker.logic_accounts_number, {'game_logic_1': 3, 'game_logic_2': 2})
+
+    def test_process_accounts_released(self):
+        self.worker.process_initialize()
+
+        self.worker.send_release_accounts_cmds([self.account_1.id, self.account_2.id])
+
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_accounts') as cmd_register_accounts:
+            self.worker.process_accounts_released([self.account_1.id, self.account_2.id])
+
+        self.assertEqual(cmd_register_accounts.call_args_list, [mock.call([self.account_1.id]), mock.call([self.account_2.id])])
+        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: 'game_logic_1', self.account_2.id: 'game_logic_2'})
+
     def test_register_accounts__double_register(self):
         self.worker.process_initialize()
         self.assertRaises(exceptions.DublicateAccountRegistration, self.worker.register_account, self.account_1.id)
@@ -339,12 +383,11 @@ class SupervisorWorkerTests(testcase.TestCase):
 
         call_recorder = mock.Mock()
 
-        with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_account', call_recorder) as cmd_register_account:
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_accounts', call_recorder) as cmd_register_accounts:
             with mock.patch('the_tale.game.workers.supervisor.Worker.dispatch_logic_cmd', call_recorder) as dispatch_logic_cmd:
                 self.worker.send_register_accounts_cmds([self.account_2.id, self.account_1.id], 'game_logic_2')
 
-        self.assertEqual(call_recorder.call_args_list, [mock.call(self.account_1.id),
-                                                        mock.call(self.account_2.id),
+        self.assertEqual(call_recorder.call_args_list, [mock.call([self.account_1.id, self.account_2.id]),
                                                         mock.call(self.account_1.id, 'cmd_1', 1),
                                                         mock.call(self.account_1.id, 'cmd_2', 2),
                                                         mock.call(self.account_2.id, 'cmd_3', 3)])
@@ -377,6 +420,147 @@ class SupervisorWorkerTests(testcase.TestCase):
 
         self.assertEqual(self.worker.accounts_owners, {self.account_1.id: None, self.account_2.id: None})
 
+    def test_send_release_accounts_cmds(self):
+        self.worker.process_initialize()
+
+        account_3 = self.accounts_factory.create_account()
+        self.worker.register_account(account_3.id)
+
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_release_accounts') as cmd_release_accounts:
+            self.worker.send_release_accounts_cmds([account_3.id, self.account_2.id, self.account_1.id])
+            self.worker.send_release_accounts_cmds([self.account_2.id])
+
+        self.assertEqual(cmd_release_accounts.call_args_list, [mock.call([account_3.id, self.account_1.id]),
+                                                               mock.call([self.account_2.id])])
+
+        self.assertEqual(self.worker.accounts_owners, {self.account_1.id: None, self.account_2.id: None, account_3.id: None})
+        self.assertEqual(self.worker.logic_accounts_number, {'game_logic_1': 0, 'game_logic_2': 0})
+
+    def test_process_logic_bundles_processing_time__wait_all_workers(self):
+        self.worker.process_initialize()
+
+        with mock.patch('the_tale.game.workers.supervisor.Worker.rebalance_logic_workers') as rebalance_logic_workers:
+            self.worker.process_logic_bundles_processing_time('game_logic_1', [])
+
+        self.assertEqual(rebalance_logic_workers.call_count, 0)
+        self.assertEqual(self.worker.logic_bundles_processing_time, {'game_logic_1': []})
+
+        with mock.patch('the_tale.game.workers.supervisor.Worker.rebalance_logic_workers') as rebalance_logic_workers:
+            self.worker.process_logic_bundles_processing_time('game_logic_2', [])
+
+        self.assertEqual(rebalance_logic_workers.call_args_list, [mock.call({'game_logic_1': [], 'game_logic_2': []})])
+        self.assertEqual(self.worker.logic_bundles_processing_time, {})
+
+    def test_rebalance_logic_workers(self):
+        self.worker.process_initialize()
+
+        account_3 = self.accounts_factory.create_account()
+        self.worker.register_account(account_3.id)
+
+        self.assertEqual(self.worker.accounts_owners[account_3.id], 'game_logic_1')
+
+        bundles_info = {'game_logic_1': [(self.account_1.id, [self.account_1.id], 3.0),
+                                         (account_3.id, [account_3.id], 2.0)],
+                        'game_logic_2': [(self.account_2.id, [self.account_2.id], 1.0)]}
+
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_release_accounts') as cmd_release_accounts:
+            self.assertEqual(self.worker.rebalance_logic_workers(bundles_info), 1)
+
+        self.assertEqual(cmd_release_accounts.call_args_list, [mock.call([account_3.id])])
+        self.assertEqual(self.worker.accounts_migrations, {account_3.id: 'game_logic_2'})
+        self.assertEqual(self.worker.accounts_owners[account_3.id], None)
+
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_accounts') as cmd_register_account:
+            self.worker.process_accounts_released([account_3.id])
+
+        self.assertEqual(cmd_register_account.call_args_list, [mock.call([account_3.id])])
+        self.assertEqual(self.worker.accounts_owners[account_3.id], 'game_logic_2')
+        self.assertEqual(self.worker.accounts_migrations, {})
+        self.assertEqual(self.worker.logic_accounts_number, {'game_logic_1': 1, 'game_logic_2': 2})
+
+    def test_rebalance_logic_workers__balanced(self):
+        self.worker.process_initialize()
+
+        bundles_info = {'game_logic_1': [(self.account_1.id, [self.account_1.id], 1.0)],
+                        'game_logic_2': [(self.account_2.id, [self.account_2.id], 1.05)]}
+
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_release_accounts') as cmd_release_accounts:
+            self.assertEqual(self.worker.rebalance_logic_workers(bundles_info), 0)
+
+        self.assertEqual(cmd_release_accounts.call_count, 0)
+        self.assertEqual(self.worker.accounts_migrations, {})
+
+    def test_rebalance_logic_workers__multiple_accounts_bundle(self):
+        self.worker.process_initialize()
+
+        account_3 = self.accounts_factory.create_account()
+        account_4 = self.accounts_factory.create_account()
+
+        self.worker.send_register_accounts_cmds([account_3.id, account_4.id], 'game_logic_1')
+
+        bundles_info = {'game_logic_1': [(self.account_1.id, [self.account_1.id], 3.0),
+                                         (account_3.id, [account_3.id, account_4.id], 2.0)],
+                        'game_logic_2': [(self.account_2.id, [self.account_2.id], 0.1)]}
+
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_release_accounts') as cmd_release_accounts:
+            self.assertEqual(self.worker.rebalance_logic_workers(bundles_info), 1)
+
+        self.assertEqual(cmd_release_accounts.call_args_list, [mock.call([account_3.id, account_4.id])])
+        self.assertEqual(self.worker.accounts_migrations, {account_3.id: 'game_logic_2', account_4.id: 'game_logic_2'})
+
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_register_accounts') as cmd_register_accounts:
+            self.worker.process_accounts_released([account_3.id, account_4.id])
+
+        self.assertEqual(cmd_register_accounts.call_args_list, [mock.call(sorted([account_3.id, account_4.id]))])
+        self.assertEqual(self.worker.accounts_owners[account_3.id], 'game_logic_2')
+        self.assertEqual(self.worker.accounts_owners[account_4.id], 'game_logic_2')
+        self.assertEqual(self.worker.accounts_migrations, {})
+        self.assertEqual(self.worker.logic_accounts_number, {'game_logic_1': 1, 'game_logic_2': 3})
+
+    def test_rebalance_logic_workers__cancel_stale_migrations(self):
+        self.worker.process_initialize()
+
+        self.worker.accounts_migrations[self.account_1.id] = 'game_logic_2'
+
+        bundles_info = {'game_logic_1': [(self.account_1.id, [self.account_1.id], 1.0)],
+                        'game_logic_2': [(self.account_2.id, [self.account_2.id], 1.05)]}
+
+        self.assertEqual(self.worker.rebalance_logic_workers(bundles_info), 0)
+
+        self.assertEqual(self.worker.accounts_migrations, {})
+
+        # account is dispatched as usual, if it will be released later
+        self.assertEqual(self.worker.choose_logic_worker_to_dispatch(self.account_1.id), 'game_logic_1')
+
+    def test_rebalance_logic_workers__skip_not_owned_bundles_and_tasks(self):
+        self.worker.process_initialize()
+
+        account_3 = self.accounts_factory.create_account()
+        self.worker.register_account(account_3.id)
+
+        task = SupervisorTaskPrototype.create_arena_pvp_1x1(self.account_1, self.account_2)
+        self.worker.tasks[task.id] = task
+        self.worker.accounts_for_tasks[self.account_1.id] = task.id
+
+        bundles_info = {'game_logic_1': [(self.account_1.id, [self.account_1.id], 3.0),
+                                         (account_3.id, [account_3.id, 666], 2.0)],
+                        'game_logic_2': [(self.account_2.id, [self.account_2.id], 0.1)]}
+
+        with mock.patch('the_tale.game.workers.logic.Worker.cmd_release_accounts') as cmd_release_accounts:
+            self.assertEqual(self.worker.rebalance_logic_workers(bundles_info), 0)
+
+        self.assertEqual(cmd_release_accounts.call_count, 0)
+
+    def test_register_task__cancel_migration(self):
+        self.worker.process_initialize()
+
+        self.worker.accounts_migrations[self.account_1.id] = 'game_logic_2'
+
+        task = SupervisorTaskPrototype.create_arena_pvp_1x1(self.account_1, self.account_2)
+        self.worker.register_task(task)
+
+        self.assertEqual(self.worker.accounts_migrations, {})
+
     def test_force_stop(self):
         self.worker.process_initialize()
         self.worker._force_stop()
@@ -14,6 +14,7 @@ from the_tale.game.persons import storage as persons_storage
 from the_tale.game.persons import logic as persons_logic
 
 from the_tale.game.map.places.storage import places_storage, buildings_storage
+from the_tale.game.map.places import logic as places_logic
 from the_tale.game.map.places.conf import places_settings
 
 from the_tale.game.bills.conf import bills_settings
@@ -217,11 +218,10 @@ class Worker(BaseWorker):
 
             place.sync_parameters() # must be last operation to display and use real data
 
-            place.update_heroes_number()
-            place.update_heroes_habits()
-
             place.mark_as_updated()
 
+        places_logic.update_heroes_statistics(places_storage.all())
+
         places_storage.save_all()
 
         persons_storage.persons_storage.remove_out_game_persons()
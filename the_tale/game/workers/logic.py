@@ -2,19 +2,21 @@
 import gc
 import datetime
 
-# from dext.common.utils import profile
-
 from the_tale.amqp_environment import environment
 
 from the_tale.common.utils import workers
 from the_tale.common import postponed_tasks
 
+from the_tale.accounts.achievements.storage import achievements_storage
+
 from the_tale.game.prototypes import TimePrototype
 from the_tale.game.logic_storage import LogicStorage
 from the_tale.game.conf import game_settings
 
 from the_tale.game.quests import logic as quests_logic
 
+from the_tale.game.heroes import modifiers_cache
+
 
 class LogicException(Exception): pass
 
@@ -27,6 +29,10 @@ class Worker(workers.BaseWorker):
         # worker initialized by supervisor
         pass
 
+    @property
+    def snapshot_file(self):
+        return game_settings.LOGIC_SNAPSHOT_FILE % {'worker_id': self.worker_id}
+
     def cmd_initialize(self, turn_number, worker_id):
         self.send_cmd('initialize', {'turn_number': turn_number, 'worker_id': worker_id})
 
@@ -42,6 +48,10 @@ class Worker(workers.BaseWorker):
         self.queue = []
         self.worker_id = worker_id
 
+        if game_settings.ENABLE_LOGIC_SNAPSHOT:
+            if self.storage.load_snapshot(self.snapshot_file, worker_id=self.worker_id, turn_number=self.turn_number):
+                self.logger.info('snapshot loaded')
+
         self.logger.info('GAME INITIALIZED')
 
         environment.workers.supervisor.cmd_answer('initialize', self.worker_id)
@@ -49,7 +59,6 @@ class Worker(workers.BaseWorker):
     def cmd_next_turn(self, turn_number):
         return self.send_cmd('next_turn', data={'turn_number': turn_number})
 
-    # @profile.profile_decorator('/home/tie/repos/mine/the-tale/profile.info')
     def process_next_turn(self, turn_number):
 
         self.turn_number += 1
@@ -62,8 +71,15 @@ class Worker(workers.BaseWorker):
             raise LogicException('dessinchonization: workers turn number (%d) not equal to saved turn number (%d)' % (self.turn_number,
                                                                                                                       TimePrototype.get_current_turn_number()))
 
-        self.storage.process_turn(logger=self.logger)
-        self.storage.save_changed_data(logger=self.logger)
+        self.storage.profiler.start_turn()
+
+        with achievements_storage.batch():
+            self.storage.process_turn(logger=self.logger)
+            self.storage.save_changed_data(logger=self.logger)
+
+        self.storage.profiler.add_counters(modifiers_cache.pop_counters())
+
+        self.storage.profiler.finish_turn()
 
         for hero_id in self.storage.skipped_heroes:
             hero = self.storage.heroes[hero_id]
@@ -71,6 +87,10 @@ class Worker(workers.BaseWorker):
                 continue
             environment.workers.supervisor.cmd_account_release_required(hero.account_id)
 
+        if self.turn_number % game_settings.LOGIC_REBALANCE_PERIOD == 0:
+            environment.workers.supervisor.cmd_logic_bundles_processing_time(worker_id=self.worker_id,
+                                                                             bundles_info=self.storage.pop_bundles_processing_time())
+
         environment.workers.supervisor.cmd_answer('next_turn', self.worker_id)
 
         if game_settings.COLLECT_GARBAGE and self.turn_number % game_settings.COLLECT_GARBAGE_PERIOD == 0:
@@ -78,24 +98,36 @@ class Worker(workers.BaseWorker):
             gc.collect()
             self.logger.info('GC: end')
 
-    def release_account(self, account_id):
+    def _release_account(self, account_id):
+        # returns True, if account released
         if account_id not in self.storage.accounts_to_heroes:
-            environment.workers.supervisor.cmd_account_released(account_id)
-            return
+            return True
 
         hero = self.storage.accounts_to_heroes[account_id]
         bundle_id = hero.actions.current_action.bundle_id
 
         if bundle_id in self.storage.ignored_bundles:
-            return
+            return False
 
         with self.storage.on_exception(self.logger,
                                        message='LogicWorker.process_release_account catch exception, while processing hero %d, try to save all bundles except %d',
                                        data=(hero.id, bundle_id),
                                        excluded_bundle_id=bundle_id):
             self.storage.release_account_data(account_id)
+            return True
+
+        return False
+
+    def release_account(self, account_id):
+        if self._release_account(account_id):
             environment.workers.supervisor.cmd_account_released(account_id)
 
+    def release_accounts(self, accounts_ids):
+        released_accounts_ids = [account_id for account_id in accounts_ids if self._release_account(account_id)]
+
+        if released_accounts_ids:
+            environment.workers.supervisor.cmd_accounts_released(released_accounts_ids)
+
     def cmd_stop(self):
         return self.send_cmd('stop')
 
@@ -103,6 +135,11 @@ class Worker(workers.BaseWorker):
         # no need to save data, since they automaticaly saved on every turn
         self.initialized = False
         self.storage.save_all(logger=self.logger)
+
+        if game_settings.ENABLE_LOGIC_SNAPSHOT:
+            heroes_number = self.storage.save_snapshot(self.snapshot_file, worker_id=self.worker_id, turn_number=self.turn_number)
+            self.logger.info('snapshot saved, heroes: %d' % heroes_number)
+
         environment.workers.supervisor.cmd_answer('stop', self.worker_id)
         self.stop_required = True
         self.logger.info('LOGIC STOPPED')
@@ -117,12 +154,33 @@ class Worker(workers.BaseWorker):
             raise LogicException('can not get account with id "%d"' % (account_id,))
         self.storage.load_account_data(account)
 
+    def cmd_register_accounts(self, accounts_ids):
+        return self.send_cmd('register_accounts', {'accounts_ids': accounts_ids})
+
+    def process_register_accounts(self, accounts_ids):
+        from the_tale.accounts.prototypes import AccountPrototype
+
+        accounts = AccountPrototype.get_list_by_id(accounts_ids)
+
+        if len(accounts) != len(accounts_ids):
+            raise LogicException('can not get accounts with ids "%r"' % (sorted(set(accounts_ids) - set(account.id for account in accounts)),))
+
+        accounts.sort(key=lambda account: account.id)
+
+        self.storage.load_accounts_data(accounts)
+
     def cmd_release_account(self, account_id):
         return self.send_cmd('release_account', {'account_id': account_id})
 
     def process_release_account(self, account_id):
         self.release_account(account_id)
 
+    def cmd_release_accounts(self, accounts_ids):
+        return self.send_cmd('release_accounts', {'accounts_ids': accounts_ids})
+
+    def process_release_accounts(self, accounts_ids):
+        self.release_accounts(accounts_ids)
+
     def cmd_logic_task(self, account_id, task_id):
         return self.send_cmd('logic_task', {'task_id': task_id,
                                             'account_id': account_id})
@@ -196,6 +254,21 @@ class Worker(workers.BaseWorker):
     def process_highlevel_data_updated(self):
         self.storage.on_highlevel_data_updated()
 
+    def cmd_turn_statistics(self):
+        return self.send_cmd('turn_statistics')
+
+    def process_turn_statistics(self):
+        environment.workers.supervisor.cmd_logic_turn_statistics(worker_id=self.worker_id,
+                                                                 statistics=self.storage.profiler.statistics())
+
+    def cmd_start_profiling(self, turns):
+        return self.send_cmd('start_profiling', {'turns': turns})
+
+    def process_start_profiling(self, turns):
+        profile_file = game_settings.TURN_PROFILE_FILE % {'worker_id': self.worker_id, 'turn_number': self.turn_number}
+        self.logger.info('start profiling of %d turns, profile will be saved to %s' % (turns, profile_file))
+        self.storage.profiler.start_profile(turns=turns, profile_file=profile_file)
+
     def cmd_setup_quest(self, account_id, knowledge_base):
         return self.send_cmd('setup_quest', {'account_id': account_id,
                                              'knowledge_base': knowledge_base})
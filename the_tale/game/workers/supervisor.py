@@ -50,7 +50,7 @@ class Worker(BaseWorker):
 
         postponed_tasks.PostponedTaskPrototype.reset_all()
 
-        self.logic_workers = {worker.name: worker for worker in (environment.workers.logic_1, environment.workers.logic_2)}
+        self.logic_workers = {worker.name: worker for worker in environment.logic_workers}
 
         #initialization
         self.logger.info('initialize logic')
@@ -90,6 +90,9 @@ class Worker(BaseWorker):
         self.accounts_owners = {}
         self.accounts_queues = {}
         self.logic_accounts_number = {logic_worker_name: 0 for logic_worker_name in self.logic_workers.iterkeys()}
+        self.logic_bundles_processing_time = {}
+        self.accounts_migrations = {}
+        self.logic_turn_statistics = {}
 
         for task_model in models.SupervisorTask.objects.filter(state=relations.SUPERVISOR_TASK_STATE.WAITING).iterator():
             task = prototypes.SupervisorTaskPrototype(task_model)
@@ -97,8 +100,10 @@ class Worker(BaseWorker):
 
         self.logger.info('distribute accounts')
 
-        for account_id in Account.objects.all().order_by('id').values_list('id', flat=True).iterator():
-            self.register_account(account_id)
+        accounts_ids = list(Account.objects.all().order_by('id').values_list('id', flat=True))
+
+        for i in xrange(0, len(accounts_ids), conf.game_settings.LOGIC_REGISTER_BATCH_SIZE):
+            self.register_accounts(accounts_ids[i:i+conf.game_settings.LOGIC_REGISTER_BATCH_SIZE])
 
         self.initialized = True
         self.wait_next_turn_answer = False
@@ -114,18 +119,29 @@ class Worker(BaseWorker):
 
         self.tasks[task.id] = task
 
+        accounts_to_release = []
+
         for account_id in task.members:
             if account_id in self.accounts_for_tasks:
                 self._force_stop()
                 raise SupervisorException('account %d already register for task %d (second task: %d)' % (account_id, self.accounts_for_tasks[account_id], task.id))
             self.accounts_for_tasks[account_id] = task.id
 
+            # task members will be registered together, so migration must be canceled
+            self.accounts_migrations.pop(account_id, None)
+
             if release_accounts:
-                self.send_release_account_cmd(account_id)
+                accounts_to_release.append(account_id)
+
+        self.send_release_accounts_cmds(accounts_to_release)
+
+    def choose_logic_worker_to_dispatch(self, account_id, hero=None):
 
-    def choose_logic_worker_to_dispatch(self, account_id):
+        if self.accounts_migrations.get(account_id) in self.logic_workers:
+            return self.accounts_migrations.pop(account_id)
 
-        hero = heroes_prototypes.HeroPrototype.get_by_account_id(account_id)
+        if hero is None:
+            hero = heroes_prototypes.HeroPrototype.get_by_account_id(account_id)
 
         bundle_id = hero.actions.current_action.bundle_id
 
@@ -144,46 +160,161 @@ class Worker(BaseWorker):
 
 
     def register_account(self, account_id):
+        self.register_accounts([account_id])
+
+    def register_accounts(self, accounts_ids):
+        # accounts are sent to logic workers with single command per worker
+        # and their heroes are loaded with single query
+        heroes = {hero.account_id: hero for hero in heroes_prototypes.HeroPrototype.get_list_by_account_id(list(accounts_ids))}
+
+        batches = {}
+
+        for account_id in accounts_ids:
+            registration = self._capture_account(account_id, hero=heroes.get(account_id))
+
+            if registration is None:
+                continue
+
+            members_ids, logic_worker_name = registration
+
+            self._assign_accounts(members_ids, logic_worker_name)
+
+            batches.setdefault(logic_worker_name, []).extend(members_ids)
+
+        for logic_worker_name, members_ids in sorted(batches.iteritems()):
+            self._send_register_accounts_cmds(members_ids, logic_worker_name)
+
+    def _capture_account(self, account_id, hero):
+        # returns (accounts ids, logic worker name), if accounts can be registered in logic, otherwise returns None
+
         if self.accounts_owners.get(account_id) is not None:
             raise exceptions.DublicateAccountRegistration(account_id=account_id, owner=self.accounts_owners[account_id])
 
         self.accounts_owners[account_id] = self.name
 
-        if account_id in self.accounts_for_tasks:
-            task = self.tasks[self.accounts_for_tasks[account_id]]
-            task.capture_member(account_id)
+        if account_id not in self.accounts_for_tasks:
+            return [account_id], self.choose_logic_worker_to_dispatch(account_id, hero=hero)
 
-            if task.all_members_captured:
-                del self.tasks[self.accounts_for_tasks[account_id]]
+        task = self.tasks[self.accounts_for_tasks[account_id]]
+        task.capture_member(account_id)
 
-                min_account_id = min(*task.members)
+        if not task.all_members_captured:
+            return None
 
-                task.process(bundle_id=min_account_id)
+        del self.tasks[self.accounts_for_tasks[account_id]]
 
-                logic_worker_name = self.choose_logic_worker_to_dispatch(min_account_id)
+        min_account_id = min(*task.members)
 
-                self.send_register_accounts_cmds(task.members, logic_worker_name)
+        task.process(bundle_id=min_account_id)
 
-                for member_id in task.members:
-                    del self.accounts_for_tasks[member_id]
+        # bundle of task members has been changed, so hero must be loaded again
+        logic_worker_name = self.choose_logic_worker_to_dispatch(min_account_id)
 
-                task.remove()
+        for member_id in task.members:
+            del self.accounts_for_tasks[member_id]
 
-            return
+        task.remove()
+
+        return list(task.members), logic_worker_name
+
+    def rebalance_logic_workers(self, bundles_info):
+        self.cancel_stale_migrations()
+
+        workers_loads = {logic_worker_name: 0.0 for logic_worker_name in self.logic_workers.iterkeys()}
+        candidates = {logic_worker_name: [] for logic_worker_name in self.logic_workers.iterkeys()}
+
+        for logic_worker_name, worker_bundles_info in bundles_info.iteritems():
+            for bundle_id, accounts_ids, processing_time in worker_bundles_info:
+                workers_loads[logic_worker_name] += processing_time
+
+                # bundle members are released and registered together, so bundle is migrated only if all of them can be moved
+                if any(self.accounts_owners.get(account_id) != logic_worker_name or
+                       account_id in self.accounts_for_tasks or
+                       account_id in self.accounts_migrations
+                       for account_id in accounts_ids):
+                    continue
+
+                candidates[logic_worker_name].append((processing_time, bundle_id, tuple(accounts_ids)))
+
+        for worker_candidates in candidates.itervalues():
+            worker_candidates.sort()
+
+        average_load = sum(workers_loads.itervalues()) / len(workers_loads)
+
+        migrations_number = 0
+
+        while migrations_number < conf.game_settings.LOGIC_REBALANCE_MAX_MIGRATIONS:
+            slowest_worker = max(sorted(workers_loads.iterkeys()), key=lambda name: workers_loads[name])
+            fastest_worker = min(sorted(workers_loads.iterkeys()), key=lambda name: workers_loads[name])
+
+            delta = workers_loads[slowest_worker] - workers_loads[fastest_worker]
+
+            if delta <= average_load * conf.game_settings.LOGIC_REBALANCE_THRESHOLD:
+                break
+
+            # choose the bundle, which migration makes loads of both workers as close as possible
+            chosen_candidate = None
+
+            for candidate in candidates[slowest_worker]:
+                if candidate[0] >= delta:
+                    break
+                if chosen_candidate is None or abs(delta - 2 * candidate[0]) < abs(delta - 2 * chosen_candidate[0]):
+                    chosen_candidate = candidate
+
+            if chosen_candidate is None or chosen_candidate[0] <= 0:
+                break
+
+            candidates[slowest_worker].remove(chosen_candidate)
+
+            processing_time, bundle_id, accounts_ids = chosen_candidate
+
+            workers_loads[slowest_worker] -= processing_time
+            workers_loads[fastest_worker] += processing_time
+
+            self.migrate_accounts(accounts_ids, fastest_worker)
+
+            migrations_number += 1
 
-        logic_worker_name = self.choose_logic_worker_to_dispatch(account_id)
+        self.logger.info('[rebalance_logic_workers] loads: %r, migrated bundles: %d' % (workers_loads, migrations_number))
 
-        self.send_register_accounts_cmds([account_id], logic_worker_name)
+        return migrations_number
+
+    def cancel_stale_migrations(self):
+        # migrations are requested only by rebalancing and logic workers answer release commands before sending next bundles info,
+        # so all migrations, which are not finished till next rebalancing, were refused (for example, bundle was ignored after exception)
+        # after cancelation, such accounts are registered as usual, if they will be released
+        if not self.accounts_migrations:
+            return 0
+
+        canceled_number = len(self.accounts_migrations)
+
+        self.logger.warn('[rebalance_logic_workers] cancel %d not finished migrations' % canceled_number)
+
+        self.accounts_migrations.clear()
+
+        return canceled_number
+
+    def migrate_accounts(self, accounts_ids, logic_worker_name):
+        # all accounts are released with single command and registered together, when logic worker answers
+        for account_id in accounts_ids:
+            self.accounts_migrations[account_id] = logic_worker_name
+
+        self.send_release_accounts_cmds(accounts_ids)
 
     def send_register_accounts_cmds(self, accounts_ids, logic_worker_name):
-        accounts_ids = sorted(accounts_ids)
+        self._assign_accounts(accounts_ids, logic_worker_name)
+        self._send_register_accounts_cmds(accounts_ids, logic_worker_name)
 
-        # register accounts in logic
+    def _assign_accounts(self, accounts_ids, logic_worker_name):
         for account_id in accounts_ids:
             self.accounts_owners[account_id] = logic_worker_name
             self.logic_accounts_number[logic_worker_name] += 1
 
-            self.logic_workers[logic_worker_name].cmd_register_account(account_id)
+    def _send_register_accounts_cmds(self, accounts_ids, logic_worker_name):
+        accounts_ids = sorted(accounts_ids)
+
+        # register accounts in logic
+        self.logic_workers[logic_worker_name].cmd_register_accounts(accounts_ids)
 
         # send delayed commands, only after all accounts will be registered
         # sice some actions (for example, text generation) may need all bundle of heroes
@@ -200,6 +331,23 @@ class Worker(BaseWorker):
             self.logic_accounts_number[account_owner] -= 1
             self.accounts_owners[account_id] = None
 
+    def send_release_accounts_cmds(self, accounts_ids):
+        # accounts are released with single command per logic worker
+        batches = {}
+
+        for account_id in accounts_ids:
+            account_owner = self.accounts_owners[account_id]
+
+            if account_owner is None:
+                continue
+
+            batches.setdefault(account_owner, []).append(account_id)
+            self.logic_accounts_number[account_owner] -= 1
+            self.accounts_owners[account_id] = None
+
+        for account_owner, owner_accounts_ids in sorted(batches.iteritems()):
+            self.logic_workers[account_owner].cmd_release_accounts(owner_accounts_ids)
+
     def dispatch_logic_cmd(self, account_id, cmd_name, kwargs):
         if account_id in self.accounts_owners and self.accounts_owners[account_id] in self.logic_workers:
             getattr(self.logic_workers[self.accounts_owners[account_id]], 'cmd_' + cmd_name)(**kwargs)
@@ -359,6 +507,56 @@ class Worker(BaseWorker):
     def process_account_released(self, account_id):
         self.register_account(account_id)
 
+    def cmd_accounts_released(self, accounts_ids):
+        return self.send_cmd('accounts_released', {'accounts_ids': accounts_ids})
+
+    def process_accounts_released(self, accounts_ids):
+        self.register_accounts(accounts_ids)
+
+    def cmd_logic_bundles_processing_time(self, worker_id, bundles_info):
+        return self.send_cmd('logic_bundles_processing_time', {'worker_id': worker_id,
+                                                               'bundles_info': bundles_info})
+
+    def process_logic_bundles_processing_time(self, worker_id, bundles_info):
+        self.logic_bundles_processing_time[worker_id] = bundles_info
+
+        if len(self.logic_bundles_processing_time) < len(self.logic_workers):
+            return
+
+        bundles_info = self.logic_bundles_processing_time
+        self.logic_bundles_processing_time = {}
+
+        self.rebalance_logic_workers(bundles_info)
+
+    def cmd_request_logic_turn_statistics(self):
+        return self.send_cmd('request_logic_turn_statistics')
+
+    def process_request_logic_turn_statistics(self):
+        self.logic_multicast('turn_statistics', arguments={})
+
+    def cmd_logic_turn_statistics(self, worker_id, statistics):
+        return self.send_cmd('logic_turn_statistics', {'worker_id': worker_id,
+                                                       'statistics': statistics})
+
+    def process_logic_turn_statistics(self, worker_id, statistics):
+        self.logic_turn_statistics[worker_id] = statistics
+
+        self.logger.info('[logic_turn_statistics] %s, turns: %d' % (worker_id, statistics['turns']))
+
+        for section, info in sorted(statistics['sections'].iteritems(), key=lambda item: -item[1]['total']):
+            self.logger.info('[logic_turn_statistics] %s: count=%d total=%.3f avg=%.6f p95=%.6f max=%.6f' % (section,
+                                                                                                             info['count'],
+                                                                                                             info['total'],
+                                                                                                             info['average'],
+                                                                                                             info['p95'],
+                                                                                                             info['max']))
+
+    def cmd_start_logic_profiling(self, turns):
+        return self.send_cmd('start_logic_profiling', {'turns': turns})
+
+    def process_start_logic_profiling(self, turns):
+        self.logic_multicast('start_profiling', arguments={'turns': turns})
+
     def cmd_setup_quest(self, account_id, knowledge_base):
         return self.send_cmd('setup_quest', {'account_id': account_id,
                                              'knowledge_base': knowledge_base})
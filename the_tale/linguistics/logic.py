@@ -90,15 +90,15 @@ def fake_text(lexicon_key, externals):
     return unicode(lexicon_key) + u': ' + u' '.join(u'%s=%s' % (k, v.form) for k, v in externals.iteritems())
 
 
-def _render_text__real(lexicon_key, externals, quiet=False, restrictions=frozenset()):
+def _render_text__real(lexicon_key, externals, quiet=False, restrictions=frozenset(), lexicon=None, dictionary=None):
     if lexicon_key is None:
         return fake_text(lexicon_key, externals)
 
     try:
         # dictionary & lexicon can be changed unexpectedly in any time
         # and some rendered data can be obsolete
-        template = game_lexicon.item.get_random_template(lexicon_key, restrictions=restrictions)
-        return template.substitute(externals, game_dictionary.item)
+        template = (lexicon or game_lexicon.item).get_random_template(lexicon_key, restrictions=restrictions)
+        return template.substitute(externals, dictionary or game_dictionary.item)
     except utg_exceptions.UtgError as e:
         if not quiet:
             logger.error(u'Exception in linguistics; key=%s, args=%r, message: "%s"' % (lexicon_key, externals, e),
@@ -107,13 +107,24 @@ def _render_text__real(lexicon_key, externals, quiet=False, restrictions=frozens
         return fake_text(lexicon_key, externals)
 
 
-def _render_text__test(lexicon_key, externals, quiet=False, restrictions=frozenset()):
-    if not game_lexicon.item.has_key(lexicon_key):
+def _render_text__test(lexicon_key, externals, quiet=False, restrictions=frozenset(), lexicon=None, dictionary=None):
+    lexicon = lexicon or game_lexicon.item
+
+    if not lexicon.has_key(lexicon_key):
         return fake_text(lexicon_key, externals)
 
-    template = game_lexicon.item.get_random_template(lexicon_key, restrictions=restrictions)
+    template = lexicon.get_random_template(lexicon_key, restrictions=restrictions)
+
+    return template.substitute(externals, dictionary or game_dictionary.item)
+
+
+def render_texts(texts, quiet=False):
+    # render list of (lexicon_key, externals, restrictions) with single synchronization of lexicon and dictionary
+    lexicon = game_lexicon.item
+    dictionary = game_dictionary.item
 
-    return template.substitute(externals, game_dictionary.item)
+    return [render_text(lexicon_key, externals, quiet, restrictions=restrictions, lexicon=lexicon, dictionary=dictionary)
+            for lexicon_key, externals, restrictions in texts]
 
 
 prepair_get_text = _prepair_get_text__test if project_settings.TESTS_RUNNING else _prepair_get_text__real
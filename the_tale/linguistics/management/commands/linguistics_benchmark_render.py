@@ -0,0 +1,72 @@
+# coding: utf-8
+import time
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from utg import lexicon as utg_lexicon
+
+from ... import prototypes
+from ... import logic
+from ...storage import game_lexicon
+from ...lexicon.keys import LEXICON_KEY
+
+
+def measure(callback, repeats):
+    started_at = time.time()
+    for i in xrange(repeats):
+        callback()
+    return time.time() - started_at
+
+
+class Command(BaseCommand):
+
+    help = 'compare templates rendering with and without cache of filtered templates'
+
+    option_list = BaseCommand.option_list + ( make_option('-r', '--repeats',
+                                                          action='store',
+                                                          type=int,
+                                                          dest='repeats',
+                                                          default=100,
+                                                          help='how many times render every key'), )
+
+    def handle(self, *args, **options):
+
+        repeats = options['repeats']
+
+        lexicon = game_lexicon.item
+
+        texts = []
+
+        for key in LEXICON_KEY.records:
+            if not lexicon.has_key(key):
+                continue
+
+            verificators = prototypes.TemplatePrototype.get_start_verificatos(key)
+
+            if not verificators:
+                continue
+
+            texts.append((key, verificators[0].preprocessed_externals(), frozenset()))
+
+        print 'keys with templates: %d' % len(texts)
+
+        def get_templates_without_cache():
+            for key, externals, restrictions in texts:
+                utg_lexicon.Lexicon.get_templates(lexicon, key, restrictions)
+
+        def get_templates_with_cache():
+            for key, externals, restrictions in texts:
+                lexicon.get_templates(key, restrictions)
+
+        def render_one_by_one():
+            for key, externals, restrictions in texts:
+                logic.render_text(key, externals, quiet=True, restrictions=restrictions)
+
+        def render_batch():
+            logic.render_texts(texts, quiet=True)
+
+        print 'templates filtering without cache: %.4f' % measure(get_templates_without_cache, repeats)
+        print 'templates filtering with cache:    %.4f' % measure(get_templates_with_cache, repeats)
+        print 'render texts one by one:           %.4f' % measure(render_one_by_one, repeats)
+        print 'render texts in batch:             %.4f' % measure(render_batch, repeats)
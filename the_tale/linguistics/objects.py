@@ -1,5 +1,7 @@
 # coding: utf-8
 
+from utg import lexicon as utg_lexicon
+
 from the_tale.game import names
 
 
@@ -30,3 +32,31 @@ class Restriction(names.ManageNameMixin):
                 self.group == other.group and
                 self.external_id == other.external_id and
                 self.name == other.name)
+
+
+class Lexicon(utg_lexicon.Lexicon):
+    # lexicon with cache of templates filtered by restrictions
+    # lexicon is recreated on every change of game lexicon, so cache lives only for one lexicon version
+    __slots__ = ('_keys_restrictions', '_templates_cache')
+
+    def __init__(self):
+        super(Lexicon, self).__init__()
+        self._keys_restrictions = {}
+        self._templates_cache = {}
+
+    def add_template(self, key, template, restrictions=frozenset()):
+        super(Lexicon, self).add_template(key, template, restrictions=restrictions)
+        self._keys_restrictions[key] = self._keys_restrictions.get(key, frozenset()) | frozenset(restrictions)
+        self._templates_cache.clear()
+
+    def get_templates(self, key, restrictions):
+        # only restrictions, used by templates of the key, change the result
+        cache_key = (key, frozenset(restrictions) & self._keys_restrictions.get(key, frozenset()))
+
+        templates = self._templates_cache.get(cache_key)
+
+        if templates is None:
+            templates = super(Lexicon, self).get_templates(key, restrictions)
+            self._templates_cache[cache_key] = templates
+
+        return templates
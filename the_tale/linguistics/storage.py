@@ -8,7 +8,6 @@ from dext.common.utils import storage as dext_storage
 from utg import words as utg_words
 from utg import templates as utg_templates
 from utg import dictionary as utg_dictionary
-from utg import lexicon as utg_lexicon
 
 from the_tale.common.utils import storage
 
@@ -58,7 +57,7 @@ class GameLexiconDictionaryStorage(storage.SingleStorage):
                                                        errors_status=relations.TEMPLATE_ERRORS_STATUS.NO_ERRORS).values_list('key', 'data')
 
     def _construct_zero_item(self):
-        return utg_lexicon.Lexicon()
+        return objects.Lexicon()
 
     def refresh(self):
         from the_tale.linguistics.lexicon.keys import LEXICON_KEY
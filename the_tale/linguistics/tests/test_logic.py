@@ -142,6 +142,20 @@ class LogicTests(TestCase):
                          u'Герой 1 w-2-нс,ед,дт')
 
 
+    def test_render_texts(self):
+        with mock.patch('the_tale.linguistics.logic.render_text', mock.Mock(side_effect=[u'text-1', u'text-2'])) as render_text:
+            texts = logic.render_texts([(keys.LEXICON_KEY.HERO_COMMON_JOURNAL_LEVEL_UP, {'a': 1}, frozenset()),
+                                        (keys.LEXICON_KEY.HERO_COMMON_DIARY_CREATE, {'b': 2}, frozenset([('x', 1)]))])
+
+        self.assertEqual(texts, [u'text-1', u'text-2'])
+
+        self.assertEqual(render_text.call_args_list,
+                         [mock.call(keys.LEXICON_KEY.HERO_COMMON_JOURNAL_LEVEL_UP, {'a': 1}, False, restrictions=frozenset(),
+                                    lexicon=storage.game_lexicon.item, dictionary=storage.game_dictionary.item),
+                          mock.call(keys.LEXICON_KEY.HERO_COMMON_DIARY_CREATE, {'b': 2}, False, restrictions=frozenset([('x', 1)]),
+                                    lexicon=storage.game_lexicon.item, dictionary=storage.game_dictionary.item)])
+
+
     def test_update_words_usage_info(self):
         word_1 = prototypes.WordPrototype.create(utg_words.Word.create_test_word(type=utg_relations.WORD_TYPE.NOUN, prefix=u'w-1-', only_required=True))
         word_2 = prototypes.WordPrototype.create(utg_words.Word.create_test_word(type=utg_relations.WORD_TYPE.NOUN, prefix=u'w-2-', only_required=True))
@@ -0,0 +1,51 @@
+# coding: utf-8
+import mock
+
+from utg import lexicon as utg_lexicon
+from utg import exceptions as utg_exceptions
+
+from the_tale.common.utils.testcase import TestCase
+
+from the_tale.linguistics import objects
+
+
+class LexiconTests(TestCase):
+
+    def setUp(self):
+        super(LexiconTests, self).setUp()
+
+        self.lexicon = objects.Lexicon()
+
+        self.lexicon.add_template('key_1', 'template_1')
+        self.lexicon.add_template('key_1', 'template_2', restrictions=frozenset([('hero', 1)]))
+        self.lexicon.add_template('key_2', 'template_3', restrictions=frozenset([('hero', 2)]))
+
+    def test_is_utg_lexicon(self):
+        self.assertTrue(isinstance(self.lexicon, utg_lexicon.Lexicon))
+
+    def test_get_templates(self):
+        self.assertEqual(set(self.lexicon.get_templates('key_1', frozenset())), set(['template_1']))
+        self.assertEqual(set(self.lexicon.get_templates('key_1', frozenset([('hero', 1), ('place', 3)]))), set(['template_1', 'template_2']))
+        self.assertEqual(list(self.lexicon.get_templates('key_2', frozenset([('hero', 1)]))), [])
+
+    def test_get_templates__cached(self):
+        templates = self.lexicon.get_templates('key_1', frozenset([('hero', 1)]))
+
+        with mock.patch('utg.lexicon.Lexicon.get_templates') as get_templates:
+            self.assertEqual(self.lexicon.get_templates('key_1', frozenset([('hero', 1)])), templates)
+            # restrictions, not used by key templates, do not change cache key
+            self.assertEqual(self.lexicon.get_templates('key_1', frozenset([('hero', 1), ('place', 3)])), templates)
+
+        self.assertEqual(get_templates.call_count, 0)
+
+    def test_add_template__reset_cache(self):
+        self.lexicon.get_templates('key_1', frozenset())
+
+        self.lexicon.add_template('key_1', 'template_4')
+
+        self.assertEqual(set(self.lexicon.get_templates('key_1', frozenset())), set(['template_1', 'template_4']))
+
+    def test_get_random_template(self):
+        self.assertEqual(self.lexicon.get_random_template('key_1', frozenset()), 'template_1')
+
+        self.assertRaises(utg_exceptions.NoTemplatesWithSpecifiedRestrictions, self.lexicon.get_random_template, 'key_2', frozenset())
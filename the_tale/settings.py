@@ -246,6 +246,12 @@ AMQP_BROKER_USER = 'the-tale'
 AMQP_BROKER_PASSWORD = 'the-tale'
 AMQP_BROKER_VHOST = '/the-tale'
 
+# number of game logic workers, must be available before logging configuration
+GAME_LOGIC_WORKERS_NUMBER = 2
+
+# number of quests generators, must be available before logging configuration
+QUESTS_GENERATORS_NUMBER = 2
+
 ##############################
 # code coverage tests
 ##############################
@@ -391,8 +397,6 @@ LOGGING = {
             'formatter': 'simple'
             },
         'file_game_supervisor': get_worker_log_file_handler('game_supervisor'),
-        'file_game_logic_1': get_worker_log_file_handler('game_logic_1'),
-        'file_game_logic_2': get_worker_log_file_handler('game_logic_2'),
         'file_game_highlevel': get_worker_log_file_handler('game_highlevel'),
         'file_game_turns_loop': get_worker_log_file_handler('game_turns_loop'),
         'file_game_long_commands': get_worker_log_file_handler('game_long_commands'),
@@ -400,7 +404,6 @@ LOGGING = {
         'file_linguistics_manager': get_worker_log_file_handler('linguistics_manager'),
         'file_market_manager': get_worker_log_file_handler('market_manager'),
         'file_game_pvp_balancer': get_worker_log_file_handler('game_pvp_balancer'),
-        'file_game_quests_generator': get_worker_log_file_handler('game_quests_generator'),
         'file_linguistics': get_worker_log_file_handler('linguistics'),
         'file_accounts_registration': get_worker_log_file_handler('accounts_registration'),
         'file_accounts_accounts_manager': get_worker_log_file_handler('accounts_accounts_manager'),
@@ -424,8 +427,6 @@ LOGGING = {
             'propagate': False
         },
         'the-tale.workers.game_supervisor': get_worker_logger('game_supervisor'),
-        'the-tale.workers.game_logic_1': get_worker_logger('game_logic_1'),
-        'the-tale.workers.game_logic_2': get_worker_logger('game_logic_2'),
         'the-tale.workers.game_highlevel': get_worker_logger('game_highlevel'),
         'the-tale.workers.game_turns_loop': get_worker_logger('game_turns_loop'),
         'the-tale.workers.game_long_commands': get_worker_logger('game_long_commands'),
@@ -433,7 +434,6 @@ LOGGING = {
         'the-tale.workers.linguistics_manager': get_worker_logger('linguistics_manager'),
         'the-tale.workers.market_manager': get_worker_logger('market_manager'),
         'the-tale.workers.game_pvp_balancer': get_worker_logger('game_pvp_balancer'),
-        'the-tale.workers.game_quests_generator': get_worker_logger('game_quests_generator'),
         'the-tale.workers.accounts_registration': get_worker_logger('accounts_registration'),
         'the-tale.workers.accounts_accounts_manager': get_worker_logger('accounts_accounts_manager'),
         'the-tale.workers.achievements_achievements_manager': get_worker_logger('achievements_achievements_manager'),
@@ -446,3 +446,13 @@ LOGGING = {
         'the-tale.linguistics': get_worker_logger('linguistics')
     } if not TESTS_RUNNING else {}
 }
+
+for logic_number in xrange(1, GAME_LOGIC_WORKERS_NUMBER + 1):
+    LOGGING['handlers']['file_game_logic_%d' % logic_number] = get_worker_log_file_handler('game_logic_%d' % logic_number)
+    if not TESTS_RUNNING:
+        LOGGING['loggers']['the-tale.workers.game_logic_%d' % logic_number] = get_worker_logger('game_logic_%d' % logic_number)
+
+for generator_number in xrange(1, QUESTS_GENERATORS_NUMBER + 1):
+    LOGGING['handlers']['file_game_quests_generator_%d' % generator_number] = get_worker_log_file_handler('game_quests_generator_%d' % generator_number)
+    if not TESTS_RUNNING:
+        LOGGING['loggers']['the-tale.workers.game_quests_generator_%d' % generator_number] = get_worker_logger('game_quests_generator_%d' % generator_number)
@@ -127,25 +127,118 @@ pgf.game.map.MapManager = function(params) {
     var mapWidth = undefined;
     var mapHeight = undefined;
 
-    function LoadMap(version) {
+    var latestMapVersion = params.currentMapVersion;
+    var loadingMapVersion = undefined;
+
+    function SetMapData(data) {
+        mapData = data;
+        loadingMapVersion = undefined;
+
+        instance.mapWidth = data.width;
+        instance.mapHeight = data.height;
+
+        jQuery(document).trigger(pgf.game.map.events.DATA_UPDATED);
+    }
+
+    function LoadRegion(version) {
         jQuery.ajax({   dataType: 'json',
                         type: 'get',
                         url: params.RegionUrl(version),
                         success: function(data, request, status) {
-                            mapData = data;
+                            SetMapData(data);
+                        },
+                        error: function() {
+                            loadingMapVersion = undefined;
+                        },
+                        complete: function() {
+                        }
+                    });
+    }
+
+    function AssembleDrawInfo(index, loadedChunks) {
+        var drawInfo = [];
+
+        for (var y = 0; y < index.height; ++y) {
+            var row = [];
+            var chunkY = Math.floor(y / index.chunk_size);
+
+            for (var x = 0; x < index.width; ++x) {
+                var chunkX = Math.floor(x / index.chunk_size);
+                var chunk = loadedChunks[index.chunks[chunkX + '_' + chunkY]];
+                row.push(chunk[y % index.chunk_size][x % index.chunk_size]);
+            }
 
-                            instance.mapWidth = data.width;
-                            instance.mapHeight = data.height;
+            drawInfo.push(row);
+        }
+
+        return drawInfo;
+    }
 
-                            jQuery(document).trigger(pgf.game.map.events.DATA_UPDATED);
+    function OnChunksLoadFailed(version) {
+        // chunks of old map versions are removed after several map updates,
+        // so load latest known version or, if it has failed too, full region file
+        loadingMapVersion = undefined;
+
+        if (latestMapVersion != version) {
+            LoadMap(latestMapVersion);
+        }
+        else if (params.RegionUrl) {
+            loadingMapVersion = version;
+            LoadRegion(version);
+        }
+    }
+
+    function LoadChunks(version) {
+        // chunks are addressed by content hash, so unchanged chunks are taken from browser cache
+        jQuery.ajax({   dataType: 'json',
+                        type: 'get',
+                        url: params.ChunksIndexUrl(version),
+                        success: function(index, request, status) {
+                            var hashes = [];
+                            var loadedChunks = {};
+
+                            for (var key in index.chunks) {
+                                if (hashes.indexOf(index.chunks[key]) == -1) hashes.push(index.chunks[key]);
+                            }
+
+                            var requests = jQuery.map(hashes, function(hash) {
+                                return jQuery.ajax({ dataType: 'json',
+                                                     type: 'get',
+                                                     cache: true,
+                                                     url: params.ChunkUrl(hash),
+                                                     success: function(chunk) { loadedChunks[hash] = chunk; } });
+                            });
+
+                            jQuery.when.apply(jQuery, requests).done(function() {
+                                SetMapData({ width: index.width,
+                                             height: index.height,
+                                             map_version: index.map_version,
+                                             draw_info: AssembleDrawInfo(index, loadedChunks),
+                                             places: index.places,
+                                             roads: index.roads });
+                            }).fail(function() {
+                                OnChunksLoadFailed(version);
+                            });
                         },
                         error: function() {
+                            OnChunksLoadFailed(version);
                         },
                         complete: function() {
                         }
                     });
     }
 
+    function LoadMap(version) {
+        loadingMapVersion = version;
+
+        if (params.ChunksIndexUrl) {
+            LoadChunks(version);
+        }
+        else {
+            LoadRegion(version);
+        }
+    }
+
     function GetMapDataForRect(x, y, w, h) {
         return { mapData: mapData,
                  dynamicData: dynamicData,
@@ -191,7 +284,9 @@ pgf.game.map.MapManager = function(params) {
             dynamicData.hero = game_data.account.hero;
         }
 
-        if (mapData && game_data.map_version != mapData.map_version) {
+        latestMapVersion = game_data.map_version;
+
+        if (game_data.map_version != mapData.map_version && game_data.map_version != loadingMapVersion) {
             LoadMap(game_data.map_version);
         }
     });
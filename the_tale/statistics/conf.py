@@ -14,4 +14,5 @@ statistics_settings = app_settings('STATISTICS',
                                    PAYMENTS_START_DATE=datetime.datetime(year=2013, month=8, day=1),
                                    JS_DATA_FILE_LOCATION=os.path.join(GEN_DATA_DIR, './data-%s.js'),
                                    JS_DATA_FILE_URL='/dcont/statistics/data-%s.js',
-                                   JS_DATA_FILE_VERSION_KEY='statistic version')
+                                   JS_DATA_FILE_VERSION_KEY='statistic version',
+                                   COMPLETE_WORKERS=4)
@@ -15,6 +15,8 @@ from the_tale.statistics.metrics import registrations
 from the_tale.statistics.metrics import lifetime
 from the_tale.statistics.metrics import monetization
 from the_tale.statistics.metrics import actual
+from the_tale.statistics.metrics import sources
+from the_tale.statistics.metrics import scheduler
 
 
 METRICS = [
@@ -150,13 +152,20 @@ class Command(BaseCommand):
                                               make_option('-r', '--recalculate-last',
                                                           action='store_true',
                                                           dest='recalculate-last',
-                                                          help='recalculate last day'),        )
+                                                          help='recalculate last day'),
+                                              make_option('-w', '--workers',
+                                                          action='store',
+                                                          type=int,
+                                                          dest='workers',
+                                                          default=statistics_settings.COMPLETE_WORKERS,
+                                                          help='number of metrics calculated in parallel'),        )
 
     def handle(self, *args, **options):
 
         force_clear = options.get('force-clear')
         verbose = options.get('verbose')
         recalculate = options.get('recalculate-last')
+        workers = options.get('workers')
 
         if recalculate:
             for MetricClass in METRICS:
@@ -169,14 +178,20 @@ class Command(BaseCommand):
                     print 'clear %s' % MetricClass.TYPE
                 MetricClass.clear()
 
-        for i, MetricClass in enumerate(METRICS):
+        sources.clear()
+
+        def process(MetricClass):
             metric = MetricClass()
             if verbose:
-                print '[%3d] calculate %s' % (i, metric.TYPE)
+                print '[%3d] calculate %s' % (METRICS.index(MetricClass), metric.TYPE)
 
             metric.initialize()
             metric.complete_values()
 
+        scheduler.run(METRICS, process, workers=workers)
+
+        sources.clear()
+
 
         data_version = int(settings.get(statistics_settings.JS_DATA_FILE_VERSION_KEY, 0))
         data_version += 1
@@ -1,20 +1,17 @@
 # coding: utf-8
 import datetime
 
-from django.db import models
-
 from the_tale.portal import conf as portal_conf
 
-from the_tale.accounts.prototypes import AccountPrototype, RandomPremiumRequestPrototype
+from the_tale.accounts.prototypes import AccountPrototype
 from the_tale.accounts.conf import accounts_settings
 
 from the_tale.finances.shop.relations import GOODS_GROUP
 from the_tale.finances.shop import conf as shop_conf
 
-from the_tale.finances.bank.prototypes import InvoicePrototype
-from the_tale.finances.bank.relations import INVOICE_STATE, ENTITY_TYPE, CURRENCY_TYPE
-
 from the_tale.statistics.metrics.base import BaseMetric, BasePercentsCombination
+from the_tale.statistics.metrics import sources
+from the_tale.statistics.metrics import windows
 from the_tale.statistics import relations
 from the_tale.statistics.conf import statistics_settings
 
@@ -39,44 +36,36 @@ class ActiveBase(BaseMetric):
 
 class Premiums(ActiveBase):
     TYPE = relations.RECORD_TYPE.PREMIUMS
+    PREMIUM_DAYS = (7, 15, 30, 90)
 
     def get_actual_value(self, date):
         return AccountPrototype._db_filter(self.db_date_gte('premium_end_at', date=date)).count()
 
-    def get_invoice_intervals_count(self, days, date):
-        starts = list(InvoicePrototype._db_filter(models.Q(state=INVOICE_STATE.CONFIRMED)|models.Q(state=INVOICE_STATE.FORCED),
-                                                  operation_uid__contains='<%s%d' % (GOODS_GROUP.PREMIUM.uid_prefix, days),
-                                                  sender_type=ENTITY_TYPE.GAME_LOGIC,
-                                                  currency=CURRENCY_TYPE.PREMIUM).values_list('created_at', flat=True))
-        return len([True
-                    for created_at in starts
-                    if created_at <= datetime.datetime.combine(date, datetime.time()) < created_at + datetime.timedelta(days=days)] )
-
-    def get_invoice_infinit_intervals_count(self, date):
-        return InvoicePrototype._db_filter(models.Q(state=INVOICE_STATE.CONFIRMED)|models.Q(state=INVOICE_STATE.FORCED),
-                                           self.db_date_lte('created_at', date),
-                                           operation_uid__contains='<%sinfinit' % GOODS_GROUP.PREMIUM.uid_prefix,
-                                           sender_type=ENTITY_TYPE.GAME_LOGIC,
-                                           currency=CURRENCY_TYPE.PREMIUM).count()
-
-    def get_chest_intervals_count(self, date):
-        starts = RandomPremiumRequestPrototype._db_all().values_list('created_at', flat=True)
-        return len([True
-                    for created_at in starts
-                    if created_at.date() <= date < (created_at + datetime.timedelta(days=shop_conf.payments_settings.RANDOM_PREMIUM_DAYS)).date()] )
+    def initialize(self):
+        super(Premiums, self).initialize()
+
+        # number of premiums, restored from purchases history
+        self.premiums = self.daily_series((), start=statistics_settings.PAYMENTS_START_DATE.date())
+
+        for created_at in sources.random_premium_requests():
+            self.premiums.add_interval(created_at.date(),
+                                       (created_at + datetime.timedelta(days=shop_conf.payments_settings.RANDOM_PREMIUM_DAYS)).date())
+
+        for purchase in sources.purchases():
+            for days in self.PREMIUM_DAYS:
+                if '<%s%d' % (GOODS_GROUP.PREMIUM.uid_prefix, days) in purchase.operation_uid:
+                    self.premiums.add_interval(windows.ceil_date(purchase.created_at),
+                                               windows.ceil_date(purchase.created_at + datetime.timedelta(days=days)))
+
+            if '<%sinfinit' % GOODS_GROUP.PREMIUM.uid_prefix in purchase.operation_uid:
+                self.premiums.add_interval(purchase.created_at.date(), None)
 
     def get_restored_value(self, date):
         # TODO: now this method use euristic which give wrong results when user buy more then one subscription simultaneously
         if statistics_settings.PAYMENTS_START_DATE.date() > date:
             return 0
 
-        return ( portal_conf.portal_settings.PREMIUM_DAYS_FOR_HERO_OF_THE_DAY +
-                 self.get_chest_intervals_count(date) +
-                 self.get_invoice_intervals_count(7, date) +
-                 self.get_invoice_intervals_count(15, date) +
-                 self.get_invoice_intervals_count(30, date) +
-                 self.get_invoice_intervals_count(90, date) +
-                 self.get_invoice_infinit_intervals_count(date))
+        return portal_conf.portal_settings.PREMIUM_DAYS_FOR_HERO_OF_THE_DAY + self.premiums.total(date)
 
 
 class PremiumPercents(BasePercentsCombination):
@@ -89,20 +78,19 @@ class PremiumPercents(BasePercentsCombination):
 class InfinitPremiums(ActiveBase):
     TYPE = relations.RECORD_TYPE.INFINIT_PREMIUMS
 
-    def get_actual_value(self, date):
-        return self.get_invoice_infinit_intervals_count(date)
+    def initialize(self):
+        super(InfinitPremiums, self).initialize()
+        self.premiums = self.daily_series((purchase.created_at.date(), 1)
+                                          for purchase in sources.purchases()
+                                          if '<%sinfinit' % GOODS_GROUP.PREMIUM.uid_prefix in purchase.operation_uid)
 
-    def get_invoice_infinit_intervals_count(self, date):
-        return InvoicePrototype._db_filter(models.Q(state=INVOICE_STATE.CONFIRMED)|models.Q(state=INVOICE_STATE.FORCED),
-                                           self.db_date_lte('created_at', date),
-                                           operation_uid__contains='<%sinfinit' % GOODS_GROUP.PREMIUM.uid_prefix,
-                                           sender_type=ENTITY_TYPE.GAME_LOGIC,
-                                           currency=CURRENCY_TYPE.PREMIUM).values_list('created_at', flat=True).count()
+    def get_actual_value(self, date):
+        return self.premiums.total(date)
 
     def get_restored_value(self, date):
         if statistics_settings.PAYMENTS_START_DATE.date() > date:
             return 0
-        return self.get_invoice_infinit_intervals_count(date)
+        return self.premiums.total(date)
 
 
 class ActiveAccountsBase(ActiveBase):
@@ -8,6 +8,7 @@ from the_tale.common.utils.logic import days_range
 from the_tale.statistics.prototypes import RecordPrototype
 from the_tale.statistics.conf import statistics_settings
 from the_tale.statistics.metrics import exceptions
+from the_tale.statistics.metrics import windows
 
 
 class BaseMetric(object):
@@ -40,11 +41,18 @@ class BaseMetric(object):
         except IndexError:
             return statistics_settings.START_DATE - datetime.timedelta(days=1)
 
+    def _record_arguments(self, date, value):
+        return {'type': self.TYPE,
+                'date': date,
+                'value_int': value if self.TYPE.value_type.is_INT else None,
+                'value_float': value if self.TYPE.value_type.is_FLOAT else None}
+
     def store_value(self, date, value):
-        return RecordPrototype.create(type=self.TYPE,
-                                      date=date,
-                                      value_int=value if self.TYPE.value_type.is_INT else None,
-                                      value_float=value if self.TYPE.value_type.is_FLOAT else None)
+        return RecordPrototype.create(**self._record_arguments(date, value))
+
+    def store_values(self, values):
+        # values: [(date, value), ...]
+        RecordPrototype.create_many(self._record_arguments(date, value) for date, value in values)
 
     def get_value(self, date):
         raise NotImplementedError()
@@ -52,12 +60,14 @@ class BaseMetric(object):
     def _get_interval(self):
         return (self.free_date, datetime.datetime.now().date())
 
+    def daily_series(self, items, start=None):
+        return windows.DailySeries.create(items, start=start, end=self._get_interval()[1])
+
     def complete_values(self):
         if self.values_completed:
             raise exceptions.ValuesCompletedError()
 
-        for date in days_range(*self._get_interval()):
-            self.store_value(date, self.get_value(date))
+        self.store_values([(date, self.get_value(date)) for date in days_range(*self._get_interval())])
         self.values_completed = True
 
     def db_date_gt(self, field, date=None):
@@ -124,14 +134,18 @@ class BaseCombination(BaseMetric):
             sources.append(data)
 
 
+        values = []
+
         for source_record in zip(*sources):
 
-            dates, values = zip(*source_record)
+            dates, source_values = zip(*source_record)
 
             if list(dates) != [dates[0]]*len(dates):
                 raise exceptions.UnequalDatesError()
 
-            self.store_value(dates[0], self.get_combined_value(*values))
+            values.append((dates[0], self.get_combined_value(*source_values)))
+
+        self.store_values(values)
 
 
 class BasePercentsCombination(BaseCombination):
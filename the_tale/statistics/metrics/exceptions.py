@@ -12,3 +12,6 @@ class UnequalDatesError(MetricsError):
 
 class ValuesCompletedError(MetricsError):
     MSG = u'values already completed, metric must be reinitialized'
+
+class CyclicDependenciesError(MetricsError):
+    MSG = u'metrics have cyclic dependencies: %(metrics)s'
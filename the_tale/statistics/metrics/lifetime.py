@@ -2,10 +2,10 @@
 
 import datetime
 
-from the_tale.accounts.prototypes import AccountPrototype
 from the_tale.accounts.conf import accounts_settings
 
 from the_tale.statistics.metrics.base import BaseMetric
+from the_tale.statistics.metrics import sources
 from the_tale.statistics import relations
 
 
@@ -14,13 +14,14 @@ class AliveAfterBase(BaseMetric):
     FULL_CLEAR_RECUIRED = True
     DAYS = None
 
+    def initialize(self):
+        super(AliveAfterBase, self).initialize()
+        self.alive = self.daily_series((account.created_at.date(), 1)
+                                       for account in sources.registered_accounts()
+                                       if (account.active_end_at - account.created_at - datetime.timedelta(seconds=accounts_settings.ACTIVE_STATE_TIMEOUT)).days >= self.DAYS)
+
     def get_value(self, date):
-        query = AccountPrototype._db_filter(self.db_date_day('created_at', date),
-                                            is_fast=False,
-                                            is_bot=False)
-        return len([True
-                    for active_end_at, created_at in query.values_list('active_end_at', 'created_at')
-                    if (active_end_at - created_at - datetime.timedelta(seconds=accounts_settings.ACTIVE_STATE_TIMEOUT)).days >= self.DAYS])
+        return self.alive.get(date)
 
     def _get_interval(self):
         return (self.free_date, (datetime.datetime.now()-datetime.timedelta(days=self.DAYS)).date())
@@ -58,40 +59,48 @@ class AliveAfter0(AliveAfterBase):
 class Lifetime(BaseMetric):
     TYPE = relations.RECORD_TYPE.LIFETIME
     FULL_CLEAR_RECUIRED = True
+    LIFETIME_DELTA = datetime.timedelta(seconds=accounts_settings.ACTIVE_STATE_TIMEOUT-1)
 
-    def get_value(self, date):
-        query = AccountPrototype._db_filter(self.db_date_day('created_at', date=date),
-                                            is_fast=False,
-                                            is_bot=False)
+    def get_lifetimes(self):
+        for account in sources.registered_accounts():
+            lifetime = account.active_end_at - account.created_at - self.LIFETIME_DELTA
+
+            # filter «strange» lifetimes
+            if lifetime > datetime.timedelta(seconds=0):
+                yield account.created_at.date(), lifetime
+
+    def initialize(self):
+        super(Lifetime, self).initialize()
 
-        lifetimes = [active_end_at - created_at - datetime.timedelta(seconds=accounts_settings.ACTIVE_STATE_TIMEOUT-1)
-                     for active_end_at, created_at in query.values_list('active_end_at', 'created_at') ]
+        lifetimes = list(self.get_lifetimes())
 
-        # filter «strange» lifetimes
-        lifetimes = [lifetime for lifetime in lifetimes if lifetime > datetime.timedelta(seconds=0)]
+        self.accounts = self.daily_series((date, 1) for date, lifetime in lifetimes)
+        self.lifetimes = self.daily_series((date, lifetime.total_seconds()) for date, lifetime in lifetimes)
 
-        if not lifetimes:
+    def get_value(self, date):
+        accounts_number = self.accounts.get(date)
+
+        if not accounts_number:
             return 0
 
-        total_time = reduce(lambda s, v: s+v, lifetimes, datetime.timedelta(seconds=0))
-        return float(total_time.total_seconds() / (24*60*60)) / len(lifetimes)
+        return float(self.lifetimes.get(date) / (24*60*60)) / accounts_number
 
 
-class LifetimePercent(BaseMetric):
+class LifetimePercent(Lifetime):
     TYPE = relations.RECORD_TYPE.LIFETIME_PERCENT
     FULL_CLEAR_RECUIRED = True
+    LIFETIME_DELTA = datetime.timedelta(seconds=accounts_settings.ACTIVE_STATE_TIMEOUT)
+
+    def get_lifetimes(self):
+        for account in sources.registered_accounts():
+            yield account.created_at.date(), account.active_end_at - account.created_at - self.LIFETIME_DELTA
 
     def get_value(self, date):
-        query = AccountPrototype._db_filter(self.db_date_day('created_at', date=date),
-                                            is_fast=False,
-                                            is_bot=False)
-        lifetimes = [active_end_at - created_at - datetime.timedelta(seconds=accounts_settings.ACTIVE_STATE_TIMEOUT)
-                     for active_end_at, created_at in query.values_list('active_end_at', 'created_at') ]
+        accounts_number = self.accounts.get(date)
 
-        if not lifetimes:
+        if not accounts_number:
             return 0
 
-        total_time = reduce(lambda s, v: s+v, lifetimes, datetime.timedelta(seconds=0))
-        lifetime = float(total_time.total_seconds()) / len(lifetimes)
+        lifetime = float(self.lifetimes.get(date)) / accounts_number
         maximum = (datetime.datetime.now().date() - date).total_seconds()
         return  lifetime / maximum * 100
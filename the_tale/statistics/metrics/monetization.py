@@ -1,120 +1,70 @@
 # coding: utf-8
 import datetime
 
-from django.db import models
-
 from the_tale.common.utils.logic import days_range
 
 from the_tale.accounts.prototypes import AccountPrototype
 
 from the_tale.finances.shop.relations import GOODS_GROUP
 
-from the_tale.finances.bank.prototypes import InvoicePrototype
-from the_tale.finances.bank.relations import INVOICE_STATE, ENTITY_TYPE, CURRENCY_TYPE
-
 from the_tale.accounts import conf as accounts_conf
 from the_tale.finances.market import conf as market_conf
 
 from the_tale.forum import models as forum_models
 
 from the_tale.statistics.metrics.base import BaseMetric, BasePercentsCombination, BaseFractionCombination, BasePercentsFromSumCombination
+from the_tale.statistics.metrics import sources
 from the_tale.statistics import relations
 from the_tale.statistics.conf import statistics_settings
 
 
-ACCEPTED_INVOICE_FILTER = models.Q(state=INVOICE_STATE.CONFIRMED)|models.Q(state=INVOICE_STATE.FORCED)
-
-
 class Payers(BaseMetric):
     TYPE = relations.RECORD_TYPE.PAYERS
-    PREFETCH_DELTA = datetime.timedelta(days=1)
 
     def initialize(self):
         super(Payers, self).initialize()
-        invoices = list(InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                                    self.db_date_gte('created_at', date=self.free_date - self.PREFETCH_DELTA),
-                                                    sender_type=ENTITY_TYPE.XSOLLA,
-                                                    currency=CURRENCY_TYPE.PREMIUM).values_list('created_at', 'recipient_id'))
 
-        self.invoices = {}
+        payers = {}
 
-        for invoice_data, recipient_id in invoices:
-            created_at = invoice_data.date()
+        for payment in sources.payments():
+            payers.setdefault(payment.created_at.date(), set()).add(payment.recipient_id)
 
-            if created_at not in self.invoices:
-                self.invoices[created_at] = set()
-
-            self.invoices[created_at].add(recipient_id)
+        self.payers = self.daily_series((date, len(recipients)) for date, recipients in payers.iteritems())
 
     def get_value(self, date):
-        return len(self.invoices.get(date, frozenset()))
+        return self.payers.get(date)
 
 
 class PayersInMonth(Payers):
     TYPE = relations.RECORD_TYPE.PAYERS_IN_MONTH
-    PREFETCH_DELTA = datetime.timedelta(days=30)
 
     def get_value(self, date):
-        return sum(len(self.invoices.get(date - datetime.timedelta(days=i), frozenset())) for i in xrange(30) )
+        return self.payers.window(date, 30)
 
 
 class Income(BaseMetric):
     TYPE = relations.RECORD_TYPE.INCOME
-    PREFETCH_DELTA = datetime.timedelta(days=1)
 
     def initialize(self):
         super(Income, self).initialize()
-        query = InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                            self.db_date_gte('created_at', date=self.free_date - self.PREFETCH_DELTA),
-                                            sender_type=ENTITY_TYPE.XSOLLA, currency=CURRENCY_TYPE.PREMIUM).values_list('created_at', 'amount')
-        invoices = [(created_at.date(), amount) for created_at, amount in query]
-
-        self.invoices_values = {}
-        for created_at, amount in invoices:
-            self.invoices_values[created_at] = self.invoices_values.get(created_at, 0) + amount
+        self.income = self.daily_series((payment.created_at.date(), payment.amount) for payment in sources.payments())
 
     def get_value(self, date):
-        return self.invoices_values.get(date, 0)
+        return self.income.get(date)
 
 
 class IncomeInMonth(Income):
     TYPE = relations.RECORD_TYPE.INCOME_IN_MONTH
-    PREFETCH_DELTA = datetime.timedelta(days=30)
 
     def get_value(self, date):
-        return sum(self.invoices_values.get(date - datetime.timedelta(days=i), 0) for i in xrange(30) )
+        return self.income.window(date, 30)
 
 
-class IncomeTotal(BaseMetric):
+class IncomeTotal(Income):
     TYPE = relations.RECORD_TYPE.INCOME_TOTAL
 
-    def initialize(self):
-        super(IncomeTotal, self).initialize()
-        query = InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                            self.db_date_gte('created_at'),
-                                            sender_type=ENTITY_TYPE.XSOLLA,
-                                            currency=CURRENCY_TYPE.PREMIUM).values_list('created_at', 'amount')
-        invoices = [(created_at.date(), amount) for created_at, amount in query]
-
-        invoices_values = {}
-        for created_at, amount in invoices:
-            invoices_values[created_at] = invoices_values.get(created_at, 0) + amount
-
-        income = InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                             self.db_date_lt('created_at'),
-                                             sender_type=ENTITY_TYPE.XSOLLA,
-                                             currency=CURRENCY_TYPE.PREMIUM).aggregate(income=models.Sum('amount'))['income']
-        if income is None:
-            income = 0
-
-        self.incomes = {}
-
-        for date in days_range(*self._get_interval()):
-            income += invoices_values.get(date, 0)
-            self.incomes[date] = income
-
     def get_value(self, date):
-        return self.incomes[date]
+        return self.income.total(date)
 
 
 class ARPPU(BaseFractionCombination):
@@ -146,34 +96,39 @@ class DaysBeforePayment(BaseMetric):
     FULL_CLEAR_RECUIRED = True
     PERIOD = 30
 
-    def get_value(self, date):
-        query = AccountPrototype._db_filter(is_fast=False, is_bot=False)
+    def initialize(self):
+        super(DaysBeforePayment, self).initialize()
+
+        recipients = sources.payments_by_recipient()
 
         # do not use accounts registered before payments turn on
-        query = query.filter(self.db_date_interval('created_at', date=date, days=-self.PERIOD),
-                             self.db_date_gte('created_at', date=statistics_settings.PAYMENTS_START_DATE.date()))
-        accounts = dict(query.values_list('id', 'created_at'))
+        payments_start = statistics_settings.PAYMENTS_START_DATE.date()
 
-        invoices = list(InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                                    sender_type=ENTITY_TYPE.XSOLLA,
-                                                    currency=CURRENCY_TYPE.PREMIUM,
-                                                    recipient_id__in=accounts.keys()).values_list('created_at', 'recipient_id'))
+        delays = []
+        payments_numbers = []
 
-        account_ids = [id_ for created_at, id_ in invoices]
+        for account in sources.registered_accounts():
+            if account.created_at <= datetime.datetime.combine(payments_start, datetime.time()):
+                continue
 
-        if not account_ids:
-            return 0
+            if account.id not in recipients:
+                continue
 
-        delays = {account_id: min([(created_at - accounts[account_id])
-                                   for created_at, id_ in invoices
-                                   if id_==account_id])
-                  for account_id in account_ids}
+            payments = recipients[account.id]
 
-        total_time = reduce(lambda s, v: s+v, delays.values(), datetime.timedelta(seconds=0))
+            delays.append((account.created_at.date(), (payments[0].created_at - account.created_at).total_seconds()))
+            payments_numbers.append((account.created_at.date(), len(payments)))
 
-        days = float(total_time.total_seconds()) / len(account_ids) / (24*60*60)
+        self.delays = self.daily_series(delays)
+        self.payments_numbers = self.daily_series(payments_numbers)
 
-        return days
+    def get_value(self, date):
+        payments_number = self.payments_numbers.window(date, self.PERIOD)
+
+        if not payments_number:
+            return 0
+
+        return float(self.delays.window(date, self.PERIOD)) / payments_number / (24*60*60)
 
 
 class ARPNU(BaseMetric):
@@ -182,26 +137,30 @@ class ARPNU(BaseMetric):
     DAYS = None
     PERIOD = 30
 
+    def initialize(self):
+        super(ARPNU, self).initialize()
+
+        recipients = sources.payments_by_recipient()
+
+        incomes = []
+
+        for account in sources.registered_accounts():
+            payments = recipients.get(account.id, ())
+            period_end = account.created_at + datetime.timedelta(days=self.DAYS)
+            incomes.append((account.created_at.date(), sum(payment.amount
+                                                           for payment in payments
+                                                           if account.created_at < payment.created_at < period_end)))
+
+        self.accounts = self.daily_series((date, 1) for date, income in incomes)
+        self.incomes = self.daily_series(incomes)
+
     def get_value(self, date):
-        query = AccountPrototype._db_filter(self.db_date_interval('created_at', date=date, days=-self.PERIOD),
-                                            is_fast=False,
-                                            is_bot=False)
-        accounts = list(query.values_list('id', 'created_at'))
+        accounts_number = self.accounts.window(date, self.PERIOD)
 
-        if not accounts:
+        if not accounts_number:
             return 0
 
-        total_income = 0
-        for account_id, created_at in accounts:
-            income = InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                                 self.db_date_interval('created_at', date=created_at, days=self.DAYS),
-                                                 sender_type=ENTITY_TYPE.XSOLLA,
-                                                 currency=CURRENCY_TYPE.PREMIUM,
-                                                 recipient_id=account_id).aggregate(income=models.Sum('amount'))['income']
-            if income is not None:
-                total_income += income
-
-        return float(total_income) / len(accounts)
+        return float(self.incomes.window(date, self.PERIOD)) / accounts_number
 
     def _get_interval(self):
         return (self.free_date, (datetime.datetime.now()-datetime.timedelta(days=self.DAYS)).date())
@@ -225,24 +184,24 @@ class LTV(BaseMetric):
     FULL_CLEAR_RECUIRED = True
     PERIOD = 7
 
-    def get_value(self, date):
-        query = AccountPrototype._db_filter(self.db_date_interval('created_at', date=date, days=-self.PERIOD),
-                                            is_fast=False,
-                                            is_bot=False)
-        accounts_ids = list(query.values_list('id', flat=True))
+    def initialize(self):
+        super(LTV, self).initialize()
 
-        if not accounts_ids:
-            return 0
+        recipients = sources.payments_by_recipient()
 
-        total_income = InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                                   sender_type=ENTITY_TYPE.XSOLLA,
-                                                   currency=CURRENCY_TYPE.PREMIUM,
-                                                   recipient_id__in=accounts_ids).aggregate(income=models.Sum('amount'))['income']
+        incomes = [(account.created_at.date(), sum(payment.amount for payment in recipients.get(account.id, ())))
+                   for account in sources.registered_accounts()]
+
+        self.accounts = self.daily_series((date, 1) for date, income in incomes)
+        self.incomes = self.daily_series(incomes)
+
+    def get_value(self, date):
+        accounts_number = self.accounts.window(date, self.PERIOD)
 
-        if total_income is None:
+        if not accounts_number:
             return 0
 
-        return float(total_income) / len(accounts_ids)
+        return float(self.incomes.window(date, self.PERIOD)) / accounts_number
 
 
 
@@ -254,18 +213,20 @@ class IncomeFromGroupsBase(BaseMetric):
     def filter_recipients(cls, ids):
         raise NotImplementedError
 
-    def get_value(self, date):
-        invoices = list(InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                                    self.db_date_interval('created_at', date=date, days=-self.PERIOD),
-                                                    sender_type=ENTITY_TYPE.XSOLLA,
-                                                    currency=CURRENCY_TYPE.PREMIUM).values_list('recipient_id', 'amount'))
+    def initialize(self):
+        super(IncomeFromGroupsBase, self).initialize()
 
-        if not invoices:
-            return 0
+        payments = sources.payments()
+
+        # groups membership is checked by current state, so it can be done once for all payers
+        recipients = set(self.filter_recipients(list(set(payment.recipient_id for payment in payments)))) if payments else set()
 
-        recipients = set(self.filter_recipients(zip(*invoices)[0]))
+        self.income = self.daily_series((payment.created_at.date(), payment.amount)
+                                        for payment in payments
+                                        if payment.recipient_id in recipients)
 
-        return sum([amount for recipient_id, amount in invoices if recipient_id in recipients], 0)
+    def get_value(self, date):
+        return self.income.window(date, self.PERIOD)
 
 
 class IncomeFromForum(IncomeFromGroupsBase):
@@ -304,20 +265,17 @@ class IncomeFromGoodsBase(BaseMetric):
     GROUP_PREFIX = None
     PERIOD = 30
 
-    def selector(self):
-        return models.Q(operation_uid__contains=self.GROUP_PREFIX)
-
-    def get_value(self, date):
-        income = InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                             self.selector(),
-                                             self.db_date_interval('created_at', date=date, days=-self.PERIOD),
-                                             sender_type=ENTITY_TYPE.GAME_LOGIC,
-                                             currency=CURRENCY_TYPE.PREMIUM).aggregate(income=models.Sum('amount'))['income']
+    def is_suitable(self, operation_uid):
+        return self.GROUP_PREFIX in operation_uid
 
-        if income is None:
-            return 0
+    def initialize(self):
+        super(IncomeFromGoodsBase, self).initialize()
+        self.income = self.daily_series((purchase.created_at.date(), purchase.amount)
+                                        for purchase in sources.purchases()
+                                        if self.is_suitable(purchase.operation_uid))
 
-        return -income
+    def get_value(self, date):
+        return -self.income.window(date, self.PERIOD)
 
 
 class IncomeFromGoodsPremium(IncomeFromGoodsBase):
@@ -365,28 +323,31 @@ class IncomeFromGoodsOther(IncomeFromGoodsBase):
     TYPE = relations.RECORD_TYPE.INCOME_FROM_GOODS_OTHER
     GROUP = None
 
-    def selector(self):
-        return ~(models.Q(operation_uid__contains='<%s' % IncomeFromGoodsPremium.GROUP_PREFIX) |
-                 models.Q(operation_uid__contains='<%s' % IncomeFromGoodsEnergy.GROUP_PREFIX) |
-                 models.Q(operation_uid__contains='<%s' % IncomeFromGoodsChest.GROUP_PREFIX) |
-                 models.Q(operation_uid__contains='<%s' % IncomeFromGoodsPeferences.GROUP_PREFIX) |
-                 models.Q(operation_uid__contains='<%s' % IncomeFromGoodsPreferencesReset.GROUP_PREFIX) |
-                 models.Q(operation_uid__contains='<%s' % IncomeFromGoodsHabits.GROUP_PREFIX) |
-                 models.Q(operation_uid__contains='<%s' % IncomeFromGoodsAbilities.GROUP_PREFIX) |
-                 models.Q(operation_uid__contains='<%s' % IncomeFromGoodsClans.GROUP_PREFIX) |
-                 models.Q(operation_uid__contains='<%s' % IncomeFromGoodsMarketCommission.GROUP_PREFIX) |
-                 models.Q(operation_uid__contains='<%s' % IncomeFromTransferMoneyCommission.GROUP_PREFIX) )
+    GROUPS = (IncomeFromGoodsPremium,
+              IncomeFromGoodsEnergy,
+              IncomeFromGoodsChest,
+              IncomeFromGoodsPeferences,
+              IncomeFromGoodsPreferencesReset,
+              IncomeFromGoodsHabits,
+              IncomeFromGoodsAbilities,
+              IncomeFromGoodsClans,
+              IncomeFromGoodsMarketCommission,
+              IncomeFromTransferMoneyCommission)
+
+    def is_suitable(self, operation_uid):
+        return not any(('<%s' % group.GROUP_PREFIX) in operation_uid for group in self.GROUPS)
 
 
 
 class PU(BaseMetric):
     TYPE = relations.RECORD_TYPE.PU
 
+    def initialize(self):
+        super(PU, self).initialize()
+        self.payers = self.daily_series((payments[0].created_at.date(), 1) for payments in sources.payments_by_recipient().itervalues())
+
     def get_value(self, date):
-        return InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                           self.db_date_lte('created_at', date=date),
-                                           sender_type=ENTITY_TYPE.XSOLLA,
-                                           currency=CURRENCY_TYPE.PREMIUM).values_list('recipient_id').order_by('recipient_id').distinct().count()
+        return self.payers.total(date)
 
 
 class PUPercents(BasePercentsCombination):
@@ -399,19 +360,46 @@ class IncomeGroupBase(BaseMetric):
     TYPE = None
     BORDERS = (None, None)
 
-    def get_value(self, date):
-        incomes = InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                              self.db_date_lte('created_at', date=date),
-                                              sender_type=ENTITY_TYPE.XSOLLA,
-                                              currency=CURRENCY_TYPE.PREMIUM).values_list('recipient_id', 'amount')
+    def in_group(self, amount):
+        return self.BORDERS[0] < amount <= self.BORDERS[1]
+
+    def initialize(self):
+        super(IncomeGroupBase, self).initialize()
+
+        # (accounts number, their total income) of group for every date
+        # accounts incomes are updated day by day, so every payment is processed once
+        self.groups = {}
+
+        payments = sources.payments()
+        payment_index = 0
 
         accounts_incomes = {}
-        for recipient_id, amount in incomes:
-            accounts_incomes[recipient_id] = accounts_incomes.get(recipient_id, 0) + amount
+        accounts_number = 0
+        group_income = 0
+
+        for date in days_range(*self._get_interval()):
+            border = datetime.datetime.combine(date + datetime.timedelta(days=1), datetime.time())
 
-        return len([True
-                    for amount in accounts_incomes.itervalues()
-                    if self.BORDERS[0] < amount <= self.BORDERS[1]])
+            while payment_index < len(payments) and payments[payment_index].created_at < border:
+                payment = payments[payment_index]
+                payment_index += 1
+
+                old_income = accounts_incomes.get(payment.recipient_id, 0)
+                new_income = old_income + payment.amount
+                accounts_incomes[payment.recipient_id] = new_income
+
+                if self.in_group(old_income):
+                    accounts_number -= 1
+                    group_income -= old_income
+
+                if self.in_group(new_income):
+                    accounts_number += 1
+                    group_income += new_income
+
+            self.groups[date] = (accounts_number, group_income)
+
+    def get_value(self, date):
+        return self.groups[date][0]
 
 
 class IncomeGroup0_500(IncomeGroupBase):
@@ -461,23 +449,12 @@ class IncomeGroup10000Percents(BasePercentsCombination):
                relations.RECORD_TYPE.PU]
 
 
-class IncomeGroupIncomeBase(BaseMetric):
+class IncomeGroupIncomeBase(IncomeGroupBase):
     TYPE = None
     BORDERS = (None, None)
 
     def get_value(self, date):
-        incomes = InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                              self.db_date_lte('created_at', date=date),
-                                              sender_type=ENTITY_TYPE.XSOLLA,
-                                              currency=CURRENCY_TYPE.PREMIUM).values_list('recipient_id', 'amount')
-
-        accounts_incomes = {}
-        for recipient_id, amount in incomes:
-            accounts_incomes[recipient_id] = accounts_incomes.get(recipient_id, 0) + amount
-
-        return sum([amount
-                    for amount in accounts_incomes.itervalues()
-                    if self.BORDERS[0] < amount <= self.BORDERS[1]], 0)
+        return self.groups[date][1]
 
 
 class IncomeGroupIncome0_500(IncomeGroupIncomeBase):
@@ -527,21 +504,14 @@ class IncomeGroupIncome10000Percents(BasePercentsCombination):
                relations.RECORD_TYPE.INCOME_TOTAL]
 
 
-class Revenue(BaseMetric):
+class Revenue(Income):
     TYPE = relations.RECORD_TYPE.REVENUE
     FULL_CLEAR_RECUIRED = True # change to False after v0.3.18
     DAYS = None
     PERIOD = 30
 
     def get_value(self, date):
-        income = InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
-                                             self.db_date_interval('created_at', date=date, days=-self.PERIOD),
-                                             sender_type=ENTITY_TYPE.XSOLLA,
-                                             currency=CURRENCY_TYPE.PREMIUM).aggregate(income=models.Sum('amount'))['income']
-        if income is None:
-            return 0
-
-        return income
+        return self.income.window(date, self.PERIOD)
 
 _FORUM_GROUPS = [relations.RECORD_TYPE.INCOME_FROM_FORUM,
                  relations.RECORD_TYPE.INCOME_FROM_SILENT]
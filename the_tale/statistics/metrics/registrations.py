@@ -1,12 +1,7 @@
 # coding: utf-8
-import datetime
-import collections
-
-from the_tale.common.utils.logic import days_range
-
-from the_tale.accounts.prototypes import AccountPrototype
 
 from the_tale.statistics.metrics.base import BaseMetric, BasePercentsCombination
+from the_tale.statistics.metrics import sources
 from the_tale.statistics import relations
 
 
@@ -17,11 +12,10 @@ class RegistrationsCompleted(BaseMetric):
 
     def initialize(self):
         super(RegistrationsCompleted, self).initialize()
-        registrations_dates = AccountPrototype._db_filter(is_fast=False, is_bot=False).values_list('created_at', flat=True)
-        self.registrations_count = collections.Counter(date.date() for date in registrations_dates)
+        self.registrations = self.daily_series((account.created_at.date(), 1) for account in sources.registered_accounts())
 
     def get_value(self, date):
-        return self.registrations_count.get(date, 0)
+        return self.registrations.get(date)
 
 
 class RegistrationsCompletedInMonth(RegistrationsCompleted):
@@ -29,30 +23,15 @@ class RegistrationsCompletedInMonth(RegistrationsCompleted):
     FULL_CLEAR_RECUIRED = True
 
     def get_value(self, date):
-        return sum(self.registrations_count.get(date - datetime.timedelta(days=i), 0) for i in xrange(30) )
+        return self.registrations.window(date, 30)
 
 
-class AccountsTotal(BaseMetric):
+class AccountsTotal(RegistrationsCompleted):
     FULL_CLEAR_RECUIRED = True
     TYPE = relations.RECORD_TYPE.REGISTRATIONS_TOTAL
 
-    def initialize(self):
-        super(AccountsTotal, self).initialize()
-
-        query = AccountPrototype._db_filter(is_fast=False, is_bot=False)
-
-        count = query.filter(self.db_date_lt('created_at')).count()
-
-        registrations_dates = query.filter(self.db_date_gte('created_at')).values_list('created_at', flat=True)
-        registrations_count = collections.Counter(date.date() for date in registrations_dates)
-
-        self.counts = {}
-        for date in days_range(*self._get_interval()):
-            count += registrations_count.get(date, 0)
-            self.counts[date] = count
-
     def get_value(self, date):
-        return self.counts.get(date, 0)
+        return self.registrations.total(date)
 
 
 class RegistrationsTries(BaseMetric):
@@ -62,16 +41,17 @@ class RegistrationsTries(BaseMetric):
     def initialize(self):
         super(RegistrationsTries, self).initialize()
 
-        registrations_dates = AccountPrototype._db_filter(is_bot=False).order_by('created_at').values_list('created_at', 'id')
-        self.registrations_count = {}
+        tries = []
 
         last_id = 0
-        for date, id_ in registrations_dates:
-            self.registrations_count[date.date()] = self.registrations_count.get(date.date(), 0) + (id_-last_id)
-            last_id = id_
+        for account in sorted(sources.accounts(), key=lambda account: account.created_at):
+            tries.append((account.created_at.date(), account.id - last_id))
+            last_id = account.id
+
+        self.registrations = self.daily_series(tries)
 
     def get_value(self, date):
-        return self.registrations_count.get(date, 0)
+        return self.registrations.get(date)
 
 
 class RegistrationsTriesInMonth(RegistrationsTries):
@@ -79,7 +59,7 @@ class RegistrationsTriesInMonth(RegistrationsTries):
     FULL_CLEAR_RECUIRED = True
 
     def get_value(self, date):
-        return sum(self.registrations_count.get(date - datetime.timedelta(days=i), 0) for i in xrange(30) )
+        return self.registrations.window(date, 30)
 
 
 class RegistrationsCompletedPercents(BasePercentsCombination):
@@ -102,11 +82,12 @@ class Referrals(BaseMetric):
 
     def initialize(self):
         super(Referrals, self).initialize()
-        referrals_dates = AccountPrototype._db_filter(is_fast=False, is_bot=False).exclude(referral_of=None).values_list('created_at', flat=True)
-        self.referrals_count = collections.Counter(date.date() for date in referrals_dates)
+        self.referrals = self.daily_series((account.created_at.date(), 1)
+                                           for account in sources.registered_accounts()
+                                           if account.referral_of_id is not None)
 
     def get_value(self, date):
-        return self.referrals_count.get(date, 0)
+        return self.referrals.get(date)
 
 
 class ReferralsInMonth(Referrals):
@@ -114,27 +95,15 @@ class ReferralsInMonth(Referrals):
     FULL_CLEAR_RECUIRED = True
 
     def get_value(self, date):
-        return sum(self.referrals_count.get(date - datetime.timedelta(days=i), 0) for i in xrange(30) )
+        return self.referrals.window(date, 30)
 
 
-class ReferralsTotal(BaseMetric):
+class ReferralsTotal(Referrals):
     TYPE = relations.RECORD_TYPE.REFERRALS_TOTAL
     FULL_CLEAR_RECUIRED = True
 
-    def initialize(self):
-        super(ReferralsTotal, self).initialize()
-        referrals_dates = AccountPrototype._db_filter(is_fast=False, is_bot=False).exclude(referral_of=None).values_list('created_at', flat=True)
-        referrals_count = collections.Counter(date.date() for date in referrals_dates)
-
-        self.counts = {}
-
-        count = 0
-        for date in days_range(*self._get_interval()):
-            count += referrals_count.get(date, 0)
-            self.counts[date] = count
-
     def get_value(self, date):
-        return self.counts[date]
+        return self.referrals.total(date)
 
 
 class ReferralsPercents(BasePercentsCombination):
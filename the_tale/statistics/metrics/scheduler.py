@@ -0,0 +1,92 @@
+# coding: utf-8
+import sys
+import Queue
+
+from multiprocessing.pool import ThreadPool
+
+from django import db
+
+from the_tale.statistics.metrics import exceptions
+
+
+def get_dependencies(metrics):
+    # {metric class: set of metric classes, which records it combines}
+    # sources, which are not calculated in the same run, are already stored and do not block metric
+    metrics_by_type = {metric.TYPE: metric for metric in metrics}
+
+    return {metric: set(metrics_by_type[source] for source in getattr(metric, 'SOURCES', ()) if source in metrics_by_type)
+            for metric in metrics}
+
+
+def get_order(metrics):
+    # metrics in order of calculation, original order is kept where dependencies allow it
+    dependencies = get_dependencies(metrics)
+
+    ordered = []
+    completed = set()
+    waiting = list(metrics)
+
+    while waiting:
+        ready = [metric for metric in waiting if dependencies[metric] <= completed]
+
+        if not ready:
+            raise exceptions.CyclicDependenciesError(metrics=', '.join(str(metric.TYPE) for metric in waiting))
+
+        for metric in ready:
+            waiting.remove(metric)
+            completed.add(metric)
+            ordered.append(metric)
+
+    return ordered
+
+
+def _process_in_thread(process, metric, results):
+    # every thread uses its own database connection, it must be closed when work done
+    try:
+        process(metric)
+        results.put((metric, None))
+    except Exception:
+        results.put((metric, sys.exc_info()))
+    finally:
+        db.connection.close()
+
+
+def run(metrics, process, workers=1):
+    # call process(metric) for every metric, metrics are processed only after all of their sources
+    # independent metrics are processed concurrently by «workers» threads
+    ordered = get_order(metrics)
+
+    if workers <= 1:
+        for metric in ordered:
+            process(metric)
+        return
+
+    dependencies = get_dependencies(metrics)
+
+    waiting = list(ordered)
+    running = set()
+    completed = set()
+
+    results = Queue.Queue()
+
+    pool = ThreadPool(workers)
+
+    try:
+        while waiting or running:
+            for metric in [metric for metric in waiting if dependencies[metric] <= completed]:
+                waiting.remove(metric)
+                running.add(metric)
+                pool.apply_async(_process_in_thread, (process, metric, results))
+
+            metric, exc_info = results.get()
+
+            running.remove(metric)
+
+            if exc_info is not None:
+                raise exc_info[0], exc_info[1], exc_info[2]
+
+            completed.add(metric)
+
+    finally:
+        pool.close()
+        pool.join()
@@ -0,0 +1,89 @@
+# coding: utf-8
+import functools
+import threading
+import collections
+
+from django.db import models
+
+from the_tale.accounts.prototypes import AccountPrototype, RandomPremiumRequestPrototype
+
+from the_tale.finances.bank.prototypes import InvoicePrototype
+from the_tale.finances.bank.relations import INVOICE_STATE, ENTITY_TYPE, CURRENCY_TYPE
+
+
+# source tables of metrics
+# every table is loaded once per statistics calculation and shared between metrics
+
+ACCEPTED_INVOICE_FILTER = models.Q(state=INVOICE_STATE.CONFIRMED)|models.Q(state=INVOICE_STATE.FORCED)
+
+AccountRow = collections.namedtuple('AccountRow', ('id', 'created_at', 'active_end_at', 'referral_of_id', 'is_fast'))
+PaymentRow = collections.namedtuple('PaymentRow', ('created_at', 'recipient_id', 'amount'))
+PurchaseRow = collections.namedtuple('PurchaseRow', ('created_at', 'operation_uid', 'amount'))
+
+
+_CACHE = {}
+
+
+def clear():
+    _CACHE.clear()
+
+
+def _cached(func):
+
+    # metrics can be calculated in parallel threads, every table must be loaded only once
+    lock = threading.Lock()
+
+    @functools.wraps(func)
+    def wrapper():
+        with lock:
+            if func.__name__ not in _CACHE:
+                _CACHE[func.__name__] = func()
+        return _CACHE[func.__name__]
+
+    return wrapper
+
+
+@_cached
+def accounts():
+    # all accounts except bots, ordered by id
+    query = AccountPrototype._db_filter(is_bot=False).order_by('id')
+    return [AccountRow(*row) for row in query.values_list('id', 'created_at', 'active_end_at', 'referral_of_id', 'is_fast')]
+
+
+@_cached
+def registered_accounts():
+    return [account for account in accounts() if not account.is_fast]
+
+
+@_cached
+def payments():
+    # accepted payments of premium currency, ordered by creation time
+    query = InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
+                                        sender_type=ENTITY_TYPE.XSOLLA,
+                                        currency=CURRENCY_TYPE.PREMIUM).order_by('created_at')
+    return [PaymentRow(*row) for row in query.values_list('created_at', 'recipient_id', 'amount')]
+
+
+@_cached
+def payments_by_recipient():
+    # {recipient_id: [payment, ...]}, payments are ordered by creation time
+    recipients = {}
+
+    for payment in payments():
+        recipients.setdefault(payment.recipient_id, []).append(payment)
+
+    return recipients
+
+
+@_cached
+def purchases():
+    # accepted purchases for premium currency in game, ordered by creation time
+    query = InvoicePrototype._db_filter(ACCEPTED_INVOICE_FILTER,
+                                        sender_type=ENTITY_TYPE.GAME_LOGIC,
+                                        currency=CURRENCY_TYPE.PREMIUM).order_by('created_at')
+    return [PurchaseRow(*row) for row in query.values_list('created_at', 'operation_uid', 'amount')]
+
+
+@_cached
+def random_premium_requests():
+    return list(RandomPremiumRequestPrototype._db_all().values_list('created_at', flat=True))
@@ -0,0 +1,86 @@
+# coding: utf-8
+import datetime
+
+
+def ceil_date(value):
+    # first date, which midnight is not earlier than value
+    if value.time() == datetime.time():
+        return value.date()
+    return value.date() + datetime.timedelta(days=1)
+
+
+class DailySeries(object):
+    # values of continuous dates interval, stored in list indexed by day number
+    # total and window sums are calculated with prefix sums in constant time
+
+    __slots__ = ('start', 'values', '_prefix_sums')
+
+    def __init__(self, start, end):
+        self.start = start
+        self.values = [0] * max((end - start).days + 1, 0)
+        self._prefix_sums = None
+
+    @classmethod
+    def create(cls, items, end, start=None):
+        # items: iterable of (date, value), values of the same date are summed
+        items = list(items)
+
+        if start is None:
+            start = min(date for date, value in items) if items else end
+
+        series = cls(start=start, end=end)
+
+        for date, value in items:
+            series.add(date, value)
+
+        return series
+
+    def add(self, date, value=1):
+        # values after end are ignored, values before start are added to the first day
+        index = (date - self.start).days
+
+        if index >= len(self.values):
+            return
+
+        self.values[max(index, 0)] += value
+        self._prefix_sums = None
+
+    def add_interval(self, first_date, end_date, value=1):
+        # add value to every day of [first_date, end_date); result must be read with total()
+        self.add(first_date, value)
+
+        if end_date is not None:
+            self.add(end_date, -value)
+
+    def _get_prefix_sums(self):
+        if self._prefix_sums is None:
+            self._prefix_sums = [0]
+
+            current_sum = 0
+
+            for value in self.values:
+                current_sum += value
+                self._prefix_sums.append(current_sum)
+
+        return self._prefix_sums
+
+    def get(self, date):
+        index = (date - self.start).days
+
+        if not 0 <= index < len(self.values):
+            return 0
+
+        return self.values[index]
+
+    def total(self, date):
+        # sum of values from start to date inclusive
+        index = min((date - self.start).days + 1, len(self.values))
+
+        if index <= 0:
+            return 0
+
+        return self._get_prefix_sums()[index]
+
+    def window(self, date, days):
+        # sum of values of «days» days, which end with date inclusive
+        return self.total(date) - self.total(date - datetime.timedelta(days=days))
@@ -16,7 +16,7 @@ class RecordPrototype(BasePrototype):
 
 
     @classmethod
-    def create(cls, type, date, value_int=None, value_float=None):
+    def _new_model(cls, type, date, value_int=None, value_float=None):
 
         if value_int is None and value_float is None:
             raise exceptions.ValueNotSpecifiedError()
@@ -31,13 +31,22 @@ class RecordPrototype(BasePrototype):
                 raise exceptions.ValueNotSpecifiedForTypeError(type=type)
             value_float = float(value_int)
 
-        model = cls._model_class.objects.create(date=date,
-                                                type=type,
-                                                value_int=value_int,
-                                                value_float=value_float)
+        return cls._model_class(date=date,
+                                type=type,
+                                value_int=value_int,
+                                value_float=value_float)
 
+    @classmethod
+    def create(cls, type, date, value_int=None, value_float=None):
+        model = cls._new_model(type=type, date=date, value_int=value_int, value_float=value_float)
+        model.save()
         return cls(model=model)
 
+    @classmethod
+    def create_many(cls, records):
+        # records: iterable of dicts with create arguments, saved with single query
+        cls._model_class.objects.bulk_create([cls._new_model(**record) for record in records])
+
 
     @classmethod
     def remove_by_type(cls, type):
@@ -64,13 +64,24 @@ class BaseMetricsTests(testcase.TestCase):
     @mock.patch('the_tale.statistics.metrics.base.BaseMetric._get_interval',
                 lambda self: (datetime.datetime(year=6, month=6, day=6, hour=6), datetime.datetime(year=6, month=6, day=9, hour=6)))
     def test_complete_values(self):
-        with mock.patch('the_tale.statistics.metrics.base.BaseMetric.store_value') as store_value:
+        with mock.patch('the_tale.statistics.metrics.base.BaseMetric.store_values') as store_values:
             self.metric.complete_values()
 
-        self.assertEqual(store_value.call_args_list,
-                         [mock.call(datetime.date(year=6, month=6, day=6), 1),
-                          mock.call(datetime.date(year=6, month=6, day=7), 2),
-                          mock.call(datetime.date(year=6, month=6, day=8), 3)])
+        self.assertEqual(store_values.call_args_list,
+                         [mock.call([(datetime.date(year=6, month=6, day=6), 1),
+                                     (datetime.date(year=6, month=6, day=7), 2),
+                                     (datetime.date(year=6, month=6, day=8), 3)])])
+
+    @mock.patch('the_tale.statistics.metrics.base.BaseMetric._get_interval',
+                lambda self: (datetime.datetime(year=6, month=6, day=6, hour=6), datetime.datetime(year=6, month=6, day=9, hour=6)))
+    def test_complete_values__records(self):
+        with self.check_delta(RecordPrototype._db_count, 3):
+            self.metric.complete_values()
+
+        self.assertEqual(RecordPrototype.select_values(type=TestMetric.TYPE,
+                                                       date_from=datetime.datetime(year=6, month=6, day=6),
+                                                       date_to=datetime.datetime(year=6, month=6, day=8)),
+                         (1, 2, 3))
 
     def test_complete_values__block_second_time(self):
         self.metric.complete_values()
@@ -29,6 +29,20 @@ class PrototypeTests(testcase.TestCase):
         self.assertEqual(record.value_int, 666)
         self.assertEqual(record.value_float, 666.6)
 
+    def test_create_many(self):
+
+        with self.check_delta(RecordPrototype._db_count, 2):
+            RecordPrototype.create_many([{'type': relations.RECORD_TYPE.TEST_INT, 'date': self.date, 'value_int': 666},
+                                         {'type': relations.RECORD_TYPE.TEST_FLOAT, 'date': self.date, 'value_float': 41.7}])
+
+        self.assertEqual(RecordPrototype.select(type=relations.RECORD_TYPE.TEST_INT, date_from=self.date, date_to=self.date), [(self.date, 666)])
+        self.assertEqual(RecordPrototype.select(type=relations.RECORD_TYPE.TEST_FLOAT, date_from=self.date, date_to=self.date), [(self.date, 41.7)])
+
+    def test_create_many__values_not_specified(self):
+        with self.check_not_changed(RecordPrototype._db_count):
+            self.assertRaises(exceptions.ValueNotSpecifiedError, RecordPrototype.create_many, [{'type': relations.RECORD_TYPE.TEST_INT, 'date': self.date, 'value_int': 666},
+                                                                                              {'type': relations.RECORD_TYPE.TEST_INT, 'date': self.date}])
+
     def test_create__values_not_specified(self):
         self.assertRaises(exceptions.ValueNotSpecifiedError, RecordPrototype.create, type=relations.RECORD_TYPE.TEST_INT, date=self.date)
 
@@ -0,0 +1,78 @@
+# coding: utf-8
+import threading
+
+from the_tale.common.utils import testcase
+
+from the_tale.statistics.metrics import scheduler
+from the_tale.statistics.metrics import exceptions
+
+
+class FakeMetric(object):
+    TYPE = None
+    SOURCES = []
+
+def create_metric(metric_type, sources=()):
+    return type('FakeMetric%s' % metric_type, (FakeMetric,), {'TYPE': metric_type, 'SOURCES': list(sources)})
+
+
+class SchedulerTests(testcase.TestCase):
+
+    def setUp(self):
+        super(SchedulerTests, self).setUp()
+
+        self.metric_1 = create_metric('1')
+        self.metric_2 = create_metric('2')
+        self.metric_3 = create_metric('3', sources=('2', '1'))
+        self.metric_4 = create_metric('4', sources=('3', 'stored metric'))
+        self.metric_5 = create_metric('5')
+
+        self.metrics = [self.metric_4, self.metric_3, self.metric_1, self.metric_2, self.metric_5]
+
+        self.processed = []
+        self.lock = threading.Lock()
+
+    def process(self, metric):
+        with self.lock:
+            self.processed.append(metric)
+
+    def check_order(self):
+        self.assertEqual(set(self.processed), set(self.metrics))
+        self.assertTrue(self.processed.index(self.metric_3) > self.processed.index(self.metric_1))
+        self.assertTrue(self.processed.index(self.metric_3) > self.processed.index(self.metric_2))
+        self.assertTrue(self.processed.index(self.metric_4) > self.processed.index(self.metric_3))
+
+    def test_get_dependencies(self):
+        self.assertEqual(scheduler.get_dependencies(self.metrics),
+                         {self.metric_1: set(),
+                          self.metric_2: set(),
+                          self.metric_3: set([self.metric_1, self.metric_2]),
+                          self.metric_4: set([self.metric_3]),
+                          self.metric_5: set()})
+
+    def test_get_order(self):
+        self.assertEqual(scheduler.get_order(self.metrics),
+                         [self.metric_1, self.metric_2, self.metric_5, self.metric_3, self.metric_4])
+
+    def test_get_order__cyclic_dependencies(self):
+        metric_1 = create_metric('1', sources=('2',))
+        metric_2 = create_metric('2', sources=('1',))
+        self.assertRaises(exceptions.CyclicDependenciesError, scheduler.get_order, [metric_1, metric_2, self.metric_5])
+
+    def test_run__one_worker(self):
+        scheduler.run(self.metrics, self.process, workers=1)
+        self.assertEqual(self.processed, [self.metric_1, self.metric_2, self.metric_5, self.metric_3, self.metric_4])
+
+    def test_run__many_workers(self):
+        scheduler.run(self.metrics, self.process, workers=3)
+        self.check_order()
+
+    def test_run__error(self):
+
+        def process(metric):
+            if metric is self.metric_3:
+                raise ZeroDivisionError()
+            self.process(metric)
+
+        self.assertRaises(ZeroDivisionError, scheduler.run, self.metrics, process, workers=3)
+
+        self.assertEqual(set(self.processed), set([self.metric_1, self.metric_2, self.metric_5]))
@@ -0,0 +1,84 @@
+# coding: utf-8
+import datetime
+
+from the_tale.common.utils import testcase
+
+from the_tale.statistics.metrics import windows
+
+
+class CeilDateTests(testcase.TestCase):
+
+    def test_midnight(self):
+        self.assertEqual(windows.ceil_date(datetime.datetime(2014, 1, 2)), datetime.date(2014, 1, 2))
+
+    def test_not_midnight(self):
+        self.assertEqual(windows.ceil_date(datetime.datetime(2014, 1, 2, 0, 0, 1)), datetime.date(2014, 1, 3))
+
+
+class DailySeriesTests(testcase.TestCase):
+
+    def setUp(self):
+        super(DailySeriesTests, self).setUp()
+        self.start = datetime.date(2014, 1, 1)
+        self.series = windows.DailySeries.create([(self.day(0), 1),
+                                                  (self.day(2), 2),
+                                                  (self.day(2), 3),
+                                                  (self.day(5), 10),
+                                                  (self.day(100), 1000)],
+                                                 end=self.day(9))
+
+    def day(self, number):
+        return self.start + datetime.timedelta(days=number)
+
+    def test_create(self):
+        self.assertEqual(self.series.start, self.start)
+        self.assertEqual(self.series.values, [1, 0, 5, 0, 0, 10, 0, 0, 0, 0])
+
+    def test_create__empty(self):
+        series = windows.DailySeries.create([], end=self.day(3))
+        self.assertEqual(series.values, [0])
+        self.assertEqual(series.total(self.day(3)), 0)
+
+    def test_get(self):
+        self.assertEqual(self.series.get(self.day(-1)), 0)
+        self.assertEqual(self.series.get(self.day(2)), 5)
+        self.assertEqual(self.series.get(self.day(10)), 0)
+
+    def test_total(self):
+        self.assertEqual(self.series.total(self.day(-1)), 0)
+        self.assertEqual(self.series.total(self.day(0)), 1)
+        self.assertEqual(self.series.total(self.day(4)), 6)
+        self.assertEqual(self.series.total(self.day(5)), 16)
+        self.assertEqual(self.series.total(self.day(20)), 16)
+
+    def test_window(self):
+        self.assertEqual(self.series.window(self.day(2), 1), 5)
+        self.assertEqual(self.series.window(self.day(2), 2), 5)
+        self.assertEqual(self.series.window(self.day(2), 3), 6)
+        self.assertEqual(self.series.window(self.day(6), 4), 10)
+        self.assertEqual(self.series.window(self.day(6), 30), 16)
+
+    def test_window__equal_to_direct_sum(self):
+        for number in xrange(10):
+            date = self.day(number)
+            self.assertEqual(self.series.window(date, 3),
+                             sum(self.series.get(date - datetime.timedelta(days=i)) for i in xrange(3)))
+
+    def test_add__resets_sums(self):
+        self.assertEqual(self.series.total(self.day(9)), 16)
+        self.series.add(self.day(9), 4)
+        self.assertEqual(self.series.total(self.day(9)), 20)
+
+    def test_add__before_start(self):
+        self.series.add(self.day(-10), 7)
+        self.assertEqual(self.series.get(self.day(0)), 8)
+
+    def test_add_interval(self):
+        series = windows.DailySeries(start=self.start, end=self.day(9))
+
+        series.add_interval(self.day(1), self.day(3))
+        series.add_interval(self.day(2), self.day(20))
+        series.add_interval(self.day(-5), self.day(-1))
+        series.add_interval(self.day(8), None)
+
+        self.assertEqual([series.total(self.day(i)) for i in xrange(10)], [0, 1, 2, 1, 1, 1, 1, 1, 2, 2])